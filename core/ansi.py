@@ -1,11 +1,15 @@
 """ANSI color code converter — {color_name} → ANSI escape sequences.
 
 Supports: 16-color, 256-color ({fg_NNN}, {bg_NNN}), 24-bit truecolor ({rgb_R_G_B}).
+Output can be limited to what a client shows (``mode``): no color, 16
+colors or 256 colors — extended colors are downsampled to the nearest.
 """
 
 from __future__ import annotations
 
 import re
+from collections import OrderedDict
+from functools import lru_cache
 
 # Standard 16-color foreground
 _FG = {
@@ -53,53 +57,140 @@ _BGRGB_RE = re.compile(r"bgrgb_(\d{1,3})_(\d{1,3})_(\d{1,3})")
 
 _COLOR_RE = re.compile(r"\{([\w]+)\}")
 
-
-def _resolve_code(tag: str) -> str | None:
-    """Resolve a color tag to ANSI escape sequence."""
-    # Named color
+# ── Client color modes ───────────────────────────────────────────
+# Extended colors are downsampled to what the client can show; in
+# STRIP mode every known tag is removed (unknown tags stay, as always).
+
+STRIP = "none"
+ANSI16 = "16"
+ANSI256 = "256"
+TRUECOLOR = "truecolor"
+COLOR_MODES = (STRIP, ANSI16, ANSI256, TRUECOLOR)
+
+# xterm default palette for the 16 base colors (index → RGB)
+_PALETTE16 = (
+    (0, 0, 0), (205, 0, 0), (0, 205, 0), (205, 205, 0),
+    (0, 0, 238), (205, 0, 205), (0, 205, 205), (229, 229, 229),
+    (127, 127, 127), (255, 0, 0), (0, 255, 0), (255, 255, 0),
+    (92, 92, 255), (255, 0, 255), (0, 255, 255), (255, 255, 255),
+)
+_CUBE = (0, 95, 135, 175, 215, 255)
+
+
+def _rgb_of_256(n: int) -> tuple[int, int, int]:
+    if n < 16:
+        return _PALETTE16[n]
+    if n < 232:
+        n -= 16
+        return _CUBE[n // 36], _CUBE[n // 6 % 6], _CUBE[n % 6]
+    level = 8 + (n - 232) * 10
+    return level, level, level
+
+
+def _nearest(rgb: tuple[int, int, int], candidates: range) -> int:
+    r, g, b = rgb
+    best, best_d = 0, 1 << 30
+    for i in candidates:
+        cr, cg, cb = _rgb_of_256(i)
+        d = (r - cr) ** 2 + (g - cg) ** 2 + (b - cb) ** 2
+        if d < best_d:
+            best, best_d = i, d
+    return best
+
+
+def _sgr16(index: int, background: bool) -> str:
+    base = (40 if background else 30) if index < 8 else (100 if background else 90)
+    return f"{_ESC}{base + index % 8}m"
+
+
+def _extended(index: int | None, rgb: tuple[int, int, int] | None,
+              background: bool, mode: str) -> str:
+    """Escape for a 256-color index or an RGB triple in *mode*."""
+    if mode == TRUECOLOR and rgb is not None:
+        return f"{_ESC}{48 if background else 38};2;{rgb[0]};{rgb[1]};{rgb[2]}m"
+    if mode in (TRUECOLOR, ANSI256):
+        if index is None:
+            index = _nearest(rgb, range(16, 256))
+        return f"{_ESC}{48 if background else 38};5;{index}m"
+    if index is not None and index < 16:
+        return _sgr16(index, background)
+    return _sgr16(_nearest(rgb or _rgb_of_256(index), range(16)), background)
+
+
+@lru_cache(maxsize=1024)
+def _resolve_code(tag: str, mode: str = TRUECOLOR) -> str | None:
+    """Resolve a color tag to an ANSI escape sequence for *mode*."""
     code = _CODE_MAP.get(tag)
     if code is not None:
-        return code
-
-    # 256-color foreground: fg_NNN
-    m = _FG256_RE.fullmatch(tag)
-    if m:
-        n = int(m.group(1))
-        if 0 <= n <= 255:
-            return f"{_ESC}38;5;{n}m"
-
-    # 256-color background: bg_NNN (where NNN > 107 to avoid conflict with named bg_*)
-    m = _BG256_RE.fullmatch(tag)
-    if m:
-        n = int(m.group(1))
-        if 0 <= n <= 255:
-            return f"{_ESC}48;5;{n}m"
-
-    # 24-bit truecolor foreground: rgb_R_G_B
-    m = _FGRGB_RE.fullmatch(tag)
-    if m:
-        r, g, b = int(m.group(1)), int(m.group(2)), int(m.group(3))
-        if all(0 <= c <= 255 for c in (r, g, b)):
-            return f"{_ESC}38;2;{r};{g};{b}m"
-
-    # 24-bit truecolor background: bgrgb_R_G_B
-    m = _BGRGB_RE.fullmatch(tag)
-    if m:
-        r, g, b = int(m.group(1)), int(m.group(2)), int(m.group(3))
-        if all(0 <= c <= 255 for c in (r, g, b)):
-            return f"{_ESC}48;2;{r};{g};{b}m"
+        return "" if mode == STRIP else code
+
+    # 256-color foreground/background: fg_NNN / bg_NNN
+    for pattern, background in ((_FG256_RE, False), (_BG256_RE, True)):
+        m = pattern.fullmatch(tag)
+        if m:
+            n = int(m.group(1))
+            if not 0 <= n <= 255:
+                return None
+            return "" if mode == STRIP else _extended(n, None, background, mode)
+
+    # 24-bit truecolor foreground/background: rgb_R_G_B / bgrgb_R_G_B
+    for pattern, background in ((_FGRGB_RE, False), (_BGRGB_RE, True)):
+        m = pattern.fullmatch(tag)
+        if m:
+            rgb = (int(m.group(1)), int(m.group(2)), int(m.group(3)))
+            if not all(0 <= c <= 255 for c in rgb):
+                return None
+            return "" if mode == STRIP else _extended(None, rgb, background, mode)
 
     return None
 
 
-def colorize(text: str) -> str:
-    """Convert {color_name} tags to ANSI escape sequences."""
-    def _replace(m: re.Match) -> str:
-        code = _resolve_code(m.group(1))
-        if code is not None:
-            return code
-        return m.group(0)  # leave unknown tags as-is
-    return _COLOR_RE.sub(_replace, text)
+# ── Colorize ─────────────────────────────────────────────────────
+# Lines without "{" are returned as is. Others are split once into
+# literal/tag segments (re.split: even = literal, odd = tag name) and
+# joined with each tag's cached escape; the result is memoized per
+# (text, mode) in a bounded LRU, so banners, prompts, room and help
+# text are converted once.
+
+COLORIZE_CACHE_SIZE = 4096
+_COLORIZE_MAX_LEN = 8192          # longer texts are converted, not cached
+_colorized: OrderedDict[tuple[str, str], str] = OrderedDict()
+_stats = {"hits": 0, "misses": 0, "plain": 0}
+
+
+def _convert(text: str, mode: str) -> str:
+    parts = _COLOR_RE.split(text)
+    for i in range(1, len(parts), 2):
+        tag = parts[i]
+        code = _resolve_code(tag, mode)
+        parts[i] = f"{{{tag}}}" if code is None else code
+    return "".join(parts)
+
+
+def colorize(text: str, mode: str = TRUECOLOR) -> str:
+    """Convert {color_name} tags to ANSI escape sequences for *mode*."""
+    if "{" not in text:
+        _stats["plain"] += 1
+        return text
+    key = (text, mode)
+    out = _colorized.get(key)
+    if out is not None:
+        _stats["hits"] += 1
+        _colorized.move_to_end(key)
+        return out
+    _stats["misses"] += 1
+    out = _convert(text, mode)
+    if len(text) <= _COLORIZE_MAX_LEN:
+        _colorized[key] = out
+        if len(_colorized) > COLORIZE_CACHE_SIZE:
+            _colorized.popitem(last=False)
+    return out
+
+
+def colorize_stats() -> dict[str, int | float]:
+    looked_up = _stats["hits"] + _stats["misses"]
+    return {**_stats, "size": len(_colorized),
+            "hit_rate": round(_stats["hits"] / looked_up, 3) if looked_up else 0.0}
 
 
 def strip_colors(text: str) -> str:
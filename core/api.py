@@ -8,7 +8,7 @@ import time
 from typing import TYPE_CHECKING, Any
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Body
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 if TYPE_CHECKING:
     from core.engine import Engine
@@ -63,6 +63,28 @@ async def api_stats() -> JSONResponse:
     })
 
 
+@app.get("/api/persistence")
+async def api_persistence() -> JSONResponse:
+    """Write-behind save queue: depth, batches, lag, bytes per autosave."""
+    engine = get_engine()
+    checkpointer = getattr(engine, "checkpointer", None)
+    saves = {"bytes_written": engine.db.bytes_written,
+             "last_auto_save": engine.last_auto_save,
+             "player_cache": engine.db.player_cache.stats(),
+             "world_checkpoint": checkpointer.stats() if checkpointer else None}
+    queue = getattr(engine, "save_queue", None)
+    if queue is None:
+        return JSONResponse({"enabled": False, **saves})
+    return JSONResponse({"enabled": True, **queue.stats(), **saves})
+
+
+@app.get("/api/logins")
+async def api_logins() -> JSONResponse:
+    """Password hashing pool: bcrypt cost, queue depth, queue wait."""
+    engine = get_engine()
+    return JSONResponse(engine.passwords.stats())
+
+
 @app.post("/api/reload")
 async def api_reload() -> JSONResponse:
     """Trigger hot reload of game modules."""
@@ -111,6 +133,61 @@ async def api_room(vnum: int) -> JSONResponse:
 # ── Lua script endpoints ──────────────────────────────────────────
 
 
+@app.get("/api/lua/profile")
+async def api_lua_profile(format: str = "json", limit: int = 20) -> Any:
+    """Lua profiler results: json (default), report (text) or collapsed."""
+    engine = get_engine()
+    if not engine.lua:
+        raise HTTPException(status_code=503, detail="Lua runtime not initialized")
+    prof = engine.lua.profiler
+    if format == "report":
+        return PlainTextResponse(prof.report(limit))
+    if format == "collapsed":
+        return PlainTextResponse(prof.collapsed())
+    return JSONResponse(prof.as_dict())
+
+
+@app.post("/api/lua/profile")
+async def api_lua_profile_control(action: str = Body(..., embed=True)) -> JSONResponse:
+    """Control the Lua profiler: start / stop / reset."""
+    engine = get_engine()
+    if not engine.lua:
+        raise HTTPException(status_code=503, detail="Lua runtime not initialized")
+    prof = engine.lua.profiler
+    if action == "start":
+        prof.start()
+    elif action == "stop":
+        prof.stop()
+    elif action == "reset":
+        prof.reset()
+    else:
+        raise HTTPException(status_code=400, detail=f"Unknown action: {action}")
+    return JSONResponse({"status": "ok", "enabled": prof.enabled})
+
+
+@app.get("/api/lua/watchdog")
+async def api_lua_watchdog() -> JSONResponse:
+    """Lua execution budgets, abort counters and quarantined functions."""
+    engine = get_engine()
+    if not engine.lua:
+        raise HTTPException(status_code=503, detail="Lua runtime not initialized")
+    return JSONResponse(engine.lua.watchdog.as_dict())
+
+
+@app.get("/api/triggers/stats")
+async def api_trigger_stats() -> JSONResponse:
+    """Trigger fires per trigger type name, and trigger store cache counters."""
+    engine = get_engine()
+    triggers = getattr(engine, "triggers", None)
+    if triggers is None:
+        raise HTTPException(status_code=503, detail="Trigger runtime not initialized")
+    store = triggers.store
+    return JSONResponse({
+        "fires": triggers.fire_stats(),
+        "store": store.stats() if store is not None else None,
+    })
+
+
 @app.get("/api/lua/{game}")
 async def api_lua_list(game: str) -> JSONResponse:
     """List Lua scripts for a game."""
@@ -149,12 +226,12 @@ async def api_lua_put(game: str, category: str, name: str,
         game=game, category=category, name=name,
         source=source, updated_by="api",
     )
-    # Hot-reload the script
+    # Hot-reload the script (swaps only its own commands/hooks)
+    changes: dict[str, Any] = {}
     if engine.lua:
         key = f"{game}/{category}/{name}"
         try:
-            engine.lua.reload_script(source, key)
-            engine.lua.register_all_commands()
+            changes = engine.lua.reload_script(source, key)
         except Exception as e:
             return JSONResponse(
                 {"status": "error", "error": str(e), "version": row["version"]},
@@ -163,22 +240,21 @@ async def api_lua_put(game: str, category: str, name: str,
     return JSONResponse({
         "status": "ok", "version": row["version"],
         "commands": engine.lua.command_count if engine.lua else 0,
+        "added": changes.get("added", []), "removed": changes.get("removed", []),
     })
 
 
 @app.post("/api/lua/reload")
 async def api_lua_reload() -> JSONResponse:
-    """Full reload of all Lua scripts from DB."""
+    """Reload Lua scripts from DB — only scripts whose source changed."""
     engine = get_engine()
     if not engine.lua:
         raise HTTPException(status_code=503, detail="Lua runtime not initialized")
-    # Re-create runtime to clear state
-    from core.lua_commands import LuaCommandRuntime
-    engine.lua = LuaCommandRuntime(engine)
-    loaded = await engine.lua.load_from_db(engine.db, engine.game_name)
-    engine.lua.register_all_commands()
+    result = await engine.lua.reload_from_db(engine.db, engine.game_name)
     return JSONResponse({
-        "status": "ok", "loaded": loaded,
+        "status": "ok", "loaded": len(result["reloaded"]),
+        "reloaded": result["reloaded"], "unchanged": result["unchanged"],
+        "removed": result["removed"], "failed": result["failed"],
         "commands": engine.lua.command_count,
         "hooks": engine.lua.hook_count,
     })
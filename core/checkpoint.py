@@ -0,0 +1,473 @@
+"""World-state checkpoints — crash recovery for the live world.
+
+Player rows are saved by the write-behind queue; everything else that
+changes at runtime (objects on the ground and in containers, door states,
+NPCs with their HP, inventory and equipment, shopkeeper stock, corpses,
+zone ages) lives only in memory. :class:`WorldCheckpointer` persists it:
+
+- **Capture** copies room state into immutable tuples (no I/O, no
+  encoding), so later changes to the live world cannot reach the captured
+  copy. The full capture is O(rooms) and runs once, at boot
+  (:meth:`WorldCheckpointer.prime`) or on the first checkpoint. After that
+  the tick only recaptures the rooms in ``World.dirty_rooms`` (characters
+  or objects moved, doors changed) plus a rotating slice of
+  ``1/snapshot_every`` of all rooms. The slice picks up in-place changes
+  no hook sees (NPC HP, inventories, object values), so those are at most
+  ``snapshot_every`` checkpoints old.
+- **Write** runs in a worker thread: the capture is diffed room by room
+  against the previous one and only changed rooms are appended to a delta
+  log (length + CRC framed, fsynced). Every ``snapshot_every`` checkpoints
+  the full state is rewritten as a snapshot (atomic rename) and a new log
+  is started, so replay stays short.
+- **Restore** at boot reads the snapshot, replays the log up to the first
+  torn or corrupt record, and rebuilds instances — instead of running every
+  zone's resets. Records naming protos that no longer exist are skipped.
+
+Files live in ``.cache/checkpoint/<game>/``: ``world.snap`` and
+``delta.<generation>.log``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import pickle
+import struct
+import time
+import zlib
+from collections.abc import Iterable
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from core.world import ItemProto, ObjInstance, Room, _next_id
+
+if TYPE_CHECKING:
+    from core.world import MobInstance, World
+
+log = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+DEFAULT_INTERVAL = 60          # seconds between checkpoints
+DEFAULT_SNAPSHOT_EVERY = 10    # checkpoints per full snapshot
+_MAGIC = b"GENOSCP\0"
+_SNAP_HEADER = struct.Struct("<8sIQI")   # magic, version, generation, crc32
+_RECORD = struct.Struct("<II")           # payload length, crc32
+
+# Captured state (all immutable):
+#   obj   = (proto vnum | ad-hoc ItemProto, values | None, (obj, ...))
+#   mob   = (vnum, hp, max_hp, mana, max_mana, move, max_move, gold, position,
+#            alignment, affects, (obj, ...), ((slot, obj), ...))
+#   room  = (doors, (obj, ...), (mob, ...)), doors = ((dir, closed, locked), ...)
+State = dict[int, tuple]
+
+
+# ── Capture ──────────────────────────────────────────────────────
+
+def _capture_obj(obj: ObjInstance, item_protos: dict[int, ItemProto]) -> tuple:
+    proto = obj.proto
+    ref: int | ItemProto = proto.vnum if item_protos.get(proto.vnum) is proto else proto
+    values = None if obj.values == proto.values else dict(obj.values)
+    contains = tuple(_capture_obj(o, item_protos) for o in obj.contains)
+    return (ref, values, contains)
+
+
+def _capture_mob(mob: MobInstance, item_protos: dict[int, ItemProto]) -> tuple:
+    return (
+        mob.proto.vnum, mob.hp, mob.max_hp, mob.mana, mob.max_mana, mob.move,
+        mob.max_move, mob.gold, mob.position, mob.alignment,
+        tuple(dict(a) if isinstance(a, dict) else a for a in mob.affects),
+        tuple(_capture_obj(o, item_protos) for o in mob.inventory),
+        tuple((slot, _capture_obj(o, item_protos)) for slot, o in mob.equipment.items()),
+    )
+
+
+def _default_doors(room: Room) -> tuple:
+    return tuple(
+        (ex.direction, "closed" in ex.flags, "locked" in ex.flags)
+        for ex in room.proto.exits if ex.has_door
+    )
+
+
+def _capture_room(room: Room, item_protos: dict[int, ItemProto],
+                  door_defaults: dict[int, tuple] | None) -> tuple | None:
+    """Immutable copy of *room*, or None if it matches a fresh room."""
+    doors = tuple((d, s.get("closed", False), s.get("locked", False))
+                  for d, s in room.door_states.items())
+    npcs = [ch for ch in room.characters if ch.player_id is None and ch.proto]
+    if not room.objects and not npcs:
+        if not doors:
+            return None
+        if door_defaults is not None:
+            default = door_defaults.get(room.vnum)
+            if default is None:
+                default = door_defaults[room.vnum] = _default_doors(room)
+        else:
+            default = _default_doors(room)
+        if doors == default:
+            return None
+    return (
+        doors,
+        tuple(_capture_obj(o, item_protos) for o in room.objects),
+        tuple(_capture_mob(m, item_protos) for m in npcs),
+    )
+
+
+def capture(world: World, door_defaults: dict[int, tuple] | None = None) -> State:
+    """Immutable copy of every room whose state differs from a fresh room.
+
+    Player characters (and what they carry) are left out: they are saved
+    with their player rows.
+    """
+    item_protos = world.item_protos
+    world.timed.sync()                  # remaining decay pulses into values["timer"]
+    state: State = {}
+    for vnum, room in world.rooms.items():
+        rec = _capture_room(room, item_protos, door_defaults)
+        if rec is not None:
+            state[vnum] = rec
+    return state
+
+
+def recapture(world: World, state: State, vnums: Iterable[int],
+              door_defaults: dict[int, tuple] | None = None) -> State:
+    """Copy of *state* with the rooms in *vnums* captured again."""
+    item_protos = world.item_protos
+    world.timed.sync()
+    state = dict(state)
+    for vnum in vnums:
+        room = world.rooms.get(vnum)
+        rec = _capture_room(room, item_protos, door_defaults) if room is not None else None
+        if rec is None:
+            state.pop(vnum, None)
+        else:
+            state[vnum] = rec
+    return state
+
+
+# ── Restore ──────────────────────────────────────────────────────
+
+class _Restorer:
+    def __init__(self, world: World) -> None:
+        self.world = world
+        self.objects = 0
+        self.mobs = 0
+        self.skipped = 0
+
+    def obj(self, rec: tuple) -> ObjInstance | None:
+        ref, values, contains = rec
+        if isinstance(ref, ItemProto):
+            obj = ObjInstance(id=_next_id(), proto=ref, values=dict(ref.values))
+        else:
+            obj = self.world.create_obj(ref)
+            if obj is None:
+                self.skipped += 1
+                return None
+        if values is not None:
+            obj.values = dict(values)
+        if values is not None or isinstance(ref, ItemProto):
+            self.world.register_obj(obj)        # reschedules a saved timer
+        for child_rec in contains:
+            child = self.obj(child_rec)
+            if child is not None:
+                child.in_obj = obj
+                obj.contains.append(child)
+        self.objects += 1
+        return obj
+
+    def mob(self, rec: tuple, room_vnum: int) -> None:
+        (vnum, hp, max_hp, mana, max_mana, move, max_move, gold, position,
+         alignment, affects, inventory, equipment) = rec
+        mob = self.world.create_mob(vnum, room_vnum)
+        if mob is None:
+            self.skipped += 1
+            return
+        mob.hp, mob.max_hp, mob.mana, mob.max_mana = hp, max_hp, mana, max_mana
+        mob.move, mob.max_move, mob.gold = move, max_move, gold
+        mob.position, mob.alignment = position, alignment
+        mob.affects = [dict(a) if isinstance(a, dict) else a for a in affects]
+        for obj_rec in inventory:
+            obj = self.obj(obj_rec)
+            if obj is not None:
+                obj.carried_by = mob
+                mob.inventory.append(obj)
+        for slot, obj_rec in equipment:
+            obj = self.obj(obj_rec)
+            if obj is not None:
+                obj.worn_by = mob
+                obj.wear_slot = slot
+                mob.equipment[slot] = obj
+        self.mobs += 1
+
+    def room(self, room: Room, rec: tuple) -> None:
+        doors, objects, mobs = rec
+        for direction, closed, locked in doors:
+            if direction in room.door_states:
+                room.door_states[direction] = {"closed": closed, "locked": locked}
+        for obj_rec in objects:
+            obj = self.obj(obj_rec)
+            if obj is not None:
+                self.world.obj_to_room(obj, room.vnum)
+        for mob_rec in mobs:
+            self.mob(mob_rec, room.vnum)
+
+
+def apply_state(world: World, state: State, zone_ages: dict[int, int]) -> dict[str, int]:
+    """Rebuild live instances in *world* (fresh, unreset) from *state*."""
+    r = _Restorer(world)
+    rooms = 0
+    for vnum, rec in state.items():
+        room = world.rooms.get(vnum)
+        if room is None:
+            r.skipped += 1
+            continue
+        r.room(room, rec)
+        rooms += 1
+    for zone in world.zones:
+        zone.age = zone_ages.get(zone.vnum, zone.age)
+    return {"rooms": rooms, "objects": r.objects, "mobs": r.mobs, "skipped": r.skipped}
+
+
+# ── Files ────────────────────────────────────────────────────────
+
+def _fsync_dir(path: Path) -> None:
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _read_log(path: Path) -> list[tuple[State, dict[int, int]]]:
+    """Delta records up to the first torn or corrupt one."""
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        return []
+    records = []
+    pos = 0
+    while pos + _RECORD.size <= len(data):
+        length, crc = _RECORD.unpack_from(data, pos)
+        payload = data[pos + _RECORD.size: pos + _RECORD.size + length]
+        if len(payload) != length or zlib.crc32(payload) != crc:
+            log.warning("Checkpoint log %s: stopped at torn record (offset %d)", path.name, pos)
+            break
+        records.append(pickle.loads(payload))
+        pos += _RECORD.size + length
+    return records
+
+
+class WorldCheckpointer:
+    """Periodic snapshot + delta-log persistence of the live world."""
+
+    def __init__(self, world: World, directory: Path, *,
+                 snapshot_every: int = DEFAULT_SNAPSHOT_EVERY) -> None:
+        self.world = world
+        self.directory = directory
+        self.snapshot_every = max(1, snapshot_every)
+        self.generation = 0
+        self._last: State | None = None            # state as of the last write
+        self._captured: State | None = None        # state as of the last capture
+        self._cursor = 0                            # next room of the refresh slice
+        self._last_ages: dict[int, int] = {}
+        self._deltas = 0                            # records in the current log
+        self._door_defaults: dict[int, tuple] = {}
+        self._task: asyncio.Task | None = None
+        # Metrics
+        self.checkpoints = 0
+        self.snapshots = 0
+        self.skipped_busy = 0
+        self.last_capture_ms = 0.0
+        self.last_rooms_captured = 0
+        self.last_write_ms = 0.0
+        self.last_bytes = 0
+        self.last_rooms_changed = 0
+        self.last_restore: dict[str, Any] = {}
+
+    @property
+    def snapshot_path(self) -> Path:
+        return self.directory / "world.snap"
+
+    def _log_path(self, generation: int) -> Path:
+        return self.directory / f"delta.{generation}.log"
+
+    # ── Checkpoint ───────────────────────────────────────────────
+
+    def prime(self) -> None:
+        """Full capture, off the tick (boot); checkpoints then recapture dirty rooms."""
+        t0 = time.perf_counter()
+        self.world.dirty_rooms.clear()
+        self._captured = capture(self.world, self._door_defaults)
+        self.last_rooms_captured = len(self.world.rooms)
+        self.last_capture_ms = (time.perf_counter() - t0) * 1000
+
+    def _capture(self) -> State:
+        world = self.world
+        if self._captured is None:
+            self.prime()
+            return self._captured
+        vnums = world.dirty_rooms
+        world.dirty_rooms = set()
+        rooms = list(world.rooms)
+        if rooms:
+            step = -(-len(rooms) // self.snapshot_every)
+            start = self._cursor % len(rooms)
+            vnums.update(rooms[start:start + step])
+            self._cursor = start + step
+        self._captured = recapture(world, self._captured, vnums, self._door_defaults)
+        self.last_rooms_captured = len(vnums)
+        return self._captured
+
+    def checkpoint(self) -> asyncio.Task | None:
+        """Capture now (on the tick, dirty rooms only); write in the background.
+
+        Returns the write task, or None if the previous write is still
+        running (this checkpoint is skipped; the next one covers it).
+        """
+        if self._task is not None and not self._task.done():
+            self.skipped_busy += 1
+            return None
+        t0 = time.perf_counter()
+        state = self._capture()
+        ages = {z.vnum: z.age for z in self.world.zones}
+        self.last_capture_ms = (time.perf_counter() - t0) * 1000
+        loop = asyncio.get_running_loop()
+        self._task = asyncio.ensure_future(loop.run_in_executor(None, self._write, state, ages))
+        return self._task
+
+    async def close(self) -> None:
+        """Final checkpoint (shutdown); waits for it to hit the disk."""
+        if self._task is not None:
+            try:
+                await self._task
+            except Exception:
+                log.exception("World checkpoint failed")
+        task = self.checkpoint()
+        if task is not None:
+            try:
+                await task
+            except Exception:
+                log.exception("World checkpoint failed")
+
+    def _write(self, state: State, ages: dict[int, int]) -> None:
+        t0 = time.perf_counter()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if self._last is None or self._deltas >= self.snapshot_every:
+            size = self._write_snapshot(state, ages)
+            self.last_rooms_changed = len(state)
+        else:
+            last = self._last
+            rooms = {v: rec for v, rec in state.items() if last.get(v) != rec}
+            rooms.update({v: None for v in last if v not in state})
+            zones = {v: a for v, a in ages.items() if self._last_ages.get(v) != a}
+            size = self._append_delta(rooms, zones) if rooms or zones else 0
+            self.last_rooms_changed = len(rooms)
+        self._last, self._last_ages = state, ages
+        self.checkpoints += 1
+        self.last_bytes = size
+        self.last_write_ms = (time.perf_counter() - t0) * 1000
+
+    def _write_snapshot(self, state: State, ages: dict[int, int]) -> int:
+        generation = self.generation + 1
+        body = pickle.dumps((state, ages), protocol=pickle.HIGHEST_PROTOCOL)
+        tmp = self.snapshot_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(_SNAP_HEADER.pack(_MAGIC, CHECKPOINT_VERSION, generation, zlib.crc32(body)))
+            f.write(body)
+            f.flush()
+            os.fsync(f.fileno())
+        # Fresh log first: a crash between the two steps leaves an empty log
+        self._log_path(generation).write_bytes(b"")
+        os.replace(tmp, self.snapshot_path)
+        _fsync_dir(self.directory)
+        for old in self.directory.glob("delta.*.log"):
+            if old.name != self._log_path(generation).name:
+                old.unlink(missing_ok=True)
+        self.generation = generation
+        self._deltas = 0
+        self.snapshots += 1
+        return _SNAP_HEADER.size + len(body)
+
+    def _append_delta(self, rooms: dict[int, tuple | None], zones: dict[int, int]) -> int:
+        payload = pickle.dumps((rooms, zones), protocol=pickle.HIGHEST_PROTOCOL)
+        with open(self._log_path(self.generation), "ab") as f:
+            f.write(_RECORD.pack(len(payload), zlib.crc32(payload)) + payload)
+            f.flush()
+            os.fsync(f.fileno())
+        self._deltas += 1
+        return _RECORD.size + len(payload)
+
+    # ── Restore ──────────────────────────────────────────────────
+
+    def load(self) -> tuple[State, dict[int, int]] | None:
+        """Latest checkpointed state (snapshot + replayed log), or None."""
+        try:
+            with open(self.snapshot_path, "rb") as f:
+                header = f.read(_SNAP_HEADER.size)
+                body = f.read()
+        except FileNotFoundError:
+            return None
+        if len(header) != _SNAP_HEADER.size:
+            return None
+        magic, version, generation, crc = _SNAP_HEADER.unpack(header)
+        if magic != _MAGIC or version != CHECKPOINT_VERSION or zlib.crc32(body) != crc:
+            log.warning("World checkpoint %s unusable, ignoring", self.snapshot_path)
+            return None
+        state, ages = pickle.loads(body)
+        records = _read_log(self._log_path(generation))
+        for rooms, zones in records:
+            for vnum, rec in rooms.items():
+                if rec is None:
+                    state.pop(vnum, None)
+                else:
+                    state[vnum] = rec
+            ages.update(zones)
+        self.generation = generation
+        self._deltas = len(records)
+        self._last, self._last_ages = dict(state), dict(ages)
+        return state, ages
+
+    def restore(self) -> dict[str, Any] | None:
+        """Rebuild the live world from the last checkpoint; None if there is none.
+
+        Call on a freshly loaded world instead of the initial zone resets.
+        """
+        t0 = time.perf_counter()
+        try:
+            loaded = self.load()
+        except Exception as e:
+            log.warning("World checkpoint unreadable, falling back to zone resets: %s", e)
+            return None
+        if loaded is None:
+            return None
+        state, ages = loaded
+        result: dict[str, Any] = apply_state(self.world, state, ages)
+        result["generation"] = self.generation
+        result["deltas"] = self._deltas
+        result["ms"] = round((time.perf_counter() - t0) * 1000, 1)
+        self.last_restore = result
+        log.info("World restored from checkpoint gen %d (+%d deltas) in %.0f ms: "
+                 "%d rooms, %d objects, %d mobs (%d skipped)", self.generation,
+                 self._deltas, result["ms"], result["rooms"], result["objects"],
+                 result["mobs"], result["skipped"])
+        return result
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "generation": self.generation,
+            "deltas": self._deltas,
+            "checkpoints": self.checkpoints,
+            "snapshots": self.snapshots,
+            "skipped_busy": self.skipped_busy,
+            "last_capture_ms": round(self.last_capture_ms, 2),
+            "last_rooms_captured": self.last_rooms_captured,
+            "last_write_ms": round(self.last_write_ms, 2),
+            "last_bytes": self.last_bytes,
+            "last_rooms_changed": self.last_rooms_changed,
+            "last_restore": self.last_restore,
+        }
@@ -1,27 +1,172 @@
 """Database layer — asyncpg connection pool, auto-init, CRUD.
 
 GenOS Unified Schema v1.0: 20 tables in DDL, players/lua_scripts included.
+:func:`create_database` picks the backend from config; ``backend: sqlite``
+selects the embedded implementation in :mod:`core.db_sqlite`.
 """
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
 import logging
 import os
+from collections.abc import AsyncIterator, Iterable
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import asyncpg
 
+from core.persistence import DEFAULT_PLAYER_CACHE_SIZE, PlayerCache
+
+if TYPE_CHECKING:
+    from core.persistence import SaveQueue
+
 log = logging.getLogger(__name__)
 
 
+# Canonical column groups for player UPDATEs. A save writes whole groups in
+# this order, so the number of distinct statements stays small and each one
+# stays in asyncpg's per-connection prepared-statement cache.
+PLAYER_COLUMN_GROUPS: tuple[tuple[str, ...], ...] = (
+    ("hp", "max_hp", "mana", "max_mana", "move", "max_move", "room_vnum"),
+    ("gold", "level", "experience", "class_id", "alignment", "armor_class", "practices"),
+    ("skills",),
+    ("equipment", "inventory"),
+    ("affects",),
+    ("stats",),
+    ("toggles", "prompt"),
+)
+_COLUMN_GROUP = {col: i for i, grp in enumerate(PLAYER_COLUMN_GROUPS) for col in grp}
+_COLUMN_ORDER = {col: n for n, col in enumerate(c for grp in PLAYER_COLUMN_GROUPS for c in grp)}
+
+
+# Fallback DDL for the engine-managed tables (schema.sql normally creates them)
+PLAYERS_DDL = """
+CREATE TABLE IF NOT EXISTS players (
+    id            SERIAL PRIMARY KEY,
+    name          TEXT UNIQUE NOT NULL,
+    password_hash TEXT NOT NULL DEFAULT '',
+    class_id      INTEGER NOT NULL DEFAULT 0,
+    race_id       INTEGER NOT NULL DEFAULT 0,
+    sex           SMALLINT NOT NULL DEFAULT 0,
+    level         INTEGER NOT NULL DEFAULT 1,
+    experience    BIGINT NOT NULL DEFAULT 0,
+    hp            INTEGER NOT NULL DEFAULT 100,
+    max_hp        INTEGER NOT NULL DEFAULT 100,
+    mana          INTEGER NOT NULL DEFAULT 100,
+    max_mana      INTEGER NOT NULL DEFAULT 100,
+    move          INTEGER NOT NULL DEFAULT 100,
+    max_move      INTEGER NOT NULL DEFAULT 100,
+    gold          INTEGER NOT NULL DEFAULT 0,
+    bank_gold     INTEGER NOT NULL DEFAULT 0,
+    armor_class   INTEGER NOT NULL DEFAULT 100,
+    alignment     INTEGER NOT NULL DEFAULT 0,
+    stats         JSONB NOT NULL DEFAULT '{}',
+    equipment     JSONB NOT NULL DEFAULT '{}',
+    inventory     JSONB NOT NULL DEFAULT '[]',
+    affects       JSONB NOT NULL DEFAULT '[]',
+    skills        JSONB NOT NULL DEFAULT '{}',
+    flags         TEXT[] NOT NULL DEFAULT '{}',
+    aliases       JSONB NOT NULL DEFAULT '{}',
+    title         TEXT NOT NULL DEFAULT '',
+    description   TEXT NOT NULL DEFAULT '',
+    room_vnum     INTEGER NOT NULL DEFAULT 0,
+    org_id        INTEGER NOT NULL DEFAULT 0,
+    org_rank      INTEGER NOT NULL DEFAULT 0,
+    practices     INTEGER NOT NULL DEFAULT 0,
+    toggles       JSONB NOT NULL DEFAULT '{}',
+    prompt        TEXT NOT NULL DEFAULT '',
+    ext           JSONB NOT NULL DEFAULT '{}',
+    created_at    TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    last_login    TIMESTAMPTZ
+)
+"""
+
+LUA_SCRIPTS_DDL = """
+CREATE TABLE IF NOT EXISTS lua_scripts (
+    id          SERIAL PRIMARY KEY,
+    game        TEXT NOT NULL DEFAULT '',
+    category    TEXT NOT NULL DEFAULT '',
+    name        TEXT NOT NULL DEFAULT '',
+    source      TEXT NOT NULL DEFAULT '',
+    version     INTEGER NOT NULL DEFAULT 1,
+    updated_at  TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    UNIQUE (game, category, name)
+)
+"""
+
+# Logins look players up case-insensitively; UNIQUE (name) can't serve that
+PLAYERS_NAME_INDEX_DDL = (
+    "CREATE INDEX IF NOT EXISTS idx_players_lower_name ON players (lower(name))"
+)
+
+
+def player_columns(changed: Iterable[str]) -> tuple[str, ...]:
+    """Canonical column tuple covering *changed*: every group it touches.
+
+    Columns outside the canonical groups (plugin extras) follow, sorted.
+    """
+    groups: set[int] = set()
+    extra: list[str] = []
+    for col in changed:
+        g = _COLUMN_GROUP.get(col)
+        if g is None:
+            extra.append(col)
+        else:
+            groups.add(g)
+    cols = [c for g in sorted(groups) for c in PLAYER_COLUMN_GROUPS[g]]
+    return (*cols, *sorted(extra))
+
+
+def _canonical(cols: Iterable[str]) -> tuple[str, ...]:
+    known = sorted((c for c in cols if c in _COLUMN_ORDER), key=_COLUMN_ORDER.__getitem__)
+    return (*known, *sorted(c for c in cols if c not in _COLUMN_ORDER))
+
+
+@lru_cache(maxsize=256)
+def _player_update_sql(cols: tuple[str, ...]) -> str:
+    sets = ", ".join(f"{k} = ${i}" for i, k in enumerate(cols, start=2))
+    return f"UPDATE players SET {sets}, last_login = NOW() WHERE id = $1"  # noqa: S608
+
+
+def _scalar_size(values: Iterable[Any]) -> int:
+    """Payload bytes of non-JSON parameters (JSONB is counted by the codec)."""
+    size = 0
+    for v in values:
+        if isinstance(v, str):
+            size += len(v.encode("utf-8"))
+        elif not isinstance(v, (dict, list)):
+            size += 8
+    return size
+
+
+def lua_source_hash(source: str) -> str:
+    """Content hash of a Lua script; equals PostgreSQL ``md5(source)``."""
+    return hashlib.md5(source.encode("utf-8")).hexdigest()
+
+
+def _encode_json(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _decode_jsonb(data: bytes) -> Any:
+    return json.loads(data[1:])
+
+
 class Database:
     """Async PostgreSQL database wrapper."""
 
     def __init__(self, config: dict[str, Any]) -> None:
         self._config = config
         self._pool: asyncpg.Pool | None = None
+        self.bytes_written = 0   # player column payload bytes saved so far
+        self._json_bytes = 0     # bytes produced by the JSONB encoder
+        self.player_cache = PlayerCache(
+            config.get("player_cache_size", DEFAULT_PLAYER_CACHE_SIZE))
+        self.save_queue: SaveQueue | None = None  # set by the engine (write-behind)
 
     @property
     def pool(self) -> asyncpg.Pool:
@@ -39,9 +184,28 @@ class Database:
             dsn,
             min_size=self._config.get("min_connections", 2),
             max_size=self._config.get("max_connections", 10),
+            statement_cache_size=self._config.get("statement_cache_size", 100),
+            init=self._init_connection,
         )
         log.info("Database pool created: %s", self._config["database"])
 
+    async def _init_connection(self, conn: asyncpg.Connection) -> None:
+        """Per-connection codecs: json/jsonb columns map to Python objects."""
+        await conn.set_type_codec(
+            "jsonb", schema="pg_catalog", format="binary",
+            encoder=self._encode_jsonb, decoder=_decode_jsonb,
+        )
+        await conn.set_type_codec(
+            "json", schema="pg_catalog",
+            encoder=_encode_json, decoder=json.loads,
+        )
+
+    def _encode_jsonb(self, value: Any) -> bytes:
+        # jsonb binary format: version byte 1 + UTF-8 JSON text
+        data = b"\x01" + _encode_json(value).encode("utf-8")
+        self._json_bytes += len(data) - 1
+        return data
+
     async def close(self) -> None:
         if self._pool:
             await self._pool.close()
@@ -99,22 +263,92 @@ class Database:
         async with self.pool.acquire() as conn:
             return await conn.fetch(f"SELECT * FROM {table}")  # noqa: S608
 
+    async def fetch_batches(self, table: str, batch_size: int = 2000
+                            ) -> AsyncIterator[list[asyncpg.Record]]:
+        """Stream ``SELECT *`` through a server-side cursor, *batch_size* rows at a time.
+
+        The next batch is requested before the current one is yielded, so
+        the server and the socket work while the caller builds objects.
+        Each call holds its own pooled connection.
+        """
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                cur = await conn.cursor(f"SELECT * FROM {table}")  # noqa: S608
+                nxt = asyncio.ensure_future(cur.fetch(batch_size))
+                try:
+                    while True:
+                        rows = await nxt
+                        if len(rows) < batch_size:
+                            if rows:
+                                yield rows
+                            return
+                        nxt = asyncio.ensure_future(cur.fetch(batch_size))
+                        await asyncio.sleep(0)  # let the FETCH go out first
+                        yield rows
+                finally:
+                    if not nxt.done():
+                        nxt.cancel()
+                        try:
+                            await nxt
+                        except (asyncio.CancelledError, Exception):
+                            pass
+
     async def fetch_one(self, table: str, key_col: str, key_val: Any) -> asyncpg.Record | None:
         async with self.pool.acquire() as conn:
             return await conn.fetchrow(
                 f"SELECT * FROM {table} WHERE {key_col} = $1", key_val  # noqa: S608
             )
 
+    async def table_fingerprints(self, tables: Iterable[str]) -> dict[str, str]:
+        """Content hash per table, computed server-side in one round trip.
+
+        Row hashes are aggregated in sorted order, so the result depends
+        only on table contents, not on physical row order.
+        """
+        parts = [
+            f"SELECT '{t}' AS t, md5(COALESCE(string_agg(h, '' ORDER BY h), '')) AS fp "
+            f"FROM (SELECT md5(x::text) AS h FROM {t} x) s"  # noqa: S608
+            for t in tables
+        ]
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(" UNION ALL ".join(parts))
+        return {r["t"]: r["fp"] for r in rows}
+
     # ── Player CRUD ────────────────────────────────────────────────
 
-    async def fetch_player(self, name: str) -> asyncpg.Record | None:
+    async def fetch_player(self, name: str) -> dict[str, Any] | None:
+        """Player row by case-insensitive name, from :attr:`player_cache` if seen.
+
+        Columns still waiting in :attr:`save_queue` are applied on top, so
+        the row is never older than the player's last save.
+        """
+        row = self.player_cache.get(name)
+        if row is None:
+            record = await self._fetch_player(name)
+            if record is None:
+                return None
+            row = dict(record)
+            self.player_cache.put(row)
+        if self.save_queue is not None:
+            row.update(self.save_queue.unsaved(row["id"]))
+        return row
+
+    async def _fetch_player(self, name: str) -> asyncpg.Record | None:
         async with self.pool.acquire() as conn:
             return await conn.fetchrow(
                 "SELECT * FROM players WHERE LOWER(name) = LOWER($1)", name
             )
 
     async def create_player(self, *, name: str, password_hash: str, sex: int,
-                            class_id: int, start_room: int) -> asyncpg.Record:
+                            class_id: int, start_room: int) -> dict[str, Any]:
+        row = dict(await self._create_player(
+            name=name, password_hash=password_hash, sex=sex,
+            class_id=class_id, start_room=start_room))
+        self.player_cache.put(row)
+        return row
+
+    async def _create_player(self, *, name: str, password_hash: str, sex: int,
+                             class_id: int, start_room: int) -> asyncpg.Record:
         async with self.pool.acquire() as conn:
             return await conn.fetchrow(
                 "INSERT INTO players (name, password_hash, sex, class_id, room_vnum) "
@@ -123,20 +357,50 @@ class Database:
             )
 
     async def save_player(self, player_id: int, data: dict[str, Any]) -> None:
-        """Save player data. Only updates specified columns."""
+        """Save player data. Only updates specified columns.
+
+        Columns are written in canonical order (see :func:`player_columns`)
+        so equal column sets share one prepared statement. The cached row
+        is updated once the write succeeds.
+        """
         if not data:
             return
-        cols = []
-        vals = []
-        for i, (k, v) in enumerate(data.items(), start=2):
-            cols.append(f"{k} = ${i}")
-            if isinstance(v, (dict, list)):
-                vals.append(json.dumps(v, ensure_ascii=False))
-            else:
-                vals.append(v)
-        query = f"UPDATE players SET {', '.join(cols)}, last_login = NOW() WHERE id = $1"  # noqa: S608
-        async with self.pool.acquire() as conn:
-            await conn.execute(query, player_id, *vals)
+        await self._save_player(player_id, data)
+        self.player_cache.update(player_id, data)
+
+    async def _save_player(self, player_id: int, data: dict[str, Any]) -> None:
+        cols = _canonical(data)
+        vals = [data[c] for c in cols]
+        json_before = self._json_bytes
+        async with self.pool.acquire() as conn:
+            await conn.execute(_player_update_sql(cols), player_id, *vals)
+        self.bytes_written += _scalar_size(vals) + self._json_bytes - json_before
+
+    async def save_players(self, rows: list[tuple[int, dict[str, Any]]]) -> None:
+        """Save many players in one transaction (write-behind batches).
+
+        Rows sharing a column set go through a single ``executemany``.
+        Cached rows are updated after the commit.
+        """
+        groups: dict[tuple[str, ...], list[tuple[Any, ...]]] = {}
+        size = 0
+        for player_id, data in rows:
+            if not data:
+                continue
+            cols = _canonical(data)
+            vals = [data[c] for c in cols]
+            size += _scalar_size(vals)
+            groups.setdefault(cols, []).append((player_id, *vals))
+        if not groups:
+            return
+        json_before = self._json_bytes
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                for cols, args in groups.items():
+                    await conn.executemany(_player_update_sql(cols), args)
+        self.bytes_written += size + self._json_bytes - json_before
+        for player_id, data in rows:
+            self.player_cache.update(player_id, data)
 
     async def execute(self, query: str, *args: Any) -> str:
         async with self.pool.acquire() as conn:
@@ -183,65 +447,60 @@ class Database:
                 game, category, name, source,
             )
 
+    async def lua_script_hashes(self, games: Iterable[str]) -> dict[tuple[str, str, str], str]:
+        """(game, category, name) → :func:`lua_source_hash` of the stored source.
+
+        Hashed server-side in one query; no sources are transferred.
+        """
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(
+                "SELECT game, category, name, md5(source) AS hash FROM lua_scripts "
+                "WHERE game = ANY($1::text[])",
+                list(games),
+            )
+        return {(r["game"], r["category"], r["name"]): r["hash"] for r in rows}
+
+    async def upsert_lua_scripts(self, scripts: list[tuple[str, str, str, str]]) -> None:
+        """Upsert many (game, category, name, source) rows in one statement.
+
+        Rows whose stored source is identical are left alone, so their
+        ``version`` is not bumped.
+        """
+        if not scripts:
+            return
+        games, categories, names, sources = (list(col) for col in zip(*scripts))
+        async with self.pool.acquire() as conn:
+            await conn.execute(
+                "INSERT INTO lua_scripts (game, category, name, source) "
+                "SELECT * FROM unnest($1::text[], $2::text[], $3::text[], $4::text[]) "
+                "ON CONFLICT (game, category, name) DO UPDATE "
+                "SET source = EXCLUDED.source, version = lua_scripts.version + 1, "
+                "    updated_at = NOW() "
+                "WHERE lua_scripts.source IS DISTINCT FROM EXCLUDED.source",
+                games, categories, names, sources,
+            )
+
     # ── Ensure tables (idempotent) ──────────────────────────────────
 
     async def ensure_players_table(self) -> None:
         """Create players table if it doesn't exist (auto_init covers schema.sql,
         but this ensures the table exists for edge cases)."""
         async with self.pool.acquire() as conn:
-            await conn.execute("""
-                CREATE TABLE IF NOT EXISTS players (
-                    id            SERIAL PRIMARY KEY,
-                    name          TEXT UNIQUE NOT NULL,
-                    password_hash TEXT NOT NULL DEFAULT '',
-                    class_id      INTEGER NOT NULL DEFAULT 0,
-                    race_id       INTEGER NOT NULL DEFAULT 0,
-                    sex           SMALLINT NOT NULL DEFAULT 0,
-                    level         INTEGER NOT NULL DEFAULT 1,
-                    experience    BIGINT NOT NULL DEFAULT 0,
-                    hp            INTEGER NOT NULL DEFAULT 100,
-                    max_hp        INTEGER NOT NULL DEFAULT 100,
-                    mana          INTEGER NOT NULL DEFAULT 100,
-                    max_mana      INTEGER NOT NULL DEFAULT 100,
-                    move          INTEGER NOT NULL DEFAULT 100,
-                    max_move      INTEGER NOT NULL DEFAULT 100,
-                    gold          INTEGER NOT NULL DEFAULT 0,
-                    bank_gold     INTEGER NOT NULL DEFAULT 0,
-                    armor_class   INTEGER NOT NULL DEFAULT 100,
-                    alignment     INTEGER NOT NULL DEFAULT 0,
-                    stats         JSONB NOT NULL DEFAULT '{}',
-                    equipment     JSONB NOT NULL DEFAULT '{}',
-                    inventory     JSONB NOT NULL DEFAULT '[]',
-                    affects       JSONB NOT NULL DEFAULT '[]',
-                    skills        JSONB NOT NULL DEFAULT '{}',
-                    flags         TEXT[] NOT NULL DEFAULT '{}',
-                    aliases       JSONB NOT NULL DEFAULT '{}',
-                    title         TEXT NOT NULL DEFAULT '',
-                    description   TEXT NOT NULL DEFAULT '',
-                    room_vnum     INTEGER NOT NULL DEFAULT 0,
-                    org_id        INTEGER NOT NULL DEFAULT 0,
-                    org_rank      INTEGER NOT NULL DEFAULT 0,
-                    practices     INTEGER NOT NULL DEFAULT 0,
-                    toggles       JSONB NOT NULL DEFAULT '{}',
-                    prompt        TEXT NOT NULL DEFAULT '',
-                    ext           JSONB NOT NULL DEFAULT '{}',
-                    created_at    TIMESTAMPTZ NOT NULL DEFAULT NOW(),
-                    last_login    TIMESTAMPTZ
-                )
-            """)
+            await conn.execute(PLAYERS_DDL)
+            await conn.execute(PLAYERS_NAME_INDEX_DDL)
 
     async def ensure_lua_scripts_table(self) -> None:
         """Create lua_scripts table if it doesn't exist."""
         async with self.pool.acquire() as conn:
-            await conn.execute("""
-                CREATE TABLE IF NOT EXISTS lua_scripts (
-                    id          SERIAL PRIMARY KEY,
-                    game        TEXT NOT NULL DEFAULT '',
-                    category    TEXT NOT NULL DEFAULT '',
-                    name        TEXT NOT NULL DEFAULT '',
-                    source      TEXT NOT NULL DEFAULT '',
-                    version     INTEGER NOT NULL DEFAULT 1,
-                    updated_at  TIMESTAMPTZ NOT NULL DEFAULT NOW(),
-                    UNIQUE (game, category, name)
-                )
-            """)
+            await conn.execute(LUA_SCRIPTS_DDL)
+
+
+def create_database(config: dict[str, Any]) -> Database:
+    """Database for the ``database:`` config section (``backend``: postgres | sqlite)."""
+    backend = config.get("backend", "postgres")
+    if backend == "sqlite":
+        from core.db_sqlite import SqliteDatabase
+        return SqliteDatabase(config)
+    if backend != "postgres":
+        raise ValueError(f"Unknown database backend: {backend!r}")
+    return Database(config)
@@ -0,0 +1,632 @@
+"""Embedded SQLite backend — the Database interface without a server.
+
+Selected with ``database.backend: sqlite``. Boot, world load, Lua seeding
+and player saves then run against a single file (or ``:memory:``), which
+is what benchmark harnesses and tests want: no PostgreSQL to start.
+
+- ``schema.sql`` and ``seed_data.sql`` are the PostgreSQL files the
+  migration tool writes; :func:`translate_schema` and :func:`iter_seed_rows`
+  convert them on the fly (JSONB and TEXT[] stored as JSON text,
+  INT4RANGE as its ``[lo,hi)`` literal, BOOLEAN as 0/1).
+- Rows come back as dicts with JSON and array columns decoded, matching
+  what the asyncpg pool codecs hand to the world loaders.
+- All calls run on one connection in a single worker thread, so the event
+  loop never blocks on disk I/O and statements never interleave.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from core.db import (
+    LUA_SCRIPTS_DDL, PLAYERS_DDL, PLAYERS_NAME_INDEX_DDL, Database, _canonical, _encode_json,
+    _scalar_size, lua_source_hash,
+)
+
+log = logging.getLogger(__name__)
+
+_BASE_DIR = Path(__file__).resolve().parent.parent
+
+# Declared column types after translation; they keep SQLite's type
+# affinity right (…TEXT → TEXT) and tell the row decoder what to undo.
+_JSON = "JSONTEXT"
+_ARRAY = "ARRAYTEXT"
+_RANGE = "RANGETEXT"
+_BOOL = "BOOLEAN"
+
+_DDL_RULES: tuple[tuple[re.Pattern[str], str], ...] = (
+    (re.compile(r"\bSERIAL PRIMARY KEY\b", re.I), "INTEGER PRIMARY KEY AUTOINCREMENT"),
+    (re.compile(r"\bTEXT\[\](.*?)DEFAULT '\{\}'", re.I), _ARRAY + r"\1DEFAULT '[]'"),
+    (re.compile(r"\bTEXT\[\]", re.I), _ARRAY),
+    (re.compile(r"\bJSONB?\b", re.I), _JSON),
+    (re.compile(r"\bINT4RANGE\b", re.I), _RANGE),
+    (re.compile(r"\bTIMESTAMPTZ\b", re.I), "TIMESTAMP"),
+    (re.compile(r"\bNOW\(\)", re.I), "CURRENT_TIMESTAMP"),
+    (re.compile(r"\bDEFAULT false\b", re.I), "DEFAULT 0"),
+    (re.compile(r"\bDEFAULT true\b", re.I), "DEFAULT 1"),
+    (re.compile(r"\bUSING GIN\s*", re.I), ""),
+    (re.compile(r"^(\s+)(values)(\s)", re.I | re.M), r'\1"\2"\3'),  # reserved in SQLite
+)
+
+_PARAM = re.compile(r"\$(\d+)")
+_CAST = re.compile(r"::\s*\w+(?:\[\])?")
+
+
+def translate_schema(sql: str) -> str:
+    """PostgreSQL DDL (as in ``data/*/sql/schema.sql``) → SQLite DDL."""
+    for pattern, repl in _DDL_RULES:
+        sql = pattern.sub(repl, sql)
+    return sql
+
+
+def translate_query(query: str) -> str:
+    """asyncpg-style query → SQLite: ``$n`` → ``?n``, casts dropped, NOW()."""
+    query = _CAST.sub("", _PARAM.sub(r"?\1", query))
+    return re.sub(r"\bNOW\(\)", "CURRENT_TIMESTAMP", query, flags=re.I)
+
+
+# ── Seed data ────────────────────────────────────────────────────
+
+_TOKEN = re.compile(r"""
+    (?P<estr>[Ee]'(?:[^'\\]|\\.|'')*')
+  | (?P<str>'(?:[^']|'')*')
+  | (?P<num>-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)
+  | (?P<cast>::\s*[A-Za-z_]\w*(?:\[\])?)
+  | (?P<word>[A-Za-z_][\w.]*|"[^"]*")
+  | (?P<punct>[(),;\[\]])
+  | (?P<skip>\s+|--[^\n]*)
+  | (?P<other>.)
+""", re.X | re.S)
+
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f"}
+
+
+def _unescape(body: str) -> str:
+    return re.sub(r"\\(.)", lambda m: _ESCAPES.get(m.group(1), m.group(1)), body)
+
+
+def _tokens(sql: str) -> Iterator[tuple[str, str, int]]:
+    for m in _TOKEN.finditer(sql):
+        kind = m.lastgroup
+        if kind != "skip":
+            yield kind, m.group(), m.start()  # type: ignore[misc]
+    yield "end", "", len(sql)
+
+
+def parse_pg_array(text: str) -> list[Any]:
+    """``{a,"b c",NULL}`` → ``["a", "b c", None]`` (one dimension)."""
+    inner = text.strip()
+    if not (inner.startswith("{") and inner.endswith("}")):
+        raise ValueError(f"not an array literal: {text!r}")
+    inner = inner[1:-1]
+    items: list[Any] = []
+    i, n = 0, len(inner)
+    while i < n:
+        if inner[i] == '"':
+            j, buf = i + 1, []
+            while inner[j] != '"':
+                if inner[j] == "\\":
+                    j += 1
+                buf.append(inner[j])
+                j += 1
+            items.append("".join(buf))
+            i = j + 1
+        else:
+            j = inner.find(",", i)
+            j = n if j < 0 else j
+            word = inner[i:j].strip()
+            items.append(None if word.upper() == "NULL" else word)
+            i = j
+        i += 1  # skip the comma
+    return items
+
+
+class _SeedParser:
+    """Reads INSERT statements from PostgreSQL seed SQL as Python rows."""
+
+    def __init__(self, sql: str) -> None:
+        self._sql = sql
+        self._it = _tokens(sql)
+        self._advance()
+
+    def _advance(self) -> None:
+        self.kind, self.text, self.pos = next(self._it)
+
+    def _expect(self, text: str) -> None:
+        if self.text.upper() != text:
+            raise ValueError(f"expected {text!r} at offset {self.pos}, got {self.text!r}")
+        self._advance()
+
+    def statements(self) -> Iterator[tuple[str, Any]]:
+        """Yield ``("insert", (table, cols, rows, on_conflict))`` or ``("sql", text)``."""
+        while self.kind != "end":
+            if self.text == ";":
+                self._advance()
+            elif self.text.upper() == "INSERT":
+                yield "insert", self._insert()
+            else:
+                start = self.pos
+                while self.kind != "end" and self.text != ";":
+                    self._advance()
+                yield "sql", self._sql[start:self.pos]
+
+    def _insert(self) -> tuple[str, list[str], list[tuple[Any, ...]], str]:
+        self._expect("INSERT")
+        self._expect("INTO")
+        table = self.text.strip('"')
+        self._advance()
+        self._expect("(")
+        cols: list[str] = []
+        while self.text != ")":
+            if self.text != ",":
+                cols.append(self.text.strip('"'))
+            self._advance()
+        self._advance()
+        self._expect("VALUES")
+        rows = [self._tuple()]
+        while self.text == ",":
+            self._advance()
+            rows.append(self._tuple())
+        conflict = ""
+        if self.text.upper() == "ON":
+            words = []
+            while self.kind != "end" and self.text != ";":
+                words.append(self.text.upper())
+                self._advance()
+            conflict = "IGNORE" if words[-1:] == ["NOTHING"] else "REPLACE"
+        return table, cols, rows, conflict
+
+    def _tuple(self) -> tuple[Any, ...]:
+        self._expect("(")
+        values = [self._value()]
+        while self.text == ",":
+            self._advance()
+            values.append(self._value())
+        self._expect(")")
+        return tuple(values)
+
+    def _value(self) -> Any:
+        kind, text = self.kind, self.text
+        self._advance()
+        if kind == "str":
+            value: Any = text[1:-1].replace("''", "'")
+        elif kind == "estr":
+            value = _unescape(text[2:-1].replace("''", "'"))
+        elif kind == "num":
+            value = float(text) if any(c in text for c in ".eE") else int(text)
+        elif text == "(":
+            value = self._value()
+            self._expect(")")
+        elif text.upper() == "ARRAY":
+            self._expect("[")
+            value = []
+            while self.text != "]":
+                if self.text == ",":
+                    self._advance()
+                    continue
+                value.append(self._value())
+            self._advance()
+        elif text.upper() == "NULL":
+            value = None
+        elif text.upper() in ("TRUE", "FALSE"):
+            value = text.upper() == "TRUE"
+        elif text.upper() in ("NOW", "CURRENT_TIMESTAMP"):
+            if self.text == "(":
+                self._advance()
+                self._expect(")")
+            value = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        else:
+            raise ValueError(f"unsupported seed value {text!r} at offset {self.pos}")
+        while self.kind == "cast":
+            self._advance()
+        return value
+
+
+def iter_seed_rows(sql: str) -> Iterator[tuple[str, Any]]:
+    """Parse PostgreSQL seed SQL; see :meth:`_SeedParser.statements`."""
+    return _SeedParser(sql).statements()
+
+
+# ── Value conversion ─────────────────────────────────────────────
+
+def _to_sqlite(value: Any) -> Any:
+    if isinstance(value, (dict, list, tuple)):
+        return _encode_json(value)
+    if isinstance(value, bool):
+        return int(value)
+    return value
+
+
+def _seed_value(kind: str, value: Any) -> Any:
+    """Seed literal → stored value for a column of declared type *kind*."""
+    if value is None:
+        return None
+    if kind == _ARRAY:
+        if isinstance(value, str):
+            value = parse_pg_array(value)
+        return _encode_json(value)
+    if kind == _JSON and not isinstance(value, str):
+        return _encode_json(value)
+    return _to_sqlite(value)
+
+
+def _json_or_raw(value: Any) -> Any:
+    return json.loads(value) if isinstance(value, str) else value
+
+
+_DECODERS: dict[str, Callable[[Any], Any]] = {
+    _JSON: _json_or_raw,
+    _ARRAY: _json_or_raw,
+    _BOOL: lambda v: v if v is None else bool(v),
+}
+
+
+# ── Database ─────────────────────────────────────────────────────
+
+class SqliteDatabase(Database):
+    """Embedded SQLite implementation of :class:`core.db.Database`.
+
+    Config keys: ``path`` (relative to the project root; default
+    ``.cache/db/<database>.sqlite3``, or ``:memory:``).
+    """
+
+    def __init__(self, config: dict[str, Any]) -> None:
+        super().__init__(config)
+        path = config.get("path") or f".cache/db/{config.get('database', 'genos')}.sqlite3"
+        self.path = path if path == ":memory:" else str(_BASE_DIR / path)
+        self._conn: sqlite3.Connection | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._columns: dict[str, list[tuple[str, Callable[[Any], Any] | None]]] = {}
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        assert self._conn is not None, "Database not connected"
+        return self._conn
+
+    async def _call(self, fn: Callable[..., Any], *args: Any) -> Any:
+        assert self._executor is not None, "Database not connected"
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def connect(self) -> None:
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="sqlite")
+
+        def _open() -> sqlite3.Connection:
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            return conn
+
+        self._conn = await self._call(_open)
+        log.info("SQLite database opened: %s", self.path)
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            await self._call(self._conn.close)
+            self._conn = None
+            log.info("SQLite database closed")
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    # ── Rows ─────────────────────────────────────────────────────
+
+    def _table_columns(self, table: str) -> list[tuple[str, Callable[[Any], Any] | None]]:
+        cols = self._columns.get(table)
+        if cols is None:
+            info = self.conn.execute(f"PRAGMA table_info({table})").fetchall()
+            cols = [(r[1], _DECODERS.get(r[2].upper())) for r in info]
+            self._columns[table] = cols
+        return cols
+
+    def _rows(self, table: str, cur: sqlite3.Cursor, rows: list[tuple[Any, ...]]
+              ) -> list[dict[str, Any]]:
+        names = [d[0] for d in cur.description]
+        decoders = dict(self._table_columns(table))
+        fns = [decoders.get(n) for n in names]
+        out = []
+        for row in rows:
+            out.append({n: (fn(v) if fn is not None and v is not None else v)
+                        for n, fn, v in zip(names, fns, row)})
+        return out
+
+    def _select(self, table: str, sql: str, args: Iterable[Any] = ()) -> list[dict[str, Any]]:
+        cur = self.conn.execute(sql, tuple(args))
+        return self._rows(table, cur, cur.fetchall())
+
+    def _select_one(self, table: str, sql: str, args: Iterable[Any] = ()
+                    ) -> dict[str, Any] | None:
+        rows = self._select(table, sql, args)
+        return rows[0] if rows else None
+
+    # ── Init ─────────────────────────────────────────────────────
+
+    async def auto_init(self, data_dir: Path, *, force: bool = False) -> None:
+        """Same contract as :meth:`Database.auto_init`, on translated SQL.
+
+        A missing ``seed_data.sql`` leaves an empty world (logged), so a
+        bare checkout can still boot.
+        """
+        await self._call(self._auto_init, data_dir, force)
+
+    def _auto_init(self, data_dir: Path, force: bool) -> None:
+        conn = self.conn
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='rooms'").fetchone()
+        if exists:
+            count = conn.execute("SELECT COUNT(*) FROM rooms").fetchone()[0]
+            if count and not force:
+                log.info("Database already initialized (%d rooms)", count)
+                return
+            log.warning("Reinitializing SQLite database — dropping tables...")
+            self._drop_all()
+
+        log.info("Initializing database from schema + seed data...")
+        schema_sql = (data_dir / "sql" / "schema.sql").read_text(encoding="utf-8")
+        conn.executescript(translate_schema(schema_sql))
+        self._columns.clear()
+        log.info("Schema applied")
+
+        seed_path = data_dir / "sql" / "seed_data.sql"
+        if not seed_path.exists():
+            log.warning("No seed data at %s — world tables left empty", seed_path)
+            return
+        rows = self._seed(seed_path.read_text(encoding="utf-8"))
+        log.info("Seed data loaded (%d rows)", rows)
+
+    def _drop_all(self) -> None:
+        conn = self.conn
+        tables = [r[0] for r in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' "
+            "AND name NOT LIKE 'sqlite_%'")]
+        for table in tables:
+            conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+        self._columns.clear()
+
+    def _seed(self, sql: str) -> int:
+        conn = self.conn
+        count = 0
+        conn.execute("BEGIN")
+        try:
+            for kind, stmt in iter_seed_rows(sql):
+                if kind == "sql":
+                    self._seed_statement(stmt)
+                    continue
+                table, cols, rows, conflict = stmt
+                types = {name: "" for name in cols}
+                for r in conn.execute(f"PRAGMA table_info({table})"):
+                    types[r[1]] = r[2].upper()
+                kinds = [types[c] for c in cols]
+                verb = f"INSERT OR {conflict}" if conflict else "INSERT"
+                names = ", ".join(f'"{c}"' for c in cols)
+                conn.executemany(
+                    f"{verb} INTO {table} ({names}) "  # noqa: S608
+                    f"VALUES ({', '.join('?' * len(cols))})",
+                    [tuple(_seed_value(k, v) for k, v in zip(kinds, row)) for row in rows],
+                )
+                count += len(rows)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return count
+
+    def _seed_statement(self, stmt: str) -> None:
+        word = stmt.split(None, 1)[0].upper() if stmt.strip() else ""
+        if word in ("", "BEGIN", "COMMIT", "SET"):
+            return
+        try:
+            self.conn.execute(translate_query(stmt))
+        except sqlite3.Error as e:
+            log.warning("Seed statement skipped (%s): %.60s", e, stmt.strip())
+
+    # ── Query helpers ────────────────────────────────────────────
+
+    async def fetch_all(self, table: str) -> list[dict[str, Any]]:
+        return await self._call(self._select, table, f"SELECT * FROM {table}")  # noqa: S608
+
+    async def fetch_batches(self, table: str, batch_size: int = 2000
+                            ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Stream ``SELECT *`` *batch_size* rows at a time.
+
+        As with PostgreSQL, the next batch is read (in the worker thread)
+        while the caller processes the current one.
+        """
+        cur = await self._call(self.conn.execute, f"SELECT * FROM {table}")  # noqa: S608
+
+        def fetch() -> list[dict[str, Any]]:
+            return self._rows(table, cur, cur.fetchmany(batch_size))
+
+        nxt = asyncio.ensure_future(self._call(fetch))
+        try:
+            while True:
+                rows = await nxt
+                if len(rows) < batch_size:
+                    if rows:
+                        yield rows
+                    return
+                nxt = asyncio.ensure_future(self._call(fetch))
+                yield rows
+        finally:
+            if not nxt.done():
+                try:
+                    await nxt
+                except Exception:
+                    pass
+            await self._call(cur.close)
+
+    async def fetch_one(self, table: str, key_col: str, key_val: Any
+                        ) -> dict[str, Any] | None:
+        return await self._call(
+            self._select_one, table,
+            f"SELECT * FROM {table} WHERE {key_col} = ?", (key_val,))  # noqa: S608
+
+    async def table_fingerprints(self, tables: Iterable[str]) -> dict[str, str]:
+        """Content hash per table, independent of row order."""
+        return await self._call(self._fingerprints, list(tables))
+
+    def _fingerprints(self, tables: list[str]) -> dict[str, str]:
+        result = {}
+        for table in tables:
+            hashes = sorted(
+                hashlib.md5(repr(row).encode("utf-8")).hexdigest()
+                for row in self.conn.execute(f"SELECT * FROM {table}"))  # noqa: S608
+            result[table] = hashlib.md5("".join(hashes).encode()).hexdigest()
+        return result
+
+    # ── Player CRUD ──────────────────────────────────────────────
+
+    async def _fetch_player(self, name: str) -> dict[str, Any] | None:
+        return await self._call(
+            self._select_one, "players",
+            "SELECT * FROM players WHERE LOWER(name) = LOWER(?)", (name,))
+
+    async def _create_player(self, *, name: str, password_hash: str, sex: int,
+                             class_id: int, start_room: int) -> dict[str, Any]:
+        return await self._call(
+            self._select_one, "players",
+            "INSERT INTO players (name, password_hash, sex, class_id, room_vnum) "
+            "VALUES (?, ?, ?, ?, ?) RETURNING *",
+            (name, password_hash, sex, class_id, start_room))
+
+    def _encode_row(self, data: dict[str, Any], cols: tuple[str, ...]) -> list[Any]:
+        vals = []
+        for c in cols:
+            v = _to_sqlite(data[c])
+            if isinstance(data[c], (dict, list, tuple)):
+                self._json_bytes += len(v.encode("utf-8"))
+            vals.append(v)
+        return vals
+
+    @staticmethod
+    def _update_sql(cols: tuple[str, ...]) -> str:
+        sets = ", ".join(f"{k} = ?" for k in cols)
+        return f"UPDATE players SET {sets}, last_login = CURRENT_TIMESTAMP WHERE id = ?"  # noqa: S608
+
+    async def _save_player(self, player_id: int, data: dict[str, Any]) -> None:
+        await self.save_players([(player_id, data)])  # also updates the cache
+
+    async def save_players(self, rows: list[tuple[int, dict[str, Any]]]) -> None:
+        """Save many players in one transaction, ``executemany`` per column set."""
+        groups: dict[tuple[str, ...], list[tuple[Any, ...]]] = {}
+        size = 0
+        json_before = self._json_bytes
+        for player_id, data in rows:
+            if not data:
+                continue
+            cols = _canonical(data)
+            size += _scalar_size(data[c] for c in cols)
+            groups.setdefault(cols, []).append((*self._encode_row(data, cols), player_id))
+        if not groups:
+            return
+        await self._call(self._write_groups, groups)
+        self.bytes_written += size + self._json_bytes - json_before
+        for player_id, data in rows:
+            self.player_cache.update(player_id, data)
+
+    def _write_groups(self, groups: dict[tuple[str, ...], list[tuple[Any, ...]]]) -> None:
+        conn = self.conn
+        conn.execute("BEGIN")
+        try:
+            for cols, args in groups.items():
+                conn.executemany(self._update_sql(cols), args)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    async def execute(self, query: str, *args: Any) -> str:
+        """Run an asyncpg-style statement; returns a status like ``UPDATE 3``."""
+        def run() -> str:
+            cur = self.conn.execute(translate_query(query), [_to_sqlite(a) for a in args])
+            verb = query.split(None, 1)[0].upper() if query.strip() else ""
+            return f"{verb} {max(cur.rowcount, 0)}"
+        return await self._call(run)
+
+    # ── Lua scripts CRUD ─────────────────────────────────────────
+
+    async def lua_scripts_count(self) -> int:
+        def count() -> int:
+            return self.conn.execute("SELECT COUNT(*) FROM lua_scripts").fetchone()[0]
+        return await self._call(count)
+
+    async def fetch_lua_scripts(self, game: str) -> list[dict[str, Any]]:
+        return await self._call(
+            self._select, "lua_scripts",
+            "SELECT * FROM lua_scripts WHERE game = ? ORDER BY category, name", (game,))
+
+    async def fetch_lua_script(self, game: str, category: str, name: str
+                               ) -> dict[str, Any] | None:
+        return await self._call(
+            self._select_one, "lua_scripts",
+            "SELECT * FROM lua_scripts WHERE game = ? AND category = ? AND name = ?",
+            (game, category, name))
+
+    async def upsert_lua_script(self, *, game: str, category: str, name: str,
+                                source: str, updated_by: str = "system"
+                                ) -> dict[str, Any]:
+        return await self._call(
+            self._select_one, "lua_scripts",
+            "INSERT INTO lua_scripts (game, category, name, source) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (game, category, name) DO UPDATE "
+            "SET source = excluded.source, version = lua_scripts.version + 1, "
+            "    updated_at = CURRENT_TIMESTAMP "
+            "RETURNING *",
+            (game, category, name, source))
+
+    async def lua_script_hashes(self, games: Iterable[str]) -> dict[tuple[str, str, str], str]:
+        def hashes(games: list[str]) -> dict[tuple[str, str, str], str]:
+            marks = ", ".join("?" * len(games))
+            rows = self.conn.execute(
+                "SELECT game, category, name, source FROM lua_scripts "
+                f"WHERE game IN ({marks})", games)  # noqa: S608
+            return {(g, c, n): lua_source_hash(src) for g, c, n, src in rows}
+        return await self._call(hashes, list(games))
+
+    async def upsert_lua_scripts(self, scripts: list[tuple[str, str, str, str]]) -> None:
+        """Upsert many rows in one transaction; identical sources keep their version."""
+        if not scripts:
+            return
+
+        def write() -> None:
+            conn = self.conn
+            conn.execute("BEGIN")
+            try:
+                conn.executemany(
+                    "INSERT INTO lua_scripts (game, category, name, source) "
+                    "VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (game, category, name) DO UPDATE "
+                    "SET source = excluded.source, version = lua_scripts.version + 1, "
+                    "    updated_at = CURRENT_TIMESTAMP "
+                    "WHERE lua_scripts.source IS NOT excluded.source",
+                    scripts)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        await self._call(write)
+
+    # ── Ensure tables (idempotent) ───────────────────────────────
+
+    async def ensure_players_table(self) -> None:
+        await self._call(self._ensure, "players", PLAYERS_DDL, PLAYERS_NAME_INDEX_DDL)
+
+    async def ensure_lua_scripts_table(self) -> None:
+        await self._call(self._ensure, "lua_scripts", LUA_SCRIPTS_DDL)
+
+    def _ensure(self, table: str, *ddl: str) -> None:
+        for stmt in ddl:
+            self.conn.execute(translate_schema(stmt))
+        self._columns.pop(table, None)
+
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import importlib
 import logging
 import os
@@ -14,12 +15,19 @@ from typing import Any, Protocol, runtime_checkable
 
 import yaml
 
-from core.db import Database
+from core.checkpoint import DEFAULT_INTERVAL, DEFAULT_SNAPSHOT_EVERY, WorldCheckpointer
+from core.db import create_database
+from core.korean import particle, render_message
+from core.lua_cache import LuaBytecodeCache
 from core.lua_commands import LuaCommandRuntime
+from core.lua_watchdog import budgets_from_config
 from core.net import TelnetConnection, TelnetServer
+from core.passwords import DEFAULT_ROUNDS, DEFAULT_WORKERS, PasswordHasher
+from core.persistence import DEFAULT_BATCH_SIZE, SaveQueue
 from core.reload import ReloadManager
 from core.session import Session
 from core.world import World
+from core.world_snapshot import load_world
 
 log = logging.getLogger(__name__)
 
@@ -113,6 +121,23 @@ class GamePlugin(Protocol):
     def register_commands(self, engine: Engine) -> None: ...
 
 
+# ── Social templates ─────────────────────────────────────────────
+
+_SOCIAL_PRONOUNS = {"m": "그", "e": "그", "s": "그의", "M": "그", "E": "그", "S": "그의"}
+
+
+@functools.lru_cache(maxsize=2048)
+def _social_template(msg: str, with_target: bool) -> str:
+    """Social message with $-codes as render_message variables.
+
+    Without a target, $N/$M/$E/$S are left as written.
+    """
+    codes = "nmesNMES" if with_target else "nmes"
+    for code in codes:
+        msg = msg.replace(f"${code}", f"{{{code}}}")
+    return msg
+
+
 # ── Engine ───────────────────────────────────────────────────────
 
 class Engine:
@@ -123,10 +148,34 @@ class Engine:
             self.config: dict[str, Any] = yaml.safe_load(f)
 
         self.game_name: str = self.config["game"]
-        self.db = Database(self.config["database"])
+        self.db = create_database(self.config["database"])
         self.world = World()
         self.reload_mgr = ReloadManager()
 
+        engine_cfg = self.config.get("engine", {}) or {}
+
+        # bcrypt off the event loop (see core.passwords)
+        self.passwords = PasswordHasher(
+            rounds=engine_cfg.get("bcrypt_rounds", DEFAULT_ROUNDS),
+            workers=engine_cfg.get("password_workers", DEFAULT_WORKERS),
+        )
+
+        # Write-behind player saves (engine.write_behind: false → inline saves)
+        self.save_queue: SaveQueue | None = None
+        if engine_cfg.get("write_behind", True):
+            self.save_queue = SaveQueue(
+                self.db, batch_size=engine_cfg.get("save_batch_size", DEFAULT_BATCH_SIZE))
+            self.db.save_queue = self.save_queue
+
+        # World-state checkpoints (engine.checkpoint_interval: 0 → off)
+        self.checkpointer: WorldCheckpointer | None = None
+        self.checkpoint_interval = engine_cfg.get("checkpoint_interval", DEFAULT_INTERVAL)
+        if self.checkpoint_interval:
+            self.checkpointer = WorldCheckpointer(
+                self.world, BASE_DIR / ".cache" / "checkpoint" / self.game_name,
+                snapshot_every=engine_cfg.get("checkpoint_snapshot_every",
+                                              DEFAULT_SNAPSHOT_EVERY))
+
         self.sessions: dict[int, Session] = {}   # conn_id → Session
         self.players: dict[str, Session] = {}     # lowercase name → Session
 
@@ -138,9 +187,15 @@ class Engine:
         self._running = False
         self._tick = 0
         self._last_save = 0.0
+        self._last_checkpoint = 0.0
+        self.last_auto_save: dict[str, int] = {}
+        self.boot_timings: dict[str, Any] = {}
+        self._auto_save_reports: set[asyncio.Task] = set()
         self._plugin: Any = None
         self._watcher_task: asyncio.Task | None = None
         self.lua: LuaCommandRuntime | None = None
+        self.lua_cache: LuaBytecodeCache | None = None
+        self.triggers: Any = None     # DG trigger runtime, for games that run one
 
         # Game time / weather
         self.game_hour: int = 8       # 0-23 MUD hours
@@ -156,6 +211,8 @@ class Engine:
 
         # 1. Connect to DB
         await self.db.connect()
+        if self.save_queue:
+            self.save_queue.start()
 
         # 2. Auto-init DB (REINIT_DB=1 forces drop+recreate from seed_data.sql)
         data_dir = BASE_DIR / "data" / self.game_name
@@ -163,8 +220,14 @@ class Engine:
         await self.db.auto_init(data_dir, force=force_reinit)
         await self.db.ensure_players_table()
 
-        # 3. Load world
-        await self.world.load_from_db(self.db, data_dir)
+        # 3. Load world (binary snapshot when the source tables are unchanged)
+        snapshot = None
+        if self.config.get("engine", {}).get("world_snapshot", True):
+            snapshot = BASE_DIR / ".cache" / "world" / f"{self.game_name}.snap"
+        t0 = time.perf_counter()
+        source = await load_world(self.world, self.db, data_dir, snapshot)
+        self.boot_timings["world"] = {
+            "source": source, "ms": round((time.perf_counter() - t0) * 1000, 1)}
 
         # 4. Load game plugin
         mod = importlib.import_module(f"games.{self.game_name}.game")
@@ -175,13 +238,22 @@ class Engine:
         self._register_core_commands()
         self._plugin.register_commands(self)
 
-        # 6. Load Lua runtime
-        self.lua = LuaCommandRuntime(self)
+        # 6. Load Lua runtime (compiled chunks cached on disk across boots)
+        if self.config.get("engine", {}).get("lua_bytecode_cache", True):
+            self.lua_cache = LuaBytecodeCache(BASE_DIR / ".cache" / "luac")
+        budgets, quarantine_after = budgets_from_config(self.config)
+        self.lua = LuaCommandRuntime(self, bytecode_cache=self.lua_cache,
+                                     budgets=budgets, quarantine_after=quarantine_after)
+        lua_budget = self.config.get("engine", {}).get("lua_budget", {}) or {}
+        self.lua.watchdog.enabled = bool(lua_budget.get("enabled", False))
         await self.db.ensure_lua_scripts_table()
-        # Always reseed from files (upsert) so updated/new scripts are picked up
+        # Sync seed files by content hash: new/changed scripts written, others skipped
+        t0 = time.perf_counter()
         seeded = await self.lua.seed_from_files(self.db, self.game_name)
-        if seeded:
-            log.info("Lua scripts seeded from files: %d", seeded)
+        self.boot_timings["lua_seed"] = {
+            **seeded, "ms": round((time.perf_counter() - t0) * 1000, 1)}
+        log.info("Lua scripts seeded from files: %d updated, %d unchanged",
+                 seeded["updated"], seeded["skipped"])
         loaded = await self.lua.load_from_db(self.db, self.game_name)
         self.lua.register_all_commands()
         log.info("Lua commands loaded: %d scripts, %d commands, %d hooks",
@@ -190,8 +262,18 @@ class Engine:
         # 7. Load Korean verb mapping into cmd_korean
         self._load_korean_mappings()
 
-        # 8. Initial zone resets
-        self._do_zone_resets(initial=True)
+        # 8. World state: last checkpoint if there is one, else initial zone resets
+        t0 = time.perf_counter()
+        restored = None
+        if self.checkpointer and not force_reinit:
+            restored = self.checkpointer.restore()
+        if restored is None:
+            self._do_zone_resets(initial=True)
+        if self.checkpointer:
+            self.checkpointer.prime()   # full capture here, not on the first tick
+        self.boot_timings["world_state"] = {
+            "source": "checkpoint" if restored else "zone_resets",
+            "ms": round((time.perf_counter() - t0) * 1000, 1)}
 
         # 9. Start network
         net_cfg = self.config.get("network", {})
@@ -209,14 +291,18 @@ class Engine:
             self._watcher_task = await start_watcher(games_dir, self.reload_mgr)
 
         self._running = True
-        self._last_save = time.monotonic()
-        log.info("=== Boot complete: %d cmds, %d korean mappings ===",
-                 len(self.cmd_handlers), len(self.cmd_korean))
-
-    def _load_korean_mappings(self) -> None:
+        self._last_save = self._last_checkpoint = time.monotonic()
+        world_boot = self.boot_timings.get("world", {})
+        log.info("=== Boot complete (%s): %d cmds, %d korean mappings, "
+                 "world from %s in %s ms ===", self.game_name,
+                 len(self.cmd_handlers), len(self.cmd_korean),
+                 world_boot.get("source", "?"), world_boot.get("ms", "?"))
+
+    def _load_korean_mappings(self, names: set[str] | None = None) -> None:
         """Load Korean → English command mappings from verb map.
 
-        Merges default + plugin-provided Korean verb mappings.
+        Merges default + plugin-provided Korean verb mappings. With *names*,
+        only verbs for those commands are mapped (incremental Lua reload).
         """
         # Let plugin extend the verb map
         plugin = getattr(self, "_plugin", None)
@@ -226,6 +312,8 @@ class Engine:
                 KOREAN_VERB_MAP.update(extra)
 
         for kr_verb, eng_cmd in KOREAN_VERB_MAP.items():
+            if names is not None and eng_cmd not in names:
+                continue
             if eng_cmd in self.cmd_handlers and kr_verb not in self.cmd_korean:
                 self.cmd_korean[kr_verb] = eng_cmd
 
@@ -238,6 +326,18 @@ class Engine:
             await session.send_line("\r\n{red}서버가 종료됩니다. 안녕히 가세요.{reset}")
             await session.save_character()
 
+        # Barrier: every queued save is committed before the pool closes
+        if self.save_queue:
+            timeout = self.config.get("engine", {}).get("shutdown_timeout", 30)
+            await self.save_queue.close(timeout=timeout)
+
+        # Final world checkpoint: the next boot resumes from here
+        checkpointer = getattr(self, "checkpointer", None)
+        if checkpointer:
+            await checkpointer.close()
+
+        self.passwords.shutdown()
+
         # Stop watcher
         if self._watcher_task:
             self._watcher_task.cancel()
@@ -276,7 +376,7 @@ class Engine:
             if self._tick % 750 == 0:
                 self._advance_game_time()
                 await self._tick_affects()
-                self._tick_corpse_decay()
+                await self._tick_obj_decay()
 
             # NPC AI (every 100 ticks = 10 seconds at 10Hz)
             if self._tick % 100 == 0:
@@ -292,6 +392,12 @@ class Engine:
                 await self._auto_save()
                 self._last_save = now
 
+            # World checkpoint: captured here, written by a worker thread
+            checkpointer = getattr(self, "checkpointer", None)
+            if checkpointer and now - self._last_checkpoint >= self.checkpoint_interval:
+                checkpointer.checkpoint()
+                self._last_checkpoint = now
+
             # Sleep until next tick
             elapsed = time.monotonic() - tick_start
             sleep_time = tick_interval - elapsed
@@ -299,13 +405,48 @@ class Engine:
                 await asyncio.sleep(sleep_time)
 
     async def _auto_save(self) -> None:
-        count = 0
+        """Save players whose columns changed; unchanged players are skipped.
+
+        With write-behind the tick only queues snapshots; the byte count is
+        reported once the queued rows are committed. While an earlier report
+        is still waiting, no new one starts (its byte window would overlap).
+        """
+        saved = skipped = 0
+        bytes_before = getattr(self.db, "bytes_written", 0)
         for session in list(self.sessions.values()):
             if session.character:
-                await session.save_character()
-                count += 1
-        if count:
-            log.info("Auto-saved %d players", count)
+                if await session.save_character():
+                    saved += 1
+                else:
+                    skipped += 1
+        if not saved and not skipped:
+            return
+        if self.save_queue and saved:
+            if self._auto_save_reports:
+                log.debug("Auto-save queued %d players; previous report still pending", saved)
+                return
+            task = asyncio.create_task(self._report_auto_save(saved, skipped, bytes_before))
+            self._auto_save_reports.add(task)
+            task.add_done_callback(self._auto_save_reports.discard)
+        else:
+            self._log_auto_save(saved, skipped, bytes_before)
+
+    async def _report_auto_save(self, saved: int, skipped: int, bytes_before: int) -> None:
+        timeout = self.config.get("engine", {}).get("save_interval", 300)
+        committed = await self.save_queue.flush(timeout=timeout)
+        self._log_auto_save(saved, skipped, bytes_before, committed)
+
+    def _log_auto_save(self, saved: int, skipped: int, bytes_before: int,
+                       committed: bool = True) -> None:
+        written = getattr(self.db, "bytes_written", 0) - bytes_before
+        self.last_auto_save = {"saved": saved, "skipped": skipped, "bytes": written,
+                               "committed": committed}
+        if not committed:
+            log.warning("Auto-save of %d players not committed yet (%d bytes so far)",
+                        saved, written)
+            return
+        log.info("Auto-saved %d players (%d unchanged skipped, %d bytes)",
+                 saved, skipped, written)
 
     # ── Combat round ─────────────────────────────────────────────
 
@@ -333,10 +474,13 @@ class Engine:
                 if char.fighting and char.fighting.hp <= 0:
                     char.fighting = None
 
-    async def _lua_combat_round(self) -> None:
-        """Run combat round via Lua hook."""
-        from core.lua_commands import HookContext
+    def _iter_fights(self):
+        """Yield (room, attacker, target) for every character due to swing.
 
+        Clears stale fights (attacker out of position, dead target) and
+        yields each attacker once per round. Lazy, so per-pair callers see
+        deaths from earlier pairs.
+        """
         processed: set[int] = set()
         for room in self.world.rooms.values():
             for char in list(room.characters):
@@ -350,22 +494,67 @@ class Engine:
                     continue
 
                 processed.add(char.id)
-                target = char.fighting
-                ctx = HookContext(self, room)
+                yield room, char, char.fighting
+
+    async def _lua_combat_round(self) -> None:
+        """Run combat round via Lua hook.
+
+        Games that register ``combat_round_batch`` get every fight in one
+        call; otherwise — or while the batch hook is quarantined by the Lua
+        watchdog — ``combat_round`` is fired once per attacker.
+        """
+        if self.lua.has_hook("combat_round_batch") and await self._lua_combat_round_batch():
+            return
+
+        for room, char, target in self._iter_fights():
+            ctx = self.lua.acquire_hook_context(room)
+            try:
                 self.lua.fire_hook("combat_round", ctx, char, target)
                 await ctx.flush()
                 await ctx.execute_deferred()
-
-                # Wimpy auto-flee check (for player chars after taking damage)
-                if char.hp > 0 and char.fighting and char.wimpy > 0:
-                    if char.hp <= char.wimpy and char.session:
-                        await char.session.send_line(
-                            "{yellow}체력이 위험합니다! 자동으로 도망칩니다!{reset}"
-                        )
-                        # Trigger flee command
-                        flee_handler = self.cmd_handlers.get("flee")
-                        if flee_handler:
-                            await flee_handler(char.session, "")
+            finally:
+                self.lua.release_context(ctx)
+            await self._check_wimpy(char)
+
+    async def _lua_combat_round_batch(self) -> bool:
+        """Run the whole round through one ``combat_round_batch`` call.
+
+        Hook contract: ``function(ctx, fights)`` where ``fights`` is an array
+        of ``{room, attacker, target}``. Deferred actions (deaths) run after
+        the batch, so the hook must skip fights whose attacker or target
+        already dropped to 0 hp earlier in the same batch. ``ctx:send_room``
+        takes the fight's room as optional second argument. Messages are
+        buffered for the whole batch and sent once per session.
+
+        The watchdog gives the call one hook budget per fight. Returns
+        False, having run nothing, when the hook is quarantined.
+        """
+        fights = list(self._iter_fights())
+        if not fights:
+            return True
+        ctx = self.lua.acquire_hook_context(None)
+        try:
+            if not self.lua.fire_batch_hook("combat_round_batch", ctx, fights):
+                return False
+            await ctx.flush(coalesce=True)
+            await ctx.execute_deferred()
+        finally:
+            self.lua.release_context(ctx)
+        for _, char, _ in fights:
+            await self._check_wimpy(char)
+        return True
+
+    async def _check_wimpy(self, char: Any) -> None:
+        """Wimpy auto-flee check (for player chars after taking damage)."""
+        if char.hp > 0 and char.fighting and char.wimpy > 0:
+            if char.hp <= char.wimpy and char.session:
+                await char.session.send_line(
+                    "{yellow}체력이 위험합니다! 자동으로 도망칩니다!{reset}"
+                )
+                # Trigger flee command
+                flee_handler = self.cmd_handlers.get("flee")
+                if flee_handler:
+                    await flee_handler(char.session, "")
 
     async def _send_to_char(self, char, message: str) -> None:
         """Send message to a character if they have a session."""
@@ -455,22 +644,15 @@ class Engine:
         if char.move < char.max_move:
             char.move = min(char.max_move, char.move + base_move)
 
-    def _tick_corpse_decay(self) -> None:
-        """Tick down corpse timers and remove expired corpses."""
-        for room in self.world.rooms.values():
-            for obj in list(room.objects):
-                if obj.values.get("corpse"):
-                    timer = obj.values.get("timer", 0)
-                    if timer <= 1:
-                        # Corpse decays — drop contents to room
-                        for item in list(obj.contains):
-                            item.in_obj = None
-                            item.room_vnum = room.proto.vnum
-                            room.objects.append(item)
-                        obj.contains.clear()
-                        room.objects.remove(obj)
-                    else:
-                        obj.values["timer"] = timer - 1
+    async def _tick_obj_decay(self) -> None:
+        """Decay pulse: remove objects whose timer ran out (see World.expire_objects)."""
+        for obj, witnesses in self.world.expire_objects():
+            name = obj.name
+            verb = "부패하여 사라집니다" if obj.values.get("corpse") else "사라집니다"
+            msg = f"{{yellow}}{name}{particle(name, '이/가')} {verb}.{{reset}}"
+            for ch in witnesses:
+                if ch.session:
+                    await ch.session.send_line(msg)
 
     # ── Game time / weather ──────────────────────────────────────
 
@@ -892,19 +1074,14 @@ class Engine:
 
         $n/$m/$e/$s → actor, $N/$M/$E/$S → target.
         Korean: gender-neutral, so $m/$M → 그, $e/$E → 그, $s/$S → 그의.
+        Particles after a name (``$n이(가)``) follow the name.
         """
         if not msg:
             return msg
-        msg = msg.replace("$n", actor.name)
-        msg = msg.replace("$m", "그")     # him/her (actor)
-        msg = msg.replace("$e", "그")     # he/she (actor)
-        msg = msg.replace("$s", "그의")   # his/her (actor)
         if target:
-            msg = msg.replace("$N", target.name)
-            msg = msg.replace("$M", "그")     # him/her (target)
-            msg = msg.replace("$E", "그")     # he/she (target)
-            msg = msg.replace("$S", "그의")   # his/her (target)
-        return msg
+            return render_message(_social_template(msg, True), n=actor.name,
+                                  N=target.name, **_SOCIAL_PRONOUNS)
+        return render_message(_social_template(msg, False), n=actor.name, **_SOCIAL_PRONOUNS)
 
     async def _do_social(self, session: Session, social_name: str, args: str) -> None:
         """Execute a social command from the socials DB table."""
@@ -1010,6 +1187,7 @@ class Engine:
                     if random.random() < 0.10:
                         best = max(room.objects, key=lambda o: o.proto.cost)
                         room.objects.remove(best)
+                        self.world.dirty_rooms.add(room.vnum)
                         best.room_vnum = None
                         best.carried_by = mob
                         mob.inventory.append(best)
@@ -1242,6 +1420,7 @@ class Engine:
                 if room and room.has_door(direction):
                     room.door_states[direction]["closed"] = state in (1, 2)
                     room.door_states[direction]["locked"] = state == 2
+                    self.world.dirty_rooms.add(room_vnum)
                 if_flag_ok = True
 
             elif cmd_type == "T":
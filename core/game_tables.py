@@ -0,0 +1,101 @@
+"""Compiled game_tables — dense arrays for well-known tables, tuple keys otherwise.
+
+Rows of the ``game_tables`` DB table carry a JSONB key object (e.g.
+``{"class_id": 0, "level": 5}``) and a JSONB value. At load time:
+
+- tables listed in :data:`DENSE_LAYOUTS` whose keys are small non-negative
+  integers become nested lists indexed ``data[class_id][level]`` (or
+  ``data[class_id][type][level]``), so a lookup is a couple of list
+  indexings instead of a ``json.dumps`` of the key;
+- every other table becomes a dict keyed by the key's values as a tuple,
+  in sorted field order.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+# table_name → (index fields in array order, default for missing entries)
+DENSE_LAYOUTS: dict[str, tuple[tuple[str, ...], Any]] = {
+    "exp_table": (("class_id", "level"), 0),
+    "thac0": (("class_id", "level"), 20),
+    "saving_throw": (("class_id", "type", "level"), 0),
+}
+
+# A dense table may be at most this many times larger than its entry count
+_MAX_SPARSITY = 8
+
+
+@dataclass(slots=True)
+class DenseTable:
+    fields: tuple[str, ...]
+    default: Any
+    data: list[Any]          # nested lists; holes are None
+
+    def get(self, *idx: int) -> Any:
+        node: Any = self.data
+        try:
+            for i in idx:
+                if i < 0:
+                    return self.default
+                node = node[i]
+        except (IndexError, TypeError):
+            return self.default
+        return self.default if node is None else node
+
+
+@dataclass(slots=True)
+class KeyedTable:
+    fields: tuple[str, ...]  # sorted key field names
+    values: dict[tuple, Any]
+
+    def get(self, default: Any = None, **key: Any) -> Any:
+        return self.values.get(tuple(key[f] for f in self.fields if f in key), default)
+
+
+def _dense(entries: list[tuple[dict[str, Any], Any]], fields: tuple[str, ...],
+           default: Any) -> DenseTable | None:
+    """Nested-list table, or None if the keys don't fit the layout."""
+    want = set(fields)
+    shape = [0] * len(fields)
+    for key, _ in entries:
+        if set(key) != want:
+            return None
+        for d, f in enumerate(fields):
+            i = key[f]
+            if not isinstance(i, int) or isinstance(i, bool) or i < 0:
+                return None
+            shape[d] = max(shape[d], i + 1)
+    cells = 1
+    for n in shape:
+        cells *= n
+    if cells > _MAX_SPARSITY * max(1, len(entries)):
+        return None
+
+    def build(depth: int) -> list[Any]:
+        if depth == len(shape) - 1:
+            return [None] * shape[depth]
+        return [build(depth + 1) for _ in range(shape[depth])]
+
+    data = build(0)
+    for key, value in entries:
+        node = data
+        for f in fields[:-1]:
+            node = node[key[f]]
+        node[key[fields[-1]]] = value
+    return DenseTable(fields, default, data)
+
+
+def compile_table(name: str, entries: list[tuple[dict[str, Any], Any]]
+                  ) -> DenseTable | KeyedTable:
+    """Compile one table's (key object, value) rows."""
+    layout = DENSE_LAYOUTS.get(name)
+    if layout is not None and entries:
+        dense = _dense(entries, *layout)
+        if dense is not None:
+            return dense
+    fields = tuple(sorted({f for key, _ in entries for f in key}))
+    return KeyedTable(fields, {
+        tuple(key[f] for f in fields if f in key): value for key, value in entries
+    })
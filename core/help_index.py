@@ -0,0 +1,211 @@
+"""Help index — keyword lookup, prefix search and ranked candidates.
+
+``World.help_entries`` is a list of dicts (keywords, category, min_level,
+body). :class:`HelpIndex` is built from it once and answers queries
+without rescanning or renormalizing keywords:
+
+- an exact map, normalized keyword → entries
+- a sorted list of (key, entry id) for prefix matches by bisection; each
+  word of a multi-word keyword is indexed as well ("magic missile" is
+  found by "mis")
+- the same sorted list over Hangul initial consonants (초성), so a query
+  typed as ``ㄷㅇㅁ`` finds "도움말"
+
+Substring matches are the last resort and only scan keywords when
+nothing ranked higher matched. Entries can be added, replaced and
+removed one at a time (:meth:`add`, :meth:`update`, :meth:`remove`).
+"""
+
+from __future__ import annotations
+
+import unicodedata
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from typing import Any
+
+# Match ranks, best first
+EXACT = 0
+PREFIX = 1
+WORD_PREFIX = 2
+CHOSEONG = 3
+SUBSTRING = 4
+
+_HANGUL_BASE = 0xAC00
+_HANGUL_END = 0xD7A3
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_CHOSEONG_SET = frozenset(_CHOSEONG)
+
+
+def normalize(text: str) -> str:
+    """Case-folded, NFC, single-spaced form used for every key."""
+    return " ".join(unicodedata.normalize("NFC", str(text)).casefold().split())
+
+
+def choseong(text: str) -> str:
+    """Initial consonants of Hangul syllables; other characters unchanged."""
+    out = []
+    for ch in text:
+        code = ord(ch)
+        if _HANGUL_BASE <= code <= _HANGUL_END:
+            out.append(_CHOSEONG[(code - _HANGUL_BASE) // 588])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def is_choseong_query(text: str) -> bool:
+    return bool(text) and all(ch in _CHOSEONG_SET or ch == " " for ch in text)
+
+
+def entry_keywords(entry: dict[str, Any]) -> list[str]:
+    keywords = entry.get("keywords", [])
+    if isinstance(keywords, str):
+        keywords = [keywords]
+    return [k for k in keywords if k]
+
+
+def entry_text(entry: dict[str, Any]) -> str:
+    """Help text (``body`` from the DB; older callers use ``text``)."""
+    return entry.get("body") or entry.get("text", "")
+
+
+@dataclass(slots=True)
+class HelpMatch:
+    entry: dict[str, Any]
+    keyword: str        # the keyword that matched, as written
+    rank: int
+
+
+class HelpIndex:
+    """Incrementally maintained index over help entries."""
+
+    def __init__(self, entries: list[dict[str, Any]] | None = None, *,
+                 choseong_search: bool = True) -> None:
+        self.source = entries
+        self.choseong_search = choseong_search
+        self.count = 0
+        self._entries: dict[int, dict[str, Any]] = {}
+        self._keys: dict[int, list[tuple[str, str]]] = {}   # id → (norm, original)
+        self._exact: dict[str, list[int]] = {}
+        self._prefix: list[tuple[str, int, int]] = []       # (key, id, rank)
+        self._cho: list[tuple[str, int, str]] = []           # (초성, id, key)
+        self._next = 0
+        self._bulk = True           # initial build: append, sort once
+        for entry in entries or ():
+            self.add(entry)
+        self._prefix.sort()
+        self._cho.sort()
+        self._bulk = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ── Maintenance ──────────────────────────────────────────────
+
+    def add(self, entry: dict[str, Any]) -> int:
+        """Index *entry*; returns its id (stable until removed)."""
+        entry_id = self._next
+        self._next += 1
+        self._entries[entry_id] = entry
+        keys = [(normalize(k), k) for k in entry_keywords(entry)]
+        self._keys[entry_id] = keys
+        for norm, _ in keys:
+            self._exact.setdefault(norm, []).append(entry_id)
+            cho = choseong(norm) if self.choseong_search else norm
+            if self._bulk:
+                self._prefix.extend(self._prefix_items(norm, entry_id))
+                if cho != norm:
+                    self._cho.append((cho, entry_id, norm))
+                continue
+            for item in self._prefix_items(norm, entry_id):
+                insort(self._prefix, item)
+            if cho != norm:
+                insort(self._cho, (cho, entry_id, norm))
+        self.count += 1
+        return entry_id
+
+    def remove(self, entry_id: int) -> None:
+        if self._entries.pop(entry_id, None) is None:
+            return
+        for norm, _ in self._keys.pop(entry_id):
+            ids = self._exact.get(norm)
+            if ids and entry_id in ids:
+                ids.remove(entry_id)
+                if not ids:
+                    del self._exact[norm]
+            for item in self._prefix_items(norm, entry_id):
+                _discard_sorted(self._prefix, item)
+            cho = choseong(norm) if self.choseong_search else norm
+            if cho != norm:
+                _discard_sorted(self._cho, (cho, entry_id, norm))
+        self.count -= 1
+
+    def update(self, entry_id: int, entry: dict[str, Any]) -> int:
+        """Replace an entry (keywords may change); returns the new id."""
+        self.remove(entry_id)
+        return self.add(entry)
+
+    def id_of(self, entry: dict[str, Any]) -> int | None:
+        for entry_id, e in self._entries.items():
+            if e is entry:
+                return entry_id
+        return None
+
+    @staticmethod
+    def _prefix_items(norm: str, entry_id: int) -> list[tuple[str, int, int]]:
+        items = [(norm, entry_id, PREFIX)]
+        words = norm.split(" ")
+        for i in range(1, len(words)):
+            items.append((" ".join(words[i:]), entry_id, WORD_PREFIX))
+        return items
+
+    # ── Queries ──────────────────────────────────────────────────
+
+    def search(self, query: str, limit: int = 10) -> list[HelpMatch]:
+        """Entries matching *query*, best first (one match per entry)."""
+        q = normalize(query)
+        if not q:
+            return []
+        best: dict[int, tuple[int, str]] = {}
+
+        def hit(entry_id: int, rank: int, norm: str) -> None:
+            prev = best.get(entry_id)
+            if prev is None or rank < prev[0]:
+                best[entry_id] = (rank, norm)
+
+        for entry_id in self._exact.get(q, ()):
+            hit(entry_id, EXACT, q)
+        i = bisect_left(self._prefix, (q,))
+        while i < len(self._prefix) and self._prefix[i][0].startswith(q):
+            key, entry_id, rank = self._prefix[i]
+            hit(entry_id, rank, key)
+            i += 1
+        if self.choseong_search and is_choseong_query(q):
+            i = bisect_left(self._cho, (q,))
+            while i < len(self._cho) and self._cho[i][0].startswith(q):
+                _, entry_id, norm = self._cho[i]
+                hit(entry_id, CHOSEONG, norm)
+                i += 1
+        if not best:
+            for entry_id, keys in self._keys.items():
+                for norm, _ in keys:
+                    if q in norm:
+                        hit(entry_id, SUBSTRING, norm)
+                        break
+
+        ranked = sorted(best.items(), key=lambda kv: (kv[1][0], len(kv[1][1]), kv[0]))
+        return [HelpMatch(self._entries[entry_id], self._keyword(entry_id, norm), rank)
+                for entry_id, (rank, norm) in ranked[:limit]]
+
+    def _keyword(self, entry_id: int, norm: str) -> str:
+        keys = self._keys[entry_id]
+        for k_norm, original in keys:
+            if k_norm == norm or k_norm.endswith(" " + norm):
+                return original
+        return keys[0][1] if keys else "?"
+
+
+def _discard_sorted(items: list, item: Any) -> None:
+    i = bisect_left(items, item)
+    if i < len(items) and items[i] == item:
+        del items[i]
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
+from typing import Any
+
 # Unicode Hangul syllable block: U+AC00..U+D7A3
 _HANGUL_BASE = 0xAC00
 _HANGUL_END = 0xD7A3
@@ -51,35 +54,107 @@ def particle(word: str, particle_type: str) -> str:
     return with_bat if has_batchim(word) else without_bat
 
 
-def render_message(template: str, **kwargs: str) -> str:
+# ── Compiled templates ───────────────────────────────────────────
+# A template is parsed once into segments; rendering substitutes the
+# variables and picks each particle from the final character written
+# before it (a particle after whitespace or at the start stays as typed).
+
+_LIT, _VAR, _PART = 0, 1, 2
+
+# Written form in templates → particle type
+_PARTICLE_FORMS = {
+    "이(가)": "이/가", "을(를)": "을/를", "은(는)": "은/는", "과(와)": "과/와",
+    "(으)로": "으로/로", "이다(다)": "이다/다", "아(야)": "아/야",
+}
+# Longest first: "이다(다)" must win over "이(가)"-style prefixes
+_FORMS_BY_LENGTH = sorted(_PARTICLE_FORMS, key=len, reverse=True)
+_FORM_STARTS = frozenset(form[0] for form in _PARTICLE_FORMS)
+
+Segment = tuple[int, str, str]     # (kind, text | var name | particle type, as written)
+
+
+@lru_cache(maxsize=4096)
+def compile_template(template: str) -> tuple[Segment, ...]:
+    """Parse *template* into literal, variable and particle segments (cached).
+
+    Variables are ``{name}``; particles are written ``이(가)`` or ``{이/가}``
+    (any pair in :data:`PARTICLES`). Unknown ``{...}`` stays a variable and
+    renders as written when no value is given (color codes pass through).
+    """
+    segments: list[Segment] = []
+    literal: list[str] = []
+
+    def flush() -> None:
+        if literal:
+            segments.append((_LIT, "".join(literal), ""))
+            literal.clear()
+
+    i, n = 0, len(template)
+    while i < n:
+        ch = template[i]
+        if ch == "{":
+            end = template.find("}", i + 1)
+            if end > i + 1:
+                name = template[i + 1:end]
+                flush()
+                if name in PARTICLES:
+                    segments.append((_PART, name, template[i:end + 1]))
+                else:
+                    segments.append((_VAR, name, template[i:end + 1]))
+                i = end + 1
+                continue
+        elif ch in _FORM_STARTS:
+            for form in _FORMS_BY_LENGTH:
+                if template.startswith(form, i):
+                    flush()
+                    segments.append((_PART, _PARTICLE_FORMS[form], form))
+                    i += len(form)
+                    break
+            else:
+                literal.append(ch)
+                i += 1
+            continue
+        literal.append(ch)
+        i += 1
+    flush()
+    return _fold(segments)
+
+
+def _fold(segments: list[Segment]) -> tuple[Segment, ...]:
+    """Resolve particles that follow literal text; merge adjacent literals."""
+    out: list[Segment] = []
+    for kind, value, written in segments:
+        if kind == _PART and out and out[-1][0] == _LIT:
+            value, kind = _pick(out[-1][1][-1:], value, written), _LIT
+        if kind == _LIT and out and out[-1][0] == _LIT:
+            out[-1] = (_LIT, out[-1][1] + value, "")
+        else:
+            out.append((kind, value, written))
+    return tuple(out)
+
+
+def _pick(last: str, particle_type: str, written: str) -> str:
+    if not last or last.isspace():
+        return written
+    return particle(last, particle_type)
+
+
+def render_message(template: str, **kwargs: Any) -> str:
     """Render a message template with automatic Korean particles.
 
     Template format: "{name}이(가)" or "{name}{이/가}"
     Supports: 이(가), 을(를), 은(는), 과(와), (으)로, 이다(다), 아(야)
     """
-    # First pass: substitute variables
-    result = template
-    for key, value in kwargs.items():
-        result = result.replace(f"{{{key}}}", value)
-
-    # Second pass: resolve particles — {word}이(가) pattern
-    import re
-
-    # Pattern: word + particle options like 이(가), 을(를), 은(는), 과(와), (으)로, 이다(다)
-    particle_patterns = [
-        (r"(\S+)이\(가\)", "이/가"),
-        (r"(\S+)을\(를\)", "을/를"),
-        (r"(\S+)은\(는\)", "은/는"),
-        (r"(\S+)과\(와\)", "과/와"),
-        (r"(\S+)\(으\)로", "으로/로"),
-        (r"(\S+)이다\(다\)", "이다/다"),
-        (r"(\S+)아\(야\)", "아/야"),
-    ]
-
-    for pattern, ptype in particle_patterns:
-        def _replace(m: re.Match, pt: str = ptype) -> str:
-            word = m.group(1)
-            return word + particle(word, pt)
-        result = re.sub(pattern, _replace, result)
-
-    return result
+    parts: list[str] = []
+    last = ""
+    for kind, value, written in compile_template(template):
+        if kind == _LIT:
+            text = value
+        elif kind == _VAR:
+            text = str(kwargs[value]) if value in kwargs else written
+        else:
+            text = _pick(last, value, written)
+        if text:
+            parts.append(text)
+            last = text[-1]
+    return "".join(parts)
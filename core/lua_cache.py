@@ -0,0 +1,109 @@
+"""Lua bytecode cache — skip re-parsing unchanged scripts at boot.
+
+Compiled chunks (``string.dump``) are stored on local disk, one file per
+chunk, named by a SHA-256 of the Lua/lupa version, chunk name and source.
+An edited script hashes to a new name, so stale entries are never loaded;
+an unreadable or unloadable entry falls back to compiling the source.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+import lupa
+from lupa import LuaRuntime
+
+log = logging.getLogger(__name__)
+
+# Compile-only Lua state. encoding=None hands string.dump output back to
+# Python as raw bytes instead of trying to decode it as UTF-8.
+_DUMP_FN = """
+function(src, name)
+    local fn, err = load(src, name, "t")
+    if not fn then error(err, 0) end
+    return string.dump(fn)
+end
+"""
+
+# Installed in each consuming runtime: load a chunk or raise LuaError.
+LOAD_CHUNK_FN = """
+function(code, name, mode)
+    local fn, err = load(code, name, mode)
+    if not fn then error(err, 0) end
+    return fn
+end
+"""
+
+
+class LuaBytecodeCache:
+    """Disk cache of compiled Lua chunks keyed by source hash + Lua version."""
+
+    def __init__(self, cache_dir: Path) -> None:
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self._compiler = LuaRuntime(encoding=None)
+        self._dump = self._compiler.eval(_DUMP_FN)
+        self._version = (
+            f"{self._compiler.lua_implementation.decode()}"
+            f"|lupa {lupa.__version__}"
+        ).encode()
+
+    def _path(self, source: str, chunkname: str) -> Path:
+        h = hashlib.sha256(self._version)
+        h.update(b"\0" + chunkname.encode("utf-8") + b"\0")
+        h.update(source.encode("utf-8"))
+        return self.cache_dir / f"{h.hexdigest()}.luac"
+
+    def bytecode(self, source: str, chunkname: str) -> bytes:
+        """Return compiled bytecode for *source*, compiling on a cache miss.
+
+        Raises LuaSyntaxError if the source does not compile.
+        """
+        path = self._path(source, chunkname)
+        try:
+            code = path.read_bytes()
+            self.hits += 1
+            return code
+        except OSError:
+            pass
+
+        self.misses += 1
+        code: bytes = self._dump(source.encode("utf-8"), chunkname.encode("utf-8"))
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_bytes(code)
+            os.replace(tmp, path)
+        except OSError as e:
+            log.warning("Lua bytecode cache write failed (%s): %s", path, e)
+        return code
+
+    def discard(self, source: str, chunkname: str) -> None:
+        """Drop the cached entry for *source* (e.g. after a failed load)."""
+        try:
+            self._path(source, chunkname).unlink()
+        except OSError:
+            pass
+
+    def load(self, load_chunk: Any, source: str, chunkname: str) -> Any:
+        """Compile *source* through the cache into a runtime's chunk function.
+
+        ``load_chunk`` is the target runtime's :data:`LOAD_CHUNK_FN`. Falls
+        back to compiling the source text when the cached bytecode is
+        rejected; syntax errors propagate as usual.
+        """
+        try:
+            code = self.bytecode(source, chunkname)
+        except lupa.LuaSyntaxError:
+            return load_chunk(source, chunkname, "t")
+        try:
+            return load_chunk(code, chunkname, "b")
+        except lupa.LuaError as e:
+            log.warning("Discarding cached bytecode for %s: %s", chunkname, e)
+            self.discard(source, chunkname)
+            return load_chunk(source, chunkname, "t")
@@ -9,16 +9,26 @@ from __future__ import annotations
 import logging
 import random
 import re
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-from lupa import LuaRuntime
+from lupa import LuaRuntime, lua_type
 
-from core.korean import has_batchim, particle
+from core.game_tables import DenseTable
+from core.help_index import EXACT, entry_text
+from core.korean import has_batchim, particle, render_message
+from core.lua_cache import LOAD_CHUNK_FN
+from core.lua_modules import LuaModuleCache
+from core.lua_profiler import LuaProfiler
+from core.lua_watchdog import LuaQuarantined, LuaWatchdog
 
 if TYPE_CHECKING:
     from core.db import Database
     from core.engine import Engine
+    from core.lua_cache import LuaBytecodeCache
+    from core.lua_watchdog import Budget
     from core.session import Session
     from core.world import MobInstance, ObjInstance, Room
 
@@ -34,6 +44,9 @@ class CommandContext:
     Messages are buffered and flushed after Lua returns.
     """
 
+    # Lua view factory — set by LuaCommandRuntime for pooled contexts
+    _make_view: Any = None
+
     def __init__(self, session: Session, engine: Engine, lua_runtime: LuaRuntime | None = None) -> None:
         self._session = session
         self._engine = engine
@@ -41,6 +54,12 @@ class CommandContext:
         self._messages: list[tuple[Session | None, str]] = []
         self._deferred: list[tuple[str, tuple]] = []
 
+    def _reset(self) -> None:
+        """Drop per-call state so the context can be reused from the pool."""
+        self._session = None  # type: ignore[assignment]
+        self._messages.clear()
+        self._deferred.clear()
+
     def _to_lua_table(self, items: list) -> Any:
         """Convert a Python list to a Lua table (1-indexed) for # and ipairs."""
         if self._lua is None:
@@ -48,6 +67,19 @@ class CommandContext:
         tbl = self._lua.table_from(items)
         return tbl
 
+    def _to_lua_view(self, items: Any) -> Any:
+        """Expose a snapshot of a Python collection to Lua as a lazy view.
+
+        The view supports #, [i], ipairs and pairs like a 1-indexed table,
+        but elements are only pushed into Lua when they are first indexed.
+        Writing to it turns it into a plain table. Falls back to a copied
+        table when no view factory is available.
+        """
+        snapshot = tuple(items)
+        if self._make_view is None:
+            return self._to_lua_table(list(snapshot))
+        return self._make_view(snapshot, len(snapshot))
+
     # ── Character proxy (direct attribute access from Lua) ────────
 
     @property
@@ -109,9 +141,7 @@ class CommandContext:
         """Remove a character from the world entirely."""
         if not char:
             return
-        room = self._engine.world.get_room(char.room_vnum)
-        if room and char in room.characters:
-            room.characters.remove(char)
+        self._engine.world.extract_char(char)
 
     def teleport_to(self, vnum: int) -> bool:
         """Move current character to room vnum. Returns success."""
@@ -230,11 +260,11 @@ class CommandContext:
         if room is None:
             char = self._session.character
             if not char:
-                return self._to_lua_table([])
+                return self._to_lua_view(())
             room = self._engine.world.get_room(char.room_vnum)
         if not room:
-            return self._to_lua_table([])
-        return self._to_lua_table(list(room.proto.exits))
+            return self._to_lua_view(())
+        return self._to_lua_view(room.proto.exits)
 
     def get_class(self, class_id: int) -> Any:
         """Get a GameClass by id."""
@@ -248,13 +278,21 @@ class CommandContext:
         """Get a game config value."""
         return self._engine.world.game_configs.get(str(key))
 
+    def get_game_table(self, name: str) -> Any:
+        """Dense game table (e.g. "thac0") as nested 0-based Python lists.
+
+        Shared with World, not copied: index as ``t[class_id][level]``.
+        None when the table is not loaded in dense form.
+        """
+        tbl = self._engine.world.compiled_tables.get(str(name))
+        return tbl.data if isinstance(tbl, DenseTable) else None
+
     def get_players(self) -> Any:
         """Get list of online player characters as a Lua table."""
-        result = []
-        for session in self._engine.players.values():
-            if session.character:
-                result.append(session.character)
-        return self._to_lua_table(result)
+        return self._to_lua_view(
+            session.character for session in self._engine.players.values()
+            if session.character
+        )
 
     # ── Room content queries (Lua tables) ────────────────────────
 
@@ -263,52 +301,52 @@ class CommandContext:
         if room is None:
             char = self._session.character
             if not char:
-                return self._to_lua_table([])
+                return self._to_lua_view(())
             room = self._engine.world.get_room(char.room_vnum)
         if not room:
-            return self._to_lua_table([])
-        return self._to_lua_table(list(room.proto.extra_descs))
+            return self._to_lua_view(())
+        return self._to_lua_view(room.proto.extra_descs)
 
     def get_characters(self, room: Room | None = None) -> Any:
         """Get characters in room as Lua table."""
         if room is None:
             char = self._session.character
             if not char:
-                return self._to_lua_table([])
+                return self._to_lua_view(())
             room = self._engine.world.get_room(char.room_vnum)
         if not room:
-            return self._to_lua_table([])
-        return self._to_lua_table(list(room.characters))
+            return self._to_lua_view(())
+        return self._to_lua_view(room.characters)
 
     def get_objects(self, room: Room | None = None) -> Any:
         """Get objects in room as Lua table."""
         if room is None:
             char = self._session.character
             if not char:
-                return self._to_lua_table([])
+                return self._to_lua_view(())
             room = self._engine.world.get_room(char.room_vnum)
         if not room:
-            return self._to_lua_table([])
-        return self._to_lua_table(list(room.objects))
+            return self._to_lua_view(())
+        return self._to_lua_view(room.objects)
 
     def get_inventory(self) -> Any:
         """Get current char inventory as Lua table."""
         char = self._session.character
         if not char:
-            return self._to_lua_table([])
-        return self._to_lua_table(list(char.inventory))
+            return self._to_lua_view(())
+        return self._to_lua_view(char.inventory)
 
     def get_char_inventory(self, char: Any) -> Any:
         """Get any character's inventory as Lua table."""
         if not char or not hasattr(char, "inventory"):
-            return self._to_lua_table([])
-        return self._to_lua_table(list(char.inventory))
+            return self._to_lua_view(())
+        return self._to_lua_view(char.inventory)
 
     def get_equipment(self) -> Any:
         """Get current char equipment as Lua table of {slot, obj} pairs."""
         char = self._session.character
         if not char:
-            return self._to_lua_table([])
+            return self._to_lua_view(())
         items = []
         for slot in sorted(char.equipment.keys()):
             items.append({"slot": slot, "obj": char.equipment[slot]})
@@ -317,36 +355,18 @@ class CommandContext:
     # ── Help / Commands / Alias ───────────────────────────────────
 
     def get_help(self, keyword: str) -> str | None:
-        """Search help entries and return text or None."""
-        kw = str(keyword).lower()
-        for entry in self._engine.world.help_entries:
-            keywords = entry.get("keywords", [])
-            if isinstance(keywords, str):
-                keywords = [keywords]
-            for k in keywords:
-                if k.lower() == kw:
-                    return entry.get("text", "")
-        # Partial match
-        matches = []
-        for entry in self._engine.world.help_entries:
-            keywords = entry.get("keywords", [])
-            if isinstance(keywords, str):
-                keywords = [keywords]
-            for k in keywords:
-                if kw in k.lower():
-                    matches.append(entry)
-                    break
-        if len(matches) == 1:
-            return matches[0].get("text", "")
-        if len(matches) > 1:
-            kw_list = []
-            for m in matches[:10]:
-                kws = m.get("keywords", [])
-                if isinstance(kws, str):
-                    kws = [kws]
-                kw_list.append(kws[0] if kws else "?")
-            return f"__MULTIPLE__:{','.join(kw_list)}"
-        return None
+        """Search help entries and return text or None.
+
+        A single best match (exact keyword, or the only entry at the best
+        rank) returns its text; otherwise ``__MULTIPLE__:`` and the ranked
+        candidates' keywords.
+        """
+        matches = self._engine.world.help_index.search(str(keyword))
+        if not matches:
+            return None
+        if matches[0].rank == EXACT or len(matches) == 1 or matches[0].rank < matches[1].rank:
+            return entry_text(matches[0].entry)
+        return f"__MULTIPLE__:{','.join(m.keyword for m in matches)}"
 
     def get_all_commands(self) -> Any:
         """Get all registered command names as Lua table."""
@@ -464,6 +484,7 @@ class CommandContext:
         room.door_states[direction]["closed"] = bool(closed)
         if locked is not None:
             room.door_states[direction]["locked"] = bool(locked)
+        self._engine.world.dirty_rooms.add(room.vnum)
         # Sync other side
         for ex in room.proto.exits:
             if ex.direction == direction:
@@ -474,6 +495,7 @@ class CommandContext:
                         other_room.door_states[rev]["closed"] = bool(closed)
                         if locked is not None:
                             other_room.door_states[rev]["locked"] = bool(locked)
+                        self._engine.world.dirty_rooms.add(other_room.vnum)
                 break
 
     def has_key(self, direction: int) -> bool:
@@ -598,6 +620,7 @@ class CommandContext:
             return
         obj.in_obj = container
         container.contains.append(obj)
+        self._engine.world.mark_obj_room(container)
 
     def obj_from_room(self, obj: Any) -> None:
         """Remove object from room floor."""
@@ -608,6 +631,7 @@ class CommandContext:
             room = self._engine.world.get_room(room_vnum)
             if room and obj in room.objects:
                 room.objects.remove(obj)
+                self._engine.world.dirty_rooms.add(room_vnum)
             obj.room_vnum = None
         else:
             # Fallback: search current character's room
@@ -616,6 +640,7 @@ class CommandContext:
                 room = self._engine.world.get_room(char.room_vnum)
                 if room and obj in room.objects:
                     room.objects.remove(obj)
+                    self._engine.world.dirty_rooms.add(room.vnum)
 
     def purge_room(self) -> None:
         """Remove all NPCs and objects from current character's room."""
@@ -627,6 +652,7 @@ class CommandContext:
             return
         room.characters = [ch for ch in room.characters if not ch.is_npc]
         room.objects.clear()
+        self._engine.world.dirty_rooms.add(room.vnum)
 
     def get_inv_count(self) -> int:
         """Get inventory count for current character (Lua # workaround)."""
@@ -639,9 +665,7 @@ class CommandContext:
         """Remove a character from their current room."""
         if not char:
             return
-        room = self._engine.world.get_room(char.room_vnum)
-        if room and char in room.characters:
-            room.characters.remove(char)
+        self._engine.world.char_from_room(char)
 
     def equip(self, obj: Any, slot: int | str) -> None:
         char = self._session.character
@@ -808,14 +832,7 @@ class CommandContext:
         """Move any character to a room (not just ctx.char)."""
         if not char:
             return
-        rv = int(room_vnum)
-        old_room = self._engine.world.get_room(char.room_vnum)
-        if old_room and char in old_room.characters:
-            old_room.characters.remove(char)
-        char.room_vnum = rv
-        new_room = self._engine.world.get_room(rv)
-        if new_room:
-            new_room.characters.append(char)
+        self._engine.world.char_to_room(char, int(room_vnum))
 
     def start_combat(self, target: Any) -> None:
         char = self._session.character
@@ -862,6 +879,11 @@ class CommandContext:
         pd = self._session.player_data
         return pd.get("level", 1) >= 34
 
+    def render(self, template: str, vars: Any = None) -> str:
+        """Render a Korean message template (see core.korean.render_message)."""
+        kwargs = {str(k): v for k, v in vars.items()} if vars is not None else {}
+        return render_message(str(template), **kwargs)
+
     def particle(self, word: str, p1: str, p2: str) -> str:
         """Select Korean particle based on batchim."""
         return p1 if has_batchim(str(word)) else p2
@@ -915,9 +937,9 @@ class CommandContext:
         """Get followers of current char as Lua table."""
         char = self._session.character
         if not char:
-            return self._to_lua_table([])
+            return self._to_lua_view(())
         followers = getattr(char, "_followers", set())
-        return self._to_lua_table(list(followers))
+        return self._to_lua_view(followers)
 
     def get_all_skills(self) -> Any:
         """Get all skills from world as Lua table of {id, name, korean_name}."""
@@ -953,41 +975,57 @@ class CommandContext:
             if fn:
                 fn(self, str(args))
 
+    def lua_profile(self, action: str = "report", arg: Any = None) -> str:
+        """Control the Lua profiler: on/off/reset/report [n]/flame."""
+        lua_rt = self._engine.lua
+        if not lua_rt:
+            return "Lua 런타임이 초기화되지 않았습니다."
+        prof = lua_rt.profiler
+        action = str(action).lower()
+        if action in ("on", "start"):
+            prof.start()
+            return "Lua 프로파일러를 켰습니다."
+        if action in ("off", "stop"):
+            prof.stop()
+            return "Lua 프로파일러를 껐습니다."
+        if action == "reset":
+            prof.reset()
+            return "Lua 프로파일 기록을 초기화했습니다."
+        if action == "flame":
+            text = prof.collapsed()
+        else:
+            limit = int(arg) if arg and str(arg).isdigit() else 20
+            text = prof.report(limit)
+        return text.replace("\n", "\r\n") if text else "기록이 없습니다."
+
     # ── Zone / World search ────────────────────────────────────────
 
     def get_zone_chars(self, zone_vnum: int | None = None, keyword: str | None = None) -> Any:
         """Get characters in the same zone. Returns Lua table of {char, room_name}."""
         char = self._session.character
         if not char:
-            return self._to_lua_table([])
+            return self._to_lua_view(())
         if zone_vnum is None:
             room = self._engine.world.get_room(char.room_vnum)
             if not room:
-                return self._to_lua_table([])
+                return self._to_lua_view(())
             zone_vnum = room.proto.zone_vnum
         kw = str(keyword).lower() if keyword else None
+        world = self._engine.world
         results = []
-        for rm in self._engine.world.rooms.values():
-            if rm.proto.zone_vnum != int(zone_vnum):
+        for ch in world.zone_chars(int(zone_vnum)):
+            if ch is char:
                 continue
-            for ch in rm.characters:
-                if ch is char:
+            if kw:
+                if kw not in ch.proto.keywords.lower() and \
+                   (not ch.player_name or kw not in ch.player_name.lower()):
                     continue
-                if kw:
-                    if kw not in ch.proto.keywords.lower() and \
-                       (not ch.player_name or kw not in ch.player_name.lower()):
-                        continue
-                results.append({"char": ch, "room_name": rm.proto.name})
+            results.append({"char": ch, "room_name": world.rooms[ch.room_vnum].proto.name})
         return self._to_lua_table(results)
 
     def find_world_char(self, name: str) -> MobInstance | None:
         """Find a character anywhere in the world by player name."""
-        name_lower = str(name).lower()
-        for room in self._engine.world.rooms.values():
-            for ch in room.characters:
-                if ch.player_name and ch.player_name.lower() == name_lower:
-                    return ch
-        return None
+        return self._engine.world.find_player(str(name))
 
     def find_shop(self) -> Any:
         """Find shop in current room. Returns (shop_info_table, keeper_mob) or (nil, nil).
@@ -1229,8 +1267,8 @@ class CommandContext:
         """Get characters in a specific room as Lua table."""
         room = self._engine.world.get_room(int(room_vnum))
         if not room:
-            return self._to_lua_table([])
-        return self._to_lua_table(list(room.characters))
+            return self._to_lua_view(())
+        return self._to_lua_view(room.characters)
 
     def find_portal(self, keyword: str) -> int | None:
         """Find a portal object in the room and return its destination vnum."""
@@ -1498,8 +1536,8 @@ class CommandContext:
     def get_affects(self, target: Any) -> Any:
         """Get target's affects as Lua table."""
         if not target:
-            return self._to_lua_table([])
-        return self._to_lua_table(list(target.affects))
+            return self._to_lua_view(())
+        return self._to_lua_view(target.affects)
 
     def reload_lua(self) -> None:
         """Alias for defer_reload."""
@@ -1533,8 +1571,25 @@ class CommandContext:
 
     # ── Flush (called from Python after Lua returns) ──────────────
 
-    async def flush(self) -> None:
-        """Send all buffered messages."""
+    async def flush(self, coalesce: bool = False) -> None:
+        """Send all buffered messages.
+
+        With *coalesce*, each session's messages are joined and sent in a
+        single send_line (used for batched hooks).
+        """
+        if coalesce:
+            grouped: dict[int, tuple[Session, list[str]]] = {}
+            for target_session, text in self._messages:
+                if target_session:
+                    entry = grouped.get(id(target_session))
+                    if entry is None:
+                        grouped[id(target_session)] = (target_session, [text])
+                    else:
+                        entry[1].append(text)
+            self._messages.clear()
+            for target_session, texts in grouped.values():
+                await target_session.send_line("\r\n".join(texts))
+            return
         for target_session, text in self._messages:
             if target_session:
                 await target_session.send_line(text)
@@ -1587,44 +1642,140 @@ class CommandContext:
 class HookContext(CommandContext):
     """Context for hook calls (combat, tick, etc.) where there may be no single session."""
 
-    def __init__(self, engine: Engine, room: Room) -> None:
+    def __init__(self, engine: Engine, room: Room, lua_runtime: LuaRuntime | None = None) -> None:
         # Create a dummy session-like object
         self._engine = engine
         self._room = room
+        self._lua = lua_runtime
         self._session = None  # type: ignore[assignment]
         self._messages: list[tuple[Session | None, str]] = []
         self._deferred: list[tuple[str, tuple]] = []
 
+    def _reset(self) -> None:
+        super()._reset()
+        self._room = None  # type: ignore[assignment]
+
     @property
     def char(self) -> None:
         return None
 
-    def send(self, msg: str) -> None:
-        """In hook context, send to all in room."""
-        for ch in self._room.characters:
+    def send(self, msg: str, room: Room | None = None) -> None:
+        """In hook context, send to all in room (hook room by default)."""
+        room = room or self._room
+        if room is None:
+            return
+        for ch in room.characters:
             if ch.session:
                 self._messages.append((ch.session, str(msg)))
 
-    def send_room(self, msg: str) -> None:
-        """Send message to all characters in the hook room."""
-        for ch in self._room.characters:
+    def send_room(self, msg: str, room: Room | None = None) -> None:
+        """Send message to all characters in a room (hook room by default)."""
+        room = room or self._room
+        if room is None:
+            return
+        for ch in room.characters:
             if ch.session:
                 self._messages.append((ch.session, f"\r\n{msg}"))
 
 
 # ── LuaCommandRuntime ────────────────────────────────────────────
 
+# Max idle contexts kept per pool (commands and hooks are never deeply nested)
+_CONTEXT_POOL_SIZE = 32
+
+# Lazy collection view: a 1-indexed proxy over a Python tuple snapshot.
+# ``#view`` is answered without copying; the snapshot is converted to a Lua
+# table only when an element is first read.
+_LUA_VIEW_FACTORY = """
+local table_from = ...
+local SEQ, LEN = {}, {}
+local function view_len(t) return rawget(t, LEN) end
+local function view_next(t, i)
+    i = i + 1
+    if i <= rawget(t, LEN) then
+        return i, t[i]
+    end
+end
+local function view_pairs(t) return view_next, t, 0 end
+-- The first write turns the view into a plain table holding the
+-- snapshot, so t[#t+1] = x, table.insert and table.remove behave as on
+-- any table returned by ctx.
+local function to_plain(t, items)
+    local n = rawget(t, LEN)
+    items = items or table_from(rawget(t, SEQ))
+    setmetatable(t, nil)
+    rawset(t, SEQ, nil)
+    rawset(t, LEN, nil)
+    for i = 1, n do rawset(t, i, items[i]) end
+end
+local VIEW_MT = {__len = view_len, __pairs = view_pairs}
+VIEW_MT.__newindex = function(t, k, v)
+    to_plain(t)
+    t[k] = v
+end
+-- First element read converts the snapshot once; later reads hit the
+-- Lua table directly through a plain __index table.
+VIEW_MT.__index = function(t, i)
+    local items = table_from(rawget(t, SEQ))
+    rawset(t, SEQ, nil)
+    setmetatable(t, {__index = items, __len = view_len, __pairs = view_pairs,
+                     __newindex = function(t2, k, v)
+                         to_plain(t2, items)
+                         t2[k] = v
+                     end})
+    return items[i]
+end
+return function(seq, n)
+    return setmetatable({[SEQ] = seq, [LEN] = n}, VIEW_MT)
+end
+"""
+
+
+# Owner key for registrations made outside a script load
+_DIRECT = "<direct>"
+
+
+@dataclass(slots=True)
+class _ScriptRegistrations:
+    """Commands, Korean names and hooks registered by one script."""
+    commands: dict[str, Any] = field(default_factory=dict)   # cmd_name → fn
+    korean: dict[str, str] = field(default_factory=dict)     # korean → cmd_name
+    hooks: list[tuple[str, Any]] = field(default_factory=list)
+
 
 class LuaCommandRuntime:
     """Manages Lua runtime, command registration, and hook dispatching."""
 
-    def __init__(self, engine: Engine) -> None:
+    def __init__(self, engine: Engine,
+                 bytecode_cache: LuaBytecodeCache | None = None,
+                 budgets: dict[str, Budget] | None = None,
+                 quarantine_after: int = 3) -> None:
         self.engine = engine
         self._lua = LuaRuntime(unpack_returned_tuples=True)
+        self._bytecode_cache = bytecode_cache
+        self._load_chunk: Any = self._lua.eval(LOAD_CHUNK_FN)
         self._commands: dict[str, Any] = {}       # cmd_name → lua function
         self._korean_cmds: dict[str, str] = {}    # korean_name → cmd_name
         self._hooks: dict[str, list[Any]] = {}    # hook_name → [lua functions]
         self._loaded_scripts: dict[str, str] = {} # "game/category/name" → source
+        # Per-script ownership (insertion order = load order)
+        self._owned: dict[str, _ScriptRegistrations] = {}
+        self._command_owner: dict[str, str] = {}  # cmd_name → script key
+        self._korean_owner: dict[str, str] = {}   # korean_name → script key
+        self._staged: _ScriptRegistrations | None = None
+        self._handlers: dict[str, Any] = {}       # cmd_name → wrapped handler
+        self._registered = False                  # register_all_commands done
+        self._inline_seq = 0
+        self._running_key: str | None = None      # script being executed
+        self._ctx_pool: list[CommandContext] = []
+        self._hook_ctx_pool: list[HookContext] = []
+        self._make_view: Any = self._lua.execute(
+            _LUA_VIEW_FACTORY, self._lua.table_from)
+        self.profiler = LuaProfiler(self._lua)
+        self.watchdog = LuaWatchdog(self._lua, self.profiler.source_of,
+                                    budgets, quarantine_after)
+        self.modules = LuaModuleCache(self._lua, self._load_chunk,
+                                      self._module_dirs, bytecode_cache)
 
         # Set up Lua globals
         self._setup_lua_env()
@@ -1637,10 +1788,17 @@ class LuaCommandRuntime:
         # register_command(name, func, korean_name?)
         def register_command(name: str, func: Any, korean_name: str | None = None) -> None:
             name = str(name)
-            runtime._commands[name] = func
+            korean_name = str(korean_name) if korean_name else None
+            staged = runtime._staged or runtime._direct_registrations()
+            staged.commands[name] = func
             if korean_name:
-                korean_name = str(korean_name)
-                runtime._korean_cmds[korean_name] = name
+                staged.korean[korean_name] = name
+            if runtime._staged is None:
+                runtime._commands[name] = func
+                runtime._command_owner[name] = _DIRECT
+                if korean_name:
+                    runtime._korean_cmds[korean_name] = name
+                    runtime._korean_owner[korean_name] = _DIRECT
             log.debug("Lua command registered: %s%s",
                       name, f" ({korean_name})" if korean_name else "")
 
@@ -1649,35 +1807,114 @@ class LuaCommandRuntime:
         # register_hook(hook_name, func)
         def register_hook(hook_name: str, func: Any) -> None:
             hook_name = str(hook_name)
-            if hook_name not in runtime._hooks:
-                runtime._hooks[hook_name] = []
-            runtime._hooks[hook_name].append(func)
+            staged = runtime._staged or runtime._direct_registrations()
+            staged.hooks.append((hook_name, func))
+            if runtime._staged is None:
+                runtime._hooks.setdefault(hook_name, []).append(func)
             log.debug("Lua hook registered: %s", hook_name)
 
         lua.globals()["register_hook"] = register_hook
 
+        # require(name) — shared, frozen data modules (data/<game>/lua/*.lua)
+        lua.globals()["require"] = self.modules.require
+
+        # char_stat(char, key, default=13) / char_equipment(char, slot)
+        # — native reads, no pcall closure needed for missing keys
+        def char_stat(char: Any, key: Any, default: Any = 13) -> Any:
+            stats = getattr(char, "stats", None)
+            if stats is not None:
+                val = stats[key] if lua_type(stats) else stats.get(key)
+                if val is not None:
+                    return val
+            return default
+
+        def char_equipment(char: Any, slot: Any) -> Any:
+            equipment = getattr(char, "equipment", None)
+            if equipment is None:
+                return None
+            return equipment[slot] if lua_type(equipment) else equipment.get(slot)
+
+        # render_message(template, vars) — compiled Korean templates
+        # (core.korean): "{name}이(가) {item}을(를) 줍니다"
+        def lua_render_message(template: Any, vars: Any = None) -> str:
+            kwargs = {str(k): v for k, v in vars.items()} if vars is not None else {}
+            return render_message(str(template), **kwargs)
+
+        lua.globals()["char_stat"] = char_stat
+        lua.globals()["char_equipment"] = char_equipment
+        lua.globals()["render_message"] = lua_render_message
+
+    def _module_dirs(self) -> list[Path]:
+        """Search path for require(): data/<game>/lua of the requiring
+        script's game (while a script loads), then of the engine's game."""
+        from core.engine import BASE_DIR
+        games = []
+        if self._running_key:
+            games.append(self._running_key.split("/", 1)[0])
+        game = getattr(self.engine, "game_name", None)
+        if isinstance(game, str):
+            games.append(game)
+        return [BASE_DIR / "data" / g / "lua"
+                for g in dict.fromkeys(games) if g != "common" and not g.startswith("<")]
+
     # ── Loading from DB ──────────────────────────────────────────
 
     async def load_from_db(self, db: Database, game_name: str) -> int:
         """Load Lua scripts from DB. Loads common first, then game-specific."""
+        t0 = time.perf_counter()
+        cache = self._bytecode_cache
+        hits, misses = (cache.hits, cache.misses) if cache else (0, 0)
         count = 0
         for scope in ("common", game_name):
             rows = await db.fetch_lua_scripts(scope)
             for row in rows:
                 key = f"{row['game']}/{row['category']}/{row['name']}"
                 try:
-                    self._lua.execute(row["source"])
-                    self._loaded_scripts[key] = row["source"]
+                    self._run_script(key, row["source"], cached=True)
                     count += 1
                 except Exception as e:
                     log.error("Failed to load Lua script %s: %s", key, e)
+        elapsed = (time.perf_counter() - t0) * 1000
+        if cache:
+            log.info("Lua scripts executed: %d in %.1f ms (bytecode cache %d hit, %d miss)",
+                     count, elapsed, cache.hits - hits, cache.misses - misses)
+        else:
+            log.info("Lua scripts executed: %d in %.1f ms", count, elapsed)
         return count
 
-    async def seed_from_files(self, db: Database, game_name: str) -> int:
-        """Import seed Lua files from games/*/lua/ into DB."""
+    def _run_script(self, key: str, source: str, cached: bool = False) -> dict[str, Any]:
+        """Execute a script and swap in its registrations atomically.
+
+        Registrations made while the chunk runs are staged; only when it
+        finishes without error do they replace the script's previous ones.
+        With *cached*, precompiled bytecode is used when a cache is set.
+        """
+        staged = _ScriptRegistrations()
+        outer, self._staged = self._staged, staged
+        outer_key, self._running_key = self._running_key, key
+        try:
+            if cached and self._bytecode_cache is not None:
+                self._bytecode_cache.load(self._load_chunk, source, f"={key}")()
+            else:
+                self._load_chunk(source, f"={key}", "t")()
+        finally:
+            self._staged = outer
+            self._running_key = outer_key
+        self._loaded_scripts[key] = source
+        return self._apply_registrations(key, staged)
+
+    async def seed_from_files(self, db: Database, game_name: str) -> dict[str, int]:
+        """Sync seed Lua files from games/*/lua/ into DB.
+
+        Stored sources are compared by content hash in one query; only new
+        or changed files are written, in one batched upsert, so unchanged
+        scripts keep their ``version``. Returns updated/skipped counts.
+        """
+        from core.db import lua_source_hash
         from core.engine import BASE_DIR
-        count = 0
-        for scope in ("common", game_name):
+        scopes = ("common", game_name)
+        files: list[tuple[str, str, str, str]] = []
+        for scope in scopes:
             lua_dir = BASE_DIR / "games" / scope / "lua"
             if not lua_dir.exists():
                 continue
@@ -1687,25 +1924,214 @@ class LuaCommandRuntime:
                 name = parts[-1].replace(".lua", "")
                 category = "/".join(parts[:-1]) if len(parts) > 1 else "lib"
                 source = lua_file.read_text(encoding="utf-8")
-                await db.upsert_lua_script(
-                    game=scope, category=category, name=name, source=source,
-                )
-                count += 1
-                log.debug("Seeded Lua: %s/%s/%s", scope, category, name)
-        return count
-
-    def load_source(self, source: str, key: str = "<inline>") -> None:
-        """Execute a Lua source string (registers commands/hooks)."""
+                files.append((scope, category, name, source))
+        stored = await db.lua_script_hashes(scopes)
+        changed = [f for f in files if stored.get(f[:3]) != lua_source_hash(f[3])]
+        await db.upsert_lua_scripts(changed)
+        for scope, category, name, _ in changed:
+            log.debug("Seeded Lua: %s/%s/%s", scope, category, name)
+        return {"updated": len(changed), "skipped": len(files) - len(changed)}
+
+    def load_source(self, source: str, key: str = "<inline>") -> dict[str, Any]:
+        """Execute a Lua source string (registers commands/hooks).
+
+        Returns the registration changes (see _apply_registrations). Each
+        "<inline>" load is its own anonymous script.
+        """
+        if key == "<inline>":
+            self._inline_seq += 1
+            key = f"<inline>#{self._inline_seq}"
         try:
-            self._lua.execute(source)
-            self._loaded_scripts[key] = source
+            changes = self._run_script(key, source)
         except Exception as e:
             log.error("Failed to load Lua source %s: %s", key, e)
             raise
+        self.watchdog.release(key)
+        return changes
+
+    def reload_script(self, source: str, key: str = "<inline>") -> dict[str, Any]:
+        """Reload a single script — swap only the registrations it owns."""
+        changes = self.load_source(source, key)
+        log.info("Lua script reloaded: %s (+%d -%d commands, %d hooks)", key,
+                 len(changes["added"]), len(changes["removed"]), changes["hooks"])
+        return changes
+
+    def unload_script(self, key: str) -> dict[str, Any]:
+        """Drop every command/hook a script registered."""
+        self._loaded_scripts.pop(key, None)
+        changes = self._apply_registrations(key, _ScriptRegistrations())
+        self._owned.pop(key, None)
+        return changes
+
+    async def reload_from_db(self, db: Database, game_name: str) -> dict[str, Any]:
+        """Incremental reload: re-run only scripts whose source changed.
+
+        Scripts no longer in the DB are unloaded.
+        """
+        result: dict[str, Any] = {"reloaded": [], "unchanged": 0,
+                                  "removed": [], "failed": {}}
+        seen: set[str] = set()
+        for scope in ("common", game_name):
+            for row in await db.fetch_lua_scripts(scope):
+                key = f"{row['game']}/{row['category']}/{row['name']}"
+                seen.add(key)
+                if self._loaded_scripts.get(key) == row["source"]:
+                    result["unchanged"] += 1
+                    continue
+                try:
+                    self.reload_script(row["source"], key)
+                    result["reloaded"].append(key)
+                except Exception as e:
+                    result["failed"][key] = str(e)
+        for key in [k for k in self._owned if k not in seen and not k.startswith("<inline>")]:
+            self.unload_script(key)
+            result["removed"].append(key)
+        return result
 
-    def reload_script(self, source: str, key: str = "<inline>") -> None:
-        """Reload a single script — re-execute to update registrations."""
-        self.load_source(source, key)
+    # ── Registration ownership ───────────────────────────────────
+
+    def _apply_registrations(self, key: str, new: _ScriptRegistrations) -> dict[str, Any]:
+        """Replace *key*'s registrations with *new*; touch only what changed.
+
+        A command registered by several scripts belongs to the one loaded
+        last (game scripts override common ones); reloading an earlier
+        script does not take it back, and removing it from the owner falls
+        back to the earlier registration.
+        """
+        old = self._owned.get(key)
+        self._owned[key] = new  # a reloaded script keeps its load position
+        order = list(self._owned)
+        rank = order.index(key)
+        added: list[str] = []
+        removed: list[str] = []
+
+        # Commands
+        stale = [n for n in (old.commands if old else ()) if n not in new.commands]
+        for name in new.commands:
+            owner = self._command_owner.get(name)
+            if owner is not None and owner != key and order.index(owner) > rank:
+                continue
+            if name not in self._commands:
+                added.append(name)
+            self._commands[name] = new.commands[name]
+            self._command_owner[name] = key
+        for name in stale:
+            if self._command_owner.get(name) != key:
+                continue
+            fallback = self._latest_owner(key, lambda reg: name in reg.commands)
+            if fallback is None:
+                del self._commands[name]
+                del self._command_owner[name]
+                removed.append(name)
+            else:
+                self._commands[name] = self._owned[fallback].commands[name]
+                self._command_owner[name] = fallback
+
+        # Korean names
+        korean_changed: list[str] = []
+        stale_kr = [kr for kr in (old.korean if old else ()) if kr not in new.korean]
+        for kr, name in new.korean.items():
+            owner = self._korean_owner.get(kr)
+            if owner is not None and owner != key and order.index(owner) > rank:
+                continue
+            self._korean_cmds[kr] = name
+            self._korean_owner[kr] = key
+            korean_changed.append(kr)
+        for kr in stale_kr:
+            if self._korean_owner.get(kr) != key:
+                continue
+            fallback = self._latest_owner(key, lambda reg: kr in reg.korean)
+            if fallback is None:
+                del self._korean_cmds[kr]
+                del self._korean_owner[kr]
+            else:
+                self._korean_cmds[kr] = self._owned[fallback].korean[kr]
+                self._korean_owner[kr] = fallback
+            korean_changed.append(kr)
+
+        # Hooks — rebuild only the affected hook lists, in script load order
+        hook_names = {h for h, _ in new.hooks} | {h for h, _ in (old.hooks if old else ())}
+        for hook_name in hook_names:
+            fns = [fn for reg in self._owned.values()
+                   for h, fn in reg.hooks if h == hook_name]
+            if fns:
+                self._hooks[hook_name] = fns
+            else:
+                self._hooks.pop(hook_name, None)
+
+        if self._registered:
+            self._sync_dispatch(added, removed, korean_changed)
+        return {"added": added, "removed": removed, "hooks": len(new.hooks),
+                "commands": len(new.commands)}
+
+    def _latest_owner(self, exclude: str, registers: Any) -> str | None:
+        """Last-loaded script other than *exclude* for which *registers* holds."""
+        owner = None
+        for key, reg in self._owned.items():
+            if key != exclude and registers(reg):
+                owner = key
+        return owner
+
+    def _direct_registrations(self) -> _ScriptRegistrations:
+        """Registrations made outside any script (e.g. lua.execute in tests)."""
+        reg = self._owned.get(_DIRECT)
+        if reg is None:
+            reg = self._owned[_DIRECT] = _ScriptRegistrations()
+        return reg
+
+    def _sync_dispatch(self, added: list[str], removed: list[str],
+                       korean_changed: list[str]) -> None:
+        """Update the engine's dispatch tables for changed names only."""
+        engine = self.engine
+        for name in removed:
+            handler = self._handlers.pop(name, None)
+            if handler is not None and engine.cmd_handlers.get(name) is handler:
+                del engine.cmd_handlers[name]
+        if removed:
+            gone = set(removed)
+            for kr in [kr for kr, eng in engine.cmd_korean.items() if eng in gone]:
+                del engine.cmd_korean[kr]
+        for name in added:
+            engine.register_command(name, self._handler_for(name))
+        for kr in korean_changed:
+            name = self._korean_cmds.get(kr)
+            if name is not None:
+                engine.cmd_korean[kr] = name
+            elif kr in engine.cmd_korean:
+                del engine.cmd_korean[kr]
+        if added:
+            map_verbs = getattr(engine, "_load_korean_mappings", None)
+            if map_verbs is not None:
+                map_verbs(set(added))
+
+    # ── Context pooling ──────────────────────────────────────────
+
+    def acquire_context(self, session: Session) -> CommandContext:
+        """Get a reset CommandContext for a command call (pooled)."""
+        if self._ctx_pool:
+            ctx = self._ctx_pool.pop()
+            ctx._session = session
+            return ctx
+        ctx = CommandContext(session, self.engine, lua_runtime=self._lua)
+        ctx._make_view = self._make_view
+        return ctx
+
+    def acquire_hook_context(self, room: Room | None) -> HookContext:
+        """Get a reset HookContext for a hook call in a room (pooled)."""
+        if self._hook_ctx_pool:
+            ctx = self._hook_ctx_pool.pop()
+            ctx._room = room
+            return ctx
+        ctx = HookContext(self.engine, room, lua_runtime=self._lua)
+        ctx._make_view = self._make_view
+        return ctx
+
+    def release_context(self, ctx: CommandContext) -> None:
+        """Reset a context and return it to its pool."""
+        ctx._reset()
+        pool = self._hook_ctx_pool if isinstance(ctx, HookContext) else self._ctx_pool
+        if len(pool) < _CONTEXT_POOL_SIZE:
+            pool.append(ctx)
 
     # ── Command dispatch ─────────────────────────────────────────
 
@@ -1716,37 +2142,85 @@ class LuaCommandRuntime:
         return self._korean_cmds.get(korean)
 
     def wrap_command(self, cmd_name: str) -> Any:
-        """Create an async Python handler that wraps a Lua command function."""
-        lua_fn = self._commands.get(cmd_name)
-        if lua_fn is None:
+        """Create an async Python handler that wraps a Lua command function.
+
+        The Lua function is looked up per call, so reloading a script that
+        only changes a command's body needs no re-wrap.
+        """
+        if cmd_name not in self._commands:
             return None
+        commands = self._commands
 
         async def handler(session: Session, args: str) -> None:
-            ctx = CommandContext(session, self.engine, lua_runtime=self._lua)
+            lua_fn = commands.get(cmd_name)
+            if lua_fn is None:
+                return
+            ctx = self.acquire_context(session)
             try:
-                lua_fn(ctx, args)
-            except Exception as e:
-                log.error("Lua command '%s' error: %s", cmd_name, e)
-                ctx.send("{red}명령어 실행 중 오류가 발생했습니다.{reset}")
-            await ctx.flush()
-            await ctx.execute_deferred()
+                try:
+                    self._call_lua("command", cmd_name, lua_fn, ctx, args)
+                except LuaQuarantined:
+                    ctx.send("{yellow}이 명령어는 현재 점검 중입니다.{reset}")
+                except Exception as e:
+                    log.error("Lua command '%s' error: %s", cmd_name, e)
+                    ctx.send("{red}명령어 실행 중 오류가 발생했습니다.{reset}")
+                await ctx.flush()
+                await ctx.execute_deferred()
+            finally:
+                self.release_context(ctx)
 
         return handler
 
+    def _call_lua(self, category: str, name: str, fn: Any, *args: Any,
+                  scale: int = 1) -> None:
+        """Call a registered Lua function under the watchdog and profiler."""
+        watchdog, profiler = self.watchdog, self.profiler
+        if not watchdog.enabled:
+            if profiler.enabled:
+                profiler.call(category, name, fn, *args)
+            else:
+                fn(*args)
+            return
+        if not profiler.enabled:
+            watchdog.call(category, name, fn, *args, scale=scale)
+            return
+        t0 = time.perf_counter()
+        instructions, ok = 0, False
+        try:
+            _, instructions = watchdog.call(category, name, fn, *args, scale=scale)
+            ok = True
+        finally:
+            profiler.record(category, name, fn, time.perf_counter() - t0,
+                            instructions, ok)
+
+    def _handler_for(self, cmd_name: str) -> Any:
+        """Wrapped handler for a command, created once per name."""
+        handler = self._handlers.get(cmd_name)
+        if handler is None:
+            handler = self._handlers[cmd_name] = self.wrap_command(cmd_name)
+        return handler
+
     def register_all_commands(self) -> None:
-        """Register all Lua commands with the engine's command dispatcher."""
+        """Register all Lua commands with the engine's command dispatcher.
+
+        After this, script loads and reloads update the dispatcher
+        incrementally (see _sync_dispatch).
+        """
+        kr_by_cmd: dict[str, list[str]] = {}
+        for kr, eng in self._korean_cmds.items():
+            kr_by_cmd.setdefault(eng, []).append(kr)
         for cmd_name in self._commands:
-            handler = self.wrap_command(cmd_name)
-            if handler:
-                # Collect ALL Korean mappings for this command
-                kr_names = [kr for kr, eng in self._korean_cmds.items() if eng == cmd_name]
-                # Register with the first Korean name
-                self.engine.register_command(
-                    cmd_name, handler, korean=kr_names[0] if kr_names else None
-                )
-                # Register additional Korean names
-                for kr in kr_names[1:]:
-                    self.engine.cmd_korean[kr] = cmd_name
+            handler = self._handler_for(cmd_name)
+            # Collect ALL Korean mappings for this command
+            kr_names = kr_by_cmd.get(cmd_name, [])
+            # Register with the first Korean name
+            self.engine.register_command(
+                cmd_name, handler, korean=kr_names[0] if kr_names else None
+            )
+            # Register additional Korean names
+            for kr in kr_names[1:]:
+                self.engine.cmd_korean[kr] = cmd_name
+        self._registered = True
 
     # ── Hook dispatch ────────────────────────────────────────────
 
@@ -1755,9 +2229,30 @@ class LuaCommandRuntime:
         hooks = self._hooks.get(hook_name, [])
         for hook_fn in hooks:
             try:
-                hook_fn(ctx, *args)
+                self._call_lua("hook", hook_name, hook_fn, ctx, *args)
+            except LuaQuarantined:
+                pass
+            except Exception as e:
+                log.error("Lua hook '%s' error: %s", hook_name, e)
+
+    def fire_batch_hook(self, hook_name: str, ctx: CommandContext,
+                        rows: list[tuple]) -> bool:
+        """Fire a hook with *rows* passed as one Lua array of arrays.
+
+        The watchdog budget is one ``hook`` budget per row. Returns False,
+        without calling anything, when a hook for *hook_name* is
+        quarantined, so the caller can fall back to per-row hooks.
+        """
+        hooks = self._hooks.get(hook_name, [])
+        if self.watchdog.enabled and any(self.watchdog.is_quarantined(fn) for fn in hooks):
+            return False
+        batch = self._lua.table_from([list(row) for row in rows], recursive=True)
+        for hook_fn in hooks:
+            try:
+                self._call_lua("hook", hook_name, hook_fn, ctx, batch, scale=len(rows))
             except Exception as e:
                 log.error("Lua hook '%s' error: %s", hook_name, e)
+        return True
 
     def has_hook(self, hook_name: str) -> bool:
         return bool(self._hooks.get(hook_name))
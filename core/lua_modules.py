@@ -0,0 +1,124 @@
+"""Lua module cache — ``require`` for shared, read-only data modules.
+
+Data tables such as ``data/<game>/lua/stat_tables.lua`` are loaded at most
+once per LuaCommandRuntime, frozen, and handed to every script that
+``require``\\s them. Reloading a script reuses the cached module instead of
+rebuilding its tables; :meth:`LuaModuleCache.invalidate` drops a module so
+the next ``require`` reads it again (e.g. after the data file changed).
+
+Frozen tables behave like plain tables for reads (indexing, ``#``,
+``pairs``, ``ipairs``); any write raises a Lua error.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
+
+from lupa import LuaError, LuaRuntime
+
+if TYPE_CHECKING:
+    from core.lua_cache import LuaBytecodeCache
+
+log = logging.getLogger(__name__)
+
+_MODULE_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)*$")
+
+# freeze(value) → read-only proxy (tables, recursively); other values as-is.
+# Reads go through a plain __index table, so they stay on the VM fast path.
+_FREEZE = """
+local setmetatable, next, type, error = setmetatable, next, type, error
+local function readonly()
+    error("attempt to modify a read-only module table", 2)
+end
+local freeze
+freeze = function(t)
+    if type(t) ~= "table" then return t end
+    local data = {}
+    for k, v in next, t do data[k] = freeze(v) end
+    return setmetatable({}, {
+        __index = data,
+        __newindex = readonly,
+        __len = function() return #data end,
+        __pairs = function() return next, data, nil end,
+        __metatable = false,
+    })
+end
+return freeze
+"""
+
+
+class LuaModuleCache:
+    """Resolves, loads and caches modules for one LuaRuntime."""
+
+    def __init__(self, lua: LuaRuntime, load_chunk: Any,
+                 search_dirs: Callable[[], list[Path]] | None = None,
+                 bytecode_cache: LuaBytecodeCache | None = None) -> None:
+        # Resolved per lookup: the engine may learn its game after creation
+        self._search_dirs = search_dirs or list
+        self._load_chunk = load_chunk
+        self._bytecode_cache = bytecode_cache
+        self._freeze = lua.execute(_FREEZE)
+        self._modules: dict[str, Any] = {}     # name → frozen module
+        self._preload: dict[str, str] = {}     # name → source
+        self._loading: set[str] = set()
+        self.loads = 0
+
+    def preload(self, name: str, source: str) -> None:
+        """Register module source in place of a file lookup."""
+        self._preload[name] = source
+        self._modules.pop(name, None)
+
+    def require(self, name: Any) -> Any:
+        """Lua ``require(name)``: the cached module, loading it on first use."""
+        name = str(name)
+        module = self._modules.get(name)
+        if module is not None:
+            return module
+        if not _MODULE_NAME.match(name):
+            raise LuaError(f"invalid module name '{name}'")
+        if name in self._loading:
+            raise LuaError(f"circular require of module '{name}'")
+        source = self._find(name)
+        self._loading.add(name)
+        try:
+            t0 = time.perf_counter()
+            chunkname = f"=module/{name}"
+            if self._bytecode_cache is not None:
+                chunk = self._bytecode_cache.load(self._load_chunk, source, chunkname)
+            else:
+                chunk = self._load_chunk(source, chunkname, "t")
+            value = chunk(name)
+        finally:
+            self._loading.discard(name)
+        module = self._freeze(True if value is None else value)
+        self._modules[name] = module
+        self.loads += 1
+        log.debug("Lua module loaded: %s (%.1f ms)", name,
+                  (time.perf_counter() - t0) * 1000)
+        return module
+
+    def _find(self, name: str) -> str:
+        source = self._preload.get(name)
+        if source is not None:
+            return source
+        rel = Path(*name.split(".")).with_suffix(".lua")
+        for base in self._search_dirs():
+            path = base / rel
+            if path.is_file():
+                return path.read_text(encoding="utf-8")
+        raise LuaError(f"module '{name}' not found")
+
+    def invalidate(self, name: str | None = None) -> None:
+        """Drop one cached module (or all) so it is re-read on next require."""
+        if name is None:
+            self._modules.clear()
+        else:
+            self._modules.pop(name, None)
+
+    @property
+    def loaded(self) -> list[str]:
+        return sorted(self._modules)
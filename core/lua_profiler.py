@@ -0,0 +1,189 @@
+"""Lua profiler — per-command, per-hook and per-source-file call statistics.
+
+When enabled, LuaCommandRuntime routes command and hook calls through
+:meth:`LuaProfiler.call`, which records call count, wall time and an
+approximate Lua instruction count (a ``debug.sethook`` count hook).
+Instruction counts are exclusive: a profiled call nested inside another
+is charged to the inner entry only. Disabled, the profiler costs one
+attribute check per call.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from lupa import LuaError, LuaRuntime
+
+# Count hook granularity — instructions are counted in steps of this size
+INSTRUCTION_STEP = 100
+
+# Runs fn(...) under a count hook and restores any outer hook afterwards.
+# Returns ok, instructions, error (errors are re-raised in Python).
+_PROFILE_CALL = """
+local STEP = ...
+local sethook, gethook, pcall = debug.sethook, debug.gethook, pcall
+return function(fn, ...)
+    local count = 0
+    local prev, mask, prev_count = gethook()
+    sethook(function() count = count + 1 end, "", STEP)
+    local ok, err = pcall(fn, ...)
+    sethook(prev, mask, prev_count)
+    return ok, count * STEP, err
+end
+"""
+
+_FUNC_SOURCE = """
+function(fn)
+    local info = debug.getinfo(fn, "S")
+    return info.source, info.short_src, info.linedefined
+end
+"""
+
+
+@dataclass(slots=True)
+class ProfileStat:
+    kind: str            # "command" / "hook"
+    name: str            # command name or hook name
+    source: str          # "game/category/name:line"
+    calls: int = 0
+    wall: float = 0.0    # seconds
+    instructions: int = 0
+    errors: int = 0
+
+    @property
+    def script(self) -> str:
+        return self.source.rsplit(":", 1)[0]
+
+
+class LuaProfiler:
+    """Collects call statistics for Lua functions called by the runtime."""
+
+    def __init__(self, lua: LuaRuntime) -> None:
+        self.enabled = False
+        self.started_at = 0.0
+        self._call = lua.execute(_PROFILE_CALL, INSTRUCTION_STEP)
+        self._func_source = lua.eval(_FUNC_SOURCE)
+        self._stats: dict[tuple[str, str, str], ProfileStat] = {}
+        # id(fn) → (fn, "source:line"); fn kept alive so ids stay unique
+        self._sources: dict[int, tuple[Any, str]] = {}
+
+    # ── Control ──────────────────────────────────────────────────
+
+    def start(self) -> None:
+        if not self.enabled:
+            self.enabled = True
+            self.started_at = time.time()
+
+    def stop(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        self._stats.clear()
+        self._sources.clear()
+        if self.enabled:
+            self.started_at = time.time()
+
+    # ── Recording ────────────────────────────────────────────────
+
+    def source_of(self, fn: Any) -> str:
+        """"game/category/name:line" of a Lua function (cached)."""
+        entry = self._sources.get(id(fn))
+        if entry is not None:
+            return entry[1]
+        try:
+            source, short_src, line = self._func_source(fn)
+            name = source[1:] if source[:1] in ("=", "@") else short_src
+            label = f"{name}:{line}"
+        except Exception:
+            label = "?"
+        self._sources[id(fn)] = (fn, label)
+        return label
+
+    def call(self, kind: str, name: str, fn: Any, *args: Any) -> None:
+        """Call a Lua function and record its cost under (kind, name)."""
+        t0 = time.perf_counter()
+        ok, instructions, err = self._call(fn, *args)
+        self.record(kind, name, fn, time.perf_counter() - t0, instructions, ok)
+        if not ok:
+            raise LuaError(str(err))
+
+    def record(self, kind: str, name: str, fn: Any, elapsed: float,
+               instructions: int, ok: bool = True) -> None:
+        """Record one call measured elsewhere (e.g. by the watchdog guard)."""
+        source = self.source_of(fn)
+        key = (kind, name, source)
+        stat = self._stats.get(key)
+        if stat is None:
+            stat = self._stats[key] = ProfileStat(kind, name, source)
+        stat.calls += 1
+        stat.wall += elapsed
+        stat.instructions += instructions
+        if not ok:
+            stat.errors += 1
+
+    # ── Reports ──────────────────────────────────────────────────
+
+    def stats(self) -> list[ProfileStat]:
+        """All entries, most expensive (wall time) first."""
+        return sorted(self._stats.values(), key=lambda s: s.wall, reverse=True)
+
+    def by_script(self) -> list[ProfileStat]:
+        """Entries aggregated per Lua source file, most expensive first."""
+        scripts: dict[str, ProfileStat] = {}
+        for s in self._stats.values():
+            agg = scripts.get(s.script)
+            if agg is None:
+                agg = scripts[s.script] = ProfileStat("script", s.script, s.script)
+            agg.calls += s.calls
+            agg.wall += s.wall
+            agg.instructions += s.instructions
+            agg.errors += s.errors
+        return sorted(scripts.values(), key=lambda s: s.wall, reverse=True)
+
+    def report(self, limit: int = 20) -> str:
+        """Human-readable report: top entries and per-script totals."""
+        def rows(stats: list[ProfileStat]) -> list[str]:
+            out = []
+            for s in stats[:limit]:
+                avg = s.wall / s.calls * 1e6 if s.calls else 0.0
+                entry = s.name if s.kind == "script" else f"{s.kind}:{s.name} ({s.source})"
+                out.append(
+                    f"{s.calls:>8} {s.wall * 1000:>10.2f} {avg:>9.1f} "
+                    f"{s.instructions:>12} {s.errors:>4}  {entry}"
+                )
+            return out
+
+        header = (f"{'calls':>8} {'total_ms':>10} {'avg_us':>9} "
+                  f"{'instr':>12} {'err':>4}  entry")
+        state = "on" if self.enabled else "off"
+        lines = [f"Lua profile ({state}, {len(self._stats)} entries)", header]
+        lines += rows(self.stats())
+        lines += ["", "Per script:", header]
+        lines += rows(self.by_script())
+        return "\n".join(lines)
+
+    def collapsed(self) -> str:
+        """Collapsed-stack output (flamegraph.pl / speedscope), weight = µs."""
+        lines = []
+        for s in self.stats():
+            us = int(s.wall * 1e6)
+            if us:
+                lines.append(f"lua;{s.script};{s.kind}:{s.name} {us}")
+        return "\n".join(lines)
+
+    def as_dict(self) -> dict[str, Any]:
+        """JSON-friendly snapshot for the API."""
+        def row(s: ProfileStat) -> dict[str, Any]:
+            return {
+                "kind": s.kind, "name": s.name, "source": s.source,
+                "calls": s.calls, "wall_ms": round(s.wall * 1000, 3),
+                "instructions": s.instructions, "errors": s.errors,
+            }
+        return {
+            "enabled": self.enabled,
+            "started_at": self.started_at,
+            "entries": [row(s) for s in self.stats()],
+            "scripts": [row(s) for s in self.by_script()],
+        }
@@ -0,0 +1,193 @@
+"""Lua watchdog — per-call instruction/time budgets for runaway scripts.
+
+Every guarded call runs under a ``debug.sethook`` count hook that aborts
+the call once it exceeds its category's instruction or time budget
+(categories: ``command``, ``hook``, ``trigger``). Time is wall time from
+the host's ``time.perf_counter``, read every STEP instructions — not
+``os.clock``, which sums CPU time over all threads of the process and
+would charge bcrypt, SQLite and checkpoint workers to the running script. Aborts are logged and
+counted per function; a function aborted ``quarantine_after`` times is
+quarantined and no longer called until its script is reloaded.
+
+Budgets come from the ``engine.lua_budget`` config section::
+
+    engine:
+      lua_budget:
+        enabled: false         # opt-in, see below for the cost
+        quarantine_after: 3
+        command: {instructions: 10000000, ms: 250}
+        hook:    {instructions: 2000000,  ms: 50}
+        trigger: {instructions: 2000000,  ms: 50}
+
+While a count hook is set the Lua VM checks it on every instruction, so
+Lua code runs ~2.5x slower — pure loops and the tbaMUD combat round alike
+(``scripts/bench_lua_watchdog.py``). The engine therefore leaves the
+watchdog off unless ``enabled`` is set.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from lupa import LuaError, LuaRuntime
+
+log = logging.getLogger(__name__)
+
+# Hook granularity — budgets are checked every STEP instructions
+STEP = 1000
+
+# guard(max_steps, max_seconds, fn, ...) → ok, instructions, result|err, tripped
+# (one step = STEP instructions)
+# Once tripped the hook raises on every instruction, so a script's own
+# pcall cannot swallow the abort. Any outer hook (e.g. a nested guard) is restored.
+_GUARD_CALL = """
+local STEP, clock = ...
+local sethook, gethook, getinfo = debug.sethook, debug.gethook, debug.getinfo
+local pcall = pcall
+local guard
+guard = function(max_steps, max_seconds, fn, ...)
+    local steps, tripped = 0, false
+    local deadline = clock() + max_seconds
+    local prev, mask, prev_count = gethook()
+    local function check()
+        if tripped then
+            -- Let the guard itself finish and restore the previous hook
+            if getinfo(2, "f").func ~= guard then
+                error("execution budget exceeded", 2)
+            end
+            return
+        end
+        steps = steps + 1
+        if steps > max_steps or clock() > deadline then
+            tripped = true
+            sethook(check, "", 1)
+            error("execution budget exceeded", 2)
+        end
+    end
+    sethook(check, "", STEP)
+    local ok, err = pcall(fn, ...)
+    sethook(prev, mask, prev_count)
+    return ok, steps * STEP, err, tripped
+end
+return guard
+"""
+
+
+class LuaBudgetExceeded(LuaError):
+    """A Lua call was aborted for exceeding its execution budget."""
+
+
+class LuaQuarantined(LuaError):
+    """A Lua function is quarantined after repeated budget aborts."""
+
+
+@dataclass(slots=True)
+class Budget:
+    instructions: int
+    ms: float
+
+
+DEFAULT_BUDGETS: dict[str, Budget] = {
+    "command": Budget(instructions=10_000_000, ms=250),
+    "hook": Budget(instructions=2_000_000, ms=50),
+    "trigger": Budget(instructions=2_000_000, ms=50),
+}
+DEFAULT_QUARANTINE_AFTER = 3
+
+
+def budgets_from_config(config: dict[str, Any]) -> tuple[dict[str, Budget], int]:
+    """Read ``engine.lua_budget`` → (budgets per category, quarantine_after)."""
+    section = config.get("engine", {}).get("lua_budget", {}) or {}
+    budgets = {}
+    for category, default in DEFAULT_BUDGETS.items():
+        cfg = section.get(category, {}) or {}
+        budgets[category] = Budget(
+            instructions=int(cfg.get("instructions", default.instructions)),
+            ms=float(cfg.get("ms", default.ms)),
+        )
+    return budgets, int(section.get("quarantine_after", DEFAULT_QUARANTINE_AFTER))
+
+
+class LuaWatchdog:
+    """Enforces execution budgets on Lua calls within one LuaRuntime."""
+
+    def __init__(self, lua: LuaRuntime, source_of: Callable[[Any], str],
+                 budgets: dict[str, Budget] | None = None,
+                 quarantine_after: int = DEFAULT_QUARANTINE_AFTER,
+                 clock: Callable[[], float] = time.perf_counter) -> None:
+        self.enabled = True
+        self.budgets = dict(budgets or DEFAULT_BUDGETS)
+        self.quarantine_after = quarantine_after
+        self.aborts = 0                           # total aborted calls
+        self.strikes: dict[str, int] = {}         # "script:line" → aborts
+        self.quarantined: set[str] = set()        # "script:line"
+        self._guard = lua.execute(_GUARD_CALL, STEP, clock)
+        self._source_of = source_of
+
+    def call(self, category: str, name: str, fn: Any, *args: Any,
+             source: str | None = None, scale: int = 1) -> tuple[Any, int]:
+        """Call *fn* under *category*'s budget → (first result, instructions).
+
+        *source* overrides the "script:line" key used for strikes and
+        quarantine. *scale* multiplies the budget, for calls that do the
+        work of several (a batch hook gets one budget per row).
+        Raises LuaQuarantined, LuaBudgetExceeded or LuaError.
+        """
+        if source is None:
+            source = self._source_of(fn)
+        if source in self.quarantined:
+            raise LuaQuarantined(f"{category} '{name}' is quarantined ({source})")
+        budget = self.budgets[category]
+        if scale > 1:
+            budget = Budget(budget.instructions * scale, budget.ms * scale)
+        ok, instructions, result, tripped = self._guard(
+            max(1, budget.instructions // STEP), budget.ms / 1000, fn, *args)
+        if tripped:
+            self._strike(category, name, source, budget)
+            raise LuaBudgetExceeded(
+                f"{category} '{name}' exceeded budget "
+                f"({budget.instructions} instructions / {budget.ms:g} ms)")
+        if not ok:
+            raise LuaError(str(result))
+        return result, instructions
+
+    def is_quarantined(self, fn: Any) -> bool:
+        return bool(self.quarantined) and self._source_of(fn) in self.quarantined
+
+    def _strike(self, category: str, name: str, source: str, budget: Budget) -> None:
+        self.aborts += 1
+        strikes = self.strikes.get(source, 0) + 1
+        self.strikes[source] = strikes
+        log.error("Lua %s '%s' (%s) aborted: budget %d instructions / %g ms "
+                  "exceeded (%d/%d)", category, name, source, budget.instructions,
+                  budget.ms, strikes, self.quarantine_after)
+        if strikes >= self.quarantine_after and source not in self.quarantined:
+            self.quarantined.add(source)
+            log.error("Lua %s '%s' (%s) quarantined until its script is reloaded",
+                      category, name, source)
+
+    def release(self, script: str) -> list[str]:
+        """Lift quarantine/strikes for every function of *script*."""
+        prefix = f"{script}:"
+        released = [s for s in self.quarantined if s.startswith(prefix)]
+        self.quarantined.difference_update(released)
+        for source in [s for s in self.strikes if s.startswith(prefix)]:
+            del self.strikes[source]
+        if released:
+            log.info("Lua quarantine lifted: %s", ", ".join(sorted(released)))
+        return released
+
+    def as_dict(self) -> dict[str, Any]:
+        """JSON-friendly status for the API."""
+        return {
+            "enabled": self.enabled,
+            "budgets": {k: {"instructions": b.instructions, "ms": b.ms}
+                        for k, b in self.budgets.items()},
+            "quarantine_after": self.quarantine_after,
+            "aborts": self.aborts,
+            "strikes": dict(self.strikes),
+            "quarantined": sorted(self.quarantined),
+        }
@@ -0,0 +1,166 @@
+"""Password hashing off the event loop — bcrypt in a bounded thread pool.
+
+A bcrypt check costs ~250 ms of CPU at cost 12. Run inline, a burst of
+logins after a restart stalls every tick. :class:`PasswordHasher` runs
+``checkpw`` / ``hashpw`` in a small dedicated ThreadPoolExecutor (bcrypt
+releases the GIL while hashing); requests beyond the worker count wait in
+a FIFO queue on the event loop.
+
+- ``engine.bcrypt_rounds`` sets the cost for new hashes (default 12).
+- :meth:`PasswordHasher.verify_and_upgrade` rehashes a correct password
+  stored at a different cost and saves it in the background.
+- :meth:`PasswordHasher.stats` reports queue depth and queue wait (time
+  from the login request to a worker picking it up).
+
+Login states reach the engine's hasher through :func:`get_hasher`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+import bcrypt
+
+log = logging.getLogger(__name__)
+
+DEFAULT_ROUNDS = 12
+DEFAULT_WORKERS = 2
+_WAIT_SAMPLES = 256
+
+
+def hash_rounds(stored_hash: str) -> int | None:
+    """Cost factor of a ``$2b$NN$...`` hash, or None if unparseable."""
+    parts = stored_hash.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+class PasswordHasher:
+    """bcrypt hash/verify on a bounded worker pool with FIFO queueing."""
+
+    def __init__(self, rounds: int = DEFAULT_ROUNDS, workers: int = DEFAULT_WORKERS) -> None:
+        self.rounds = rounds
+        self.workers = max(1, workers)
+        self._executor: ThreadPoolExecutor | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._background: set[asyncio.Task] = set()
+        # Metrics
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self.rehashed = 0
+        self._waits: deque[float] = deque(maxlen=_WAIT_SAMPLES)
+        self.max_wait = 0.0
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="bcrypt")
+        if self._slots is None or self._loop is not loop:
+            self._slots = asyncio.Semaphore(self.workers)
+            self._loop = loop
+        slots = self._slots
+        queued = time.monotonic()
+        self.waiting += 1
+        try:
+            await slots.acquire()
+        finally:
+            self.waiting -= 1
+        wait = time.monotonic() - queued
+        self._waits.append(wait)
+        self.max_wait = max(self.max_wait, wait)
+        self.running += 1
+        try:
+            return await loop.run_in_executor(self._executor, fn, *args)
+        finally:
+            self.running -= 1
+            self.completed += 1
+            slots.release()
+
+    async def hash(self, password: str) -> str:
+        """New bcrypt hash of *password* at the configured cost."""
+        salt = bcrypt.gensalt(rounds=self.rounds)
+        hashed: bytes = await self._run(bcrypt.hashpw, password.encode("utf-8"), salt)
+        return hashed.decode("utf-8")
+
+    async def verify(self, password: str, stored_hash: str) -> bool:
+        """True if *password* matches *stored_hash*; malformed hashes fail."""
+        if not stored_hash:
+            return False
+        try:
+            return await self._run(bcrypt.checkpw, password.encode("utf-8"),
+                                   stored_hash.encode("utf-8"))
+        except ValueError:
+            log.warning("Malformed password hash rejected")
+            return False
+
+    def needs_rehash(self, stored_hash: str) -> bool:
+        rounds = hash_rounds(stored_hash)
+        return rounds is not None and rounds != self.rounds
+
+    async def verify_and_upgrade(self, password: str, stored_hash: str,
+                                 save: Callable[[str], Any] | None = None) -> bool:
+        """:meth:`verify`, then rehash at the current cost if it changed.
+
+        The rehash runs in the background so login is not delayed; *save*
+        receives the new hash (sync or async callable).
+        """
+        if not await self.verify(password, stored_hash):
+            return False
+        if save is not None and self.needs_rehash(stored_hash):
+            task = asyncio.create_task(self._rehash(password, save))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+        return True
+
+    async def _rehash(self, password: str, save: Callable[[str], Any]) -> None:
+        try:
+            new_hash = await self.hash(password)
+            result = save(new_hash)
+            if asyncio.iscoroutine(result):
+                await result
+            self.rehashed += 1
+        except Exception:
+            log.exception("Password rehash failed")
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._slots = None
+
+    def stats(self) -> dict[str, Any]:
+        waits = sorted(self._waits)
+        p95 = waits[min(len(waits) - 1, int(len(waits) * 0.95))] if waits else 0.0
+        return {
+            "rounds": self.rounds,
+            "workers": self.workers,
+            "waiting": self.waiting,
+            "running": self.running,
+            "completed": self.completed,
+            "rehashed": self.rehashed,
+            "queue_wait_avg_ms": round(sum(waits) / len(waits) * 1000, 1) if waits else 0.0,
+            "queue_wait_p95_ms": round(p95 * 1000, 1),
+            "queue_wait_max_ms": round(self.max_wait * 1000, 1),
+        }
+
+
+_default: PasswordHasher | None = None
+
+
+def get_hasher(engine: Any) -> PasswordHasher:
+    """The engine's hasher, or a process-wide default (tests, tools)."""
+    hasher = getattr(engine, "passwords", None)
+    if isinstance(hasher, PasswordHasher):
+        return hasher
+    global _default
+    if _default is None:
+        _default = PasswordHasher()
+    return _default
@@ -0,0 +1,406 @@
+"""Write-behind persistence — player saves off the game loop.
+
+``Session.save_character`` serializes the character and hands the snapshot
+to :class:`SaveQueue`, which returns immediately. A background writer task
+drains the queue in batches through :meth:`Database.save_players` (one
+transaction, ``executemany`` per column set).
+
+- Several saves of the same player before the writer gets to them are
+  coalesced into one row (later columns win).
+- :meth:`SaveQueue.flush` is a barrier: it returns once every snapshot
+  enqueued before the call (for one player, or everyone) is committed.
+  Quit and shutdown use it so nothing is lost when a session ends.
+- A failed batch is retried with one probe row first. If the probe fails
+  too the database is treated as down: the whole batch waits for the
+  back-off, with one log line per outage instead of one per row. If the
+  probe commits, the rest is split in halves until the failing rows are
+  isolated, so one bad row does not hold back the rest. Rows that failed are put
+  back (newer snapshots for the same player win) and retried after a
+  back-off; the server keeps running. A row that fails on its own while
+  other rows commit ``_MAX_ROW_FAILURES`` times is dropped and logged;
+  flushes waiting for it return False and the ``on_drop`` callback given
+  to :meth:`SaveQueue.enqueue` gets the lost columns.
+
+:meth:`SaveQueue.stats` reports queue depth and lag (enqueue → commit).
+
+:class:`PlayerCache` keeps recently seen player rows in process so logins,
+reconnects and lookups of offline players skip ``Database.fetch_player``.
+It is updated only when a save commits (``Database.save_players``), so it
+never shows a state the database does not have — snapshots still queued,
+put back after a failure or dropped leave it untouched.
+``Database.fetch_player`` overlays :meth:`SaveQueue.unsaved` on the row, so
+a login right after a quit whose flush timed out still sees its last save.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:
+    from core.db import Database
+
+log = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_FLUSH_TIMEOUT = 10.0
+DEFAULT_PLAYER_CACHE_SIZE = 1000
+_RETRY_DELAY = 1.0          # seconds, doubled per consecutive failure
+_MAX_RETRY_DELAY = 30.0
+_MAX_ROW_FAILURES = 3       # isolated failures before a row is dropped
+
+
+@dataclass(slots=True)
+class _Pending:
+    data: dict[str, Any]
+    seq: int                 # sequence number of the oldest unsaved snapshot
+    enqueued_at: float       # monotonic time of that snapshot
+    on_drop: Callable[[dict[str, Any]], None] | None = None
+
+
+class SaveQueue:
+    """Coalescing write-behind queue for player rows."""
+
+    def __init__(self, db: Database, *, batch_size: int = DEFAULT_BATCH_SIZE,
+                 flush_timeout: float = DEFAULT_FLUSH_TIMEOUT) -> None:
+        self._db = db
+        self.batch_size = max(1, batch_size)
+        self.flush_timeout = flush_timeout  # used by callers for quit barriers
+        self._pending: dict[int, _Pending] = {}    # player_id → snapshot
+        self._inflight: dict[int, _Pending] = {}
+        self._seq = 0
+        self._barriers: list[tuple[int | None, int, asyncio.Future]] = []
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._failures_in_row = 0
+        self._probes = 0                           # rotates the outage probe row
+        self._row_failures: dict[int, int] = {}    # player_id → isolated failures
+        # Metrics
+        self.enqueued = 0
+        self.coalesced = 0
+        self.written = 0
+        self.batches = 0
+        self.failures = 0
+        self.dropped = 0
+        self.max_lag = 0.0
+        self.last_batch_rows = 0
+        self.last_batch_ms = 0.0
+        self.last_batch_lag = 0.0
+
+    # ── Producer side ────────────────────────────────────────────
+
+    def enqueue(self, player_id: int, data: dict[str, Any],
+                on_drop: Callable[[dict[str, Any]], None] | None = None) -> None:
+        """Queue a snapshot of *data* for *player_id*; never blocks.
+
+        *on_drop* is called with the columns of the row if the queue gives
+        up on it (see ``_MAX_ROW_FAILURES``).
+        """
+        if not data:
+            return
+        self._seq += 1
+        self.enqueued += 1
+        entry = self._pending.get(player_id)
+        if entry is None:
+            self._pending[player_id] = _Pending(dict(data), self._seq, time.monotonic(),
+                                                on_drop)
+        else:
+            entry.data.update(data)
+            if on_drop is not None:
+                entry.on_drop = on_drop
+            self.coalesced += 1
+        self._wake.set()
+
+    async def flush(self, player_id: int | None = None, *,
+                    timeout: float | None = None) -> bool:
+        """Barrier: wait until everything queued so far is committed.
+
+        With *player_id*, only that player's snapshots are waited for.
+        Without a running writer the queue is drained inline. Returns
+        False if *timeout* expired first or a snapshot was dropped.
+        """
+        if not self._blocking(player_id, self._seq):
+            return True
+        fut = asyncio.get_running_loop().create_future()
+        self._barriers.append((player_id, self._seq, fut))
+        if self._task is None or self._task.done():
+            while not fut.done():
+                if not await self._write_batch():
+                    return False
+            return fut.result()
+        self._wake.set()
+        try:
+            return await asyncio.wait_for(asyncio.shield(fut), timeout)
+        except asyncio.TimeoutError:
+            return False
+
+    # ── Writer task ──────────────────────────────────────────────
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="save-queue")
+
+    async def close(self, timeout: float | None = None) -> bool:
+        """Flush everything, then stop the writer. False if data was left."""
+        done = await self.flush(timeout=timeout)
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if not done:
+            log.error("Save queue closed with %d unsaved players", len(self._pending))
+        return done
+
+    async def _run(self) -> None:
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            while self._pending:
+                if await self._write_batch():
+                    self._failures_in_row = 0
+                    continue
+                self._failures_in_row += 1
+                delay = min(_MAX_RETRY_DELAY,
+                            _RETRY_DELAY * 2 ** (self._failures_in_row - 1))
+                await asyncio.sleep(delay)
+
+    async def _write_batch(self) -> bool:
+        """Write up to batch_size pending rows in one transaction."""
+        if not self._pending:
+            return True
+        ids = list(self._pending)[: self.batch_size]
+        self._inflight = {pid: self._pending.pop(pid) for pid in ids}
+        rows = [(pid, e.data) for pid, e in self._inflight.items()]
+        t0 = time.monotonic()
+        failed = await self._save_rows(rows)
+        saved = [pid for pid in self._inflight if pid not in failed]
+        if failed:
+            self.failures += 1
+            if saved:
+                log.error("Player save batch: %d of %d rows failed, will retry",
+                          len(failed), len(rows))
+            else:
+                # Outage: log when it starts, not on every retry
+                log.log(logging.DEBUG if self._failures_in_row else logging.ERROR,
+                        "Player save batch of %d rows failed (%s), will retry",
+                        len(rows), next(iter(failed.values())))
+        for pid in failed:
+            entry = self._inflight.pop(pid)
+            if saved:
+                # Failed on its own while other rows committed: the row is bad
+                strikes = self._row_failures.get(pid, 0) + 1
+                if strikes >= _MAX_ROW_FAILURES:
+                    self._drop(pid, entry, failed[pid])
+                    continue
+                self._row_failures[pid] = strikes
+            # Put the row back; anything queued meanwhile is newer and wins
+            newer = self._pending.get(pid)
+            if newer is not None:
+                entry.data.update(newer.data)
+                entry.on_drop = newer.on_drop or entry.on_drop
+            self._pending[pid] = entry
+        if not saved:
+            self._inflight = {}
+            return False
+        for pid in saved:
+            self._row_failures.pop(pid, None)
+        now = time.monotonic()
+        lag = max(now - e.enqueued_at for e in self._inflight.values())
+        self._inflight = {}
+        self.batches += 1
+        self.written += len(saved)
+        self.last_batch_rows = len(saved)
+        self.last_batch_ms = (now - t0) * 1000
+        self.last_batch_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        self._release_barriers()
+        return True
+
+    async def _save_rows(self, rows: list[tuple[int, dict[str, Any]]]) -> dict[int, str]:
+        """Save *rows* → {player_id: error} of failed rows.
+
+        A failed batch is split only after a single probe row commits; if
+        the probe fails as well every row is reported failed (outage).
+        """
+        error = await self._try_save(rows)
+        if error is None:
+            return {}
+        if len(rows) == 1:
+            return {rows[0][0]: error}
+        # Prefer a row with no isolated failures, and rotate the probe so a
+        # bad row cannot pose as an outage forever
+        start = self._probes % len(rows)
+        order = list(range(start, len(rows))) + list(range(start))
+        i = next((j for j in order if rows[j][0] not in self._row_failures), start)
+        probe_error = await self._try_save(rows[i:i + 1])
+        if probe_error is not None:
+            self._probes += 1
+            return {pid: probe_error for pid, _ in rows}
+        return await self._bisect(rows[:i] + rows[i + 1:])
+
+    async def _bisect(self, rows: list[tuple[int, dict[str, Any]]]) -> dict[int, str]:
+        """Save *rows*, halving failed batches → {player_id: error} of failed rows."""
+        error = await self._try_save(rows)
+        if error is None:
+            return {}
+        if len(rows) == 1:
+            return {rows[0][0]: error}
+        mid = len(rows) // 2
+        failed = await self._bisect(rows[:mid])
+        failed.update(await self._bisect(rows[mid:]))
+        return failed
+
+    async def _try_save(self, rows: list[tuple[int, dict[str, Any]]]) -> str | None:
+        if not rows:
+            return None
+        try:
+            await self._db.save_players(rows)
+        except Exception as e:
+            return f"{type(e).__name__}: {e}"
+        return None
+
+    def _drop(self, player_id: int, entry: _Pending, error: str) -> None:
+        self._row_failures.pop(player_id, None)
+        self.dropped += 1
+        log.error("Dropping save for player %d after %d failed attempts (%s); "
+                  "columns: %s", player_id, _MAX_ROW_FAILURES, error,
+                  ", ".join(sorted(entry.data)))
+        for barrier_player, seq, fut in self._barriers:
+            if (not fut.done() and barrier_player in (None, player_id)
+                    and entry.seq <= seq):
+                fut.set_result(False)
+        if entry.on_drop is not None:
+            try:
+                entry.on_drop(entry.data)
+            except Exception:
+                log.exception("on_drop callback failed for player %d", player_id)
+
+    # ── Barriers ─────────────────────────────────────────────────
+
+    def _blocking(self, player_id: int | None, seq: int) -> bool:
+        """True if a snapshot at or before *seq* is still unsaved."""
+        for entries in (self._pending, self._inflight):
+            if player_id is not None:
+                entry = entries.get(player_id)
+                if entry is not None and entry.seq <= seq:
+                    return True
+                continue
+            for entry in entries.values():
+                if entry.seq <= seq:
+                    return True
+        return False
+
+    def _release_barriers(self) -> None:
+        waiting = []
+        for player_id, seq, fut in self._barriers:
+            if fut.done():
+                continue
+            if self._blocking(player_id, seq):
+                waiting.append((player_id, seq, fut))
+            else:
+                fut.set_result(True)
+        self._barriers = waiting
+
+    # ── Metrics ──────────────────────────────────────────────────
+
+    @property
+    def depth(self) -> int:
+        return len(self._pending) + len(self._inflight)
+
+    def unsaved(self, player_id: int) -> dict[str, Any]:
+        """Columns queued or in flight for *player_id*, newest values winning."""
+        data: dict[str, Any] = {}
+        for entries in (self._inflight, self._pending):
+            entry = entries.get(player_id)
+            if entry is not None:
+                data.update(entry.data)
+        return copy.deepcopy(data)
+
+    def stats(self) -> dict[str, Any]:
+        now = time.monotonic()
+        oldest = min((e.enqueued_at for e in self._pending.values()), default=now)
+        return {
+            "pending": len(self._pending),
+            "inflight": len(self._inflight),
+            "oldest_pending_s": round(now - oldest, 3),
+            "enqueued": self.enqueued,
+            "coalesced": self.coalesced,
+            "written": self.written,
+            "batches": self.batches,
+            "failures": self.failures,
+            "dropped": self.dropped,
+            "last_batch_rows": self.last_batch_rows,
+            "last_batch_ms": round(self.last_batch_ms, 2),
+            "last_batch_lag_s": round(self.last_batch_lag, 3),
+            "max_lag_s": round(self.max_lag, 3),
+            "running": self._task is not None and not self._task.done(),
+        }
+
+
+class PlayerCache:
+    """LRU of player rows keyed by lowercase name.
+
+    Rows are copied on the way in and out, so callers may mutate what
+    they get without touching the cache.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_PLAYER_CACHE_SIZE) -> None:
+        self.max_size = max(0, max_size)
+        self._rows: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._names: dict[int, str] = {}    # player_id → cache key
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name: str) -> dict[str, Any] | None:
+        row = self._rows.get(name.lower())
+        if row is None:
+            self.misses += 1
+            return None
+        self._rows.move_to_end(name.lower())
+        self.hits += 1
+        return copy.deepcopy(row)
+
+    def put(self, row: dict[str, Any]) -> None:
+        if not self.max_size or not row.get("name"):
+            return
+        key = row["name"].lower()
+        self._rows[key] = copy.deepcopy(row)
+        self._rows.move_to_end(key)
+        if row.get("id") is not None:
+            self._names[row["id"]] = key
+        while len(self._rows) > self.max_size:
+            _, old = self._rows.popitem(last=False)
+            self._names.pop(old.get("id"), None)
+
+    def update(self, player_id: int, data: dict[str, Any]) -> None:
+        """Apply saved columns to the cached row, if that player is cached."""
+        key = self._names.get(player_id)
+        row = self._rows.get(key) if key is not None else None
+        if row is not None:
+            row.update(copy.deepcopy(data))
+
+    def invalidate(self, name: str) -> None:
+        row = self._rows.pop(name.lower(), None)
+        if row is not None:
+            self._names.pop(row.get("id"), None)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._rows),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
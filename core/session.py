@@ -3,18 +3,25 @@
 from __future__ import annotations
 
 import asyncio
+import copy
 import logging
 from typing import Any, Protocol, runtime_checkable
 
-import bcrypt
-
-from core.ansi import colorize
+from core.ansi import COLOR_MODES, TRUECOLOR, colorize
 from core.net import TelnetConnection
+from core.db import player_columns
+from core.passwords import get_hasher
+from core.persistence import SaveQueue
 from core.world import MobInstance, Room, World, _next_id
 
 log = logging.getLogger(__name__)
 
 
+def _row_baseline(row: dict[str, Any]) -> dict[str, Any]:
+    """Column values as stored in the DB row, detached from later changes."""
+    return copy.deepcopy(dict(row))
+
+
 @runtime_checkable
 class SessionState(Protocol):
     """Protocol for login flow states."""
@@ -44,13 +51,18 @@ class Session:
         self.state: SessionState | None = None
         self.character: MobInstance | None = None
         self.player_data: dict[str, Any] = {}
+        # Column → value as last saved; save_character writes only differences
+        self._saved: dict[str, Any] = {}
         self._closed = False
+        # What the client can show: none | 16 | 256 | truecolor
+        mode = str(self.config.get("network", {}).get("color_mode", TRUECOLOR))
+        self.color_mode = mode if mode in COLOR_MODES else TRUECOLOR
 
     async def send(self, text: str) -> None:
-        await self.conn.send(colorize(text))
+        await self.conn.send(colorize(text, self.color_mode))
 
     async def send_line(self, text: str = "") -> None:
-        await self.conn.send_line(colorize(text))
+        await self.conn.send_line(colorize(text, self.color_mode))
 
     async def run(self) -> None:
         """Main session loop — drives the state machine."""
@@ -88,20 +100,13 @@ class Session:
 
     async def enter_game(self) -> None:
         """Transition from login to playing state."""
-        import json as _json
         pd = self.player_data
         start_room = pd.get("room_vnum", self.config.get("world", {}).get("start_room", 3001))
 
-        # Parse JSONB fields if they come as strings
-        saved_skills = pd.get("skills", {})
-        if isinstance(saved_skills, str):
-            saved_skills = _json.loads(saved_skills) if saved_skills else {}
-        saved_stats = pd.get("stats", {})
-        if isinstance(saved_stats, str):
-            saved_stats = _json.loads(saved_stats) if saved_stats else {}
-        saved_affects = pd.get("affects", [])
-        if isinstance(saved_affects, str):
-            saved_affects = _json.loads(saved_affects) if saved_affects else []
+        # JSONB columns arrive decoded (Database registers the codecs)
+        saved_skills = pd.get("skills") or {}
+        saved_stats = pd.get("stats") or {}
+        saved_affects = pd.get("affects") or []
 
         # Create MobInstance for player
         from core.world import MobProto, recalc_equip_bonuses
@@ -139,11 +144,10 @@ class Session:
             affects=saved_affects,
         )
         self.character = char
+        self._saved = _row_baseline(pd)
 
         # Restore equipment from saved data
-        saved_equip = pd.get("equipment", {})
-        if isinstance(saved_equip, str):
-            saved_equip = _json.loads(saved_equip) if saved_equip else {}
+        saved_equip = pd.get("equipment") or {}
         for slot, vnum in saved_equip.items():
             obj = self.world.create_obj(int(vnum))
             if obj:
@@ -152,9 +156,7 @@ class Session:
                 char.equipment[slot] = obj
 
         # Restore inventory from saved data
-        saved_inv = pd.get("inventory", [])
-        if isinstance(saved_inv, str):
-            saved_inv = _json.loads(saved_inv) if saved_inv else []
+        saved_inv = pd.get("inventory") or []
         for vnum in saved_inv:
             obj = self.world.create_obj(int(vnum))
             if obj:
@@ -177,13 +179,19 @@ class Session:
         # Show room
         await self.engine.do_look(self, "")
 
+    async def save_password_hash(self, pw_hash: str) -> None:
+        """Store a rehashed password (bcrypt cost changed since it was set)."""
+        self.player_data["password_hash"] = pw_hash
+        if self.player_data.get("id"):
+            await self.db.save_player(self.player_data["id"], {"password_hash": pw_hash})
+
     async def disconnect(self) -> None:
         """Public disconnect — login states and commands call this."""
         await self._disconnect()
 
     async def _disconnect(self) -> None:
         if self.character:
-            await self.save_character()
+            await self.save_character(flush=True)
             self.world.char_from_room(self.character)
             self.engine.sessions.pop(self.conn.id, None)
             if self.player_data.get("name"):
@@ -191,10 +199,16 @@ class Session:
             log.info("Player %s disconnected", self.character.name)
         self._closed = True
 
-    async def save_character(self) -> None:
-        """Save full character state to DB."""
+    async def save_character(self, *, flush: bool = False) -> bool:
+        """Save changed character columns to DB; False if nothing changed.
+
+        Only columns that differ from the last save (or the row loaded at
+        login) are written. With the engine's write-behind queue the
+        snapshot is queued and this returns at once; *flush* waits until it
+        is committed (quit).
+        """
         if not self.character or not self.character.player_id:
-            return
+            return False
         c = self.character
         # Serialize equipment: {slot: vnum}
         equip_data = {}
@@ -213,16 +227,40 @@ class Session:
             "class_id": c.class_id,
             "alignment": c.alignment,
             "armor_class": c.armor_class,
-            "skills": c.skills,
+            # Copies: a queued snapshot must not follow later in-game changes
+            "skills": dict(c.skills),
             "equipment": equip_data,
             "inventory": inv_data,
-            "affects": c.affects,
-            "stats": c.stats,
+            "affects": [dict(a) if isinstance(a, dict) else a for a in c.affects],
+            "stats": dict(c.stats),
             "practices": self.player_data.get("practices", 0),
-            "toggles": self.player_data.get("toggles", {}),
+            "toggles": dict(self.player_data.get("toggles", {})),
             "prompt": self.player_data.get("prompt", ""),
         }
-        await self.db.save_player(c.player_id, data)
+        saved = self._saved
+        changed = [k for k, v in data.items() if k not in saved or saved[k] != v]
+        # Whole canonical column groups, so saves reuse a few prepared statements
+        dirty = {k: data[k] for k in player_columns(changed) if k in data}
+        queue = getattr(self.engine, "save_queue", None)
+        if not isinstance(queue, SaveQueue):
+            if dirty:
+                await self.db.save_player(c.player_id, dirty)
+                saved.update(dirty)
+            return bool(dirty)
+        if dirty:
+            # The queue retries until committed, so the baseline moves now;
+            # if it gives up on the row, _forget_saved makes the columns dirty
+            queue.enqueue(c.player_id, dirty, on_drop=self._forget_saved)
+            saved.update(dirty)
+        if flush:
+            if not await queue.flush(c.player_id, timeout=queue.flush_timeout):
+                log.error("Save of %s not committed before quit", c.name)
+        return bool(dirty)
+
+    def _forget_saved(self, columns: dict[str, Any]) -> None:
+        """Columns the save queue dropped: resend them with the next save."""
+        for key in columns:
+            self._saved.pop(key, None)
 
     def _get_prompt(self) -> str:
         """Get prompt — plugin can override for playing state."""
@@ -285,7 +323,9 @@ class GetPasswordState:
     async def on_input(self, session: Session, text: str) -> SessionState | None:
         await session.conn.set_echo(False)
         stored_hash = session.player_data.get("password_hash", "")
-        if bcrypt.checkpw(text.encode("utf-8"), stored_hash.encode("utf-8")):
+        if await get_hasher(session.engine).verify_and_upgrade(
+            text, stored_hash, session.save_password_hash
+        ):
             await session.conn.set_echo(True)
             await session.send_line("\r\n인증 성공!")
             # Update last_login
@@ -320,7 +360,7 @@ class ConfirmPasswordState:
             session.player_data.pop("_password", None)
             return NewPasswordState()
         # Hash password
-        pw_hash = bcrypt.hashpw(text.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+        pw_hash = await get_hasher(session.engine).hash(text)
         session.player_data["password_hash"] = pw_hash
         session.player_data.pop("_password", None)
         return SelectSexState()
@@ -0,0 +1,105 @@
+"""Timed objects — min-heap of object expiries (corpses, temporary items).
+
+Objects whose ``values["timer"]`` is set decay after that many decay
+pulses (one per MUD hour). Instead of scanning every room each pulse,
+:class:`TimedObjects` keeps a heap ordered by the pulse at which each
+object expires, so a pulse costs O(expiring objects · log n).
+
+Removal is lazy: :meth:`TimedObjects.remove` forgets the object's current
+expiry and the stale heap entry is dropped when it surfaces. Entries hold
+weak references, so objects extracted without ``remove`` are not kept
+alive. Callers still check that a popped object is in the world.
+"""
+
+from __future__ import annotations
+
+import heapq
+import weakref
+from itertools import count
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from core.world import ObjInstance
+
+
+def obj_timer(obj: ObjInstance) -> int:
+    """Decay pulses set on *obj* (``values["timer"]``), 0 if none."""
+    values = obj.values
+    if not isinstance(values, dict):
+        return 0
+    try:
+        return max(0, int(values.get("timer") or 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+class TimedObjects:
+    """Objects ordered by expiry pulse."""
+
+    def __init__(self) -> None:
+        self.pulse = 0
+        self._heap: list[tuple[int, int, int, weakref.ref[ObjInstance]]] = []
+        self._expires: dict[int, int] = {}      # obj id → current expiry pulse
+        self._seq = count()
+        self.expired = 0
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+    def __contains__(self, obj: ObjInstance) -> bool:
+        return obj.id in self._expires
+
+    def add(self, obj: ObjInstance, pulses: int | None = None) -> None:
+        """(Re)schedule *obj* to expire *pulses* from now (default: its timer)."""
+        if pulses is None:
+            pulses = obj_timer(obj)
+        if pulses <= 0:
+            self.remove(obj)
+            return
+        expires = self.pulse + pulses
+        self._expires[obj.id] = expires
+        heapq.heappush(self._heap, (expires, next(self._seq), obj.id, weakref.ref(obj)))
+        if len(self._heap) > 2 * len(self._expires) + 64:
+            self._compact()
+
+    def remove(self, obj: ObjInstance) -> None:
+        self._expires.pop(obj.id, None)
+
+    def remaining(self, obj: ObjInstance) -> int | None:
+        expires = self._expires.get(obj.id)
+        return None if expires is None else expires - self.pulse
+
+    def advance(self) -> list[ObjInstance]:
+        """Next pulse; returns the objects that expire on it."""
+        self.pulse += 1
+        heap = self._heap
+        due = []
+        while heap and heap[0][0] <= self.pulse:
+            expires, _, obj_id, ref = heapq.heappop(heap)
+            if self._expires.get(obj_id) != expires:
+                continue                        # removed or rescheduled
+            del self._expires[obj_id]
+            obj = ref()
+            if obj is not None:
+                due.append(obj)
+        self.expired += len(due)
+        return due
+
+    def sync(self) -> None:
+        """Write each object's remaining pulses back to ``values["timer"]``."""
+        for expires, _, obj_id, ref in self._heap:
+            obj = ref()
+            if obj is not None and self._expires.get(obj_id) == expires:
+                obj.values["timer"] = expires - self.pulse
+
+    def _compact(self) -> None:
+        """Drop stale entries left by remove/reschedule and collected objects."""
+        self._heap = [e for e in self._heap
+                      if self._expires.get(e[2]) == e[0] and e[3]() is not None]
+        heapq.heapify(self._heap)
+        live = {e[2] for e in self._heap}
+        self._expires = {k: v for k, v in self._expires.items() if k in live}
+
+    def stats(self) -> dict[str, Any]:
+        return {"pulse": self.pulse, "scheduled": len(self._expires),
+                "heap": len(self._heap), "expired": self.expired}
@@ -10,13 +10,20 @@ GenOS Unified Schema v1.0:
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import random
+import sys
+import time
+import weakref
 from dataclasses import dataclass, field
 from typing import Any
 
 from core.db import Database
+from core.game_tables import DenseTable, KeyedTable, compile_table
+from core.help_index import HelpIndex
+from core.timers import TimedObjects, obj_timer
 
 log = logging.getLogger(__name__)
 
@@ -187,7 +194,7 @@ def _next_id() -> int:
     return _next_instance_id
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, weakref_slot=True)
 class MobInstance:
     id: int
     proto: MobProto
@@ -246,7 +253,7 @@ class MobInstance:
         self.player_level = value
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, weakref_slot=True)
 class ObjInstance:
     id: int
     proto: ItemProto
@@ -317,65 +324,102 @@ class World:
         self.races: dict[int, RaceProto] = {}
         self.socials: dict[str, dict[str, Any]] = {}
         self.help_entries: list[dict[str, Any]] = []
+        self._help_index: HelpIndex | None = None
         self.game_configs: dict[str, Any] = {}
-        self.game_tables: dict[str, dict[str, Any]] = {}  # table_name → {key_json → value}
+        # table_name → DenseTable (well-known tables) or KeyedTable
+        self.compiled_tables: dict[str, DenseTable | KeyedTable] = {}
+        self.load_timings: dict[str, float] = {}   # table → ms of last load
+        # Entity registry (weak: extracted instances drop out when unreferenced)
+        self.entities: weakref.WeakValueDictionary[int, MobInstance | ObjInstance] = \
+            weakref.WeakValueDictionary()
+        self.player_chars: dict[str, MobInstance] = {}    # lowercase name → character
+        self._zone_chars: dict[int, weakref.WeakValueDictionary[int, MobInstance]] = {}
+        self.timed = TimedObjects()     # objects with values["timer"] (corpses, ...)
+        # Rooms whose characters, objects or doors changed since the last
+        # world checkpoint captured them (core.checkpoint)
+        self.dirty_rooms: set[int] = set()
 
     async def load_from_db(self, db: Database, data_dir: Any = None) -> None:
-        """Load all proto tables into memory."""
+        """Load all proto tables into memory.
+
+        Tables are fetched concurrently over the pool; room exits wait
+        for rooms, everything else is independent. Each table streams in
+        batches (``Database.fetch_batches``) so protos are built while the
+        next batch is in flight.
+        """
         log.info("Loading world from database...")
+        t0 = time.perf_counter()
+        rss0 = _peak_rss_kb()
+        self.load_timings = {}
+
+        async def rooms_then_exits() -> None:
+            await self._timed("rooms", self._load_rooms, db)
+            await self._timed("room_exits", self._load_room_exits, db)
+
+        await asyncio.gather(
+            rooms_then_exits(),
+            self._timed("item_protos", self._load_items, db),
+            self._timed("mob_protos", self._load_mobs, db),
+            self._timed("zones", self._load_zones, db),
+            self._timed("shops", self._load_shops, db),
+            self._timed("classes", self._load_classes, db),
+            self._timed("skills", self._load_skills, db),
+            self._timed("races", self._load_races, db),
+            self._timed("socials", self._load_socials, db),
+            self._timed("help_entries", self._load_help, db),
+            self._timed("game_configs", self._load_game_configs, db),
+            self._timed("game_tables", self._load_game_tables, db),
+        )
+
+        rss1 = _peak_rss_kb()
+        log.info("World loaded: %d rooms, %d items, %d mobs in %.0f ms "
+                 "(peak RSS %d KB, +%d KB)",
+                 len(self.rooms), len(self.item_protos), len(self.mob_protos),
+                 (time.perf_counter() - t0) * 1000, rss1, rss1 - rss0)
+        log.info("  Table times: %s", ", ".join(
+            f"{t} {ms:.0f}ms" for t, ms in
+            sorted(self.load_timings.items(), key=lambda kv: -kv[1])))
 
-        await self._load_rooms(db)
-        await self._load_room_exits(db)
-        await self._load_items(db)
-        await self._load_mobs(db)
-        await self._load_zones(db)
-        await self._load_shops(db)
-        await self._load_classes(db)
-        await self._load_skills(db)
-        await self._load_races(db)
-        await self._load_socials(db)
-        await self._load_help(db)
-        await self._load_game_configs(db)
-        await self._load_game_tables(db)
-
-        log.info("World loaded: %d rooms, %d items, %d mobs",
-                 len(self.rooms), len(self.item_protos), len(self.mob_protos))
+    async def _timed(self, table: str, loader: Any, db: Database) -> None:
+        t0 = time.perf_counter()
+        await loader(db)
+        self.load_timings[table] = (time.perf_counter() - t0) * 1000
 
     # ── Loaders ─────────────────────────────────────────────
 
     async def _load_rooms(self, db: Database) -> None:
-        rows = await db.fetch_all("rooms")
-        for r in rows:
-            extra_descs_data = _jload(r["extra_descs"])
-            extra_descs = [ExtraDesc(e["keywords"], e["description"]) for e in extra_descs_data]
-            flags = _ensure_list(r.get("flags", []))
-            scripts = _jload(r.get("scripts", "[]"))
-            ext = _jload(r.get("ext", "{}"))
-            proto = RoomProto(
-                vnum=r["vnum"], name=r["name"], description=r["description"],
-                zone_vnum=r.get("zone_vnum", 0), sector=r.get("sector", 0),
-                flags=flags, exits=[], extra_descs=extra_descs,
-                scripts=scripts, ext=ext,
-            )
-            self.rooms[r["vnum"]] = Room(proto=proto)
+        async for rows in db.fetch_batches("rooms"):
+            for r in rows:
+                extra_descs_data = r["extra_descs"] or []
+                extra_descs = [ExtraDesc(e["keywords"], e["description"]) for e in extra_descs_data]
+                flags = _ensure_list(r.get("flags", []))
+                scripts = r.get("scripts") or []
+                ext = r.get("ext") or {}
+                proto = RoomProto(
+                    vnum=r["vnum"], name=r["name"], description=r["description"],
+                    zone_vnum=r.get("zone_vnum", 0), sector=r.get("sector", 0),
+                    flags=flags, exits=[], extra_descs=extra_descs,
+                    scripts=scripts, ext=ext,
+                )
+                self.rooms[r["vnum"]] = Room(proto=proto)
         log.info("  Rooms: %d", len(self.rooms))
 
     async def _load_room_exits(self, db: Database) -> None:
-        rows = await db.fetch_all("room_exits")
-        for r in rows:
-            room = self.rooms.get(r["from_vnum"])
-            if room is None:
-                continue
-            flags = _ensure_list(r.get("flags", []))
-            ex = Exit(
-                direction=r["direction"],
-                to_vnum=r["to_vnum"],
-                keywords=r.get("keywords", ""),
-                description=r.get("description", ""),
-                key_vnum=r.get("key_vnum", -1),
-                flags=tuple(flags),
-            )
-            room.proto.exits.append(ex)
+        async for rows in db.fetch_batches("room_exits"):
+            for r in rows:
+                room = self.rooms.get(r["from_vnum"])
+                if room is None:
+                    continue
+                flags = _ensure_list(r.get("flags", []))
+                ex = Exit(
+                    direction=r["direction"],
+                    to_vnum=r["to_vnum"],
+                    keywords=r.get("keywords", ""),
+                    description=r.get("description", ""),
+                    key_vnum=r.get("key_vnum", -1),
+                    flags=tuple(flags),
+                )
+                room.proto.exits.append(ex)
         # Initialize door states
         for room in self.rooms.values():
             room.init_doors()
@@ -383,195 +427,247 @@ class World:
         log.info("  Exits: %d", total_exits)
 
     async def _load_items(self, db: Database) -> None:
-        rows = await db.fetch_all("item_protos")
-        for r in rows:
-            extra_descs_data = _jload(r.get("extra_descs", "[]"))
-            extra_descs = [ExtraDesc(e["keywords"], e["description"]) for e in extra_descs_data]
-            self.item_protos[r["vnum"]] = ItemProto(
-                vnum=r["vnum"], keywords=r.get("keywords", ""),
-                short_desc=r.get("short_desc", ""),
-                long_desc=r.get("long_desc", ""),
-                item_type=r.get("item_type", "other"),
-                weight=r.get("weight", 0), cost=r.get("cost", 0),
-                min_level=r.get("min_level", 0),
-                wear_slots=_ensure_list(r.get("wear_slots", [])),
-                flags=_ensure_list(r.get("flags", [])),
-                values=_jload(r.get("values", "{}")),
-                affects=_jload(r.get("affects", "[]")),
-                extra_descs=extra_descs,
-                scripts=_jload(r.get("scripts", "[]")),
-                ext=_jload(r.get("ext", "{}")),
-            )
+        async for rows in db.fetch_batches("item_protos"):
+            for r in rows:
+                extra_descs_data = r.get("extra_descs") or []
+                extra_descs = [ExtraDesc(e["keywords"], e["description"]) for e in extra_descs_data]
+                self.item_protos[r["vnum"]] = ItemProto(
+                    vnum=r["vnum"], keywords=r.get("keywords", ""),
+                    short_desc=r.get("short_desc", ""),
+                    long_desc=r.get("long_desc", ""),
+                    item_type=r.get("item_type", "other"),
+                    weight=r.get("weight", 0), cost=r.get("cost", 0),
+                    min_level=r.get("min_level", 0),
+                    wear_slots=_ensure_list(r.get("wear_slots", [])),
+                    flags=_ensure_list(r.get("flags", [])),
+                    values=r.get("values") or {},
+                    affects=r.get("affects") or [],
+                    extra_descs=extra_descs,
+                    scripts=r.get("scripts") or [],
+                    ext=r.get("ext") or {},
+                )
         log.info("  Items: %d", len(self.item_protos))
 
     async def _load_mobs(self, db: Database) -> None:
-        rows = await db.fetch_all("mob_protos")
-        for r in rows:
-            self.mob_protos[r["vnum"]] = MobProto(
-                vnum=r["vnum"], keywords=r.get("keywords", ""),
-                short_desc=r.get("short_desc", ""),
-                long_desc=r.get("long_desc", ""),
-                detail_desc=r.get("detail_desc", ""),
-                level=r.get("level", 1),
-                max_hp=r.get("max_hp", 1),
-                max_mana=r.get("max_mana", 0),
-                max_move=r.get("max_move", 0),
-                armor_class=r.get("armor_class", 100),
-                hitroll=r.get("hitroll", 0),
-                damroll=r.get("damroll", 0),
-                damage_dice=r.get("damage_dice", "1d4+0"),
-                gold=r.get("gold", 0),
-                experience=r.get("experience", 0),
-                alignment=r.get("alignment", 0),
-                sex=r.get("sex", 0),
-                position=r.get("position", 8),
-                class_id=r.get("class_id", 0),
-                race_id=r.get("race_id", 0),
-                act_flags=_ensure_list(r.get("act_flags", [])),
-                aff_flags=_ensure_list(r.get("aff_flags", [])),
-                stats=_jload(r.get("stats", "{}")),
-                skills=_jload(r.get("skills", "{}")),
-                scripts=_jload(r.get("scripts", "[]")),
-                ext=_jload(r.get("ext", "{}")),
-            )
+        async for rows in db.fetch_batches("mob_protos"):
+            for r in rows:
+                self.mob_protos[r["vnum"]] = MobProto(
+                    vnum=r["vnum"], keywords=r.get("keywords", ""),
+                    short_desc=r.get("short_desc", ""),
+                    long_desc=r.get("long_desc", ""),
+                    detail_desc=r.get("detail_desc", ""),
+                    level=r.get("level", 1),
+                    max_hp=r.get("max_hp", 1),
+                    max_mana=r.get("max_mana", 0),
+                    max_move=r.get("max_move", 0),
+                    armor_class=r.get("armor_class", 100),
+                    hitroll=r.get("hitroll", 0),
+                    damroll=r.get("damroll", 0),
+                    damage_dice=r.get("damage_dice", "1d4+0"),
+                    gold=r.get("gold", 0),
+                    experience=r.get("experience", 0),
+                    alignment=r.get("alignment", 0),
+                    sex=r.get("sex", 0),
+                    position=r.get("position", 8),
+                    class_id=r.get("class_id", 0),
+                    race_id=r.get("race_id", 0),
+                    act_flags=_ensure_list(r.get("act_flags", [])),
+                    aff_flags=_ensure_list(r.get("aff_flags", [])),
+                    stats=r.get("stats") or {},
+                    skills=r.get("skills") or {},
+                    scripts=r.get("scripts") or [],
+                    ext=r.get("ext") or {},
+                )
         log.info("  Mobs: %d", len(self.mob_protos))
 
     async def _load_zones(self, db: Database) -> None:
-        rows = await db.fetch_all("zones")
-        for r in rows:
-            self.zones.append(Zone(
-                vnum=r["vnum"], name=r["name"],
-                builders=r.get("builders", ""),
-                lifespan=r.get("lifespan", 30),
-                reset_mode=r.get("reset_mode", 2),
-                flags=_ensure_list(r.get("flags", [])),
-                resets=_jload(r.get("resets", "[]")),
-                ext=_jload(r.get("ext", "{}")),
-            ))
+        async for rows in db.fetch_batches("zones"):
+            for r in rows:
+                self.zones.append(Zone(
+                    vnum=r["vnum"], name=r["name"],
+                    builders=r.get("builders", ""),
+                    lifespan=r.get("lifespan", 30),
+                    reset_mode=r.get("reset_mode", 2),
+                    flags=_ensure_list(r.get("flags", [])),
+                    resets=r.get("resets") or [],
+                    ext=r.get("ext") or {},
+                ))
         self.zones.sort(key=lambda z: z.vnum)
         log.info("  Zones: %d", len(self.zones))
 
     async def _load_shops(self, db: Database) -> None:
-        rows = await db.fetch_all("shops")
-        for r in rows:
-            shop = Shop(
-                vnum=r["vnum"], keeper_vnum=r["keeper_vnum"],
-                room_vnum=r.get("room_vnum", 0),
-                buy_types=_ensure_list(r.get("buy_types", [])),
-                buy_profit=r.get("buy_profit", 1.1),
-                sell_profit=r.get("sell_profit", 0.9),
-                hours=_jload(r.get("hours", "{}")),
-                inventory=_jload(r.get("inventory", "[]")),
-                messages=_jload(r.get("messages", "{}")),
-                ext=_jload(r.get("ext", "{}")),
-            )
-            self.shops[shop.keeper_vnum] = shop
+        async for rows in db.fetch_batches("shops"):
+            for r in rows:
+                shop = Shop(
+                    vnum=r["vnum"], keeper_vnum=r["keeper_vnum"],
+                    room_vnum=r.get("room_vnum", 0),
+                    buy_types=_ensure_list(r.get("buy_types", [])),
+                    buy_profit=r.get("buy_profit", 1.1),
+                    sell_profit=r.get("sell_profit", 0.9),
+                    hours=r.get("hours") or {},
+                    inventory=r.get("inventory") or [],
+                    messages=r.get("messages") or {},
+                    ext=r.get("ext") or {},
+                )
+                self.shops[shop.keeper_vnum] = shop
         log.info("  Shops: %d", len(self.shops))
 
     async def _load_classes(self, db: Database) -> None:
-        rows = await db.fetch_all("classes")
-        for r in rows:
-            # INT4RANGE comes as asyncpg Range object or string "[min,max)"
-            hp = _parse_range(r.get("hp_gain"), (1, 10))
-            mana = _parse_range(r.get("mana_gain"), (0, 0))
-            move = _parse_range(r.get("move_gain"), (0, 0))
-            self.classes[r["id"]] = GameClass(
-                id=r["id"], name=r["name"],
-                abbrev=r.get("abbrev", ""),
-                hp_gain=hp, mana_gain=mana, move_gain=move,
-                base_stats=_jload(r.get("base_stats", "{}")),
-                ext=_jload(r.get("ext", "{}")),
-            )
+        async for rows in db.fetch_batches("classes"):
+            for r in rows:
+                # INT4RANGE comes as asyncpg Range object or string "[min,max)"
+                hp = _parse_range(r.get("hp_gain"), (1, 10))
+                mana = _parse_range(r.get("mana_gain"), (0, 0))
+                move = _parse_range(r.get("move_gain"), (0, 0))
+                self.classes[r["id"]] = GameClass(
+                    id=r["id"], name=r["name"],
+                    abbrev=r.get("abbrev", ""),
+                    hp_gain=hp, mana_gain=mana, move_gain=move,
+                    base_stats=r.get("base_stats") or {},
+                    ext=r.get("ext") or {},
+                )
         log.info("  Classes: %d", len(self.classes))
 
     async def _load_skills(self, db: Database) -> None:
-        rows = await db.fetch_all("skills")
-        for r in rows:
-            self.skills[r["id"]] = SkillProto(
-                id=r["id"], name=r["name"],
-                skill_type=r.get("skill_type", "spell"),
-                mana_cost=r.get("mana_cost", 0),
-                target=r.get("target", "ignore"),
-                violent=r.get("violent", False),
-                min_position=r.get("min_position", 0),
-                routines=_ensure_list(r.get("routines", [])),
-                wearoff_msg=r.get("wearoff_msg", ""),
-                class_levels=_jload(r.get("class_levels", "{}")),
-                ext=_jload(r.get("ext", "{}")),
-            )
+        async for rows in db.fetch_batches("skills"):
+            for r in rows:
+                self.skills[r["id"]] = SkillProto(
+                    id=r["id"], name=r["name"],
+                    skill_type=r.get("skill_type", "spell"),
+                    mana_cost=r.get("mana_cost", 0),
+                    target=r.get("target", "ignore"),
+                    violent=r.get("violent", False),
+                    min_position=r.get("min_position", 0),
+                    routines=_ensure_list(r.get("routines", [])),
+                    wearoff_msg=r.get("wearoff_msg", ""),
+                    class_levels=r.get("class_levels") or {},
+                    ext=r.get("ext") or {},
+                )
         log.info("  Skills: %d", len(self.skills))
 
     async def _load_races(self, db: Database) -> None:
-        rows = await db.fetch_all("races")
-        for r in rows:
-            self.races[r["id"]] = RaceProto(
-                id=r["id"], name=r["name"],
-                abbrev=r.get("abbrev", ""),
-                stat_mods=_jload(r.get("stat_mods", "{}")),
-                body_parts=_ensure_list(r.get("body_parts", [])),
-                size=r.get("size", "medium"),
-                ext=_jload(r.get("ext", "{}")),
-            )
+        async for rows in db.fetch_batches("races"):
+            for r in rows:
+                self.races[r["id"]] = RaceProto(
+                    id=r["id"], name=r["name"],
+                    abbrev=r.get("abbrev", ""),
+                    stat_mods=r.get("stat_mods") or {},
+                    body_parts=_ensure_list(r.get("body_parts", [])),
+                    size=r.get("size", "medium"),
+                    ext=r.get("ext") or {},
+                )
         log.info("  Races: %d", len(self.races))
 
     async def _load_socials(self, db: Database) -> None:
-        rows = await db.fetch_all("socials")
-        for r in rows:
-            self.socials[r["command"]] = {
-                "command": r["command"],
-                "min_victim_position": r.get("min_victim_position", 0),
-                "messages": _jload(r.get("messages", "{}")),
-            }
+        async for rows in db.fetch_batches("socials"):
+            for r in rows:
+                self.socials[r["command"]] = {
+                    "command": r["command"],
+                    "min_victim_position": r.get("min_victim_position", 0),
+                    "messages": r.get("messages") or {},
+                }
         log.info("  Socials: %d", len(self.socials))
 
     async def _load_help(self, db: Database) -> None:
-        rows = await db.fetch_all("help_entries")
-        for r in rows:
-            self.help_entries.append({
-                "keywords": _ensure_list(r.get("keywords", [])),
-                "category": r.get("category", "general"),
-                "min_level": r.get("min_level", 0),
-                "body": r.get("body", ""),
-            })
+        async for rows in db.fetch_batches("help_entries"):
+            for r in rows:
+                self.help_entries.append({
+                    "keywords": _ensure_list(r.get("keywords", [])),
+                    "category": r.get("category", "general"),
+                    "min_level": r.get("min_level", 0),
+                    "body": r.get("body", ""),
+                })
+        self._help_index = HelpIndex(self.help_entries)
         log.info("  Help entries: %d", len(self.help_entries))
 
     async def _load_game_configs(self, db: Database) -> None:
-        rows = await db.fetch_all("game_configs")
-        for r in rows:
-            val = _jload(r["value"])
-            self.game_configs[r["key"]] = val
+        async for rows in db.fetch_batches("game_configs"):
+            for r in rows:
+                self.game_configs[r["key"]] = r["value"]
         log.info("  Game configs: %d", len(self.game_configs))
 
     async def _load_game_tables(self, db: Database) -> None:
-        rows = await db.fetch_all("game_tables")
-        for r in rows:
-            table = r["table_name"]
-            key = json.dumps(_jload(r["key"]), sort_keys=True)
-            value = _jload(r["value"])
-            if table not in self.game_tables:
-                self.game_tables[table] = {}
-            self.game_tables[table][key] = value
-        total = sum(len(v) for v in self.game_tables.values())
-        log.info("  Game tables: %d entries across %d tables",
-                 total, len(self.game_tables))
+        entries: dict[str, list[tuple[dict[str, Any], Any]]] = {}
+        async for rows in db.fetch_batches("game_tables"):
+            for r in rows:
+                table = r["table_name"]
+                entries.setdefault(table, []).append((r["key"], r["value"]))
+        self.compile_game_tables(entries)
+        total = sum(len(v) for v in entries.values())
+        dense = sum(isinstance(t, DenseTable) for t in self.compiled_tables.values())
+        log.info("  Game tables: %d entries across %d tables (%d dense)",
+                 total, len(entries), dense)
+
+    def compile_game_tables(self, entries: dict[str, list[tuple[dict[str, Any], Any]]]
+                            ) -> None:
+        """Compile (key object, value) rows per table into lookup structures."""
+        for table, rows in entries.items():
+            self.compiled_tables[table] = compile_table(table, rows)
 
     # ── Convenience lookups ─────────────────────────────────
 
     def get_exp_required(self, class_id: int, level: int) -> int:
         """Look up experience required for a level."""
-        tbl = self.game_tables.get("exp_table", {})
-        key = json.dumps({"class_id": class_id, "level": level}, sort_keys=True)
-        return tbl.get(key, 0)
+        tbl = self.compiled_tables.get("exp_table")
+        if type(tbl) is DenseTable:
+            return tbl.get(class_id, level)
+        return self._table_get("exp_table", 0, class_id=class_id, level=level)
 
     def get_thac0(self, class_id: int, level: int) -> int:
-        tbl = self.game_tables.get("thac0", {})
-        key = json.dumps({"class_id": class_id, "level": level}, sort_keys=True)
-        return tbl.get(key, 20)
+        tbl = self.compiled_tables.get("thac0")
+        if type(tbl) is DenseTable:
+            return tbl.get(class_id, level)
+        return self._table_get("thac0", 20, class_id=class_id, level=level)
 
     def get_saving_throw(self, class_id: int, save_type: int, level: int) -> int:
-        tbl = self.game_tables.get("saving_throw", {})
-        key = json.dumps({"class_id": class_id, "level": level, "type": save_type}, sort_keys=True)
-        return tbl.get(key, 0)
+        tbl = self.compiled_tables.get("saving_throw")
+        if type(tbl) is DenseTable:
+            return tbl.get(class_id, save_type, level)
+        return self._table_get("saving_throw", 0,
+                               class_id=class_id, type=save_type, level=level)
+
+    def get_table_value(self, table: str, default: Any = None, **key: Any) -> Any:
+        """Look up any game table by its key fields."""
+        return self._table_get(table, default, **key)
+
+    def _table_get(self, table: str, default: Any, **key: Any) -> Any:
+        compiled = self.compiled_tables.get(table)
+        if compiled is None:
+            return default
+        if isinstance(compiled, DenseTable):
+            return compiled.get(*(key[f] for f in compiled.fields))
+        return compiled.get(default, **key)
+
+    # ── Help ────────────────────────────────────────────────
+
+    @property
+    def help_index(self) -> HelpIndex:
+        """Index over help_entries; rebuilt if the list was replaced or resized."""
+        index = self._help_index
+        if index is None or index.source is not self.help_entries \
+                or index.count != len(self.help_entries):
+            index = self._help_index = HelpIndex(self.help_entries)
+        return index
+
+    def add_help_entry(self, entry: dict[str, Any]) -> None:
+        index = self.help_index
+        self.help_entries.append(entry)
+        index.add(entry)
+
+    def update_help_entry(self, old: dict[str, Any], new: dict[str, Any]) -> None:
+        """Replace *old* with *new* in place; only that entry is reindexed."""
+        index = self.help_index
+        self.help_entries[self.help_entries.index(old)] = new
+        entry_id = index.id_of(old)
+        if entry_id is not None:
+            index.update(entry_id, new)
+
+    def remove_help_entry(self, entry: dict[str, Any]) -> None:
+        index = self.help_index
+        self.help_entries.remove(entry)
+        entry_id = index.id_of(entry)
+        if entry_id is not None:
+            index.remove(entry_id)
 
     # ── Room access ─────────────────────────────────────────
 
@@ -596,38 +692,215 @@ class World:
             alignment=proto.alignment, sex=proto.sex,
             stats=dict(proto.stats),
         )
+        self.entities[mob.id] = mob
         room = self.rooms.get(room_vnum)
         if room:
             room.characters.append(mob)
+            self._join_zone(mob, room)
+            self.dirty_rooms.add(room_vnum)
         return mob
 
     def create_obj(self, vnum: int) -> ObjInstance | None:
         proto = self.item_protos.get(vnum)
         if proto is None:
             return None
-        return ObjInstance(
+        obj = ObjInstance(
             id=_next_id(), proto=proto, values=dict(proto.values),
         )
+        self.register_obj(obj)
+        return obj
+
+    def register_obj(self, obj: ObjInstance) -> None:
+        """Register an object made outside create_obj (corpses, restores).
+
+        Objects with ``values["timer"]`` are scheduled to decay.
+        """
+        self.entities[obj.id] = obj
+        if obj_timer(obj):
+            self.timed.add(obj)
 
     def obj_to_room(self, obj: ObjInstance, room_vnum: int) -> None:
         obj.room_vnum = room_vnum
         room = self.rooms.get(room_vnum)
         if room:
             room.objects.append(obj)
+            self.dirty_rooms.add(room_vnum)
 
     def char_to_room(self, mob: MobInstance, room_vnum: int) -> None:
         old_room = self.rooms.get(mob.room_vnum)
         if old_room and mob in old_room.characters:
             old_room.characters.remove(mob)
+            self._leave_zone(mob, old_room)
+            self.dirty_rooms.add(old_room.vnum)
         mob.room_vnum = room_vnum
+        self.entities[mob.id] = mob
+        if mob.player_id is not None and mob.player_name:
+            self.player_chars[mob.player_name.lower()] = mob
         new_room = self.rooms.get(room_vnum)
         if new_room:
             new_room.characters.append(mob)
+            self._join_zone(mob, new_room)
+            self.dirty_rooms.add(room_vnum)
 
     def char_from_room(self, mob: MobInstance) -> None:
         room = self.rooms.get(mob.room_vnum)
         if room and mob in room.characters:
             room.characters.remove(mob)
+            self._leave_zone(mob, room)
+            self.dirty_rooms.add(room.vnum)
+        if mob.player_name and self.player_chars.get(mob.player_name.lower()) is mob:
+            del self.player_chars[mob.player_name.lower()]
+
+    def extract_char(self, mob: MobInstance) -> None:
+        """Remove a character from the world and the entity registry."""
+        self.char_from_room(mob)
+        if self.entities.get(mob.id) is mob:
+            del self.entities[mob.id]
+
+    def extract_obj(self, obj: ObjInstance) -> None:
+        """Remove an object (and its contents) from the world."""
+        self._detach_obj(obj)
+        for item in list(obj.contains):
+            self.extract_obj(item)
+        obj.contains.clear()
+        self.timed.remove(obj)
+        if self.entities.get(obj.id) is obj:
+            del self.entities[obj.id]
+
+    def _detach_obj(self, obj: ObjInstance) -> bool:
+        """Take *obj* out of its room, carrier, wearer or container."""
+        self.mark_obj_room(obj)
+        found = False
+        if obj.in_obj is not None:
+            if obj in obj.in_obj.contains:
+                obj.in_obj.contains.remove(obj)
+                found = True
+            obj.in_obj = None
+        if obj.worn_by is not None:
+            wearer = obj.worn_by
+            if wearer.equipment.get(obj.wear_slot) is obj:
+                del wearer.equipment[obj.wear_slot]
+                recalc_equip_bonuses(wearer)
+                found = True
+            obj.worn_by = None
+            obj.wear_slot = ""
+        if obj.carried_by is not None:
+            if obj in obj.carried_by.inventory:
+                obj.carried_by.inventory.remove(obj)
+                found = True
+            obj.carried_by = None
+        if obj.room_vnum is not None:
+            room = self.rooms.get(obj.room_vnum)
+            if room is not None and obj in room.objects:
+                room.objects.remove(obj)
+                found = True
+            obj.room_vnum = None
+        return found
+
+    def mark_obj_room(self, obj: ObjInstance) -> None:
+        """Mark the room *obj* is in (on the floor, carried or nested) dirty."""
+        while obj.in_obj is not None:
+            obj = obj.in_obj
+        holder = obj.carried_by or obj.worn_by
+        room_vnum = holder.room_vnum if holder is not None else obj.room_vnum
+        if room_vnum is not None:
+            self.dirty_rooms.add(room_vnum)
+
+    def expire_objects(self) -> list[tuple[ObjInstance, list[MobInstance]]]:
+        """One decay pulse: remove objects whose timer ran out.
+
+        Wherever the object is — on the floor, carried, worn or inside a
+        container — its contents drop to that same place. Returns each
+        removed object with the characters who saw it go.
+        """
+        expired = []
+        for obj in self.timed.advance():
+            holder = obj.carried_by or obj.worn_by
+            parent = obj.in_obj
+            room = self.rooms.get(obj.room_vnum) if obj.room_vnum is not None else None
+            if not self._detach_obj(obj):
+                continue                        # already gone from the world
+            for item in obj.contains:
+                item.in_obj = None
+                if parent is not None:
+                    item.in_obj = parent
+                    parent.contains.append(item)
+                elif holder is not None:
+                    item.carried_by = holder
+                    holder.inventory.append(item)
+                elif room is not None:
+                    self.obj_to_room(item, room.vnum)
+            obj.contains.clear()
+            if self.entities.get(obj.id) is obj:
+                del self.entities[obj.id]
+            if holder is not None:
+                witnesses = [holder]
+            elif room is not None:
+                witnesses = list(room.characters)
+            else:
+                witnesses = []
+            expired.append((obj, witnesses))
+        return expired
+
+    # ── Entity registry ─────────────────────────────────────
+    # Instances made by create_mob/create_obj and characters moved with
+    # char_to_room are registered; rooms stay the source of truth, so a
+    # registry hit is checked against its room before it is returned.
+
+    def _join_zone(self, mob: MobInstance, room: Room) -> None:
+        zone = self._zone_chars.get(room.proto.zone_vnum)
+        if zone is None:
+            zone = self._zone_chars[room.proto.zone_vnum] = weakref.WeakValueDictionary()
+        zone[mob.id] = mob
+
+    def _leave_zone(self, mob: MobInstance, room: Room) -> None:
+        zone = self._zone_chars.get(room.proto.zone_vnum)
+        if zone is not None and zone.get(mob.id) is mob:
+            del zone[mob.id]
+
+    def _in_room(self, mob: MobInstance) -> Room | None:
+        room = self.rooms.get(mob.room_vnum)
+        return room if room is not None and mob in room.characters else None
+
+    def find_char(self, char_id: int) -> MobInstance | None:
+        """Character with instance id *char_id* that is in a room.
+
+        Characters placed into ``room.characters`` directly are not
+        registered; they are found by a room scan and registered then.
+        """
+        ch = self.entities.get(char_id)
+        if isinstance(ch, MobInstance) and self._in_room(ch):
+            return ch
+        for room in self.rooms.values():
+            for ch in room.characters:
+                if ch.id == char_id:
+                    self.entities[ch.id] = ch
+                    self._join_zone(ch, room)
+                    return ch
+        return None
+
+    def find_obj(self, obj_id: int) -> ObjInstance | None:
+        obj = self.entities.get(obj_id)
+        return obj if isinstance(obj, ObjInstance) else None
+
+    def find_player(self, name: str) -> MobInstance | None:
+        """Player character in the world by name (case-insensitive)."""
+        ch = self.player_chars.get(name.lower())
+        return ch if ch is not None and self._in_room(ch) else None
+
+    def zone_chars(self, zone_vnum: int) -> list[MobInstance]:
+        """Characters in a zone, in arrival order."""
+        zone = self._zone_chars.get(zone_vnum)
+        if not zone:
+            return []
+        result = []
+        for ch in list(zone.values()):
+            room = self._in_room(ch)
+            if room is not None and room.proto.zone_vnum == zone_vnum:
+                result.append(ch)
+            else:
+                del zone[ch.id]
+        return result
 
 
 # ── Equipment stat recalculation ─────────────────────────────────
@@ -667,11 +940,14 @@ def recalc_equip_bonuses(char: MobInstance) -> None:
 
 # ── Utility functions ────────────────────────────────────────────
 
-def _jload(val: Any) -> Any:
-    """Load JSON if string, otherwise return as-is."""
-    if isinstance(val, str):
-        return json.loads(val)
-    return val
+def _peak_rss_kb() -> int:
+    """Peak resident set size of this process (0 where unsupported)."""
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
 
 
 def _ensure_list(val: Any) -> list:
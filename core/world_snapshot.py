@@ -0,0 +1,172 @@
+"""World snapshot — boot from a binary image of the loaded world.
+
+After a successful ``World.load_from_db`` the compiled world (room, item
+and mob protos with their exits, zones, shops, classes, skills, races,
+socials, help, configs and compiled game tables) is pickled to
+``.cache/world/<game>.snap``. The file header carries:
+
+- a format version and a fingerprint of the modules defining the world
+  classes, so a code change invalidates old snapshots;
+- a content hash of the source tables, computed server-side in one query
+  (``Database.table_fingerprints``) without transferring any rows.
+
+At boot the snapshot is used when both match; otherwise the world is read
+from the DB and a new snapshot written. Any read error falls back to the DB.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import gc
+import hashlib
+import io
+import logging
+import os
+import pickle
+import struct
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from core.db import Database
+    from core.world import World
+
+log = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+_MAGIC = b"GENOSWS\0"
+_HEADER = struct.Struct("<8sI32s32s")   # magic, version, code hash, content hash
+
+# Source tables read by World.load_from_db
+WORLD_TABLES = (
+    "rooms", "room_exits", "item_protos", "mob_protos", "zones", "shops", "classes",
+    "skills", "races", "socials", "help_entries", "game_configs", "game_tables",
+)
+
+# World attributes filled by load_from_db
+_WORLD_ATTRS = (
+    "rooms", "item_protos", "mob_protos", "zones", "shops", "classes", "skills",
+    "races", "socials", "help_entries", "game_configs", "compiled_tables",
+)
+
+_CODE_FILES = ("world.py", "game_tables.py", "world_snapshot.py")
+
+
+def _code_hash() -> bytes:
+    h = hashlib.sha256(str(SNAPSHOT_VERSION).encode())
+    base = Path(__file__).resolve().parent
+    for name in _CODE_FILES:
+        h.update((base / name).read_bytes())
+    return h.digest()
+
+
+def content_hash(fingerprints: dict[str, str]) -> bytes:
+    """Combine per-table fingerprints into the snapshot key."""
+    h = hashlib.sha256()
+    for table in sorted(fingerprints):
+        h.update(f"{table}\0{fingerprints[table]}\0".encode())
+    return h.digest()
+
+
+class _Pickler(pickle.Pickler):
+    """Pickles dataclasses as ``cls(*fields)``.
+
+    The default path restores frozen slotted dataclasses (Exit, ExtraDesc)
+    through ``dataclasses.fields()`` and ``object.__setattr__`` per object,
+    which dominated snapshot load time.
+    """
+
+    _fields: dict[type, tuple[str, ...]] = {}
+
+    def reducer_override(self, obj: object) -> object:
+        cls = type(obj)
+        names = self._fields.get(cls)
+        if names is None:
+            if not dataclasses.is_dataclass(cls):
+                return NotImplemented
+            names = tuple(f.name for f in dataclasses.fields(cls) if f.init)
+            self._fields[cls] = names
+        return cls, tuple(getattr(obj, n) for n in names)
+
+
+def save_snapshot(world: World, path: Path, key: bytes) -> int:
+    """Write *world* to *path* atomically; returns the file size."""
+    state = {attr: getattr(world, attr) for attr in _WORLD_ATTRS}
+    buf = io.BytesIO()
+    _Pickler(buf, protocol=pickle.HIGHEST_PROTOCOL).dump(state)
+    body = buf.getvalue()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, SNAPSHOT_VERSION, _code_hash(), key))
+        f.write(body)
+    os.replace(tmp, path)
+    return _HEADER.size + len(body)
+
+
+def load_snapshot(world: World, path: Path, key: bytes) -> bool:
+    """Fill *world* from *path* if it matches *key* and this code version."""
+    try:
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                return False
+            magic, version, code, stored_key = _HEADER.unpack(header)
+            if (magic != _MAGIC or version != SNAPSHOT_VERSION
+                    or code != _code_hash() or stored_key != key):
+                return False
+            # Only new, acyclic objects: skip GC passes while unpickling
+            gc_was_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                state = pickle.load(f)
+            finally:
+                if gc_was_enabled:
+                    gc.enable()
+    except FileNotFoundError:
+        return False
+    except Exception as e:
+        log.warning("World snapshot unreadable (%s): %s", path, e)
+        return False
+    for attr in _WORLD_ATTRS:
+        setattr(world, attr, state[attr])
+    return True
+
+
+async def load_world(world: World, db: Database, data_dir: Path | None,
+                     snapshot_path: Path | None) -> str:
+    """Load *world* from a fresh snapshot or the DB; returns the source used.
+
+    With *snapshot_path* None the snapshot is bypassed entirely.
+    """
+    t0 = time.perf_counter()
+    if snapshot_path is None:
+        await world.load_from_db(db, data_dir)
+        log.info("World loaded from DB in %.0f ms", (time.perf_counter() - t0) * 1000)
+        return "db"
+    try:
+        key = content_hash(await db.table_fingerprints(WORLD_TABLES))
+    except Exception as e:
+        log.warning("World table fingerprint failed, loading from DB: %s", e)
+        await world.load_from_db(db, data_dir)
+        return "db"
+    t_hash = time.perf_counter()
+    if load_snapshot(world, snapshot_path, key):
+        log.info("World loaded from snapshot %s in %.0f ms (hash %.0f ms): "
+                 "%d rooms, %d items, %d mobs", snapshot_path.name,
+                 (time.perf_counter() - t0) * 1000, (t_hash - t0) * 1000,
+                 len(world.rooms), len(world.item_protos), len(world.mob_protos))
+        return "snapshot"
+    await world.load_from_db(db, data_dir)
+    t_db = time.perf_counter()
+    try:
+        size = save_snapshot(world, snapshot_path, key)
+    except Exception as e:
+        log.warning("World snapshot write failed (%s): %s", snapshot_path, e)
+    else:
+        log.info("World snapshot written: %s (%d KB, %.0f ms)", snapshot_path.name,
+                 size // 1024, (time.perf_counter() - t_db) * 1000)
+    log.info("World loaded from DB in %.0f ms (hash %.0f ms)",
+             (t_db - t0) * 1000, (t_hash - t0) * 1000)
+    return "db"
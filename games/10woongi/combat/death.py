@@ -41,8 +41,7 @@ async def handle_death(engine: Any, victim: Any, killer: Any | None = None) -> N
 
         # Remove NPC from room
         room = world.get_room(victim.room_vnum)
-        if room and victim in room.characters:
-            room.characters.remove(victim)
+        world.extract_char(victim)
 
         # Notify room
         if room:
@@ -5,7 +5,7 @@ from __future__ import annotations
 import importlib
 from typing import Any
 
-import bcrypt
+from core.passwords import get_hasher
 
 _PKG = "games.10woongi"
 
@@ -77,7 +77,9 @@ class WoongiGetPasswordState:
 
     async def on_input(self, session: Any, text: str) -> Any:
         stored_hash = session.player_data.get("password_hash", "")
-        if bcrypt.checkpw(text.encode("utf-8"), stored_hash.encode("utf-8")):
+        if await get_hasher(session.engine).verify_and_upgrade(
+            text, stored_hash, session.save_password_hash
+        ):
             await session.send_line("\r\n인증 성공!")
             await session.db.save_player(session.player_data["id"], {})
             await session.enter_game()
@@ -112,7 +114,7 @@ class WoongiConfirmPasswordState:
             await session.send_line("비밀번호가 일치하지 않습니다. 다시 설정해주세요.")
             session.player_data.pop("_password", None)
             return WoongiNewPasswordState()
-        pw_hash = bcrypt.hashpw(text.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+        pw_hash = await get_hasher(session.engine).hash(text)
         session.player_data["password_hash"] = pw_hash
         session.player_data.pop("_password", None)
         return WoongiSelectGenderState()
@@ -1,4 +1,4 @@
-"""3eyes death system — exp penalty, proficiency gain, PK tracking, corpse decay."""
+"""3eyes death system — exp penalty, proficiency gain, PK tracking."""
 
 from __future__ import annotations
 
@@ -101,8 +101,8 @@ async def handle_death(engine: Engine, victim: MobInstance,
     # Create corpse
     corpse = _make_corpse(victim)
     if room:
-        corpse.room_vnum = victim.room_vnum
-        room.objects.append(corpse)
+        world.register_obj(corpse)      # schedules decay (values["timer"])
+        world.obj_to_room(corpse, victim.room_vnum)
 
     # Gold transfer to killer
     if victim.gold > 0 and killer and not killer.is_npc:
@@ -128,8 +128,7 @@ async def handle_death(engine: Engine, victim: MobInstance,
                 _add_proficiency(killer, exp_gain)
 
         # Remove NPC from room
-        if room and victim in room.characters:
-            room.characters.remove(victim)
+        world.extract_char(victim)
 
         # Notify room
         if room:
@@ -204,8 +203,7 @@ async def handle_death(engine: Engine, victim: MobInstance,
 
         # Respawn to spirit room (11971)
         start_room = c.SPIRIT_ROOM
-        if room and victim in room.characters:
-            room.characters.remove(victim)
+        world.char_from_room(victim)
 
         # Full HP, 10% MP recovery (PvE death), PK: 50% HP/MP
         if is_pk:
@@ -215,11 +213,10 @@ async def handle_death(engine: Engine, victim: MobInstance,
             victim.hp = victim.max_hp
             victim.mana = max(1, victim.max_mana // 10)
         victim.position = 8  # POS_STANDING
-        victim.room_vnum = start_room
+        world.char_to_room(victim, start_room)
 
         dest = world.get_room(start_room)
         if dest:
-            dest.characters.append(victim)
             if victim.session:
                 await victim.session.send_line(
                     "\r\n{yellow}죽음에서 벗어나 정신을 차립니다.{reset}\r\n"
@@ -227,46 +224,6 @@ async def handle_death(engine: Engine, victim: MobInstance,
                 await engine.do_look(victim.session, "")
 
 
-async def decay_corpses(engine: Engine) -> None:
-    """Tick-based corpse decay — removes corpses when timer reaches 0.
-
-    Called from engine tick. Each corpse has values["timer"] that decrements
-    every tick. When timer <= 0, corpse dissolves and remaining items drop to room.
-    """
-    world = engine.world
-    for room in list(world.rooms.values()):
-        for obj in list(room.objects):
-            vals = getattr(obj, "values", None)
-            if not vals or not isinstance(vals, dict):
-                continue
-            if not vals.get("corpse"):
-                continue
-            # Decrement timer
-            timer = vals.get("timer", 0)
-            timer -= 1
-            vals["timer"] = timer
-            if timer > 0:
-                continue
-            # Corpse decays: drop items to room
-            for item in list(getattr(obj, "contains", [])):
-                item.in_obj = None
-                item.room_vnum = room.vnum
-                room.objects.append(item)
-            if hasattr(obj, "contains"):
-                obj.contains.clear()
-            # Remove corpse
-            room.objects.remove(obj)
-            # Notify room
-            name = getattr(obj, "name", "시체")
-            if not name:
-                name = obj.proto.short_desc if obj.proto else "시체"
-            for ch in room.characters:
-                if ch.session:
-                    await ch.session.send_line(
-                        f"{{yellow}}{name}가 부패하여 사라집니다.{{reset}}"
-                    )
-
-
 def calculate_exp_gain(killer: MobInstance, victim: MobInstance) -> int:
     """3eyes exp gain — contribution-based (simplified)."""
     base = victim.proto.experience if victim.proto else 0
@@ -78,11 +78,6 @@ class ThreeEyesPlugin:
             base += f"\n[{enemy.name}: {condition}] "
         return base
 
-    async def on_tick(self, engine: Engine) -> None:
-        """3eyes per-tick hook — corpse decay."""
-        death = _import("combat.death")
-        await death.decay_corpses(engine)
-
     async def mobile_activity(self, engine: Engine) -> None:
         """3eyes NPC AI — MAGGRE auto-aggro with lowest-piety targeting.
 
@@ -11,7 +11,7 @@ import re
 from pathlib import Path
 from typing import Any
 
-import bcrypt
+from core.passwords import get_hasher
 
 _PKG = "games.3eyes"
 
@@ -93,8 +93,8 @@ class ThreeEyesGetPasswordState:
 
     async def on_input(self, session: Any, text: str) -> Any:
         stored_hash = session.player_data.get("password_hash", "")
-        if stored_hash and bcrypt.checkpw(
-            text.encode("utf-8"), stored_hash.encode("utf-8")
+        if await get_hasher(session.engine).verify_and_upgrade(
+            text, stored_hash, session.save_password_hash
         ):
             return ThreeEyesMainMenuState()
         else:
@@ -203,9 +203,7 @@ class ThreeEyesChangePasswordState:
     async def on_input(self, session: Any, text: str) -> Any:
         if self._step == 0:
             stored_hash = session.player_data.get("password_hash", "")
-            if stored_hash and bcrypt.checkpw(
-                text.encode("utf-8"), stored_hash.encode("utf-8")
-            ):
+            if await get_hasher(session.engine).verify(text, stored_hash):
                 self._step = 1
                 return None  # re-prompt for new password
             else:
@@ -218,9 +216,7 @@ class ThreeEyesChangePasswordState:
             if len(text) > 14:
                 await session.send_line("14자이상 초과하면 안됩니다.")
                 return None
-            pw_hash = bcrypt.hashpw(
-                text.encode("utf-8"), bcrypt.gensalt()
-            ).decode("utf-8")
+            pw_hash = await get_hasher(session.engine).hash(text)
             session.player_data["password_hash"] = pw_hash
             await session.db.save_player(
                 session.player_data["id"],
@@ -353,9 +349,7 @@ class ThreeEyesSetPasswordState:
             )
             return None
 
-        pw_hash = bcrypt.hashpw(
-            pw.encode("utf-8"), bcrypt.gensalt()
-        ).decode("utf-8")
+        pw_hash = await get_hasher(session.engine).hash(pw)
 
         stats = session.player_data.pop("_stats", {
             "str": 10, "dex": 10, "con": 10, "int": 10, "pie": 10,
@@ -112,10 +112,7 @@ local STAT_BONUS = {
 -- ── Stat access ───────────────────────────────────────────────
 
 function te_stat(mob, key, default)
-    default = default or 13
-    local ok, val = pcall(function() return mob.stats[key] end)
-    if ok and val then return val end
-    return default
+    return char_stat(mob, key, default or 13)
 end
 
 function te_bonus(stat_value)
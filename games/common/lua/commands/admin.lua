@@ -0,0 +1,12 @@
+-- admin.lua — common admin commands (all games)
+
+-- ── luaprof — Lua profiler control ──────────────────────────────
+-- luaprof on | off | reset | report [n] | flame
+register_command("luaprof", function(ctx, args)
+    if not ctx:is_admin() then
+        ctx:send("권한이 없습니다.")
+        return
+    end
+    local parts = split(args or "")
+    ctx:send(ctx:lua_profile(parts[1] or "report", parts[2]))
+end)
@@ -5,8 +5,7 @@ from __future__ import annotations
 import random
 from typing import Any
 
-import bcrypt
-
+from core.passwords import get_hasher
 from games.simoon.constants import (
     CLASS_ABBREV, CLASS_INITIAL_HP, CLASS_INITIAL_MANA, CLASS_NAMES,
     MORTAL_START_ROOM, RACE_ALLOWED_CLASSES, RACE_NAMES, RACE_STAT_MODS,
@@ -44,7 +43,9 @@ class SimoonGetPasswordState:
 
     async def on_input(self, session: Any, text: str) -> Any:
         stored_hash = session.player_data.get("password_hash", "")
-        if bcrypt.checkpw(text.encode("utf-8"), stored_hash.encode("utf-8")):
+        if await get_hasher(session.engine).verify_and_upgrade(
+            text, stored_hash, session.save_password_hash
+        ):
             await session.send_line("\r\n인증 성공!")
             await session.db.save_player(session.player_data["id"], {})
             await session.enter_game()
@@ -79,7 +80,7 @@ class SimoonConfirmPasswordState:
             await session.send_line("비밀번호가 일치하지 않습니다. 다시 설정해주세요.")
             session.player_data.pop("_password", None)
             return SimoonNewPasswordState()
-        pw_hash = bcrypt.hashpw(text.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+        pw_hash = await get_hasher(session.engine).hash(text)
         session.player_data["password_hash"] = pw_hash
         session.player_data.pop("_password", None)
         return SimoonSelectGenderState()
@@ -24,8 +24,5 @@ SIMOON_CASTER = {[0]=true, [1]=true, [4]=true, [6]=true}
 
 -- Get stat value safely
 function simoon_stat(mob, key, default)
-    default = default or 13
-    local ok, val = pcall(function() return mob.stats[key] end)
-    if ok and val then return val end
-    return default
+    return char_stat(mob, key, default or 13)
 end
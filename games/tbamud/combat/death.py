@@ -64,8 +64,8 @@ async def handle_death(engine: Engine, victim: MobInstance,
 
     # Place corpse in room
     if room:
-        corpse.room_vnum = victim.room_vnum
-        room.objects.append(corpse)
+        world.register_obj(corpse)      # schedules decay (values["timer"])
+        world.obj_to_room(corpse, victim.room_vnum)
 
     # Gold drop
     if victim.gold > 0 and room:
@@ -90,9 +90,7 @@ async def handle_death(engine: Engine, victim: MobInstance,
                     )
 
         # Remove NPC from room
-        if room:
-            if victim in room.characters:
-                room.characters.remove(victim)
+        world.extract_char(victim)
 
         # Notify room
         if room:
@@ -134,17 +132,15 @@ async def handle_death(engine: Engine, victim: MobInstance,
 
         # Respawn at start room
         start_room = engine.config.get("world", {}).get("start_room", 3001)
-        if room and victim in room.characters:
-            room.characters.remove(victim)
+        world.char_from_room(victim)
 
         victim.hp = max(1, victim.max_hp // 2)
         victim.mana = max(0, victim.max_mana // 2)
         victim.position = 8  # POS_STANDING
-        victim.room_vnum = start_room
+        world.char_to_room(victim, start_room)
 
         dest = world.get_room(start_room)
         if dest:
-            dest.characters.append(victim)
             if victim.session:
                 await victim.session.send_line(
                     "\r\n{yellow}정신을 차려보니 신전에 있습니다.{reset}\r\n"
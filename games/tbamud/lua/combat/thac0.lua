@@ -1,5 +1,5 @@
 -- thac0.lua — tbaMUD THAC0 combat system
--- Registers combat_round hook for engine._combat_round
+-- Registers combat_round / combat_round_batch hooks for engine._combat_round
 
 local ATTACK_TYPES = {
     [0]="때림", [1]="찌름(쏘아)", [2]="채찍질", [3]="베기",
@@ -8,45 +8,11 @@ local ATTACK_TYPES = {
     [12]="폭발", [13]="주먹질", [14]="찌르기",
 }
 
-local THAC0_TABLE = {
-    [0] = {[0]=100,[1]=20,[2]=20,[3]=20,[4]=19,[5]=19,[6]=19,[7]=18,[8]=18,[9]=18,
-        [10]=17,[11]=17,[12]=17,[13]=16,[14]=16,[15]=16,[16]=15,[17]=15,[18]=15,
-        [19]=14,[20]=14,[21]=14,[22]=13,[23]=13,[24]=13,[25]=12,[26]=12,[27]=12,
-        [28]=11,[29]=11,[30]=11,[31]=10,[32]=10,[33]=10,[34]=9},
-    [1] = {[0]=100,[1]=20,[2]=20,[3]=20,[4]=18,[5]=18,[6]=18,[7]=16,[8]=16,[9]=16,
-        [10]=14,[11]=14,[12]=14,[13]=12,[14]=12,[15]=12,[16]=10,[17]=10,[18]=10,
-        [19]=8,[20]=8,[21]=8,[22]=6,[23]=6,[24]=6,[25]=4,[26]=4,[27]=4,
-        [28]=2,[29]=2,[30]=2,[31]=1,[32]=1,[33]=1,[34]=1},
-    [2] = {[0]=100,[1]=20,[2]=20,[3]=19,[4]=19,[5]=18,[6]=18,[7]=17,[8]=17,[9]=16,
-        [10]=16,[11]=15,[12]=15,[13]=14,[14]=14,[15]=13,[16]=13,[17]=12,[18]=12,
-        [19]=11,[20]=11,[21]=10,[22]=10,[23]=9,[24]=9,[25]=8,[26]=8,[27]=7,
-        [28]=7,[29]=6,[30]=6,[31]=5,[32]=5,[33]=4,[34]=4},
-    [3] = {[0]=100,[1]=20,[2]=19,[3]=18,[4]=17,[5]=16,[6]=15,[7]=14,[8]=14,[9]=13,
-        [10]=12,[11]=11,[12]=10,[13]=9,[14]=8,[15]=7,[16]=6,[17]=5,[18]=4,
-        [19]=3,[20]=2,[21]=1,[22]=1,[23]=1,[24]=1,[25]=1,[26]=1,[27]=1,
-        [28]=1,[29]=1,[30]=1,[31]=1,[32]=1,[33]=1,[34]=1},
-}
-
-local STR_TOHIT = {
-    [0]=-5,[1]=-5,[2]=-3,[3]=-3,[4]=-2,[5]=-2,[6]=-1,[7]=-1,[8]=0,[9]=0,
-    [10]=0,[11]=0,[12]=0,[13]=0,[14]=0,[15]=0,[16]=0,[17]=1,[18]=1,
-    [19]=3,[20]=3,[21]=4,[22]=4,[23]=5,[24]=6,[25]=7,
-    [26]=1,[27]=2,[28]=2,[29]=2,[30]=3,
-}
-
-local STR_TODAM = {
-    [0]=-4,[1]=-4,[2]=-2,[3]=-1,[4]=-1,[5]=-1,[6]=0,[7]=0,[8]=0,[9]=0,
-    [10]=0,[11]=0,[12]=0,[13]=0,[14]=0,[15]=0,[16]=1,[17]=1,[18]=2,
-    [19]=7,[20]=8,[21]=9,[22]=10,[23]=11,[24]=12,[25]=14,
-    [26]=3,[27]=3,[28]=4,[29]=5,[30]=6,
-}
-
-local DEX_DEFENSIVE = {
-    [0]=6,[1]=5,[2]=5,[3]=4,[4]=3,[5]=2,[6]=1,[7]=0,[8]=0,[9]=0,
-    [10]=0,[11]=0,[12]=0,[13]=0,[14]=0,[15]=-1,[16]=-2,[17]=-3,[18]=-4,
-    [19]=-4,[20]=-4,[21]=-5,[22]=-5,[23]=-5,[24]=-6,[25]=-6,
-}
-
+-- THAC0 / strength / dexterity tables (shared, read-only)
+local STATS = require("stat_tables")
+local THAC0_TABLE = STATS.thac0
+local STRENGTH = STATS.strength
+local DEXTERITY = STATS.dexterity
 
 local function get_thac0(class_id, level)
     local tbl = THAC0_TABLE[class_id] or THAC0_TABLE[0]
@@ -54,12 +20,7 @@ local function get_thac0(class_id, level)
     return tbl[clamped] or 20
 end
 
-local function get_stat(mob, key, default)
-    default = default or 13
-    local ok, val = pcall(function() return mob.stats[key] end)
-    if ok and val then return val end
-    return default
-end
+local get_stat = char_stat
 
 local function compute_ac(char)
     local ac
@@ -70,7 +31,7 @@ local function compute_ac(char)
     end
     -- Dex bonus
     local dex = math.min(math.max(get_stat(char, "dex", 13), 0), 25)
-    ac = ac + (DEX_DEFENSIVE[dex] or 0)
+    ac = ac + DEXTERITY[dex].defensive
     return math.max(-10, math.min(ac, 100))
 end
 
@@ -81,7 +42,7 @@ local function roll_hit(ctx, attacker, defender)
         hr = attacker.proto.hitroll
     else
         thac0 = get_thac0(attacker.class_id, attacker.level)
-        hr = (attacker.hitroll or 0) + (STR_TOHIT[math.min(get_stat(attacker, "str", 13), 30)] or 0)
+        hr = (attacker.hitroll or 0) + STRENGTH[math.max(0, math.min(get_stat(attacker, "str", 13), 30))].tohit
     end
     local ac = compute_ac(defender)
     local roll = ctx:random(1, 20)
@@ -114,7 +75,7 @@ local function roll_damage(ctx, attacker)
     end
 
     if not attacker.is_npc then
-        total = total + (STR_TODAM[math.min(get_stat(attacker, "str", 13), 30)] or 0)
+        total = total + STRENGTH[math.max(0, math.min(get_stat(attacker, "str", 13), 30))].todam
         total = total + (attacker.damroll or 0)
     end
 
@@ -123,13 +84,10 @@ end
 
 local function get_attack_type(attacker)
     local atk_type = 0
-    local equip = attacker.equipment
-    if equip then
-        local ok, weapon = pcall(function() return equip[16] end)
-        if ok and weapon and weapon.proto then
-            local ok2, v = pcall(function() return weapon.proto.values[3] end)
-            if ok2 and v then atk_type = tonumber(v) or 0 end
-        end
+    local weapon = char_equipment(attacker, 16)
+    if weapon and weapon.proto then
+        local ok2, v = pcall(function() return weapon.proto.values[3] end)
+        if ok2 and v then atk_type = tonumber(v) or 0 end
     end
     return atk_type, ATTACK_TYPES[atk_type] or "때림"
 end
@@ -175,7 +133,7 @@ end
 
 -- ── Combat round hook ─────────────────────────────────────────
 
-register_hook("combat_round", function(ctx, attacker, defender)
+local function fight_round(ctx, attacker, defender)
     attacker.position = 7  -- POS_FIGHTING
     local _, atk_name = get_attack_type(attacker)
 
@@ -240,4 +198,18 @@ register_hook("combat_round", function(ctx, attacker, defender)
         ctx:stop_combat(attacker)
         ctx:defer_death(defender, attacker)
     end
+end
+
+register_hook("combat_round", fight_round)
+
+-- Batched round: every fight in one call. Deaths are deferred until the
+-- batch ends, so skip fights where either side already dropped.
+register_hook("combat_round_batch", function(ctx, fights)
+    for i = 1, #fights do
+        local fight = fights[i]
+        local attacker, defender = fight[2], fight[3]
+        if attacker.hp > 0 and defender.hp > 0 and attacker.fighting == defender then
+            fight_round(ctx, attacker, defender)
+        end
+    end
 end)
@@ -0,0 +1,160 @@
+"""Lazy DG trigger store — index trigger metadata at boot, compile on first fire.
+
+``data/tbamud/lua/triggers.lua`` holds ~1,500 generated entries of the form::
+
+    Triggers[N] = {
+        name = "...",
+        attach_type = 0,
+        trigger_type = 64,
+        numeric_arg = 100,
+        execute = function(self, actor, extra) ... end,
+    }
+
+Most triggers never fire in a session, so the store only scans the text
+for entry boundaries and the scalar fields. An entry's table constructor
+is compiled as its own chunk (``=tbamud/triggers:N``) the first time it
+is fetched (:meth:`TriggerStore.get`) and kept in a bounded LRU; an entry that fails to compile is
+recorded and no longer affects the rest of the file.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from core.lua_cache import LuaBytecodeCache
+
+log = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SIZE = 256
+
+_ENTRY_PREFIX = "\nTriggers["
+_ESCAPES = {"n": "\n", "t": "\t", "\\": "\\", '"': '"', "'": "'"}
+
+
+def _unquote(literal: str) -> str:
+    return re.sub(r"\\(.)", lambda m: _ESCAPES.get(m.group(1), m.group(1)),
+                  literal[1:-1])
+
+
+@dataclass(slots=True)
+class TriggerMeta:
+    vnum: int
+    name: str
+    attach_type: int
+    trigger_type: int
+    numeric_arg: int
+    arg: str
+    start: int           # span of the entry's table constructor in the source
+    end: int
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "vnum": self.vnum, "type": self.trigger_type, "name": self.name,
+            "arg": self.arg, "attach_type": self.attach_type,
+            "numeric_arg": self.numeric_arg,
+        }
+
+
+def scan_triggers(source: str) -> dict[int, TriggerMeta]:
+    """Index every ``Triggers[N] = {...}`` entry without compiling it."""
+    index: dict[int, TriggerMeta] = {}
+    pos = source.find(_ENTRY_PREFIX)
+    while pos >= 0:
+        key_start = pos + len(_ENTRY_PREFIX)
+        key_end = source.find("]", key_start)
+        start = source.find("{", key_end)      # the opening brace
+        end = source.find("\n}", start)
+        if key_end < 0 or start < 0 or end < 0:
+            break
+        end += 2
+        pos = source.find(_ENTRY_PREFIX, end)
+        # Scalar fields precede the execute function
+        head_end = source.find("    execute =", start, end)
+        fields = {}
+        for line in source[start + 2:head_end if head_end > 0 else end].splitlines():
+            key, sep, value = line.strip().partition(" = ")
+            if sep:
+                fields[key] = value.rstrip(",")
+        vnum = int(source[key_start:key_end])
+        index[vnum] = TriggerMeta(
+            vnum=vnum,
+            name=_unquote(fields["name"]) if "name" in fields else "",
+            attach_type=int(fields.get("attach_type", 0)),
+            trigger_type=int(fields.get("trigger_type", 0)),
+            numeric_arg=int(fields.get("numeric_arg", 0)),
+            arg=_unquote(fields["arg"]) if "arg" in fields else "",
+            start=start, end=end,
+        )
+    return index
+
+
+class TriggerStore:
+    """Trigger metadata index with compile-on-first-fire bodies (LRU)."""
+
+    def __init__(self, source: str, load_chunk: Any,
+                 cache_size: int = DEFAULT_CACHE_SIZE,
+                 bytecode_cache: LuaBytecodeCache | None = None) -> None:
+        self._source = source
+        self._load_chunk = load_chunk
+        self._bytecode_cache = bytecode_cache
+        self.cache_size = max(1, cache_size)
+        self.index = scan_triggers(source)
+        self._compiled: OrderedDict[int, Any] = OrderedDict()  # vnum → Lua table
+        self.broken: dict[int, str] = {}                        # vnum → compile error
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, vnum: int) -> bool:
+        return vnum in self.index
+
+    def source_of(self, vnum: int) -> str:
+        meta = self.index[vnum]
+        return self._source[meta.start:meta.end]
+
+    def get(self, vnum: int) -> Any:
+        """Compiled entry table for *vnum* (None if unknown or broken)."""
+        entry = self._compiled.get(vnum)
+        if entry is not None:
+            self.hits += 1
+            self._compiled.move_to_end(vnum)
+            return entry
+        if vnum not in self.index or vnum in self.broken:
+            return None
+        self.misses += 1
+        code = "return " + self.source_of(vnum)
+        chunkname = f"=tbamud/triggers:{vnum}"
+        try:
+            if self._bytecode_cache is not None:
+                entry = self._bytecode_cache.load(self._load_chunk, code, chunkname)()
+            else:
+                entry = self._load_chunk(code, chunkname, "t")()
+        except Exception as e:
+            self.broken[vnum] = str(e).split("\n", 1)[0]
+            log.warning("Trigger %d failed to compile: %s", vnum, self.broken[vnum])
+            return None
+        self._compiled[vnum] = entry
+        if len(self._compiled) > self.cache_size:
+            self._compiled.popitem(last=False)
+            self.evictions += 1
+        return entry
+
+    @property
+    def compiled_count(self) -> int:
+        return len(self._compiled)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "triggers": len(self.index), "compiled": len(self._compiled),
+            "cache_size": self.cache_size, "hits": self.hits,
+            "misses": self.misses, "evictions": self.evictions,
+            "broken": len(self.broken),
+        }
@@ -1,13 +1,32 @@
-"""DG Script trigger runtime — Lua-based trigger execution via lupa."""
+"""DG Script trigger runtime — Lua-based trigger execution via lupa.
+
+A fired trigger runs the global ``execute_trigger(vnum, arg)`` when a
+script defines one. Otherwise its body is fetched from the
+:class:`TriggerStore` (compiled on first fire) and ``execute(self, actor,
+extra)`` runs as a coroutine under the watchdog's ``trigger`` budget:
+
+- ``self`` is a minimal trigger-self with ``self:say(text)`` and
+  ``self:emote(text)``, echoed to the owner's room; ``%actor.name%`` is
+  substituted. Other DG fields and commands are not provided, and a body
+  that uses them stops with a logged error.
+- ``coroutine.yield(n)`` (DG ``wait n``) suspends the body; the rest runs
+  ``n`` seconds later, again under the watchdog.
+"""
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import re
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
+from games.tbamud.trigger_store import DEFAULT_CACHE_SIZE, TriggerStore
+
 if TYPE_CHECKING:
     from core.engine import Engine
+    from core.lua_cache import LuaBytecodeCache
+    from core.lua_watchdog import Budget, LuaWatchdog
     from core.world import MobInstance, ObjInstance, Room
 
 log = logging.getLogger(__name__)
@@ -30,6 +49,67 @@ TRIG_ROOM_COMMAND = 14
 TRIG_ROOM_RANDOM = 15
 TRIG_ROOM_SPEECH = 16
 
+# new(fn) → body id; step(id, ...) → seconds until the body continues,
+# or nil once it is done (running bodies stay in a Lua table by id)
+_STEP_BODY = """
+local create, resume, status = coroutine.create, coroutine.resume, coroutine.status
+local bodies, last = {}, 0
+local function step(id, ...)
+    local co = bodies[id]
+    local ok, wait = resume(co, ...)
+    if not ok then
+        bodies[id] = nil
+        error(wait, 0)
+    end
+    if status(co) == "dead" then
+        bodies[id] = nil
+        return nil
+    end
+    return tonumber(wait) or 0
+end
+local function new(fn)
+    last = last + 1
+    bodies[last] = create(fn)
+    return last
+end
+return step, new
+"""
+
+# make_self(owner, actor) → the ``self`` passed to trigger bodies
+_TRIGGER_SELF = """
+local say, emote = ...
+return function(owner, actor)
+    return {
+        say = function(_, text) say(owner, actor, text) end,
+        emote = function(_, text) emote(owner, actor, text) end,
+    }
+end
+"""
+
+# DG trigger_type bits per attach_type (0 mob, 1 object, 2 room), for stats
+_ATTACH_NAMES = {0: "mob", 1: "obj", 2: "room"}
+_TYPE_BITS = {
+    0: ("global", "random", "command", "speech", "act", "death", "greet",
+        "greet_all", "entry", "receive", "fight", "hitprcnt", "bribe", "load",
+        "memory", "cast", "leave", "door", "", "time"),
+    1: ("global", "random", "command", "", "", "timer", "get", "drop", "give",
+        "wear", "", "remove", "", "load", "", "cast", "leave", "", "consume",
+        "time"),
+    2: ("global", "random", "command", "speech", "", "zone_reset", "enter",
+        "drop", "", "", "", "", "", "", "", "cast", "leave", "door", "", "time"),
+}
+
+
+def trigger_type_name(attach_type: int, trigger_type: int) -> str:
+    """``mob:greet``, ``room:random|enter``, … for a DG trigger_type bitvector."""
+    names = _TYPE_BITS.get(attach_type, ())
+    bits = [names[i] if i < len(names) and names[i] else f"bit{i}"
+            for i in range(trigger_type.bit_length()) if trigger_type >> i & 1]
+    return f"{_ATTACH_NAMES.get(attach_type, attach_type)}:{'|'.join(bits) or 'none'}"
+
+
+_ACTOR_NAME = re.compile(r"%actor\.name%")
+
 
 class TriggerRuntime:
     """Manage DG Script triggers via lupa Lua runtime."""
@@ -39,16 +119,41 @@ class TriggerRuntime:
         self._lua = None
         self._triggers: dict[int, dict[str, Any]] = {}  # vnum → trigger data
         self._variables: dict[str, dict[str, str]] = {}  # context → variables
-
-    def init(self, data_dir: Path | None = None) -> bool:
-        """Initialize Lua runtime and load triggers."""
+        self.watchdog: LuaWatchdog | None = None
+        self.store: TriggerStore | None = None
+        # Dispatch index: (room / mob proto / obj proto vnum, type) → trigger vnums
+        self._room_index: dict[tuple[int, int], list[int]] = {}
+        self._mob_index: dict[tuple[int, int], list[int]] = {}
+        self._obj_index: dict[tuple[int, int], list[int]] = {}
+        self.fire_counts: dict[tuple[int, int], int] = {}  # (attach, type) → fires
+        self._data_dir: Path | None = None
+        self._cache_size: int | None = None
+        self._bytecode_cache: LuaBytecodeCache | None = None
+        self._step_body: Any = None
+        self._new_body: Any = None
+        self._make_self: Any = None
+
+    def init(self, data_dir: Path | None = None,
+             bytecode_cache: LuaBytecodeCache | None = None,
+             budgets: dict[str, Budget] | None = None,
+             cache_size: int | None = None) -> bool:
+        """Initialize Lua runtime and index triggers.
+
+        Only trigger metadata is read at boot; each trigger body is
+        compiled on first fire and kept in an LRU of *cache_size* entries
+        (through the bytecode cache, when given).
+        """
         try:
             from lupa import LuaRuntime
+
+            from core.lua_watchdog import LuaWatchdog
         except ImportError:
             log.warning("lupa not installed — triggers disabled")
             return False
 
         self._lua = LuaRuntime(unpack_returned_tuples=True)
+        self.watchdog = LuaWatchdog(
+            self._lua, lambda fn: "tbamud/triggers:?", budgets)
 
         # Set up sandbox
         g = self._lua.globals()
@@ -63,41 +168,63 @@ class TriggerRuntime:
         g.damage = self._api_damage
         g.heal = self._api_heal
         g.force_command = self._api_force_command
+        self._step_body, self._new_body = self._lua.execute(_STEP_BODY)
+        self._make_self = self._lua.execute(
+            _TRIGGER_SELF, self._api_trigger_say, self._api_trigger_emote)
+
+        self._data_dir = data_dir
+        self._cache_size = cache_size or DEFAULT_CACHE_SIZE
+        self._bytecode_cache = bytecode_cache
+        return self.reload()
+
+    def reload(self) -> bool:
+        """(Re)index triggers.lua and rebuild the dispatch index."""
+        from core.lua_cache import LOAD_CHUNK_FN
 
-        # Load triggers Lua source
+        if self._lua is None:
+            return False
+        data_dir = self._data_dir
         if data_dir:
             triggers_path = data_dir / "lua" / "triggers.lua"
             if triggers_path.exists():
                 try:
                     source = triggers_path.read_text(encoding="utf-8")
-                    self._lua.execute(source)
-                    # Get trigger registry from Lua
-                    triggers_table = g.Triggers
-                    if triggers_table:
-                        self._load_trigger_table(triggers_table)
-                    log.info("Loaded %d triggers from Lua", len(self._triggers))
+                    self.store = TriggerStore(
+                        source, self._lua.eval(LOAD_CHUNK_FN),
+                        cache_size=self._cache_size or DEFAULT_CACHE_SIZE,
+                        bytecode_cache=self._bytecode_cache)
+                    self._triggers = {
+                        vnum: meta.as_dict() for vnum, meta in self.store.index.items()
+                    }
+                    log.info("Indexed %d triggers from Lua", len(self._triggers))
                 except Exception as e:
                     log.error("Failed to load triggers.lua: %s", e)
                     return False
 
+        self.build_index()
         return True
 
-    def _load_trigger_table(self, lua_table: Any) -> None:
-        """Extract trigger definitions from Lua table."""
-        if not self._lua:
+    def build_index(self) -> None:
+        """Map (room / mob proto / obj proto vnum, trigger type) → trigger vnums.
+
+        Call again after trigger or world prototype changes.
+        """
+        self._room_index = {}
+        self._mob_index = {}
+        self._obj_index = {}
+        world = getattr(self.engine, "world", None)
+        if world is None:
             return
-        try:
-            for key in lua_table:
-                trig = lua_table[key]
-                if trig:
-                    self._triggers[int(key)] = {
-                        "vnum": int(key),
-                        "type": int(trig.trigger_type or 0),
-                        "name": str(trig.name or ""),
-                        "arg": str(trig.arg or ""),
-                    }
-        except Exception as e:
-            log.warning("Error loading trigger table: %s", e)
+        for index, protos in (
+            (self._room_index, (room.proto for room in world.rooms.values())),
+            (self._mob_index, world.mob_protos.values()),
+            (self._obj_index, world.item_protos.values()),
+        ):
+            for proto in protos:
+                for trig_vnum in proto.scripts:
+                    trig = self._triggers.get(trig_vnum)
+                    if trig:
+                        index.setdefault((proto.vnum, trig["type"]), []).append(trig_vnum)
 
     @property
     def trigger_count(self) -> int:
@@ -109,47 +236,86 @@ class TriggerRuntime:
     # ── Trigger execution ────────────────────────────────────────
 
     async def fire_trigger(self, trig_vnum: int, actor: Any = None,
-                           target: Any = None, arg: str = "") -> bool:
-        """Execute a trigger by vnum. Returns True if trigger was found and run."""
+                           target: Any = None, arg: str = "",
+                           owner: Any = None) -> bool:
+        """Execute a trigger by vnum. Returns True if trigger was found and run.
+
+        *owner* is the room, mob or object the trigger is attached to.
+        """
         if not self._lua:
             return False
 
         trig = self._triggers.get(trig_vnum)
         if not trig:
             return False
+        key = (trig.get("attach_type", 0), trig["type"])
+        self.fire_counts[key] = self.fire_counts.get(key, 0) + 1
 
         try:
-            g = self._lua.globals()
-            execute_fn = g.execute_trigger
+            execute_fn = self._lua.globals().execute_trigger
             if execute_fn:
-                result = execute_fn(trig_vnum, arg)
+                result, _ = self.watchdog.call(
+                    "trigger", str(trig_vnum), execute_fn, trig_vnum, arg,
+                    source=f"tbamud/triggers:{trig_vnum}")
                 return bool(result)
+            entry = self.store.get(trig_vnum) if self.store else None
+            if entry is None or not entry.execute:
+                return False
+            body = self._new_body(entry.execute)
+            self._step(trig_vnum, body, self._make_self(owner, actor), actor, arg)
+            return True
         except Exception as e:
             log.warning("Trigger %d execution error: %s", trig_vnum, e)
 
         return False
 
+    def _step(self, trig_vnum: int, body: Any, *args: Any) -> None:
+        """Run *body* up to its next wait; schedule the rest."""
+        wait, _ = self.watchdog.call(
+            "trigger", str(trig_vnum), self._step_body, body, *args,
+            source=f"tbamud/triggers:{trig_vnum}")
+        if wait is not None:
+            asyncio.get_running_loop().call_later(
+                float(wait), self._resume, trig_vnum, body)
+
+    def _resume(self, trig_vnum: int, body: Any) -> None:
+        try:
+            self._step(trig_vnum, body)
+        except Exception as e:
+            log.warning("Trigger %d execution error: %s", trig_vnum, e)
+
     async def check_room_triggers(self, room_vnum: int, trig_type: int,
                                   actor: Any = None, arg: str = "") -> bool:
         """Check and fire room triggers of given type."""
-        room = self.engine.world.get_room(room_vnum)
-        if not room:
+        trigs = self._room_index.get((room_vnum, trig_type))
+        if trigs is None:
             return False
-
-        for trig_vnum in room.proto.scripts:
-            trig = self._triggers.get(trig_vnum)
-            if trig and trig["type"] == trig_type:
-                return await self.fire_trigger(trig_vnum, actor=actor, arg=arg)
-        return False
+        return await self.fire_trigger(trigs[0], actor=actor, arg=arg,
+                                       owner=self.engine.world.get_room(room_vnum))
 
     async def check_mob_triggers(self, mob: Any, trig_type: int,
                                  actor: Any = None, arg: str = "") -> bool:
         """Check and fire mob triggers of given type."""
-        for trig_vnum in mob.proto.scripts:
-            trig = self._triggers.get(trig_vnum)
-            if trig and trig["type"] == trig_type:
-                return await self.fire_trigger(trig_vnum, actor=actor, arg=arg)
-        return False
+        trigs = self._mob_index.get((mob.proto.vnum, trig_type))
+        if trigs is None:
+            return False
+        return await self.fire_trigger(trigs[0], actor=actor, arg=arg, owner=mob)
+
+    async def check_obj_triggers(self, obj: ObjInstance, trig_type: int,
+                                 actor: Any = None, arg: str = "") -> bool:
+        """Check and fire object triggers of given type."""
+        trigs = self._obj_index.get((obj.proto.vnum, trig_type))
+        if trigs is None:
+            return False
+        return await self.fire_trigger(trigs[0], actor=actor, arg=arg, owner=obj)
+
+    def fire_stats(self) -> dict[str, int]:
+        """Trigger fires per trigger type name (see :func:`trigger_type_name`)."""
+        stats: dict[str, int] = {}
+        for (attach_type, trig_type), count in self.fire_counts.items():
+            name = trigger_type_name(attach_type, trig_type)
+            stats[name] = stats.get(name, 0) + count
+        return stats
 
     # ── Engine API (exposed to Lua) ──────────────────────────────
 
@@ -158,13 +324,10 @@ class TriggerRuntime:
 
     def _api_send_to_char(self, char_id: int, message: str) -> None:
         """Send message to a character by ID."""
-        # Find character
-        for room in self.engine.world.rooms.values():
-            for ch in room.characters:
-                if ch.id == char_id and ch.session:
-                    import asyncio
-                    asyncio.ensure_future(ch.session.send_line(str(message)))
-                    return
+        ch = self.engine.world.find_char(char_id)
+        if ch and ch.session:
+            import asyncio
+            asyncio.ensure_future(ch.session.send_line(str(message)))
 
     def _api_send_to_room(self, room_vnum: int, message: str) -> None:
         """Send message to all characters in a room."""
@@ -175,6 +338,33 @@ class TriggerRuntime:
                 if ch.session:
                     asyncio.ensure_future(ch.session.send_line(str(message)))
 
+    def _api_trigger_say(self, owner: Any, actor: Any, text: str) -> None:
+        """``self:say(text)`` — the owner speaks to its room."""
+        text = self._expand(text, actor)
+        name = getattr(owner, "name", "")
+        self._echo_owner(owner, f"{name}이(가) '{text}'라고 말합니다." if name else text)
+
+    def _api_trigger_emote(self, owner: Any, actor: Any, text: str) -> None:
+        """``self:emote(text)`` — the owner acts in its room."""
+        text = self._expand(text, actor)
+        name = getattr(owner, "name", "")
+        self._echo_owner(owner, f"{name} {text}" if name else text)
+
+    @staticmethod
+    def _expand(text: Any, actor: Any) -> str:
+        name = getattr(actor, "name", "") if actor is not None else ""
+        return _ACTOR_NAME.sub(lambda _: name, str(text))
+
+    def _echo_owner(self, owner: Any, message: str) -> None:
+        holder = getattr(owner, "carried_by", None) or getattr(owner, "worn_by", None)
+        if holder is not None:
+            owner = holder
+        room_vnum = getattr(owner, "room_vnum", None)
+        if room_vnum is None:
+            room_vnum = getattr(owner, "vnum", None)     # a Room
+        if room_vnum is not None:
+            self._api_send_to_room(room_vnum, message)
+
     def _api_get_variable(self, context: str, name: str) -> str:
         """Get a DG Script variable."""
         return self._variables.get(str(context), {}).get(str(name), "")
@@ -189,39 +379,25 @@ class TriggerRuntime:
     def _api_teleport(self, char_id: int, room_vnum: int) -> None:
         """Teleport a character to a room."""
         world = self.engine.world
-        for room in world.rooms.values():
-            for ch in room.characters:
-                if ch.id == char_id:
-                    room.characters.remove(ch)
-                    ch.room_vnum = room_vnum
-                    dest = world.get_room(room_vnum)
-                    if dest:
-                        dest.characters.append(ch)
-                    return
+        ch = world.find_char(char_id)
+        if ch:
+            world.char_to_room(ch, room_vnum)
 
     def _api_damage(self, char_id: int, amount: int) -> None:
         """Deal damage to a character."""
-        for room in self.engine.world.rooms.values():
-            for ch in room.characters:
-                if ch.id == char_id:
-                    ch.hp -= int(amount)
-                    return
+        ch = self.engine.world.find_char(char_id)
+        if ch:
+            ch.hp -= int(amount)
 
     def _api_heal(self, char_id: int, amount: int) -> None:
         """Heal a character."""
-        for room in self.engine.world.rooms.values():
-            for ch in room.characters:
-                if ch.id == char_id:
-                    ch.hp = min(ch.max_hp, ch.hp + int(amount))
-                    return
+        ch = self.engine.world.find_char(char_id)
+        if ch:
+            ch.hp = min(ch.max_hp, ch.hp + int(amount))
 
     def _api_force_command(self, char_id: int, command: str) -> None:
         """Force a character to execute a command."""
-        for room in self.engine.world.rooms.values():
-            for ch in room.characters:
-                if ch.id == char_id and ch.session:
-                    import asyncio
-                    asyncio.ensure_future(
-                        self.engine.process_command(ch.session, str(command))
-                    )
-                    return
+        ch = self.engine.world.find_char(char_id)
+        if ch and ch.session:
+            import asyncio
+            asyncio.ensure_future(self.engine.process_command(ch.session, str(command)))
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Benchmark — world-state checkpoint restore vs. initial zone resets.
+
+Builds a synthetic world (zones of rooms with doors, mobs carrying and
+wearing items, containers on the floor — M/G/E/O/P/D resets), then times:
+
+  resets   — Engine._do_zone_resets(initial=True) on a fresh world
+  capture  — full capture (WorldCheckpointer.prime, at boot)
+  tick     — checkpoint capture on the tick after ~1% of rooms changed
+             (dirty rooms plus the 1/snapshot_every refresh slice)
+  snapshot — full snapshot write (worker thread)
+  delta    — delta-log append for that checkpoint
+  restore  — snapshot + log replay into a fresh world
+
+Usage:
+    python scripts/bench_checkpoint.py [--zones N] [--rooms N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from core.checkpoint import WorldCheckpointer  # noqa: E402
+from core.engine import Engine  # noqa: E402
+from core.world import Exit, ItemProto, MobProto, Room, RoomProto, World, Zone  # noqa: E402
+
+
+def build_world(zones: int, rooms: int) -> World:
+    world = World()
+    for z in range(zones):
+        resets = []
+        for r in range(rooms):
+            vnum = z * 1000 + r
+            exits = [Exit(direction=0, to_vnum=vnum + 1, flags=("door",))]
+            room = Room(proto=RoomProto(vnum=vnum, name=f"room {vnum}", zone_vnum=z,
+                                        exits=exits))
+            room.init_doors()
+            world.rooms[vnum] = room
+            world.mob_protos[vnum] = MobProto(vnum=vnum, max_hp=50, gold=10)
+            for i in range(4):
+                world.item_protos[vnum * 10 + i] = ItemProto(
+                    vnum=vnum * 10 + i, values={"charges": i})
+            resets += [
+                {"command": "M", "arg1": vnum, "arg2": 1, "arg3": vnum},
+                {"command": "G", "arg1": vnum * 10, "if_flag": 1},
+                {"command": "E", "arg1": vnum * 10 + 1, "arg3": "wield", "if_flag": 1},
+                {"command": "O", "arg1": vnum * 10 + 2, "arg3": vnum},
+                {"command": "P", "arg1": vnum * 10 + 3, "if_flag": 1},
+                {"command": "D", "arg1": vnum, "arg2": 0, "arg3": 2},
+            ]
+        world.zones.append(Zone(vnum=z, resets=resets))
+    return world
+
+
+def _ms(t0: float) -> float:
+    return (time.perf_counter() - t0) * 1000
+
+
+async def run(opts: argparse.Namespace) -> None:
+    engine = Engine.__new__(Engine)
+    engine.world = world = build_world(opts.zones, opts.rooms)
+    t0 = time.perf_counter()
+    engine._do_zone_resets(initial=True)
+    resets_ms = _ms(t0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cp = WorldCheckpointer(world, Path(tmp))
+        cp.prime()
+        full_ms = cp.last_capture_ms
+        await cp.checkpoint()
+        snap = cp.stats()
+        for vnum in list(world.rooms)[:: 100]:
+            world.rooms[vnum].door_states[0]["locked"] = False
+            world.dirty_rooms.add(vnum)         # what set_door_state does
+        await cp.checkpoint()
+        delta = cp.stats()
+
+        fresh = build_world(opts.zones, opts.rooms)
+        t0 = time.perf_counter()
+        result = WorldCheckpointer(fresh, Path(tmp)).restore()
+        restore_ms = _ms(t0)
+        size = sum(f.stat().st_size for f in Path(tmp).iterdir())
+
+    print(f"world: {len(world.rooms)} rooms, {result['mobs']} mobs, "
+          f"{result['objects']} objects; checkpoint files {size / 1024:.0f} KiB")
+    print(f"  resets (initial) {resets_ms:8.1f} ms")
+    print(f"  capture (full)   {full_ms:8.1f} ms")
+    print(f"  capture (tick)   {delta['last_capture_ms']:8.1f} ms  "
+          f"({delta['last_rooms_captured']} rooms)")
+    print(f"  snapshot write   {snap['last_write_ms']:8.1f} ms  ({snap['last_bytes']} B)")
+    print(f"  delta write      {delta['last_write_ms']:8.1f} ms  ({delta['last_bytes']} B, "
+          f"{delta['last_rooms_changed']} rooms)")
+    print(f"  restore          {restore_ms:8.1f} ms  ({restore_ms / resets_ms:.2f}x resets)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--zones", type=int, default=40)
+    parser.add_argument("--rooms", type=int, default=50)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Microbenchmark — World game_tables lookups (thac0, exp, saving throws).
+
+Loads tbaMUD's thac0 / saving_throws / exp tables from data/tbamud/lua in
+the shape of game_tables DB rows, then times per-call lookup cost for:
+
+  json     — the old path: json.dumps(sorted key dict) + dict lookup
+  world    — World.get_thac0 / get_exp_required / get_saving_throw
+  dense    — DenseTable.get directly
+  lua      — Lua indexing the shared array from ctx:get_game_table()
+
+Usage:
+    python scripts/bench_game_tables.py [--n N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import timeit
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from lupa import LuaRuntime  # noqa: E402
+
+from core.world import World  # noqa: E402
+
+DATA_DIR = BASE_DIR / "data" / "tbamud" / "lua"
+
+
+def _rows() -> dict[str, list[tuple[dict, int]]]:
+    lua = LuaRuntime()
+    stats = lua.execute((DATA_DIR / "stat_tables.lua").read_text(encoding="utf-8"))
+    exp = lua.execute((DATA_DIR / "exp_tables.lua").read_text(encoding="utf-8"))
+    entries: dict[str, list[tuple[dict, int]]] = {"thac0": [], "saving_throw": [], "exp_table": []}
+    for cls, levels in stats.thac0.items():
+        for lvl, v in levels.items():
+            entries["thac0"].append(({"class_id": cls, "level": lvl}, v))
+    for ckey, levels in stats.saving_throws.items():
+        cls, typ = (int(x) for x in ckey.split("_"))
+        for lvl, v in levels.items():
+            entries["saving_throw"].append(({"class_id": cls, "type": typ, "level": lvl}, v))
+    for cls, levels in exp.items():
+        if isinstance(cls, int):
+            for lvl, v in levels.items():
+                entries["exp_table"].append(({"class_id": cls, "level": lvl}, v))
+    return entries
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=200_000)
+    opts = parser.parse_args()
+
+    entries = _rows()
+    world = World()
+    json_tables: dict[str, dict[str, int]] = {}
+    for table, rows in entries.items():
+        json_tables[table] = {json.dumps(k, sort_keys=True): v for k, v in rows}
+    world.compile_game_tables(entries)
+
+    rng = random.Random(1)
+    keys = [(rng.randrange(4), rng.randrange(5), rng.randrange(35)) for _ in range(1024)]
+
+    def old_thac0(c: int, lvl: int) -> int:
+        key = json.dumps({"class_id": c, "level": lvl}, sort_keys=True)
+        return json_tables["thac0"].get(key, 20)
+
+    def old_save(c: int, t: int, lvl: int) -> int:
+        key = json.dumps({"class_id": c, "level": lvl, "type": t}, sort_keys=True)
+        return json_tables["saving_throw"].get(key, 0)
+
+    thac0 = world.compiled_tables["thac0"]
+    lua = LuaRuntime()
+    lua_loop = lua.eval("""function(t, keys, n)
+        local s = 0
+        for i = 1, n do
+            local k = keys[(i % 1024) + 1]
+            s = s + t[k[1]][k[3]]
+        end
+        return s
+    end""")
+    lua_keys = lua.table_from([list(k) for k in keys], recursive=True)
+
+    cases = {
+        "thac0 json": lambda: [old_thac0(c, lvl) for c, _, lvl in keys],
+        "thac0 world": lambda: [world.get_thac0(c, lvl) for c, _, lvl in keys],
+        "thac0 dense": lambda: [thac0.get(c, lvl) for c, _, lvl in keys],
+        "save json": lambda: [old_save(c, t, lvl) for c, t, lvl in keys],
+        "save world": lambda: [world.get_saving_throw(c, t, lvl) for c, t, lvl in keys],
+        "exp world": lambda: [world.get_exp_required(c, lvl) for c, _, lvl in keys],
+    }
+    reps = max(1, opts.n // len(keys))
+    print(f"{'case':14s} {'ns/lookup':>10s}")
+    for label, fn in cases.items():
+        best = min(timeit.repeat(fn, number=reps, repeat=3))
+        print(f"{label:14s} {best / (reps * len(keys)) * 1e9:10.0f}")
+    best = min(timeit.repeat(lambda: lua_loop(thac0.data, lua_keys, opts.n),
+                             number=1, repeat=3))
+    print(f"{'thac0 lua':14s} {best / opts.n * 1e9:10.0f}")
+
+
+if __name__ == "__main__":
+    main()
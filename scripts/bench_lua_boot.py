@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Benchmark — Lua script boot time per game, with and without bytecode cache.
+
+Executes the same scripts LuaCommandRuntime.load_from_db would (common +
+game seed files from games/*/lua/) three ways:
+
+  source  — plain execute() of the source text (no cache)
+  cold    — bytecode cache enabled, empty cache directory (compile + dump)
+  warm    — bytecode cache enabled, populated cache directory
+
+For tbaMUD, data/tbamud/lua/triggers.lua is timed the same way.
+
+Usage:
+    python scripts/bench_lua_boot.py [--repeat N] [game ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from core.lua_cache import LuaBytecodeCache  # noqa: E402
+from core.lua_commands import LuaCommandRuntime  # noqa: E402
+from games.tbamud.triggers import TriggerRuntime  # noqa: E402
+
+GAMES = ("tbamud", "simoon", "3eyes", "10woongi")
+
+
+class _FileDB:
+    """Serves seed files in the shape of Database.fetch_lua_scripts rows."""
+
+    async def fetch_lua_scripts(self, game: str) -> list[dict]:
+        lua_dir = BASE_DIR / "games" / game / "lua"
+        rows = []
+        for lua_file in sorted(lua_dir.rglob("*.lua")):
+            parts = list(lua_file.relative_to(lua_dir).parts)
+            rows.append({
+                "game": game,
+                "category": "/".join(parts[:-1]) if len(parts) > 1 else "lib",
+                "name": parts[-1].replace(".lua", ""),
+                "source": lua_file.read_text(encoding="utf-8"),
+            })
+        rows.sort(key=lambda r: (r["category"], r["name"]))
+        return rows
+
+
+def _time_scripts(game: str, cache_dir: Path | None) -> tuple[float, int]:
+    engine = SimpleNamespace(world=None, players={}, sessions={}, config={})
+    cache = LuaBytecodeCache(cache_dir) if cache_dir else None
+    runtime = LuaCommandRuntime(engine, bytecode_cache=cache)  # type: ignore[arg-type]
+    t0 = time.perf_counter()
+    count = asyncio.run(runtime.load_from_db(_FileDB(), game))  # type: ignore[arg-type]
+    return (time.perf_counter() - t0) * 1000, count
+
+
+def _time_triggers(cache_dir: Path | None) -> tuple[float, int]:
+    engine = SimpleNamespace(world=None)
+    runtime = TriggerRuntime(engine)  # type: ignore[arg-type]
+    cache = LuaBytecodeCache(cache_dir) if cache_dir else None
+    t0 = time.perf_counter()
+    runtime.init(BASE_DIR / "data" / "tbamud", bytecode_cache=cache)
+    return (time.perf_counter() - t0) * 1000, runtime.trigger_count
+
+
+def _best(fn, repeat: int) -> tuple[float, int]:
+    runs = [fn() for _ in range(repeat)]
+    return min(r[0] for r in runs), runs[0][1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("games", nargs="*", default=list(GAMES))
+    parser.add_argument("--repeat", type=int, default=5)
+    opts = parser.parse_args()
+    logging.basicConfig(level=logging.CRITICAL)
+
+    print(f"{'target':22s} {'items':>5s} {'source':>10s} {'cold':>10s} {'warm':>10s}")
+    for game in opts.games:
+        targets = [(f"{game} scripts", lambda d: _time_scripts(game, d))]
+        if game == "tbamud":
+            targets.append(("tbamud triggers.lua", _time_triggers))
+        for label, run in targets:
+            src_ms, count = _best(lambda: run(None), opts.repeat)
+            cold = []
+            for _ in range(opts.repeat):
+                with tempfile.TemporaryDirectory() as tmp:
+                    cold.append(run(Path(tmp))[0])
+            with tempfile.TemporaryDirectory() as tmp:
+                run(Path(tmp))
+                warm_ms, _ = _best(lambda: run(Path(tmp)), opts.repeat)
+            print(f"{label:22s} {count:5d} {src_ms:8.1f}ms {min(cold):8.1f}ms "
+                  f"{warm_ms:8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Microbenchmark — Lua command dispatch cost per call.
+
+Compares the legacy path (fresh CommandContext per call, collections copied
+into Lua tables with table_from) against the pooled path (contexts reused
+from LuaCommandRuntime's pool, collections exposed as lazy views).
+
+Reports wall time, Python allocations (tracemalloc) and Lua heap growth
+per command.
+
+Usage:
+    python scripts/bench_lua_context.py [--iterations N] [--objects N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.lua_commands import CommandContext, LuaCommandRuntime  # noqa: E402
+from core.world import (  # noqa: E402
+    ItemProto, MobInstance, MobProto, ObjInstance, Room, RoomProto, World,
+)
+
+# Typical "look"-style command: scans room contents, touches a few entries
+_COMMAND = """
+register_command("bench", function(ctx, args)
+    local chars = ctx:get_characters()
+    local objs = ctx:get_objects()
+    local inv = ctx:get_inventory()
+    local n = 0
+    for i = 1, #chars do
+        if chars[i] ~= ctx.char then n = n + 1 end
+    end
+    if #objs > 0 then n = n + #objs end
+    if #inv > 0 then n = n + 1 end
+    ctx:send("count " .. n)
+end)
+"""
+
+
+class _NullSession:
+    def __init__(self) -> None:
+        self.character: MobInstance | None = None
+        self.player_data: dict = {}
+
+    async def send_line(self, text: str) -> None:
+        pass
+
+
+def _build(objects: int) -> tuple[LuaCommandRuntime, _NullSession]:
+    world = World()
+    room = Room(proto=RoomProto(vnum=1, name="bench"))
+    world.rooms[1] = room
+    item = ItemProto(vnum=10, keywords="stone", short_desc="stone")
+    for i in range(objects):
+        room.objects.append(ObjInstance(id=1000 + i, proto=item, room_vnum=1))
+    mob_proto = MobProto(vnum=20, keywords="rat", short_desc="rat")
+    for i in range(10):
+        room.characters.append(MobInstance(
+            id=2000 + i, proto=mob_proto, room_vnum=1, hp=10, max_hp=10))
+
+    session = _NullSession()
+    char = MobInstance(
+        id=1, proto=MobProto(vnum=-1, keywords="bench", short_desc="bench"),
+        room_vnum=1, hp=10, max_hp=10, player_id=1, player_name="bench",
+        session=session,
+    )
+    char.inventory = [ObjInstance(id=3000 + i, proto=item) for i in range(20)]
+    session.character = char
+    room.characters.append(char)
+
+    engine = SimpleNamespace(world=world, players={}, sessions={}, config={})
+    runtime = LuaCommandRuntime(engine)  # type: ignore[arg-type]
+    runtime.load_source(_COMMAND, "bench/bench")
+    return runtime, session
+
+
+async def _legacy_call(runtime: LuaCommandRuntime, fn, session) -> None:
+    ctx = CommandContext(session, runtime.engine, lua_runtime=runtime._lua)
+    fn(ctx, "")
+    await ctx.flush()
+    await ctx.execute_deferred()
+
+
+async def _run(label: str, call, iterations: int, runtime: LuaCommandRuntime) -> None:
+    lua_gc = runtime._lua.eval("collectgarbage")
+    for _ in range(200):  # warm up pools / caches
+        await call()
+
+    # 1. Wall time (no tracing)
+    t0 = time.perf_counter()
+    for _ in range(iterations):
+        await call()
+    elapsed = time.perf_counter() - t0
+
+    # 2. Python allocations (tracemalloc peak over one batch)
+    lua_gc("collect")
+    tracemalloc.start()
+    for _ in range(100):
+        await call()
+    _, py_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # 3. Lua heap growth with the collector paused
+    lua_gc("collect")
+    lua_gc("stop")
+    lua_before = lua_gc("count")
+    for _ in range(iterations):
+        await call()
+    lua_after = lua_gc("count")
+    lua_gc("restart")
+    lua_gc("collect")
+
+    print(f"{label:8s} {elapsed / iterations * 1e6:8.2f} us/cmd  "
+          f"py-peak {py_peak / 100:8.1f} B/cmd  "
+          f"lua-alloc {(lua_after - lua_before) / iterations * 1024:8.1f} B/cmd")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--objects", type=int, default=50)
+    opts = parser.parse_args()
+
+    runtime, session = _build(opts.objects)
+    fn = runtime._commands["bench"]
+    handler = runtime.wrap_command("bench")
+
+    print(f"iterations={opts.iterations} room_objects={opts.objects}")
+    await _run("before", lambda: _legacy_call(runtime, fn, session), opts.iterations, runtime)
+    await _run("after", lambda: handler(session, ""), opts.iterations, runtime)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
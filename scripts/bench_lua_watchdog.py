@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Benchmark — cost of the Lua watchdog count hook.
+
+Loads the tbaMUD Lua scripts and times, with the watchdog off and on:
+
+  loop    — a pure-Lua arithmetic loop (worst case for a count hook)
+  look    — the ``look`` command in a room with mobs and objects
+  combat  — one combat round (``combat_round_batch``) over N fights
+
+Usage:
+    python scripts/bench_lua_watchdog.py [--fights N] [--iterations N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from core.engine import Engine  # noqa: E402
+from core.lua_commands import LuaCommandRuntime  # noqa: E402
+from core.world import (  # noqa: E402
+    ItemProto, MobInstance, MobProto, ObjInstance, Room, RoomProto, World,
+)
+
+
+class _NullSession:
+    def __init__(self, char: MobInstance) -> None:
+        self.character = char
+        self.player_data = {"level": char.level}
+
+    async def send_line(self, text: str) -> None:
+        pass
+
+    async def send(self, text: str) -> None:
+        pass
+
+
+def build(fights: int) -> tuple[Engine, _NullSession]:
+    world = World()
+    room = Room(proto=RoomProto(vnum=3001, name="광장", description="넓은 광장입니다.",
+                                zone_vnum=30))
+    world.rooms[3001] = room
+    item = ItemProto(vnum=10, keywords="돌", short_desc="돌멩이")
+    for i in range(20):
+        room.objects.append(ObjInstance(id=5000 + i, proto=item, room_vnum=3001))
+    proto = MobProto(vnum=20, keywords="고블린", short_desc="고블린", level=5,
+                     hitroll=2, damroll=2, damage_dice="1d6", max_hp=10**9)
+    mobs = []
+    for i in range(2 * fights):
+        mob = MobInstance(id=1000 + i, proto=proto, room_vnum=3001, hp=10**9,
+                          max_hp=10**9)
+        mob.position = 7
+        room.characters.append(mob)
+        mobs.append(mob)
+    for a, b in zip(mobs[::2], mobs[1::2]):
+        a.fighting, b.fighting = b, a
+
+    engine = Engine.__new__(Engine)
+    engine.world = world
+    engine.config = {"world": {"start_room": 3001}}
+    engine.sessions, engine.players = {}, {}
+    engine.cmd_handlers, engine.cmd_korean = {}, {}
+    engine._register_core_commands()
+    engine.game_name = "tbamud"
+    from games.tbamud.game import TbaMudPlugin
+    engine._plugin = TbaMudPlugin()
+    engine.lua = LuaCommandRuntime(engine)
+    for scope in ("common", "tbamud"):
+        lua_dir = BASE_DIR / "games" / scope / "lua"
+        lib = lua_dir / "lib.lua"
+        if lib.exists():
+            engine.lua.load_source(lib.read_text(encoding="utf-8"), f"{scope}/lib")
+        for sub in ("commands", "combat"):
+            for f in sorted((lua_dir / sub).glob("*.lua")):
+                engine.lua.load_source(f.read_text(encoding="utf-8"), f"{scope}/{sub}/{f.stem}")
+    engine.lua.register_all_commands()
+
+    char = MobInstance(id=1, proto=MobProto(vnum=-1, keywords="tester", short_desc="tester"),
+                       room_vnum=3001, hp=100, max_hp=100, player_id=1,
+                       player_name="tester", player_level=10)
+    session = _NullSession(char)
+    char.session = session
+    room.characters.append(char)
+    return engine, session
+
+
+async def _time(label: str, call, iterations: int, lua: LuaCommandRuntime) -> None:
+    result = {}
+    for enabled in (False, True):
+        lua.watchdog.enabled = enabled
+        random.seed(1)
+        for _ in range(max(1, iterations // 10)):
+            await call()
+        best = float("inf")
+        for _ in range(3):
+            t0 = time.perf_counter()
+            for _ in range(iterations):
+                await call()
+            best = min(best, time.perf_counter() - t0)
+        result[enabled] = best / iterations * 1e6
+    off, on = result[False], result[True]
+    print(f"  {label:8s} off {off:9.1f} us   on {on:9.1f} us   ({on / off:.2f}x)")
+
+
+async def run(opts: argparse.Namespace) -> None:
+    engine, session = build(opts.fights)
+    lua = engine.lua
+    lua.load_source('register_command("spin_bench", function(ctx, args)\n'
+                    '  local n = 0 for i = 1, 200000 do n = n + i % 7 end\nend)',
+                    "bench/spin")
+    spin = lua.wrap_command("spin_bench")
+    look = engine.cmd_handlers["look"]
+
+    print(f"fights={opts.fights} iterations={opts.iterations}")
+    await _time("loop", lambda: spin(session, ""), max(1, opts.iterations // 20), lua)
+    await _time("look", lambda: look(session, ""), opts.iterations, lua)
+    await _time("combat", engine._lua_combat_round, max(1, opts.iterations // 10), lua)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fights", type=int, default=50)
+    parser.add_argument("--iterations", type=int, default=1000)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
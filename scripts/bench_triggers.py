@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Benchmark — tbaMUD trigger boot time and resident memory, eager vs lazy.
+
+  whole   — execute data/tbamud/lua/triggers.lua as one chunk (old boot path)
+  eager   — index + compile every trigger body at boot
+  lazy    — index only (TriggerRuntime.init); bodies compile on first fire
+
+Memory is the Lua heap (collectgarbage "count"), Python allocations made
+during boot (tracemalloc, separate run) and the process resident set after
+boot (fresh interpreter per mode; Linux only). The lazy row also reports
+the cost of fetching one trigger body the first time and again.
+
+Usage:
+    python scripts/bench_triggers.py [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from games.tbamud.triggers import TriggerRuntime  # noqa: E402
+
+DATA_DIR = BASE_DIR / "data" / "tbamud"
+
+
+def _lua_kb(runtime: TriggerRuntime) -> float:
+    runtime._lua.execute("collectgarbage('collect')")
+    return float(runtime._lua.eval("collectgarbage('count')"))
+
+
+def _rss_kb() -> float:
+    """Current resident set size of this process (0 where unsupported)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return 0.0
+    return pages * os.sysconf("SC_PAGE_SIZE") / 1024
+
+
+def _child_rss(mode: str) -> tuple[float, float]:
+    """→ (RSS before boot, RSS after boot) in KB, measured in a fresh process."""
+    out = subprocess.run([sys.executable, __file__, "--rss", mode],
+                         capture_output=True, text=True, check=True).stdout
+    before, after = out.split()
+    return float(before), float(after)
+
+
+def _boot(mode: str, trace: bool = False) -> tuple[float, float, float, TriggerRuntime]:
+    """→ (boot ms, Lua heap KB, Python KB, runtime); Python KB needs *trace*."""
+    runtime = TriggerRuntime(SimpleNamespace(world=None))  # type: ignore[arg-type]
+    if trace:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    if mode == "whole":
+        runtime.init()
+        source = (DATA_DIR / "lua" / "triggers.lua").read_text(encoding="utf-8")
+        try:
+            runtime._lua.execute(source)
+        except Exception:
+            pass  # the generated file does not compile as a whole
+    else:
+        runtime.init(DATA_DIR, cache_size=10**6)
+        if mode == "eager":
+            for vnum in runtime.store.index:
+                runtime.store.get(vnum)
+    elapsed = (time.perf_counter() - t0) * 1000
+    py_kb = 0.0
+    if trace:
+        py_kb = tracemalloc.get_traced_memory()[0] / 1024
+        tracemalloc.stop()
+    return elapsed, _lua_kb(runtime), py_kb, runtime
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--rss", metavar="MODE", help=argparse.SUPPRESS)
+    opts = parser.parse_args()
+    logging.basicConfig(level=logging.CRITICAL)
+    if opts.rss:
+        before = _rss_kb()
+        _boot(opts.rss)
+        print(before, _rss_kb())
+        return
+
+    print(f"{'mode':6s} {'boot':>10s} {'lua_heap':>10s} {'python':>10s} {'rss':>10s}  notes")
+    for mode in ("whole", "eager", "lazy"):
+        runs = [_boot(mode) for _ in range(opts.repeat)]
+        ms = min(r[0] for r in runs)
+        _, lua_kb, py_kb, runtime = _boot(mode, trace=True)
+        rss_before, rss_after = _child_rss(mode)
+        note = f"rss {rss_before / 1024:.1f} -> {rss_after / 1024:.1f} MB"
+        if runtime.store is not None:
+            stats = runtime.store.stats()
+            note += f"; {stats['triggers']} indexed, {stats['compiled']} compiled, " \
+                    f"{stats['broken']} broken"
+        if mode == "lazy":
+            vnum = next(v for v in runtime.store.index if v not in runtime.store.broken)
+            t0 = time.perf_counter()
+            runtime.store.get(vnum)
+            first = (time.perf_counter() - t0) * 1e6
+            t0 = time.perf_counter()
+            runtime.store.get(vnum)
+            again = (time.perf_counter() - t0) * 1e6
+            note += f"; #{vnum} body: compile {first:.0f}us, cached {again:.1f}us"
+        rss_kb = rss_after - rss_before
+        print(f"{mode:6s} {ms:8.1f}ms {lua_kb:8.0f}KB {py_kb:8.0f}KB {rss_kb:8.0f}KB  {note}")
+
+
+if __name__ == "__main__":
+    main()
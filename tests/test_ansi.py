@@ -1,6 +1,6 @@
 """Tests for ANSI color code converter."""
 
-from core.ansi import colorize, strip_ansi, strip_colors
+from core.ansi import ANSI16, ANSI256, STRIP, colorize, colorize_stats, strip_ansi, strip_colors
 
 
 class TestColorize:
@@ -35,6 +35,46 @@ class TestColorize:
         assert "\033[91m" in result
 
 
+class TestColorModes:
+    LINE = "{red}a{rgb_255_128_0}b{fg_196}c{bg_21}d{nope}{reset}"
+
+    def test_truecolor_keeps_extended(self):
+        assert colorize(self.LINE) == (
+            "\033[31ma\033[38;2;255;128;0mb\033[38;5;196mc\033[48;5;21md{nope}\033[0m")
+
+    def test_256_downsamples_rgb(self):
+        assert "\033[38;5;208m" in colorize(self.LINE, ANSI256)
+
+    def test_16_downsamples_everything(self):
+        assert colorize(self.LINE, ANSI16) == (
+            "\033[31ma\033[33mb\033[91mc\033[44md{nope}\033[0m")
+        assert colorize("{fg_9}{bg_rgb}", ANSI16) == "\033[91m{bg_rgb}"
+
+    def test_strip_removes_known_tags_only(self):
+        assert colorize(self.LINE, STRIP) == "abcd{nope}"
+
+    def test_out_of_range_left_as_is(self):
+        assert colorize("{fg_300}{rgb_1_2_256}") == "{fg_300}{rgb_1_2_256}"
+
+
+class TestColorizeCache:
+    def test_plain_text_fast_path(self):
+        before = colorize_stats()["plain"]
+        text = "no tags here"
+        assert colorize(text) is text
+        assert colorize_stats()["plain"] == before + 1
+
+    def test_static_line_cached_per_mode(self):
+        text = "{cyan}unique banner for cache test{reset}"
+        before = colorize_stats()
+        first = colorize(text)
+        assert colorize(text) is first
+        assert colorize(text, STRIP) == "unique banner for cache test"
+        after = colorize_stats()
+        assert after["misses"] == before["misses"] + 2
+        assert after["hits"] == before["hits"] + 1
+
+
 class TestStripColors:
     def test_strip(self):
         assert strip_colors("{red}hello{reset}") == "hello"
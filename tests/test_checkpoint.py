@@ -0,0 +1,163 @@
+"""Tests for world-state checkpoints (snapshot + delta log, restore)."""
+
+import pytest
+
+from core.checkpoint import WorldCheckpointer, capture
+from core.world import Exit, ItemProto, MobProto, ObjInstance, Room, RoomProto, World, Zone
+
+
+def _world():
+    world = World()
+    for vnum in (3001, 3002):
+        exits = [Exit(direction=0, to_vnum=3002, flags=("door", "closed"))] \
+            if vnum == 3001 else []
+        room = Room(proto=RoomProto(vnum=vnum, name=str(vnum), zone_vnum=30, exits=exits))
+        room.init_doors()
+        world.rooms[vnum] = room
+    world.mob_protos[100] = MobProto(vnum=100, max_hp=40, gold=5)
+    for vnum in (200, 201, 202):
+        world.item_protos[vnum] = ItemProto(vnum=vnum, values={"charges": 3})
+    world.zones.append(Zone(vnum=30))
+    return world
+
+
+def _populate(world):
+    guard = world.create_mob(100, 3001)
+    guard.hp = 12
+    sword = world.create_obj(200)
+    sword.worn_by, sword.wear_slot = guard, "wield"
+    guard.equipment["wield"] = sword
+    potion = world.create_obj(201)
+    potion.carried_by = guard
+    guard.inventory.append(potion)
+    bag = world.create_obj(202)
+    bag.values["charges"] = 1
+    coin = world.create_obj(201)
+    coin.in_obj = bag
+    bag.contains.append(coin)
+    world.obj_to_room(bag, 3002)
+    world.rooms[3001].door_states[0] = {"closed": False, "locked": False}
+    world.zones[0].age = 7
+    return guard, bag
+
+
+@pytest.mark.asyncio
+async def test_round_trip(tmp_path):
+    world = _world()
+    _populate(world)
+    await WorldCheckpointer(world, tmp_path).checkpoint()
+
+    fresh = _world()
+    result = WorldCheckpointer(fresh, tmp_path).restore()
+    assert result["mobs"] == 1 and result["objects"] == 4 and result["skipped"] == 0
+    guard = fresh.rooms[3001].characters[0]
+    assert guard.hp == 12 and guard.room_vnum == 3001
+    assert guard.equipment["wield"].worn_by is guard
+    assert guard.equipment["wield"].wear_slot == "wield"
+    assert guard.inventory[0].carried_by is guard
+    bag = fresh.rooms[3002].objects[0]
+    assert bag.values == {"charges": 1} and bag.room_vnum == 3002
+    assert bag.contains[0].in_obj is bag
+    assert fresh.rooms[3001].door_states[0] == {"closed": False, "locked": False}
+    assert fresh.zones[0].age == 7
+    assert capture(fresh) == capture(world)
+
+
+def test_untouched_rooms_are_not_captured():
+    world = _world()
+    assert capture(world) == {}
+
+
+@pytest.mark.asyncio
+async def test_deltas_replayed_and_compacted(tmp_path):
+    world = _world()
+    guard, bag = _populate(world)
+    cp = WorldCheckpointer(world, tmp_path, snapshot_every=2)
+    await cp.checkpoint()
+    world.extract_obj(bag)
+    guard.gold = 99
+    world.dirty_rooms.add(3001)     # in-place change: no hook marks it
+    await cp.checkpoint()
+    assert cp.stats()["deltas"] == 1 and cp.last_rooms_changed == 2
+
+    fresh = _world()
+    WorldCheckpointer(fresh, tmp_path).restore()
+    assert fresh.rooms[3002].objects == []
+    assert fresh.rooms[3001].characters[0].gold == 99
+
+    await cp.checkpoint()       # nothing changed: no record
+    assert cp.stats()["deltas"] == 1
+    guard.gold = 1
+    world.dirty_rooms.add(3001)
+    await cp.checkpoint()
+    guard.gold = 2
+    world.dirty_rooms.add(3001)
+    await cp.checkpoint()       # log full → snapshot, old log removed
+    assert cp.snapshots == 2 and cp.stats()["deltas"] == 0
+    assert [p.name for p in tmp_path.glob("delta.*.log")] == ["delta.2.log"]
+
+
+@pytest.mark.asyncio
+async def test_tick_recaptures_dirty_rooms_and_a_slice(tmp_path):
+    world = _world()
+    for vnum in range(1, 9):
+        world.rooms[vnum] = Room(proto=RoomProto(vnum=vnum, name=str(vnum), zone_vnum=30))
+    guard, _ = _populate(world)
+    cp = WorldCheckpointer(world, tmp_path, snapshot_every=5)
+    cp.prime()                              # full capture at boot
+    assert not world.dirty_rooms
+    world.char_to_room(guard, 3002)         # movement marks both rooms
+    assert world.dirty_rooms == {3001, 3002}
+    await cp.checkpoint()
+    assert cp.last_rooms_captured <= 2 + 2  # dirty rooms + a 1/5 slice of 10
+    assert capture(world) == cp._captured
+    guard.hp = 3                            # in-place: found by the slice
+    for _ in range(5):
+        await cp.checkpoint()
+    assert capture(world) == cp._captured
+
+
+@pytest.mark.asyncio
+async def test_torn_tail_record_ignored(tmp_path):
+    world = _world()
+    guard, _ = _populate(world)
+    cp = WorldCheckpointer(world, tmp_path)
+    await cp.checkpoint()
+    guard.hp = 30
+    world.dirty_rooms.add(3001)
+    await cp.checkpoint()
+    guard.hp = 1
+    world.dirty_rooms.add(3001)
+    await cp.checkpoint()
+    log = tmp_path / "delta.1.log"
+    log.write_bytes(log.read_bytes()[:-3])
+
+    fresh = _world()
+    assert WorldCheckpointer(fresh, tmp_path).restore()["deltas"] == 1
+    assert fresh.rooms[3001].characters[0].hp == 30
+
+
+@pytest.mark.asyncio
+async def test_corpses_and_missing_protos(tmp_path):
+    world = _world()
+    corpse_proto = ItemProto(vnum=-1, short_desc="시체", values={"corpse": True, "timer": 5})
+    corpse = ObjInstance(id=1, proto=corpse_proto, values={"corpse": True, "timer": 2})
+    loot = world.create_obj(200)
+    loot.in_obj = corpse
+    corpse.contains.append(loot)
+    world.obj_to_room(corpse, 3001)
+    await WorldCheckpointer(world, tmp_path).checkpoint()
+
+    fresh = _world()
+    del fresh.item_protos[200]
+    result = WorldCheckpointer(fresh, tmp_path).restore()
+    restored = fresh.rooms[3001].objects[0]
+    assert restored.proto.short_desc == "시체" and restored.values["timer"] == 2
+    assert fresh.timed.remaining(restored) == 2
+    assert restored.contains == [] and result["skipped"] == 1
+
+
+def test_no_checkpoint_and_corrupt_snapshot(tmp_path):
+    assert WorldCheckpointer(_world(), tmp_path).restore() is None
+    (tmp_path / "world.snap").write_bytes(b"garbage")
+    assert WorldCheckpointer(_world(), tmp_path).restore() is None
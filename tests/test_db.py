@@ -93,3 +93,58 @@ class TestDatabase:
         await db.save_player(1, {})
         # Empty data should not trigger query
         mock_conn.execute.assert_not_called()
+
+
+class TestFetchBatches:
+    @pytest.mark.asyncio
+    async def test_streams_until_short_batch(self, db_config):
+        db = Database(db_config)
+        batches = [[1, 2], [3, 4], [5]]
+        cur = MagicMock()
+        cur.fetch = AsyncMock(side_effect=batches)
+        conn = MagicMock()
+        conn.cursor = AsyncMock(return_value=cur)
+        conn.transaction.return_value.__aenter__ = AsyncMock()
+        conn.transaction.return_value.__aexit__ = AsyncMock(return_value=False)
+        pool = MagicMock()
+        pool.acquire.return_value.__aenter__ = AsyncMock(return_value=conn)
+        pool.acquire.return_value.__aexit__ = AsyncMock()
+        db._pool = pool
+
+        got = [rows async for rows in db.fetch_batches("rooms", batch_size=2)]
+        assert got == batches
+        assert cur.fetch.await_count == 3
+        conn.cursor.assert_awaited_once_with("SELECT * FROM rooms")
+
+
+class TestLuaSeedQueries:
+    def _db(self, db_config, conn):
+        db = Database(db_config)
+        pool = MagicMock()
+        pool.acquire.return_value.__aenter__ = AsyncMock(return_value=conn)
+        pool.acquire.return_value.__aexit__ = AsyncMock()
+        db._pool = pool
+        return db
+
+    @pytest.mark.asyncio
+    async def test_hashes_in_one_query(self, db_config):
+        conn = AsyncMock()
+        conn.fetch = AsyncMock(return_value=[
+            {"game": "common", "category": "lib", "name": "lib", "hash": "abc"}])
+        db = self._db(db_config, conn)
+        assert await db.lua_script_hashes(("common", "3eyes")) == {
+            ("common", "lib", "lib"): "abc"}
+        query, games = conn.fetch.await_args.args
+        assert "md5(source)" in query and games == ["common", "3eyes"]
+
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_single_statement(self, db_config):
+        conn = AsyncMock()
+        db = self._db(db_config, conn)
+        await db.upsert_lua_scripts([])
+        conn.execute.assert_not_called()
+        await db.upsert_lua_scripts([("common", "lib", "lib", "a"), ("3eyes", "cmd", "x", "b")])
+        assert conn.execute.await_count == 1
+        query, *cols = conn.execute.await_args.args
+        assert "unnest" in query and "IS DISTINCT FROM" in query
+        assert cols == [["common", "3eyes"], ["lib", "cmd"], ["lib", "x"], ["a", "b"]]
@@ -0,0 +1,206 @@
+"""Tests for the embedded SQLite backend (real sqlite3, no server)."""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+import yaml
+
+from core.db import Database, create_database
+from core.db_sqlite import SqliteDatabase, iter_seed_rows, parse_pg_array, translate_schema
+from core.world import World
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+SEED = """BEGIN;
+-- proto data
+INSERT INTO rooms (vnum, zone_vnum, name, description, sector, flags, extra_descs) VALUES
+ (3001, 30, '신전', 'It''s a temple.', 0, '{indoors,"no mob"}',
+  '[{"keywords": "altar", "description": "stone"}]'::jsonb),
+ (3002, 30, 'Hall', E'Line\\nTwo', 1, ARRAY['dark'], '[]');
+INSERT INTO room_exits (from_vnum, direction, to_vnum) VALUES (3001, 0, 3002);
+INSERT INTO classes (id, name, abbrev, hp_gain) VALUES (0, '마법사', 'Mu', '[3,9)');
+INSERT INTO skills (id, name, violent) VALUES (1, 'kick', true);
+INSERT INTO game_configs (key, value) VALUES ('mud_name', '"GenOS"'), ('max_level', '34');
+INSERT INTO zones (vnum, name, level_range) VALUES (30, 'Midgaard', '[1,31)')
+ ON CONFLICT DO NOTHING;
+SELECT setval('help_entries_id_seq', 1);
+COMMIT;
+"""
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    sql = tmp_path / "sql"
+    sql.mkdir()
+    (sql / "schema.sql").write_text(
+        (BASE_DIR / "data" / "3eyes" / "sql" / "schema.sql").read_text(encoding="utf-8"),
+        encoding="utf-8")
+    (sql / "seed_data.sql").write_text(SEED, encoding="utf-8")
+    return tmp_path
+
+
+@pytest.fixture
+async def db(data_dir):
+    db = SqliteDatabase({"backend": "sqlite", "path": ":memory:"})
+    await db.connect()
+    await db.auto_init(data_dir)
+    await db.ensure_players_table()
+    await db.ensure_lua_scripts_table()
+    yield db
+    await db.close()
+
+
+class TestTranslation:
+    @pytest.mark.parametrize("game", ["tbamud", "3eyes", "simoon", "10woongi"])
+    def test_game_schemas_apply(self, game):
+        schema = (BASE_DIR / "data" / game / "sql" / "schema.sql").read_text(encoding="utf-8")
+        conn = sqlite3.connect(":memory:")
+        conn.executescript(translate_schema(schema))
+        names = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        assert {"rooms", "item_protos", "players", "lua_scripts"} <= names
+
+    def test_pg_array_literal(self):
+        assert parse_pg_array('{a,"b c",NULL,"x\\"y"}') == ["a", "b c", None, 'x"y']
+        assert parse_pg_array("{}") == []
+
+    def test_seed_statements(self):
+        stmts = list(iter_seed_rows(SEED))
+        inserts = [s for kind, s in stmts if kind == "insert"]
+        assert [t for t, *_ in inserts][:2] == ["rooms", "room_exits"]
+        _, cols, rows, _ = inserts[0]
+        assert cols[:3] == ["vnum", "zone_vnum", "name"]
+        assert rows[0][3] == "It's a temple." and rows[1][3] == "Line\nTwo"
+        assert rows[1][5] == ["dark"]
+        assert inserts[-1][3] == "IGNORE"
+
+
+class TestSqliteDatabase:
+    def test_backend_from_config(self):
+        assert isinstance(create_database({"backend": "sqlite", "path": ":memory:"}),
+                          SqliteDatabase)
+        assert type(create_database({"host": "x"})) is Database
+        with pytest.raises(ValueError):
+            create_database({"backend": "mysql"})
+
+    @pytest.mark.asyncio
+    async def test_rows_decoded_like_asyncpg(self, db):
+        rooms = {r["vnum"]: r for r in await db.fetch_all("rooms")}
+        assert rooms[3001]["flags"] == ["indoors", "no mob"]
+        assert rooms[3001]["extra_descs"][0]["keywords"] == "altar"
+        assert rooms[3002]["ext"] == {}
+        skill = await db.fetch_one("skills", "id", 1)
+        assert skill["violent"] is True and skill["routines"] == []
+
+    @pytest.mark.asyncio
+    async def test_world_loads(self, db):
+        world = World()
+        await world.load_from_db(db)
+        assert set(world.rooms) == {3001, 3002}
+        assert world.rooms[3001].proto.exits[0].to_vnum == 3002
+        assert world.classes[0].hp_gain == (3, 8)
+        assert world.game_configs["mud_name"] == "GenOS"
+        assert world.game_configs["max_level"] == 34
+
+    @pytest.mark.asyncio
+    async def test_auto_init_idempotent_and_force(self, db, data_dir):
+        await db.execute("DELETE FROM room_exits")
+        await db.auto_init(data_dir)
+        assert await db.fetch_all("room_exits") == []
+        await db.auto_init(data_dir, force=True)
+        assert len(await db.fetch_all("room_exits")) == 1
+
+    @pytest.mark.asyncio
+    async def test_fetch_batches(self, db):
+        batches = [rows async for rows in db.fetch_batches("rooms", batch_size=1)]
+        assert [len(b) for b in batches] == [1, 1]
+        assert batches[0][0]["flags"] == ["indoors", "no mob"]
+
+    @pytest.mark.asyncio
+    async def test_fingerprints_track_content(self, db):
+        before = await db.table_fingerprints(["rooms", "zones"])
+        assert before == await db.table_fingerprints(["zones", "rooms"])
+        await db.execute("UPDATE rooms SET name = $1 WHERE vnum = $2", "Temple", 3001)
+        after = await db.table_fingerprints(["rooms", "zones"])
+        assert after["rooms"] != before["rooms"] and after["zones"] == before["zones"]
+
+    @pytest.mark.asyncio
+    async def test_player_crud(self, db):
+        row = await db.create_player(name="Alice", password_hash="h", sex=1,
+                                     class_id=0, start_room=3001)
+        assert row["stats"] == {} and row["flags"] == [] and row["last_login"] is None
+        await db.save_players([(row["id"], {"hp": 5, "skills": {"kick": 3}}), (99, {})])
+        loaded = await db.fetch_player("aLiCe")
+        assert loaded["hp"] == 5 and loaded["skills"] == {"kick": 3}
+        stored = await db.fetch_one("players", "id", row["id"])
+        assert stored["skills"] == {"kick": 3} and stored["last_login"] is not None
+        assert db.bytes_written == 8 + len('{"kick": 3}')
+        await db.save_player(row["id"], {"gold": 10})
+        assert (await db.fetch_player("alice"))["gold"] == 10
+        assert await db.fetch_player("bob") is None
+
+    @pytest.mark.asyncio
+    async def test_name_lookup_uses_lower_index(self, db):
+        plan = await db._call(lambda: db.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM players WHERE LOWER(name) = LOWER(?)",
+            ("x",)).fetchall())
+        assert "idx_players_lower_name" in str(plan)
+
+    @pytest.mark.asyncio
+    async def test_lua_scripts(self, db):
+        first = await db.upsert_lua_script(game="3eyes", category="cmd", name="look", source="a")
+        again = await db.upsert_lua_script(game="3eyes", category="cmd", name="look", source="b")
+        await db.upsert_lua_script(game="3eyes", category="base", name="z", source="c")
+        assert (first["version"], again["version"]) == (1, 2)
+        assert [r["name"] for r in await db.fetch_lua_scripts("3eyes")] == ["z", "look"]
+        assert (await db.fetch_lua_script("3eyes", "cmd", "look"))["source"] == "b"
+        assert await db.lua_scripts_count() == 2
+
+    @pytest.mark.asyncio
+    async def test_bulk_lua_upsert_keeps_unchanged_versions(self, db):
+        from core.db import lua_source_hash
+
+        await db.upsert_lua_scripts([("g", "cmd", "a", "x"), ("g", "cmd", "b", "y")])
+        await db.upsert_lua_scripts([("g", "cmd", "a", "x"), ("g", "cmd", "b", "z")])
+        versions = {r["name"]: r["version"] for r in await db.fetch_lua_scripts("g")}
+        assert versions == {"a": 1, "b": 2}
+        hashes = await db.lua_script_hashes(["g", "other"])
+        assert hashes[("g", "cmd", "b")] == lua_source_hash("z")
+
+    @pytest.mark.asyncio
+    async def test_reseed_from_files_is_a_no_op(self, db):
+        from core.lua_commands import LuaCommandRuntime
+        from tests.test_lua_framework import _make_engine
+
+        runtime = LuaCommandRuntime(_make_engine())
+        first = await runtime.seed_from_files(db, "tbamud")
+        again = await runtime.seed_from_files(db, "tbamud")
+        assert first["skipped"] == 0 and first["updated"] > 0
+        assert again == {"updated": 0, "skipped": first["updated"]}
+        rows = await db.fetch_lua_scripts("common")
+        assert rows and {r["version"] for r in rows} == {1}
+
+
+@pytest.mark.asyncio
+async def test_engine_boots_on_sqlite(tmp_path):
+    from core.engine import Engine
+
+    cfg = yaml.safe_load((BASE_DIR / "config" / "tbamud.yaml").read_text(encoding="utf-8"))
+    cfg["database"] = {"backend": "sqlite", "path": str(tmp_path / "genos.sqlite3")}
+    cfg["network"]["telnet_port"] = 0
+    cfg["engine"]["world_snapshot"] = False
+    cfg["engine"]["checkpoint_interval"] = 0
+    cfg["dev"]["hot_reload"] = False
+    path = tmp_path / "tbamud.yaml"
+    path.write_text(yaml.safe_dump(cfg, allow_unicode=True), encoding="utf-8")
+
+    engine = Engine(path)
+    await engine.boot()
+    try:
+        assert isinstance(engine.db, SqliteDatabase)
+        assert await engine.db.lua_scripts_count() > 0
+        assert engine.lua.command_count > 0
+        assert engine.boot_timings["lua_seed"]["updated"] > 0
+        assert engine.boot_timings["world_state"]["source"] == "zone_resets"
+    finally:
+        await engine.shutdown()
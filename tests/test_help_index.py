@@ -0,0 +1,56 @@
+"""Tests for the help index — exact, prefix, choseong, incremental updates."""
+
+from core.help_index import CHOSEONG, EXACT, PREFIX, SUBSTRING, WORD_PREFIX, HelpIndex, choseong
+from core.world import World
+
+ENTRIES = [
+    {"keywords": ["LOOK", "l"], "body": "Look around."},
+    {"keywords": ["LOCK"], "body": "Lock a door."},
+    {"keywords": ["MAGIC MISSILE"], "body": "A bolt."},
+    {"keywords": ["도움말", "help"], "body": "도움말 사용법."},
+    {"keywords": "SCORE", "body": "Your stats."},
+]
+
+
+def _keys(matches):
+    return [(m.keyword, m.rank) for m in matches]
+
+
+class TestHelpIndex:
+    def test_exact_before_prefix(self):
+        idx = HelpIndex(ENTRIES)
+        assert _keys(idx.search("l")) == [("l", EXACT), ("LOCK", PREFIX)]
+        assert _keys(idx.search("  Lo ")) == [("LOOK", PREFIX), ("LOCK", PREFIX)]
+
+    def test_word_prefix_and_substring(self):
+        idx = HelpIndex(ENTRIES)
+        assert _keys(idx.search("mis")) == [("MAGIC MISSILE", WORD_PREFIX)]
+        assert _keys(idx.search("cor")) == [("SCORE", SUBSTRING)]
+        assert idx.search("zzz") == []
+
+    def test_choseong(self):
+        assert choseong("도움말 help") == "ㄷㅇㅁ help"
+        assert _keys(HelpIndex(ENTRIES).search("ㄷㅇ")) == [("도움말", CHOSEONG)]
+        assert HelpIndex(ENTRIES, choseong_search=False).search("ㄷㅇ") == []
+
+    def test_incremental_update(self):
+        idx = HelpIndex(list(ENTRIES))
+        entry_id = idx.id_of(ENTRIES[1])
+        new_id = idx.update(entry_id, {"keywords": ["UNLOCK"], "body": "Unlock."})
+        assert [m.keyword for m in idx.search("lo")] == ["LOOK"]
+        idx.remove(new_id)
+        assert idx.search("unlock") == [] and len(idx) == 4
+
+
+class TestWorldHelp:
+    def test_index_follows_entries(self):
+        w = World()
+        w.help_entries = [dict(e) for e in ENTRIES]
+        assert w.help_index.search("score")[0].rank == EXACT
+        w.add_help_entry({"keywords": ["SCAN"], "body": "Scan."})
+        old = w.help_entries[0]
+        w.update_help_entry(old, {"keywords": ["GLANCE"], "body": "Glance."})
+        assert w.help_index.search("look") == []
+        assert w.help_index.search("glance")[0].entry["body"] == "Glance."
+        w.remove_help_entry(w.help_entries[-1])
+        assert w.help_index.search("scan") == [] and len(w.help_index) == 5
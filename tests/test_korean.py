@@ -1,7 +1,7 @@
 """Tests for Korean language utilities."""
 
 import pytest
-from core.korean import has_batchim, particle, render_message
+from core.korean import compile_template, has_batchim, particle, render_message
 
 
 class TestHasBatchim:
@@ -83,3 +83,34 @@ class TestRenderMessage:
     def test_particle_object_no_batchim(self):
         result = render_message("{item}을(를) 주웠습니다", item="도끼")
         assert "도끼를" in result
+
+
+class TestCompiledTemplates:
+    def test_segments_cached_and_folded(self):
+        segs = compile_template("{exp}을(를) 얻고 칼(으)로 벤다")
+        assert compile_template("{exp}을(를) 얻고 칼(으)로 벤다") is segs
+        assert [kind for kind, _, _ in segs] == [1, 2, 0]
+        assert segs[2][1] == " 얻고 칼로 벤다"
+
+    def test_brace_particles_and_rieul(self):
+        assert render_message("{a}{이/가} {b}(으)로", a="도끼", b="칼") == "도끼가 칼로"
+        assert render_message("{a}과(와) {b}이다(다)", a="검", b="나") == "검과 나다"
+
+    def test_particle_without_word_and_missing_var(self):
+        assert render_message("이(가) {red}{x}", y="-") == "이(가) {red}{x}"
+        assert render_message("{x} 을(를)", x="검") == "검 을(를)"
+
+    def test_empty_value_uses_text_before(self):
+        assert render_message("{x}{y}을(를)", x="검", y="") == "검을"
+
+
+class TestSocialParticles:
+    def test_subst_social_resolves_particles(self):
+        from types import SimpleNamespace
+        from core.engine import Engine
+
+        actor, target = SimpleNamespace(name="철수"), SimpleNamespace(name="영희")
+        assert Engine._subst_social("$n이(가) $N을(를) 안습니다.", actor, target) \
+            == "철수가 영희를 안습니다."
+        assert Engine._subst_social("$n이(가) $s 팔을 봅니다 $N", actor) \
+            == "철수가 그의 팔을 봅니다 $N"
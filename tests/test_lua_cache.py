@@ -0,0 +1,81 @@
+"""Tests for the Lua bytecode cache."""
+
+import pytest
+from lupa import LuaError, LuaRuntime
+from unittest.mock import MagicMock
+
+from core.lua_cache import LOAD_CHUNK_FN, LuaBytecodeCache
+from core.lua_commands import LuaCommandRuntime
+
+
+def _loader():
+    lua = LuaRuntime(unpack_returned_tuples=True)
+    return lua, lua.eval(LOAD_CHUNK_FN)
+
+
+class TestLuaBytecodeCache:
+    def test_miss_then_hit(self, tmp_path):
+        cache = LuaBytecodeCache(tmp_path)
+        lua, load_chunk = _loader()
+        fn = cache.load(load_chunk, "answer = 40 + 2", "=t/a")
+        fn()
+        assert lua.globals().answer == 42
+        assert (cache.hits, cache.misses) == (0, 1)
+        assert len(list(tmp_path.glob("*.luac"))) == 1
+
+        # A fresh cache (next boot) loads the stored bytecode
+        cache2 = LuaBytecodeCache(tmp_path)
+        lua2, load_chunk2 = _loader()
+        cache2.load(load_chunk2, "answer = 40 + 2", "=t/a")()
+        assert lua2.globals().answer == 42
+        assert (cache2.hits, cache2.misses) == (1, 0)
+
+    def test_source_change_is_new_entry(self, tmp_path):
+        cache = LuaBytecodeCache(tmp_path)
+        _, load_chunk = _loader()
+        cache.load(load_chunk, "x = 1", "=t/x")
+        cache.load(load_chunk, "x = 2", "=t/x")
+        assert cache.misses == 2
+        assert len(list(tmp_path.glob("*.luac"))) == 2
+
+    def test_corrupt_entry_falls_back_to_source(self, tmp_path):
+        cache = LuaBytecodeCache(tmp_path)
+        lua, load_chunk = _loader()
+        cache.load(load_chunk, "y = 7", "=t/y")
+        entry = next(tmp_path.glob("*.luac"))
+        entry.write_bytes(b"\x1bLua garbage")
+
+        cache.load(load_chunk, "y = 7", "=t/y")()
+        assert lua.globals().y == 7
+        assert not entry.exists()
+
+    def test_syntax_error_propagates(self, tmp_path):
+        cache = LuaBytecodeCache(tmp_path)
+        _, load_chunk = _loader()
+        with pytest.raises(LuaError):
+            cache.load(load_chunk, "this is not lua", "=t/bad")
+        assert list(tmp_path.glob("*.luac")) == []
+
+
+class TestRuntimeBytecodeCache:
+    @pytest.mark.asyncio
+    async def test_load_from_db_uses_cache(self, tmp_path):
+        rows = [
+            {"game": "common", "category": "commands", "name": "ping",
+             "source": 'register_command("ping", function(ctx, args) end, "핑")',
+             "version": 1},
+        ]
+
+        async def mock_fetch(game):
+            return rows if game == "common" else []
+
+        db = MagicMock()
+        db.fetch_lua_scripts = mock_fetch
+
+        for expected_hits in (0, 1):
+            cache = LuaBytecodeCache(tmp_path)
+            runtime = LuaCommandRuntime(MagicMock(), bytecode_cache=cache)
+            assert await runtime.load_from_db(db, "tbamud") == 1
+            assert runtime.has_command("ping")
+            assert runtime.get_korean_cmd("핑") == "ping"
+            assert cache.hits == expected_hits
@@ -171,6 +171,128 @@ class TestLuaCombatRoundHook:
         assert ch.experience > 0
 
 
+class TestLuaCombatRoundBatch:
+    def test_batch_hook_registered(self):
+        eng = _make_engine()
+        assert eng.lua.has_hook("combat_round_batch")
+        assert eng.lua.has_hook("combat_round")
+
+    @pytest.mark.asyncio
+    async def test_one_lua_call_per_round(self):
+        random.seed(7)
+        w = _make_world()
+        eng = _make_engine(w)
+        ch = _player(level=20, class_id=3, room_vnum=3002)
+        session = _make_session(eng, ch)
+        mobs = [_npc(level=1, hp=500, room_vnum=3002) for _ in range(3)]
+        for i, mob in enumerate(mobs):
+            mob.id = 100 + i
+            mob.fighting = ch
+        w.rooms[3002].characters.extend([ch, *mobs])
+        ch.fighting = mobs[0]
+        ch.position = 7
+
+        calls = []
+        orig_call = eng.lua._call_lua
+        eng.lua._call_lua = lambda cat, name, *a, **kw: (calls.append(name),
+                                                          orig_call(cat, name, *a, **kw))
+        await eng._lua_combat_round()
+
+        assert calls == ["combat_round_batch"]
+        # All four attackers swung; the player's messages arrive in one send
+        assert session.send_line.call_count == 1
+        text = session.send_line.call_args[0][0]
+        assert text.count("고블린") >= 3
+
+    @pytest.mark.asyncio
+    async def test_dead_target_skipped_within_batch(self):
+        w = _make_world()
+        eng = _make_engine(w)
+        ch = _player(level=30, class_id=3, room_vnum=3002)
+        ch.hitroll = 20
+        _make_session(eng, ch)
+        mob = _npc(level=1, hp=1, room_vnum=3002)
+        w.rooms[3002].characters.extend([ch, mob])
+        ch.fighting = mob
+        mob.fighting = ch
+        ch.position = 7
+
+        orig = random.randint
+        random.randint = lambda a, b: 20 if b == 20 else orig(a, b)
+        try:
+            await eng._lua_combat_round()
+        finally:
+            random.randint = orig
+
+        # Mob died in the batch: it must not have swung back, death ran once
+        assert mob not in w.rooms[3002].characters
+        assert ch.hp == 100
+        assert ch.fighting is None
+
+    @pytest.mark.asyncio
+    async def test_per_pair_fallback(self):
+        w = _make_world()
+        eng = _make_engine(w)
+        eng.lua._hooks.pop("combat_round_batch")
+        ch = _player(level=20, class_id=3, room_vnum=3002)
+        session = _make_session(eng, ch)
+        mob = _npc(level=1, hp=500, room_vnum=3002)
+        w.rooms[3002].characters.extend([ch, mob])
+        ch.fighting = mob
+        ch.position = 7
+        await eng._lua_combat_round()
+        assert session.send_line.call_count >= 1
+
+    @pytest.mark.asyncio
+    async def test_quarantined_batch_falls_back_per_pair(self):
+        w = _make_world()
+        eng = _make_engine(w)
+        watchdog = eng.lua.watchdog
+        [batch_fn] = eng.lua._hooks["combat_round_batch"]
+        watchdog.quarantined.add(watchdog._source_of(batch_fn))
+        ch = _player(level=20, class_id=3, room_vnum=3002)
+        session = _make_session(eng, ch)
+        mobs = [_npc(level=1, hp=500, room_vnum=3002) for _ in range(2)]
+        for i, mob in enumerate(mobs):
+            mob.id = 100 + i
+            mob.fighting = ch
+        w.rooms[3002].characters.extend([ch, *mobs])
+        ch.fighting = mobs[0]
+        ch.position = 7
+
+        calls = []
+        orig_call = eng.lua._call_lua
+        eng.lua._call_lua = lambda cat, name, *a, **kw: (calls.append(name),
+                                                          orig_call(cat, name, *a, **kw))
+        await eng._lua_combat_round()
+
+        assert calls == ["combat_round"] * 3
+        assert session.send_line.call_count >= 1
+
+    def test_batch_budget_scales_with_fights(self):
+        from core.lua_watchdog import Budget
+        eng = _make_engine()
+        eng.lua.watchdog.budgets["hook"] = Budget(instructions=20_000, ms=1000)
+        eng.lua.load_source(
+            'register_hook("busy_batch", function(ctx, rows)\n'
+            '  for _ = 1, #rows do local n = 0 for i = 1, 3000 do n = n + i end end\n'
+            'end)', "test/busy")
+        ctx = eng.lua.acquire_hook_context(None)
+        assert eng.lua.fire_batch_hook("busy_batch", ctx, [(None,)] * 20)
+        assert eng.lua.watchdog.aborts == 0
+
+    def test_hook_send_room_explicit_room(self):
+        w = _make_world()
+        eng = _make_engine(w)
+        ch = _player(room_vnum=3001)
+        session = _make_session(eng, ch)
+        w.rooms[3001].characters.append(ch)
+        ctx = HookContext(eng, None, lua_runtime=eng.lua._lua)
+        ctx.send_room("쾅!")                  # no room → dropped
+        ctx.send_room("쾅!", w.rooms[3001])
+        assert ctx._messages == [(session, "\r\n쾅!")]
+
+
 # ── Cast command tests ────────────────────────────────────────
 
 
@@ -170,6 +170,109 @@ class TestLuaCommandRuntime:
         assert runtime.has_command("mutable")
 
 
+class TestScriptOwnership:
+    _COMBAT = """
+        register_command("bash", function(ctx, args) ctx:send("bash") end, "강타")
+        register_hook("combat_round", function(ctx) ctx:send("round") end)
+    """
+
+    def _runtime(self):
+        engine = _make_engine()
+        runtime = LuaCommandRuntime(engine)
+        engine.lua = runtime
+        return engine, runtime
+
+    def test_reload_does_not_duplicate_hooks(self):
+        _, runtime = self._runtime()
+        runtime.load_source(self._COMBAT, "tbamud/combat/thac0")
+        runtime.reload_script(self._COMBAT, "tbamud/combat/thac0")
+        runtime.reload_script(self._COMBAT, "tbamud/combat/thac0")
+        assert runtime.hook_count == 1
+
+    def test_hooks_keep_load_order(self):
+        _, runtime = self._runtime()
+        runtime.load_source('register_hook("tick", function() return 1 end)', "common/a")
+        runtime.load_source('register_hook("tick", function() return 2 end)', "common/b")
+        runtime.reload_script('register_hook("tick", function() return 10 end)', "common/a")
+        assert [fn() for fn in runtime._hooks["tick"]] == [10, 2]
+
+    def test_removed_command_unregistered(self):
+        engine, runtime = self._runtime()
+        runtime.load_source(self._COMBAT, "tbamud/combat/thac0")
+        runtime.register_all_commands()
+        changes = runtime.reload_script(
+            'register_command("kick", function() end, "차기")', "tbamud/combat/thac0")
+        assert changes["added"] == ["kick"] and changes["removed"] == ["bash"]
+        assert not runtime.has_command("bash")
+        assert runtime.get_korean_cmd("강타") is None
+        assert not runtime.has_hook("combat_round")
+        assert "bash" not in engine.cmd_handlers and "강타" not in engine.cmd_korean
+        assert "kick" in engine.cmd_handlers and engine.cmd_korean["차기"] == "kick"
+        engine._load_korean_mappings.assert_called_with({"kick"})
+
+    @pytest.mark.asyncio
+    async def test_body_change_needs_no_rewrap(self):
+        engine, runtime = self._runtime()
+        runtime.load_source(self._COMBAT, "tbamud/combat/thac0")
+        runtime.register_all_commands()
+        handler = engine.cmd_handlers["bash"]
+        runtime.reload_script(
+            'register_command("bash", function(ctx) ctx:send("v2") end, "강타")',
+            "tbamud/combat/thac0")
+        assert engine.cmd_handlers["bash"] is handler
+        session = _make_session(engine)
+        await handler(session, "")
+        session.send_line.assert_any_call("v2")
+
+    def test_game_override_survives_common_reload(self):
+        _, runtime = self._runtime()
+        runtime.load_source('register_command("look", function() return "common" end)',
+                            "common/commands/core")
+        runtime.load_source('register_command("look", function() return "game" end)',
+                            "tbamud/commands/look")
+        runtime.reload_script('register_command("look", function() return "common2" end)',
+                              "common/commands/core")
+        assert runtime._commands["look"]() == "game"
+        # Removing the override falls back to the common command
+        runtime.unload_script("tbamud/commands/look")
+        assert runtime._commands["look"]() == "common2"
+
+    def test_failed_reload_keeps_registrations(self):
+        _, runtime = self._runtime()
+        runtime.load_source(self._COMBAT, "tbamud/combat/thac0")
+        with pytest.raises(Exception):
+            runtime.reload_script('register_command("half", function() end)\n'
+                                  'error("broken")', "tbamud/combat/thac0")
+        assert runtime.has_command("bash") and not runtime.has_command("half")
+        assert runtime.hook_count == 1
+        assert runtime.loaded_scripts["tbamud/combat/thac0"] == self._COMBAT
+
+    @pytest.mark.asyncio
+    async def test_reload_from_db_only_changed(self):
+        engine, runtime = self._runtime()
+        rows = {
+            "common": [{"game": "common", "category": "commands", "name": "a",
+                        "source": 'register_command("a", function() end)'}],
+            "tbamud": [{"game": "tbamud", "category": "combat", "name": "thac0",
+                        "source": self._COMBAT}],
+        }
+        db = MagicMock()
+
+        async def mock_fetch(game):
+            return rows[game]
+
+        db.fetch_lua_scripts = mock_fetch
+        await runtime.load_from_db(db, "tbamud")
+        rows["tbamud"][0]["source"] = self._COMBAT + "\n-- edited"
+        rows["common"] = []
+        result = await runtime.reload_from_db(db, "tbamud")
+        assert result["reloaded"] == ["tbamud/combat/thac0"]
+        assert result["removed"] == ["common/commands/a"]
+        assert result["unchanged"] == 0
+        assert not runtime.has_command("a")
+        assert runtime.hook_count == 1
+
+
 # ── CommandContext tests ─────────────────────────────────────────
 
 
@@ -445,6 +548,20 @@ class TestCommandContext:
 
 # ── Lua command execution (wrap_command) ─────────────────────────
 
+    def test_get_game_table_shared_without_copy(self):
+        engine = _make_engine()
+        engine.world.compile_game_tables({
+            "thac0": [({"class_id": 0, "level": lv}, 20 - lv) for lv in range(3)],
+        })
+        runtime = LuaCommandRuntime(engine)
+        engine.lua = runtime
+        ctx = CommandContext(_make_session(engine), engine)
+        tbl = ctx.get_game_table("thac0")
+        assert tbl is engine.world.compiled_tables["thac0"].data
+        fn = runtime._lua.eval("function(ctx) return ctx:get_game_table('thac0')[0][2] end")
+        assert fn(ctx) == 18
+        assert ctx.get_game_table("missing") is None
+
 
 class TestLuaCommandExecution:
     @pytest.mark.asyncio
@@ -670,21 +787,49 @@ class TestSeedAndLoad:
         db = MagicMock()
         upserted = []
 
-        async def mock_upsert(**kwargs):
-            upserted.append(kwargs)
-            return {"game": kwargs["game"], "category": kwargs["category"],
-                    "name": kwargs["name"], "source": kwargs["source"],
-                    "version": 1, "updated_at": "now"}
+        async def mock_hashes(games):
+            assert tuple(games) == ("common", "tbamud")
+            return {}
+
+        async def mock_upsert(scripts):
+            upserted.extend(scripts)
 
-        db.upsert_lua_script = mock_upsert
+        db.lua_script_hashes = mock_hashes
+        db.upsert_lua_scripts = mock_upsert
 
-        count = await runtime.seed_from_files(db, "tbamud")
+        result = await runtime.seed_from_files(db, "tbamud")
         # Should have seeded at least lib.lua and commands/core.lua from common
-        assert count >= 2
-        names = [u["name"] for u in upserted]
+        assert result["updated"] >= 2 and result["skipped"] == 0
+        names = [name for _, _, name, _ in upserted]
         assert "lib" in names
         assert "core" in names
 
+    @pytest.mark.asyncio
+    async def test_seed_skips_unchanged_by_hash(self):
+        from core.db import lua_source_hash
+
+        runtime = LuaCommandRuntime(_make_engine())
+        db = MagicMock()
+        written = []
+        stored: dict = {}
+
+        async def mock_hashes(games):
+            return dict(stored)
+
+        async def mock_upsert(scripts):
+            written.append(list(scripts))
+            stored.update({s[:3]: lua_source_hash(s[3]) for s in scripts})
+
+        db.lua_script_hashes = mock_hashes
+        db.upsert_lua_scripts = mock_upsert
+
+        first = await runtime.seed_from_files(db, "tbamud")
+        key = ("common", "lib", "lib")
+        stored[key] = lua_source_hash("-- older lib")
+        second = await runtime.seed_from_files(db, "tbamud")
+        assert second == {"updated": 1, "skipped": first["updated"] - 1}
+        assert [s[:3] for s in written[-1]] == [key]
+
     @pytest.mark.asyncio
     async def test_load_from_db(self):
         engine = _make_engine()
@@ -746,6 +891,137 @@ class TestHookContext:
         session.send_line.assert_awaited_once_with("hello")
 
 
+# ── Context pooling / lazy Lua views ─────────────────────────────
+
+
+class TestContextPool:
+    @pytest.mark.asyncio
+    async def test_command_context_reused(self):
+        engine = _make_engine()
+        session = _make_session(engine, 3001)
+        runtime = LuaCommandRuntime(engine)
+        seen = []
+        runtime.load_source("""
+            register_command("ping", function(ctx, args)
+                ctx:send("pong")
+            end)
+        """)
+        real_acquire = runtime.acquire_context
+
+        def spy(sess):
+            ctx = real_acquire(sess)
+            seen.append(ctx)
+            return ctx
+
+        runtime.acquire_context = spy
+        handler = runtime.wrap_command("ping")
+        await handler(session, "")
+        await handler(session, "")
+        assert seen[0] is seen[1]
+        assert seen[0]._session is None
+        assert seen[0]._messages == []
+        assert session.send_line.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_context_released_after_error(self):
+        engine = _make_engine()
+        session = _make_session(engine, 3001)
+        runtime = LuaCommandRuntime(engine)
+        runtime.load_source("""
+            register_command("broken", function(ctx, args)
+                ctx:defer_save()
+                error("boom")
+            end)
+        """)
+        handler = runtime.wrap_command("broken")
+        await handler(session, "")
+        assert len(runtime._ctx_pool) == 1
+        assert runtime._ctx_pool[0]._deferred == []
+
+    def test_hook_context_pool(self):
+        engine = _make_engine()
+        runtime = LuaCommandRuntime(engine)
+        room1 = engine.world.rooms[3001]
+        room2 = engine.world.rooms[3002]
+        ctx = runtime.acquire_hook_context(room1)
+        assert ctx._room is room1
+        runtime.release_context(ctx)
+        again = runtime.acquire_hook_context(room2)
+        assert again is ctx
+        assert again._room is room2
+        assert runtime.acquire_context(MagicMock()) is not ctx
+
+
+class TestLuaViews:
+    def _run(self, engine, session, body):
+        runtime = LuaCommandRuntime(engine)
+        runtime.load_source(
+            'register_command("t", function(ctx, args)\n' + body + '\nend)'
+        )
+        ctx = runtime.acquire_context(session)
+        runtime._commands["t"](ctx, "")
+        return [msg for _, msg in ctx._messages]
+
+    def test_view_len_index_ipairs(self):
+        engine = _make_engine()
+        session = _make_session(engine, 3001)
+        msgs = self._run(engine, session, """
+            local chars = ctx:get_characters()
+            ctx:send("n=" .. #chars)
+            ctx:send("first=" .. chars[1].name)
+            ctx:send("none=" .. tostring(chars[0]) .. tostring(chars[2]))
+            local c = 0
+            for i, ch in ipairs(chars) do c = c + 1 end
+            for k, ch in pairs(chars) do c = c + 1 end
+            ctx:send("iter=" .. c)
+        """)
+        assert msgs == ["n=1", "first=테스터", "none=nilnil", "iter=2"]
+
+    def test_view_is_snapshot(self):
+        engine = _make_engine()
+        session = _make_session(engine, 3001)
+        proto = ItemProto(vnum=10, keywords="돌", short_desc="돌")
+        room = engine.world.rooms[3001]
+        for i in range(3):
+            room.objects.append(ObjInstance(id=100 + i, proto=proto, room_vnum=3001))
+        msgs = self._run(engine, session, """
+            local objs = ctx:get_objects()
+            local n = #objs
+            for i = 1, n do ctx:obj_from_room(objs[i]) end
+            ctx:send(n .. "/" .. #ctx:get_objects())
+        """)
+        assert msgs == ["3/0"]
+        assert room.objects == []
+
+    def test_view_append_becomes_table(self):
+        engine = _make_engine()
+        session = _make_session(engine, 3001)
+        proto = ItemProto(vnum=10, keywords="돌", short_desc="돌")
+        room = engine.world.rooms[3001]
+        for i in range(2):
+            room.objects.append(ObjInstance(id=100 + i, proto=proto, room_vnum=3001))
+        msgs = self._run(engine, session, """
+            local a = ctx:get_objects()
+            a[#a + 1] = "x"
+            table.insert(a, "y")
+            local b = ctx:get_objects()
+            local _ = b[1]
+            table.insert(b, 1, "z")
+            local c = 0
+            for _ in ipairs(a) do c = c + 1 end
+            ctx:send(#a .. "/" .. c .. "/" .. a[1].id .. a[3] .. a[4])
+            ctx:send(#b .. "/" .. b[1] .. b[2].id .. "/" .. table.remove(b).id .. #b)
+        """)
+        assert msgs == ["4/4/100xy", "3/z100/1012"]
+        assert len(room.objects) == 2
+
+    def test_view_without_factory_is_list(self):
+        engine = _make_engine()
+        session = _make_session(engine, 3001)
+        ctx = CommandContext(session, engine)
+        assert ctx.get_characters() == [session.character]
+
+
 # ── Integration: lib.lua loaded before commands ──────────────────
 
 
@@ -0,0 +1,103 @@
+"""Tests for require()-style shared Lua data modules and native stat accessors."""
+
+import pytest
+from lupa import LuaError
+
+from core.lua_commands import LuaCommandRuntime
+from tests.test_lua_framework import _make_engine, _make_session
+
+
+def _runtime():
+    engine = _make_engine()
+    runtime = LuaCommandRuntime(engine)
+    engine.lua = runtime
+    return engine, runtime
+
+
+class TestRequire:
+    def test_data_module_loaded_once_and_shared(self):
+        _, runtime = _runtime()
+        same, thac0 = runtime._lua.execute("""
+            local a = require("stat_tables")
+            local b = require("stat_tables")
+            return a == b, a.thac0[1][34]
+        """)
+        assert same and thac0 == 1
+        assert runtime.modules.loaded == ["stat_tables"]
+        assert runtime.modules.loads == 1
+
+    def test_module_survives_script_reload(self):
+        _, runtime = _runtime()
+        src = 'local T = require("exp_tables") register_hook("t", function() return T end)'
+        runtime.load_source(src, "tbamud/lib/exp")
+        first = runtime._hooks["t"][0]()
+        runtime.reload_script(src + "\n", "tbamud/lib/exp")
+        assert runtime._lua.eval("rawequal")(runtime._hooks["t"][0](), first)
+        assert runtime.modules.loads == 1
+
+    def test_frozen(self):
+        _, runtime = _runtime()
+        runtime.modules.preload("consts", "return {list = {10, 20, 30}, name = 'x'}")
+        n, total, keys = runtime._lua.execute("""
+            local m = require("consts")
+            local total = 0
+            for _, v in ipairs(m.list) do total = total + v end
+            local keys = 0
+            for _ in pairs(m) do keys = keys + 1 end
+            return #m.list, total, keys
+        """)
+        assert (n, total, keys) == (3, 60, 2)
+        with pytest.raises(LuaError, match="read-only"):
+            runtime._lua.execute('require("consts").list[1] = 5')
+        with pytest.raises(LuaError, match="read-only"):
+            runtime._lua.execute('require("consts").extra = 1')
+
+    def test_invalidate_rereads(self):
+        _, runtime = _runtime()
+        runtime.modules.preload("v", "return {n = 1}")
+        assert runtime._lua.execute('return require("v").n') == 1
+        runtime.modules.preload("v", "return {n = 2}")
+        assert runtime._lua.execute('return require("v").n') == 2
+        runtime.modules.invalidate()
+        assert runtime.modules.loaded == []
+
+    def test_missing_and_invalid(self):
+        _, runtime = _runtime()
+        with pytest.raises(LuaError, match="not found"):
+            runtime._lua.execute('require("no_such_module")')
+        with pytest.raises(LuaError, match="invalid"):
+            runtime._lua.execute('require("../../etc/passwd")')
+
+    def test_requiring_script_game_wins(self):
+        engine, runtime = _runtime()
+        engine.game_name = "3eyes"
+        runtime.load_source(
+            'local T = require("stat_tables") register_hook("t", function() return T.thac0 end)',
+            "tbamud/combat/x")
+        # tbaMUD THAC0 table: class 0, level 34 → 9
+        assert runtime._hooks["t"][0]()[0][34] == 9
+
+
+class TestNativeAccessors:
+    def test_char_stat(self):
+        engine, runtime = _runtime()
+        char = _make_session(engine).character
+        char.stats = {"str": 18}
+        fn = runtime._lua.eval("function(c) return char_stat(c, 'str'), char_stat(c, 'dex'), "
+                               "char_stat(c, 'dex', 5) end")
+        assert fn(char) == (18, 13, 5)
+        assert runtime._lua.execute("return char_stat({stats = {str = 9}}, 'str')") == 9
+
+    def test_char_equipment(self):
+        engine, runtime = _runtime()
+        char = _make_session(engine).character
+        char.equipment = {16: "sword"}
+        fn = runtime._lua.eval("function(c) return char_equipment(c, 16), char_equipment(c, 5) end")
+        assert fn(char) == ("sword", None)
+
+    def test_render_message(self):
+        _, runtime = _runtime()
+        assert runtime._lua.execute(
+            'return render_message("{a}이(가) {b}을(를) 줍니다", {a = "철수", b = "검"})'
+        ) == "철수가 검을 줍니다"
+        assert runtime._lua.execute('return render_message("{x}(으)로", {x = 3})') == "3으로"
@@ -0,0 +1,113 @@
+"""Tests for the Lua profiler."""
+
+import pytest
+from lupa import LuaError
+
+from core.lua_commands import HookContext, LuaCommandRuntime
+from tests.test_lua_framework import _make_engine, _make_session
+
+
+def _runtime():
+    engine = _make_engine()
+    runtime = LuaCommandRuntime(engine)
+    engine.lua = runtime
+    runtime.load_source("""
+register_command("spin", function(ctx, args)
+    local n = 0
+    for i = 1, 1000 do n = n + i end
+    ctx:send(tostring(n))
+end)
+register_command("boom", function(ctx, args) error("boom") end)
+register_hook("tick", function(ctx) end)
+""", "common/commands/prof")
+    return engine, runtime
+
+
+class TestLuaProfiler:
+    @pytest.mark.asyncio
+    async def test_disabled_records_nothing(self):
+        engine, runtime = _runtime()
+        session = _make_session(engine)
+        await runtime.wrap_command("spin")(session, "")
+        assert runtime.profiler.stats() == []
+
+    @pytest.mark.asyncio
+    async def test_command_stats(self):
+        engine, runtime = _runtime()
+        session = _make_session(engine)
+        runtime.profiler.start()
+        handler = runtime.wrap_command("spin")
+        await handler(session, "")
+        await handler(session, "")
+
+        [stat] = runtime.profiler.stats()
+        assert (stat.kind, stat.name, stat.calls) == ("command", "spin", 2)
+        assert stat.source == "common/commands/prof:2"
+        assert stat.script == "common/commands/prof"
+        assert stat.instructions >= 2000
+        assert stat.wall > 0
+        session.send_line.assert_any_call("500500")
+
+    @pytest.mark.asyncio
+    async def test_error_counted_and_reported(self):
+        engine, runtime = _runtime()
+        session = _make_session(engine)
+        runtime.profiler.start()
+        await runtime.wrap_command("boom")(session, "")
+        [stat] = runtime.profiler.stats()
+        assert stat.errors == 1
+        # Error message still reaches the player
+        sent = " ".join(str(c) for c in session.send_line.call_args_list)
+        assert "오류" in sent
+
+    def test_hooks_and_reports(self):
+        engine, runtime = _runtime()
+        runtime.profiler.start()
+        ctx = HookContext(engine, None, lua_runtime=runtime._lua)
+        runtime.fire_hook("tick", ctx)
+        runtime.fire_hook("tick", ctx)
+
+        [stat] = runtime.profiler.stats()
+        assert (stat.kind, stat.name, stat.calls) == ("hook", "tick", 2)
+        report = runtime.profiler.report()
+        assert "hook:tick" in report
+        assert "Per script:" in report
+        for line in runtime.profiler.collapsed().splitlines():
+            assert line.startswith("lua;common/commands/prof;hook:tick ")
+
+    def test_restores_outer_hook(self):
+        _, runtime = _runtime()
+        lua = runtime._lua
+        lua.execute("outer_ticks = 0; "
+                    "debug.sethook(function() outer_ticks = outer_ticks + 1 end, '', 1)")
+        runtime.profiler.start()
+        runtime.profiler.call("command", "x", lua.eval("function() end"))
+        lua.execute("local x = 0 for i = 1, 10 do x = x + 1 end")
+        assert lua.globals().outer_ticks > 0
+        lua.execute("debug.sethook()")
+
+    def test_call_reraises(self):
+        _, runtime = _runtime()
+        with pytest.raises(LuaError):
+            runtime.profiler.call("command", "bad", runtime._lua.eval("function() error('x') end"))
+
+    def test_reset(self):
+        engine, runtime = _runtime()
+        runtime.profiler.start()
+        runtime.fire_hook("tick", HookContext(engine, None, lua_runtime=runtime._lua))
+        runtime.profiler.reset()
+        assert runtime.profiler.stats() == []
+        assert runtime.profiler.enabled
+
+
+class TestProfileCommand:
+    def test_ctx_lua_profile(self):
+        engine, runtime = _runtime()
+        from core.lua_commands import CommandContext
+        ctx = CommandContext(_make_session(engine), engine)
+        assert "켰습니다" in ctx.lua_profile("on")
+        assert runtime.profiler.enabled
+        runtime.fire_hook("tick", HookContext(engine, None, lua_runtime=runtime._lua))
+        assert "hook:tick" in ctx.lua_profile("report")
+        assert "껐습니다" in ctx.lua_profile("off")
+        assert not runtime.profiler.enabled
@@ -0,0 +1,166 @@
+"""Tests for the Lua execution budget watchdog."""
+
+import pytest
+from lupa import LuaError
+
+from core.lua_commands import HookContext, LuaCommandRuntime
+from core.lua_watchdog import Budget, LuaBudgetExceeded, budgets_from_config
+from tests.test_lua_framework import _make_engine, _make_session
+
+_SCRIPT = """
+register_command("spin", function(ctx, args)
+    while true do end
+end)
+register_command("sneaky", function(ctx, args)
+    while true do pcall(function() for i = 1, 1e9 do end end) end
+end)
+register_command("ok", function(ctx, args)
+    local n = 0
+    for i = 1, 10000 do n = n + i end
+    ctx:send("sum " .. n)
+end)
+register_hook("tick", function(ctx)
+    while true do end
+end)
+"""
+
+
+def _runtime(**kwargs):
+    engine = _make_engine()
+    budgets = {
+        "command": Budget(instructions=100_000, ms=1000),
+        "hook": Budget(instructions=50_000, ms=1000),
+        "trigger": Budget(instructions=50_000, ms=1000),
+    }
+    runtime = LuaCommandRuntime(engine, budgets=budgets, **kwargs)
+    engine.lua = runtime
+    runtime.load_source(_SCRIPT, "common/commands/runaway")
+    return engine, runtime
+
+
+class TestLuaWatchdog:
+    @pytest.mark.asyncio
+    async def test_infinite_loop_aborted(self):
+        engine, runtime = _runtime()
+        session = _make_session(engine)
+        await runtime.wrap_command("spin")(session, "")
+        assert runtime.watchdog.aborts == 1
+        assert runtime.watchdog.strikes == {"common/commands/runaway:2": 1}
+        sent = " ".join(str(c) for c in session.send_line.call_args_list)
+        assert "오류" in sent
+
+    def test_script_pcall_cannot_swallow_abort(self):
+        _, runtime = _runtime()
+        with pytest.raises(LuaBudgetExceeded):
+            runtime._call_lua("command", "sneaky", runtime._commands["sneaky"], None, "")
+
+    def test_time_budget(self):
+        engine = _make_engine()
+        runtime = LuaCommandRuntime(engine, budgets={
+            "command": Budget(instructions=10**12, ms=20),
+            "hook": Budget(instructions=10**12, ms=20),
+            "trigger": Budget(instructions=10**12, ms=20),
+        })
+        runtime.load_source(_SCRIPT, "common/commands/runaway")
+        with pytest.raises(LuaBudgetExceeded):
+            runtime._call_lua("command", "spin", runtime._commands["spin"], None, "")
+
+    def test_time_budget_uses_host_clock(self):
+        from lupa import LuaRuntime
+
+        from core.lua_watchdog import LuaWatchdog
+        lua = LuaRuntime()
+        ticks = iter(range(0, 10**6, 10))
+        watchdog = LuaWatchdog(lua, lambda fn: "x:1", {"hook": Budget(10**12, 25)},
+                               clock=lambda: next(ticks) / 1000)
+        fn = lua.eval("function() local n = 0 for i = 1, 20000 do n = n + i end end")
+        with pytest.raises(LuaBudgetExceeded):     # 10 ms per check: 3rd check trips
+            watchdog.call("hook", "x", fn)
+
+    @pytest.mark.asyncio
+    async def test_within_budget_runs(self):
+        engine, runtime = _runtime()
+        session = _make_session(engine)
+        await runtime.wrap_command("ok")(session, "")
+        session.send_line.assert_any_call("sum 50005000")
+        assert runtime.watchdog.aborts == 0
+
+    def test_regular_errors_are_not_strikes(self):
+        _, runtime = _runtime()
+        runtime.load_source('register_command("bad", function() error("x") end)',
+                            "common/commands/bad")
+        with pytest.raises(LuaError) as exc:
+            runtime._call_lua("command", "bad", runtime._commands["bad"])
+        assert not isinstance(exc.value, LuaBudgetExceeded)
+        assert runtime.watchdog.aborts == 0
+
+    @pytest.mark.asyncio
+    async def test_quarantine_and_release_on_reload(self):
+        engine, runtime = _runtime(quarantine_after=2)
+        session = _make_session(engine)
+        handler = runtime.wrap_command("spin")
+        await handler(session, "")
+        await handler(session, "")
+        assert "common/commands/runaway:2" in runtime.watchdog.quarantined
+
+        # Quarantined: not executed, player told it is under maintenance
+        session.send_line.reset_mock()
+        await handler(session, "")
+        assert runtime.watchdog.aborts == 2
+        sent = " ".join(str(c) for c in session.send_line.call_args_list)
+        assert "점검" in sent
+
+        runtime.reload_script(_SCRIPT, "common/commands/runaway")
+        assert runtime.watchdog.quarantined == set()
+        assert runtime.watchdog.strikes == {}
+
+    def test_hook_budget(self):
+        engine, runtime = _runtime(quarantine_after=1)
+        ctx = HookContext(engine, None, lua_runtime=runtime._lua)
+        runtime.fire_hook("tick", ctx)
+        assert runtime.watchdog.aborts == 1
+        runtime.fire_hook("tick", ctx)   # quarantined → skipped
+        assert runtime.watchdog.aborts == 1
+
+    def test_profiler_records_guarded_calls(self):
+        engine, runtime = _runtime()
+        runtime.profiler.start()
+        runtime._call_lua("command", "ok", runtime._commands["ok"],
+                          _make_ctx(engine, runtime), "")
+        [stat] = runtime.profiler.stats()
+        assert stat.calls == 1 and stat.instructions > 0
+
+
+class TestTriggerBudget:
+    @pytest.mark.asyncio
+    async def test_runaway_trigger_aborted(self):
+        from games.tbamud.triggers import TriggerRuntime
+        runtime = TriggerRuntime(_make_engine())
+        runtime.init(budgets={
+            "command": Budget(instructions=50_000, ms=1000),
+            "hook": Budget(instructions=50_000, ms=1000),
+            "trigger": Budget(instructions=50_000, ms=1000),
+        })
+        runtime._lua.execute("function execute_trigger(vnum, arg) while true do end end")
+        runtime._triggers[100] = {"vnum": 100, "type": 1, "name": "loop", "arg": ""}
+        assert await runtime.fire_trigger(100) is False
+        assert runtime.watchdog.strikes == {"tbamud/triggers:100": 1}
+
+
+def _make_ctx(engine, runtime):
+    return runtime.acquire_context(_make_session(engine))
+
+
+class TestBudgetConfig:
+    def test_defaults(self):
+        budgets, quarantine_after = budgets_from_config({})
+        assert set(budgets) == {"command", "hook", "trigger"}
+        assert quarantine_after == 3
+
+    def test_overrides(self):
+        budgets, quarantine_after = budgets_from_config({"engine": {"lua_budget": {
+            "quarantine_after": 5, "hook": {"ms": 10},
+        }}})
+        assert budgets["hook"].ms == 10
+        assert budgets["hook"].instructions == 2_000_000
+        assert quarantine_after == 5
@@ -0,0 +1,87 @@
+"""Tests for off-loop bcrypt hashing."""
+
+import asyncio
+import time
+
+import pytest
+
+from core.passwords import PasswordHasher, get_hasher, hash_rounds
+
+
+class TestPasswordHasher:
+    @pytest.mark.asyncio
+    async def test_hash_and_verify(self):
+        h = PasswordHasher(rounds=4)
+        pw_hash = await h.hash("비밀번호")
+        assert hash_rounds(pw_hash) == 4
+        assert await h.verify("비밀번호", pw_hash)
+        assert not await h.verify("틀림", pw_hash)
+        assert not await h.verify("x", "")
+        assert not await h.verify("x", "not-a-bcrypt-hash")
+
+    @pytest.mark.asyncio
+    async def test_rehash_on_cost_change(self):
+        old = await PasswordHasher(rounds=4).hash("secret")
+        h = PasswordHasher(rounds=5)
+        saved = []
+
+        async def save(new_hash):
+            saved.append(new_hash)
+
+        assert h.needs_rehash(old)
+        assert await h.verify_and_upgrade("secret", old, save)
+        await asyncio.gather(*h._background)
+        assert len(saved) == 1 and hash_rounds(saved[0]) == 5
+        assert await h.verify("secret", saved[0])
+        assert h.rehashed == 1
+
+        saved.clear()
+        assert not await h.verify_and_upgrade("wrong", old, save)
+        assert await h.verify_and_upgrade("secret", await h.hash("secret"), save)
+        assert not h._background and saved == []
+
+    @pytest.mark.asyncio
+    async def test_bounded_pool_queues_and_measures_wait(self):
+        h = PasswordHasher(rounds=4, workers=1)
+        pw_hash = await h.hash("pw")
+        peak = 0
+
+        async def watch():
+            nonlocal peak
+            while True:
+                peak = max(peak, h.running)
+                await asyncio.sleep(0)
+
+        watcher = asyncio.create_task(watch())
+        results = await asyncio.gather(*(h.verify("pw", pw_hash) for _ in range(4)))
+        watcher.cancel()
+        assert all(results) and peak == 1
+        stats = h.stats()
+        assert stats["completed"] == 5 and stats["waiting"] == 0
+        assert stats["queue_wait_max_ms"] > 0
+
+    @pytest.mark.asyncio
+    async def test_event_loop_not_blocked(self):
+        h = PasswordHasher(rounds=10)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.001)
+
+        t = asyncio.create_task(ticker())
+        t0 = time.perf_counter()
+        await h.hash("pw")
+        elapsed = time.perf_counter() - t0
+        t.cancel()
+        # A blocked loop would tick once; an idle one ticks ~once per ms
+        assert ticks > max(2, elapsed * 1000 / 10)
+
+    def test_get_hasher_prefers_engine(self):
+        class Eng:
+            passwords = PasswordHasher(rounds=4)
+
+        assert get_hasher(Eng()) is Eng.passwords
+        assert get_hasher(object()) is get_hasher(None)
@@ -0,0 +1,422 @@
+"""Tests for the write-behind player save queue and dirty-column saves."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from core.db import Database
+from core.persistence import PlayerCache, SaveQueue
+
+
+def _db(fail: int = 0):
+    """Fake DB recording save_players batches; the first *fail* calls raise."""
+    db = MagicMock()
+    db.batches = []
+    failures = [fail]
+
+    async def save_players(rows):
+        if failures[0] > 0:
+            failures[0] -= 1
+            raise ConnectionError("db down")
+        db.batches.append([(pid, dict(data)) for pid, data in rows])
+
+    db.save_players = AsyncMock(side_effect=save_players)
+    return db
+
+
+class TestSaveQueue:
+    @pytest.mark.asyncio
+    async def test_coalesces_same_player(self):
+        db = _db()
+        q = SaveQueue(db)
+        q.enqueue(1, {"hp": 10, "gold": 5})
+        q.enqueue(1, {"hp": 7})
+        q.enqueue(2, {"hp": 3})
+        assert await q.flush()
+        assert db.batches == [[(1, {"hp": 7, "gold": 5}), (2, {"hp": 3})]]
+        assert q.coalesced == 1 and q.written == 2 and q.depth == 0
+
+    @pytest.mark.asyncio
+    async def test_batches_split_by_size(self):
+        db = _db()
+        q = SaveQueue(db, batch_size=2)
+        for pid in range(5):
+            q.enqueue(pid, {"hp": pid})
+        assert await q.flush()
+        assert [len(b) for b in db.batches] == [2, 2, 1]
+
+    @pytest.mark.asyncio
+    async def test_background_writer_and_player_barrier(self):
+        db = _db()
+        q = SaveQueue(db)
+        q.start()
+        q.enqueue(1, {"hp": 1})
+        assert q.stats()["pending"] == 1
+        assert await q.flush(1, timeout=1)
+        assert db.batches[-1] == [(1, {"hp": 1})]
+        assert q.stats()["running"]
+        assert await q.close(timeout=1)
+        assert not q.stats()["running"]
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_requeued_newer_wins(self):
+        db = _db(fail=1)
+        q = SaveQueue(db)
+        q.enqueue(1, {"hp": 1, "gold": 9})
+        assert not await q.flush()
+        assert q.failures == 1 and q.depth == 1
+        q.enqueue(1, {"hp": 2})
+        assert await q.flush()
+        assert db.batches == [[(1, {"hp": 2, "gold": 9})]]
+
+    @pytest.mark.asyncio
+    async def test_poison_row_isolated_then_dropped(self):
+        db = _db()
+        healthy = db.save_players.side_effect
+
+        async def save_players(rows):
+            if any(pid == 2 for pid, _ in rows):
+                raise ValueError("bad value")
+            await healthy(rows)
+
+        db.save_players.side_effect = save_players
+        q = SaveQueue(db)
+        lost = []
+        for pid in (1, 2, 3):
+            q.enqueue(pid, {"hp": pid}, on_drop=lost.append)
+        assert await q._write_batch()
+        assert db.batches == [[(1, {"hp": 1})], [(3, {"hp": 3})]]
+        assert q.depth == 1 and q.written == 2 and q.failures == 1
+        assert not await q._write_batch()         # alone: kept, no strike
+        for round_ in range(2):
+            q.enqueue(10 + round_, {"hp": 1})
+            assert await q._write_batch()         # probe skips the struck row
+        assert q.depth == 0 and q.dropped == 1
+        assert [pid for b in db.batches for pid, _ in b] == [1, 3, 10, 11]
+        assert lost == [{"hp": 2}]
+
+    @pytest.mark.asyncio
+    async def test_flush_reports_dropped_player(self):
+        db = _db()
+        healthy = db.save_players.side_effect
+
+        async def save_players(rows):
+            if any(pid == 2 for pid, _ in rows):
+                raise ValueError("bad value")
+            await healthy(rows)
+
+        db.save_players.side_effect = save_players
+        q = SaveQueue(db)
+        q.enqueue(2, {"hp": 2})
+        q.enqueue(10, {"hp": 1})
+        assert not await q._write_batch()         # bad probe looks like an outage
+        assert await q._write_batch()             # next probe commits, row 2 isolated
+        q.enqueue(11, {"hp": 1})
+        assert await q._write_batch()
+        q.enqueue(12, {"hp": 1})
+        assert not await q.flush(2)               # third strike: dropped
+        assert q.dropped == 1 and q.depth == 0
+        assert await q.flush()
+
+    @pytest.mark.asyncio
+    async def test_flush_times_out_while_db_down(self):
+        db = MagicMock()
+        db.save_players = AsyncMock(side_effect=ConnectionError("db down"))
+        q = SaveQueue(db)
+        q.start()
+        q.enqueue(1, {"hp": 1})
+        assert not await q.flush(timeout=0.05)
+        assert not await q.close(timeout=0.05)
+
+    @pytest.mark.asyncio
+    async def test_outage_costs_one_probe_per_retry(self, monkeypatch, caplog):
+        import asyncio
+
+        from core import persistence
+
+        monkeypatch.setattr(persistence, "_RETRY_DELAY", 0.01)
+        db = MagicMock()
+        db.save_players = AsyncMock(side_effect=ConnectionError("db down"))
+        q = SaveQueue(db)
+        for pid in range(100):
+            q.enqueue(pid, {"hp": pid})
+        q.start()
+        while q._failures_in_row < 3:
+            await asyncio.sleep(0.005)
+        await q.close(timeout=0)
+        assert db.save_players.await_count <= 2 * (q._failures_in_row + 1)
+        errors = [r for r in caplog.records if r.levelname == "ERROR" and "batch" in r.message]
+        assert len(errors) == 1
+        assert q.depth == 100 and q.dropped == 0
+
+    @pytest.mark.asyncio
+    async def test_session_save_goes_through_queue(self):
+        from tests.test_lua_framework import _make_engine, _make_session
+        from core.session import Session
+
+        engine = _make_engine()
+        engine.db = _db()
+        engine.save_queue = SaveQueue(engine.db)
+        session = _make_session(engine)
+        session.db = engine.db
+        session._saved = {}
+        session.character.player_id = 42
+        assert await Session.save_character(session)
+        assert engine.db.batches == [] and engine.save_queue.depth == 1
+        session.character.hp -= 1
+        assert await Session.save_character(session, flush=True)
+        assert len(engine.db.batches) == 1
+        assert engine.db.batches[0][0][0] == 42
+        assert engine.save_queue.coalesced == 1
+
+
+class TestDirtyColumns:
+    def _session(self):
+        from tests.test_lua_framework import _make_engine, _make_session
+
+        engine = _make_engine()
+        engine.db = MagicMock()
+        engine.db.save_player = AsyncMock()
+        session = _make_session(engine)
+        session.db = engine.db
+        session.character.player_id = 7
+        session._saved = {}
+        return session
+
+    @pytest.mark.asyncio
+    async def test_only_changed_columns_written(self):
+        from core.session import Session
+
+        session = self._session()
+        c = session.character
+        c.skills = {"kick": 10}
+        assert await Session.save_character(session)
+        full = session.db.save_player.await_args.args[1]
+        assert "skills" in full and "hp" in full
+
+        assert not await Session.save_character(session)
+        assert session.db.save_player.await_count == 1
+
+        c.hp -= 3
+        c.skills["kick"] = 11          # in-place change of a JSONB column
+        assert await Session.save_character(session)
+        written = session.db.save_player.await_args.args[1]
+        assert written["hp"] == c.hp and written["skills"] == {"kick": 11}
+        assert "gold" not in written and "stats" not in written
+
+    @pytest.mark.asyncio
+    async def test_failed_inline_save_stays_dirty(self):
+        from core.session import Session
+
+        session = self._session()
+        session.db.save_player = AsyncMock(side_effect=ConnectionError("db down"))
+        with pytest.raises(ConnectionError):
+            await Session.save_character(session)
+        session.db.save_player = AsyncMock()
+        assert await Session.save_character(session)
+        assert "hp" in session.db.save_player.await_args.args[1]
+
+    @pytest.mark.asyncio
+    async def test_dropped_columns_resent(self):
+        from core.session import Session
+
+        session = self._session()
+        await Session.save_character(session)
+        Session._forget_saved(session, {"hp": 1})
+        assert await Session.save_character(session)
+        assert "hp" in session.db.save_player.await_args.args[1]
+
+    @pytest.mark.asyncio
+    async def test_changes_widen_to_canonical_groups(self):
+        from core.db import PLAYER_COLUMN_GROUPS
+        from core.session import Session
+
+        session = self._session()
+        await Session.save_character(session)
+        session.character.gold += 1
+        await Session.save_character(session)
+        assert tuple(session.db.save_player.await_args.args[1]) == PLAYER_COLUMN_GROUPS[1]
+
+    def test_baseline_detached(self):
+        from core.session import _row_baseline
+
+        skills = {"kick": 1}
+        base = _row_baseline({"hp": 5, "skills": skills})
+        skills["kick"] = 2
+        assert base == {"hp": 5, "skills": {"kick": 1}}
+
+
+class TestDatabaseSavePlayers:
+    @pytest.mark.asyncio
+    async def test_executemany_per_column_set_in_transaction(self):
+        db = Database({"host": "x", "port": 1, "user": "u", "password": "p", "database": "d"})
+        conn = AsyncMock()
+        conn.transaction = MagicMock()
+        conn.transaction.return_value.__aenter__ = AsyncMock()
+        conn.transaction.return_value.__aexit__ = AsyncMock(return_value=False)
+        pool = MagicMock()
+        pool.acquire.return_value.__aenter__ = AsyncMock(return_value=conn)
+        pool.acquire.return_value.__aexit__ = AsyncMock()
+        db._pool = pool
+
+        await db.save_players([
+            (1, {"hp": 1, "stats": {"str": 18}}),
+            (2, {"hp": 2, "stats": {}}),
+            (3, {"gold": 5}),
+            (4, {}),
+        ])
+        assert conn.transaction.call_count == 1
+        assert conn.executemany.await_count == 2
+        query, args = conn.executemany.await_args_list[0].args
+        assert query.startswith("UPDATE players SET hp = $2, stats = $3")
+        # JSONB values go to the driver as objects; the pool codec encodes them
+        assert args == [(1, 1, {"str": 18}), (2, 2, {})]
+        assert db.bytes_written == 3 * 8
+
+
+class TestPlayerStatements:
+    def test_player_columns_canonical(self):
+        from core.db import player_columns
+
+        assert player_columns(["room_vnum"]) == (
+            "hp", "max_hp", "mana", "max_mana", "move", "max_move", "room_vnum")
+        assert player_columns(["inventory", "hp", "zeta", "alpha"])[-4:] == (
+            "equipment", "inventory", "alpha", "zeta")
+        assert player_columns([]) == ()
+
+    def test_same_column_set_same_statement(self):
+        from core.db import _canonical, _player_update_sql
+
+        a = _player_update_sql(_canonical({"stats": 1, "hp": 2}))
+        b = _player_update_sql(_canonical({"hp": 2, "stats": 1}))
+        assert a is b
+        assert a == "UPDATE players SET hp = $2, stats = $3, last_login = NOW() WHERE id = $1"
+
+    def test_jsonb_codec_roundtrip_counts_bytes(self):
+        from core.db import _decode_jsonb
+
+        db = Database({"host": "x", "port": 1, "user": "u", "password": "p", "database": "d"})
+        data = db._encode_jsonb({"이름": [1, 2]})
+        assert data[:1] == b"\x01"
+        assert _decode_jsonb(data) == {"이름": [1, 2]}
+        assert db._json_bytes == len(data) - 1
+
+
+class TestPlayerCache:
+    def test_lru_and_copies(self):
+        cache = PlayerCache(max_size=2)
+        cache.put({"id": 1, "name": "Alice", "skills": {"kick": 1}})
+        cache.put({"id": 2, "name": "Bob"})
+        row = cache.get("ALICE")
+        row["skills"]["kick"] = 99
+        assert cache.get("alice")["skills"] == {"kick": 1}
+        cache.put({"id": 3, "name": "Carol"})          # evicts Bob (least recent)
+        assert cache.get("bob") is None and len(cache) == 2
+        cache.update(2, {"hp": 1})                      # evicted: no-op
+        assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_fetch_player_served_from_cache(self):
+        db = Database({"host": "x", "port": 1, "user": "u", "password": "p", "database": "d"})
+        db._fetch_player = AsyncMock(
+            side_effect=lambda n: {"id": 5, "name": "Alice", "hp": 10} if n == "alice" else None)
+        db._save_player = AsyncMock()
+        assert (await db.fetch_player("alice"))["hp"] == 10
+        await db.save_player(5, {"hp": 3})
+        assert (await db.fetch_player("Alice"))["hp"] == 3
+        assert db._fetch_player.await_count == 1
+        assert await db.fetch_player("nobody") is None    # misses are not cached
+        assert await db.fetch_player("nobody") is None
+        assert db._fetch_player.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_fetch_player_overlays_unsaved_columns(self):
+        db = Database({"host": "x", "port": 1, "user": "u", "password": "p", "database": "d"})
+        db._fetch_player = AsyncMock(return_value={"id": 5, "name": "Alice", "hp": 10,
+                                                   "gold": 1})
+        db.save_players = AsyncMock(side_effect=ConnectionError("db down"))
+        db.save_queue = SaveQueue(db)
+        db.save_queue.enqueue(5, {"hp": 3})
+        assert not await db.save_queue.flush(5)             # quit flush failed
+        db.save_queue.enqueue(5, {"gold": 9})
+        row = await db.fetch_player("alice")
+        assert row["hp"] == 3 and row["gold"] == 9
+        assert db.player_cache.get("alice")["hp"] == 10     # cache keeps committed state
+
+    @pytest.mark.asyncio
+    async def test_cache_follows_commits_only(self):
+        db = _db(fail=1)
+        db.player_cache = PlayerCache()
+        db.player_cache.put({"id": 1, "name": "Alice", "hp": 10, "gold": 0})
+        healthy = db.save_players.side_effect
+
+        async def save_players(rows):
+            await healthy(rows)
+            for pid, data in rows:
+                db.player_cache.update(pid, data)     # what Database.save_players does
+
+        db.save_players.side_effect = save_players
+        q = SaveQueue(db)
+        q.enqueue(1, {"hp": 4})
+        assert db.player_cache.get("alice")["hp"] == 10     # queued, not committed
+        assert not await q.flush()
+        assert db.player_cache.get("alice")["hp"] == 10     # failed batch put back
+        assert await q.flush()
+        assert db.player_cache.get("alice") == {"id": 1, "name": "Alice", "hp": 4, "gold": 0}
+
+    @pytest.mark.asyncio
+    async def test_commit_of_older_batch_shows_committed_state(self):
+        db = _db()
+        db.player_cache = PlayerCache()
+        db.player_cache.put({"id": 1, "name": "Alice", "hp": 10})
+        q = SaveQueue(db)
+
+        async def save_players(rows):
+            q.enqueue(1, {"hp": 2})                   # arrives while the batch is written
+            for pid, data in rows:
+                db.player_cache.update(pid, data)     # what Database.save_players does
+            db.batches.append(rows)
+
+        db.save_players = AsyncMock(side_effect=save_players)
+        q.enqueue(1, {"hp": 7})
+        assert await q._write_batch()
+        assert db.batches[0] == [(1, {"hp": 7})]
+        assert db.player_cache.get("alice")["hp"] == 7      # hp 2 is still queued
+        assert await q._write_batch()
+        assert db.player_cache.get("alice")["hp"] == 2
+
+
+class TestAutoSaveReport:
+    def _engine(self, flush):
+        from core.engine import Engine
+
+        engine = Engine.__new__(Engine)
+        engine.config = {"engine": {"save_interval": 1}}
+        engine.db = MagicMock(bytes_written=0)
+        engine.save_queue = MagicMock()
+        engine.save_queue.flush = flush
+        session = MagicMock()
+        session.save_character = AsyncMock(return_value=True)
+        engine.sessions = {1: session}
+        engine.last_auto_save = {}
+        engine._auto_save_reports = set()
+        return engine
+
+    @pytest.mark.asyncio
+    async def test_one_report_at_a_time_and_timeout_flagged(self):
+        import asyncio
+
+        gate = asyncio.Event()
+
+        async def flush(timeout=None):
+            await gate.wait()
+            return False
+
+        engine = self._engine(flush)
+        await engine._auto_save()
+        await engine._auto_save()
+        assert len(engine._auto_save_reports) == 1
+        gate.set()
+        await asyncio.gather(*engine._auto_save_reports)
+        assert not engine._auto_save_reports
+        assert engine.last_auto_save["committed"] is False
@@ -174,6 +174,36 @@ class TestAPIRoom:
         api_mod._engine = None
 
 
+class TestAPILuaProfile:
+    @pytest.mark.asyncio
+    async def test_profile_control_and_report(self):
+        import json
+        import core.api as api_mod
+        from core.api import api_lua_profile, api_lua_profile_control
+        from core.lua_commands import HookContext, LuaCommandRuntime
+        eng = _make_engine_with_players()
+        eng.lua = LuaCommandRuntime(eng)
+        eng.lua.load_source('register_hook("tick", function(ctx) end)', "common/lib/t")
+        api_mod._engine = eng
+
+        result = json.loads((await api_lua_profile_control("start")).body)
+        assert result["enabled"] is True
+        eng.lua.fire_hook("tick", HookContext(eng, None, lua_runtime=eng.lua._lua))
+
+        result = json.loads((await api_lua_profile()).body)
+        assert result["entries"][0]["name"] == "tick"
+        assert result["entries"][0]["calls"] == 1
+        assert result["scripts"][0]["name"] == "common/lib/t"
+        text = (await api_lua_profile(format="report")).body.decode()
+        assert "hook:tick" in text
+
+        from fastapi import HTTPException
+        with pytest.raises(HTTPException):
+            await api_lua_profile_control("bogus")
+
+        api_mod._engine = None
+
+
 class TestWebSocketSession:
     def test_ws_session_init(self):
         from core.api import WebSocketSession
@@ -255,3 +285,25 @@ class TestGetEngine:
         from core.api import get_engine
         assert get_engine() is eng
         api_mod._engine = None
+
+
+class TestAPITriggerStats:
+    @pytest.mark.asyncio
+    async def test_fires_keyed_by_type_name(self):
+        import json
+
+        import core.api as api_mod
+        from core.api import api_trigger_stats
+        from games.tbamud.triggers import TriggerRuntime
+
+        eng = MagicMock()
+        eng.triggers = TriggerRuntime(eng)
+        eng.triggers.fire_counts = {(0, 64): 2, (2, 66): 1}
+        api_mod._engine = eng
+        result = json.loads((await api_trigger_stats()).body)
+        assert result == {"fires": {"mob:greet": 2, "room:random|enter": 1}, "store": None}
+        eng.triggers = None
+        from fastapi import HTTPException
+        with pytest.raises(HTTPException):
+            await api_trigger_stats()
+        api_mod._engine = None
@@ -234,3 +234,198 @@ class TestTriggerAPIs:
         runtime = TriggerRuntime(eng)
         # Should not raise
         runtime._lua_print("hello", "world")
+
+
+_TRIGGERS_LUA = '''local Triggers = {}
+
+-- Trigger 100: Greeter
+Triggers[100] = {
+    name = "Greeter \\"A\\"",
+    attach_type = 0,
+    trigger_type = 64,
+    numeric_arg = 100,
+    execute = function(self, actor, extra)
+        greeted = (greeted or 0) + 1
+    end,
+}
+
+-- Trigger 101: Broken
+Triggers[101] = {
+    name = "Broken",
+    attach_type = 2,
+    trigger_type = 4,
+    numeric_arg = 0,
+    execute = function(self, actor, extra)
+        if argcheck('arg) then end
+    end,
+}
+
+-- Trigger 102: Speaker
+Triggers[102] = {
+    name = "Speaker",
+    attach_type = 0,
+    trigger_type = 8,
+    numeric_arg = 1,
+    execute = function(self, actor, extra)
+        heard = extra
+    end,
+}
+
+-- Trigger 103: Waiter
+Triggers[103] = {
+    name = "Waiter",
+    attach_type = 0,
+    trigger_type = 1,
+    numeric_arg = 100,
+    execute = function(self, actor, extra)
+        self:say("Hello, %actor.name%.")
+        coroutine.yield(0.01)
+        self:emote("waves.")
+    end,
+}
+
+return Triggers
+'''
+
+
+def _store_runtime(tmp_path, cache_size=None):
+    (tmp_path / "lua").mkdir()
+    (tmp_path / "lua" / "triggers.lua").write_text(_TRIGGERS_LUA, encoding="utf-8")
+    runtime = TriggerRuntime(_make_engine())
+    assert runtime.init(tmp_path, cache_size=cache_size)
+    return runtime
+
+
+class TestTriggerStore:
+    def test_index_without_compiling(self, tmp_path):
+        runtime = _store_runtime(tmp_path)
+        assert runtime.trigger_count == 4
+        assert runtime.get_trigger(100) == {
+            "vnum": 100, "type": 64, "name": 'Greeter "A"', "arg": "",
+            "attach_type": 0, "numeric_arg": 100,
+        }
+        assert runtime.store.compiled_count == 0
+        assert runtime.store.broken == {}
+
+    def test_compile_on_first_get(self, tmp_path):
+        runtime = _store_runtime(tmp_path)
+        entry = runtime.store.get(100)
+        assert runtime.store.get(100) is entry
+        assert (runtime.store.misses, runtime.store.hits) == (1, 1)
+        entry.execute(entry, None, "")
+        assert runtime._lua.globals().greeted == 1
+
+    def test_broken_trigger_isolated(self, tmp_path):
+        runtime = _store_runtime(tmp_path)
+        assert runtime.store.get(101) is None
+        assert runtime.store.get(101) is None
+        assert list(runtime.store.broken) == [101]
+        assert runtime.store.misses == 1  # not recompiled
+        assert runtime.store.get(100) is not None
+
+    @pytest.mark.asyncio
+    async def test_body_run_from_store_without_dispatcher(self, tmp_path):
+        runtime = _store_runtime(tmp_path)
+        assert await runtime.fire_trigger(102, arg="hi") is True
+        assert runtime._lua.globals().heard == "hi"
+        assert runtime.store.compiled_count == 1
+        assert await runtime.fire_trigger(101) is False   # broken body
+
+    @pytest.mark.asyncio
+    async def test_body_self_say_and_wait(self, tmp_path):
+        import asyncio
+
+        runtime = _store_runtime(tmp_path)
+        room = runtime.engine.world.get_room(3001)
+        actor = MagicMock()
+        actor.name = "철수"
+        owner = MagicMock(spec=["name", "room_vnum"])
+        owner.name = "경비병"
+        owner.room_vnum = 3001
+        listener = MagicMock()
+        listener.session.send_line = AsyncMock()
+        room.characters.append(listener)
+        assert await runtime.fire_trigger(103, actor=actor, owner=owner) is True
+        await asyncio.sleep(0.05)
+        lines = [c.args[0] for c in listener.session.send_line.call_args_list]
+        assert lines == ["경비병이(가) 'Hello, 철수.'라고 말합니다.", "경비병 waves."]
+
+    @pytest.mark.asyncio
+    async def test_dispatcher_result_is_handled_flag(self, tmp_path):
+        runtime = _store_runtime(tmp_path)
+        runtime._lua.execute(
+            "function execute_trigger(vnum, arg) heard = arg; return vnum == 102 end")
+        assert await runtime.fire_trigger(102, arg="hello") is True
+        assert runtime._lua.globals().heard == "hello"
+        assert await runtime.fire_trigger(100) is False
+        runtime._lua.execute("function execute_trigger(vnum, arg) end")
+        assert await runtime.fire_trigger(102) is False
+
+    def test_lru_bound(self, tmp_path):
+        runtime = _store_runtime(tmp_path, cache_size=1)
+        store = runtime.store
+        store.get(100)
+        store.get(102)
+        assert store.compiled_count == 1 and store.evictions == 1
+        store.get(100)
+        assert store.misses == 3
+
+    def test_bundled_triggers_indexed(self):
+        from pathlib import Path
+        data_dir = Path(__file__).parent.parent / "data" / "tbamud"
+        if not (data_dir / "lua" / "triggers.lua").exists():
+            pytest.skip("tbaMUD trigger data not present")
+        runtime = TriggerRuntime(_make_engine())
+        assert runtime.init(data_dir)
+        assert runtime.trigger_count > 1000
+        assert runtime.store.compiled_count == 0
+
+
+class TestTriggerDispatchIndex:
+    def _mob(self, runtime, scripts):
+        proto = MobProto(
+            vnum=200, keywords="guard", short_desc="경비병",
+            long_desc="", detail_desc="",
+            level=10, hitroll=0, armor_class=0, max_hp=52,
+            damage_dice="1d6+3", gold=50, experience=500,
+            act_flags=[], aff_flags=[], alignment=0, sex=0,
+            scripts=scripts,
+        )
+        runtime.engine.world.mob_protos[200] = proto
+        return MobInstance(id=7, proto=proto, room_vnum=3001, hp=50, max_hp=50)
+
+    def test_index_built_at_load(self, tmp_path):
+        runtime = _store_runtime(tmp_path)
+        # Room 3001 has scripts [100, 101]
+        assert runtime._room_index == {(3001, 64): [100], (3001, 4): [101]}
+
+    @pytest.mark.asyncio
+    async def test_room_and_mob_dispatch(self, tmp_path):
+        runtime = _store_runtime(tmp_path)
+        runtime._lua.execute(
+            "function execute_trigger(vnum, arg) heard = arg; return true end")
+        mob = self._mob(runtime, [102])
+        runtime.build_index()
+        assert await runtime.check_room_triggers(3001, 64) is True
+        assert await runtime.check_room_triggers(3001, 8) is False
+        assert await runtime.check_mob_triggers(mob, 8, arg="hi") is True
+        assert runtime._lua.globals().heard == "hi"
+        assert runtime.fire_stats() == {"mob:greet": 1, "mob:speech": 1}
+
+    @pytest.mark.asyncio
+    async def test_obj_dispatch(self, tmp_path):
+        from core.world import ItemProto, ObjInstance
+        runtime = _store_runtime(tmp_path)
+        runtime._lua.execute("function execute_trigger(vnum, arg) return true end")
+        proto = ItemProto(vnum=300, keywords="ball", short_desc="공", scripts=[100])
+        runtime.engine.world.item_protos[300] = proto
+        runtime.build_index()
+        obj = ObjInstance(id=1, proto=proto)
+        assert await runtime.check_obj_triggers(obj, 64) is True
+        assert await runtime.check_obj_triggers(obj, 4) is False
+
+    def test_reload_rebuilds_index(self, tmp_path):
+        runtime = _store_runtime(tmp_path)
+        runtime.engine.world.rooms[3001].proto.scripts = [102]
+        assert runtime.reload()
+        assert runtime._room_index == {(3001, 8): [102]}
@@ -0,0 +1,117 @@
+"""Tests for timed objects — expiry heap and World decay."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from core.engine import Engine
+from core.timers import TimedObjects
+from core.world import ItemProto, MobInstance, MobProto, ObjInstance, Room, RoomProto, World
+
+
+def _world():
+    w = World()
+    w.rooms[1] = Room(proto=RoomProto(vnum=1, name="Room 1", zone_vnum=0))
+    w.item_protos[10] = ItemProto(vnum=10, short_desc="빵")
+    w.item_protos[11] = ItemProto(vnum=11, short_desc="불꽃", values={"timer": 2})
+    w.mob_protos[5] = MobProto(vnum=5, max_hp=10)
+    return w
+
+
+def _corpse(w, timer=2):
+    proto = ItemProto(vnum=-5, short_desc="고블린의 시체", item_type="container",
+                      values={"corpse": True, "timer": timer})
+    corpse = ObjInstance(id=9000, proto=proto, values=dict(proto.values))
+    loot = w.create_obj(10)
+    loot.in_obj = corpse
+    corpse.contains.append(loot)
+    w.register_obj(corpse)
+    return corpse, loot
+
+
+class TestTimedObjects:
+    def test_expiry_order_and_reschedule(self):
+        t = TimedObjects()
+        objs = [ObjInstance(id=i, proto=ItemProto(vnum=1), values={"timer": i}) for i in (3, 1, 2)]
+        for o in objs:
+            t.add(o)
+        assert [o.id for o in t.advance()] == [1]
+        t.add(objs[0], 1)                        # id 3 now due next pulse
+        assert sorted(o.id for o in t.advance()) == [2, 3]
+        assert t.advance() == [] and len(t) == 0
+
+    def test_removed_objects_never_expire(self):
+        t = TimedObjects()
+        obj = ObjInstance(id=1, proto=ItemProto(vnum=1), values={"timer": 1})
+        t.add(obj)
+        t.remove(obj)
+        assert t.advance() == [] and obj not in t
+
+    def test_sync_writes_remaining(self):
+        t = TimedObjects()
+        obj = ObjInstance(id=1, proto=ItemProto(vnum=1), values={"timer": 5})
+        t.add(obj)
+        t.advance()
+        t.sync()
+        assert obj.values["timer"] == 4 and t.remaining(obj) == 4
+
+
+class TestWorldDecay:
+    def test_created_with_timer_is_scheduled(self):
+        w = _world()
+        assert w.create_obj(11) in w.timed and w.create_obj(10) not in w.timed
+
+    def test_floor_corpse_drops_contents(self):
+        w = _world()
+        corpse, loot = _corpse(w)
+        w.obj_to_room(corpse, 1)
+        assert w.expire_objects() == []
+        [(gone, witnesses)] = w.expire_objects()
+        assert gone is corpse and witnesses == []
+        assert w.rooms[1].objects == [loot] and loot.in_obj is None and loot.room_vnum == 1
+
+    def test_carried_and_contained_corpses_decay(self):
+        w = _world()
+        mob = w.create_mob(5, 1)
+        carried, loot = _corpse(w, timer=1)
+        carried.carried_by = mob
+        mob.inventory.append(carried)
+        bag = w.create_obj(10)
+        w.obj_to_room(bag, 1)
+        inner, inner_loot = _corpse(w, timer=1)
+        inner.id = 9001
+        inner.in_obj = bag
+        bag.contains.append(inner)
+        w.timed.add(inner)
+
+        expired = dict((o.id, ws) for o, ws in w.expire_objects())
+        assert expired == {9000: [mob], 9001: []}
+        assert mob.inventory == [loot] and loot.carried_by is mob
+        assert bag.contains == [inner_loot] and inner_loot.in_obj is bag
+
+    def test_extracted_object_is_skipped(self):
+        w = _world()
+        obj = w.create_obj(11)
+        w.obj_to_room(obj, 1)
+        w.rooms[1].objects.clear()              # removed without extract_obj
+        w.timed.advance()
+        assert w.expire_objects() == []
+        other = w.create_obj(11)
+        w.obj_to_room(other, 1)
+        w.extract_obj(other)
+        assert other not in w.timed and other.room_vnum is None
+
+
+@pytest.mark.asyncio
+async def test_engine_decay_pulse_notifies_room():
+    engine = Engine.__new__(Engine)
+    engine.world = w = _world()
+    corpse, _ = _corpse(w, timer=1)
+    w.obj_to_room(corpse, 1)
+    pc = MobInstance(id=1, proto=w.mob_protos[5], room_vnum=1, hp=1, max_hp=1,
+                     player_id=1, player_name="Alice", session=MagicMock())
+    pc.session.send_line = AsyncMock()
+    w.char_to_room(pc, 1)
+    await engine._tick_obj_decay()
+    pc.session.send_line.assert_awaited_once()
+    assert "고블린의 시체가 부패하여 사라집니다" in pc.session.send_line.await_args.args[0]
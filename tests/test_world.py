@@ -163,3 +163,160 @@ class TestWorld:
         assert mob.room_vnum == 2
         assert mob not in w.rooms[1].characters
         assert mob in w.rooms[2].characters
+
+
+class TestEntityRegistry:
+    def _world(self):
+        w = World()
+        for vnum, zone in ((1, 10), (2, 10), (3, 20)):
+            w.rooms[vnum] = Room(proto=RoomProto(vnum=vnum, name=f"Room {vnum}", zone_vnum=zone))
+        w.mob_protos[5] = MobProto(vnum=5, keywords="guard", max_hp=10)
+        w.item_protos[7] = ItemProto(vnum=7)
+        return w
+
+    def test_lookup_by_id(self):
+        w = self._world()
+        mob = w.create_mob(5, 1)
+        obj = w.create_obj(7)
+        assert w.find_char(mob.id) is mob and w.find_obj(obj.id) is obj
+        assert w.find_char(obj.id) is None
+        w.extract_char(mob)
+        assert w.find_char(mob.id) is None and mob.id not in w.entities
+
+    def test_unregistered_char_found_by_scan(self):
+        w = self._world()
+        mob = MobInstance(id=4242, proto=w.mob_protos[5], room_vnum=3, hp=1, max_hp=1)
+        w.rooms[3].characters.append(mob)
+        assert w.find_char(4242) is mob
+        assert w.entities[4242] is mob and w.zone_chars(20) == [mob]
+
+    def test_zone_membership_follows_movement(self):
+        w = self._world()
+        a, b = w.create_mob(5, 1), w.create_mob(5, 2)
+        assert w.zone_chars(10) == [a, b] and w.zone_chars(20) == []
+        w.char_to_room(a, 3)
+        assert w.zone_chars(10) == [b] and w.zone_chars(20) == [a]
+        w.char_from_room(b)
+        assert w.zone_chars(10) == []
+
+    def test_player_by_name(self):
+        w = self._world()
+        pc = MobInstance(id=1, proto=w.mob_protos[5], room_vnum=0, hp=1, max_hp=1,
+                         player_id=7, player_name="Alice")
+        w.char_to_room(pc, 2)
+        assert w.find_player("aLICE") is pc
+        w.char_from_room(pc)
+        assert w.find_player("alice") is None
+
+
+class TestGameTables:
+    def _world(self):
+        w = World()
+        w.compile_game_tables({
+            "thac0": [({"class_id": c, "level": lv}, 20 - lv)
+                      for c in range(2) for lv in range(5)],
+            "saving_throw": [({"class_id": 0, "type": 1, "level": 3}, 42)],
+            "exp_table": [({"class_id": 0, "level": 2}, 2500)],
+            "titles": [({"class_id": 0, "level": 1, "sex": "m"}, "견습생")],
+        })
+        return w
+
+    def test_dense_lookups(self):
+        from core.game_tables import DenseTable
+        w = self._world()
+        assert isinstance(w.compiled_tables["thac0"], DenseTable)
+        assert w.get_thac0(1, 4) == 16
+        assert w.get_saving_throw(0, 1, 3) == 42
+        assert w.get_exp_required(0, 2) == 2500
+
+    def test_dense_defaults_out_of_range(self):
+        w = self._world()
+        assert w.get_thac0(9, 4) == 20
+        assert w.get_thac0(0, -1) == 20
+        assert w.get_saving_throw(0, 0, 3) == 0   # hole
+        assert w.get_exp_required(0, 99) == 0
+
+    def test_missing_tables(self):
+        w = World()
+        assert w.get_thac0(0, 1) == 20
+        assert w.get_exp_required(0, 1) == 0
+        assert w.get_table_value("nope", default=7, a=1) == 7
+
+    def test_keyed_fallback(self):
+        from core.game_tables import KeyedTable
+        w = self._world()
+        assert isinstance(w.compiled_tables["titles"], KeyedTable)
+        assert w.get_table_value("titles", sex="m", level=1, class_id=0) == "견습생"
+        assert w.get_table_value("titles", sex="f", level=1, class_id=0) is None
+
+    def test_irregular_known_table_falls_back(self):
+        from core.game_tables import KeyedTable
+        w = World()
+        w.compile_game_tables({"thac0": [({"class_id": "warrior", "level": 1}, 19)]})
+        assert isinstance(w.compiled_tables["thac0"], KeyedTable)
+        assert w.get_thac0("warrior", 1) == 19
+
+    def test_sparse_known_table_falls_back(self):
+        from core.game_tables import KeyedTable
+        w = World()
+        w.compile_game_tables({"exp_table": [({"class_id": 0, "level": 100000}, 1)]})
+        assert isinstance(w.compiled_tables["exp_table"], KeyedTable)
+        assert w.get_exp_required(0, 100000) == 1
+
+
+class _BatchDB:
+    """fetch_batches over in-memory tables; records how many streams overlap."""
+
+    def __init__(self, tables, batch_size=2):
+        self.tables = tables
+        self.batch_size = batch_size
+        self.open = 0
+        self.max_open = 0
+
+    async def fetch_batches(self, table):
+        import asyncio
+        self.open += 1
+        self.max_open = max(self.max_open, self.open)
+        try:
+            rows = self.tables.get(table, [])
+            for i in range(0, len(rows), self.batch_size):
+                await asyncio.sleep(0)
+                yield rows[i:i + self.batch_size]
+        finally:
+            self.open -= 1
+
+
+class TestConcurrentLoad:
+    @pytest.mark.asyncio
+    async def test_tables_stream_concurrently(self):
+        rooms = [{"vnum": v, "name": f"방{v}", "description": "", "extra_descs": []}
+                 for v in range(1, 6)]
+        exits = [{"from_vnum": v, "direction": 0, "to_vnum": v + 1, "flags": ["door"]}
+                 for v in range(1, 5)]
+        mobs = [{"vnum": 100 + i} for i in range(3)]
+        zones = [{"vnum": z, "name": f"z{z}"} for z in (30, 10, 20)]
+        db = _BatchDB({"rooms": rooms, "room_exits": exits, "mob_protos": mobs,
+                       "zones": zones,
+                       "game_tables": [{"table_name": "thac0",
+                                        "key": {"class_id": 0, "level": 1}, "value": 19}]})
+        w = World()
+        await w.load_from_db(db)
+
+        assert db.max_open > 1
+        assert len(w.rooms) == 5 and len(w.mob_protos) == 3
+        assert [e.to_vnum for e in w.rooms[1].proto.exits] == [2]
+        assert w.rooms[1].door_states            # doors initialised after exits
+        assert [z.vnum for z in w.zones] == [10, 20, 30]
+        assert w.get_thac0(0, 1) == 19
+        assert set(w.load_timings) >= {"rooms", "room_exits", "game_tables", "help_entries"}
+
+    @pytest.mark.asyncio
+    async def test_decoded_json_values_kept(self):
+        db = _BatchDB({"game_configs": [{"key": "max_level", "value": "100"},
+                                        {"key": "motd", "value": "[1]"}],
+                       "rooms": [{"vnum": 1, "name": "방", "description": "",
+                                  "extra_descs": None, "ext": None}]})
+        w = World()
+        await w.load_from_db(db)
+        assert w.game_configs == {"max_level": "100", "motd": "[1]"}
+        assert w.rooms[1].proto.ext == {} and w.rooms[1].proto.extra_descs == []
@@ -0,0 +1,89 @@
+"""Tests for the binary world snapshot used at boot."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from core import world_snapshot
+from core.world_snapshot import content_hash, load_snapshot, load_world, save_snapshot
+from core.world import World
+from tests.test_lua_framework import _make_world
+
+
+def _loaded_world():
+    world = _make_world()
+    world.compile_game_tables({
+        "thac0": [({"class_id": 0, "level": 1}, 19)],
+        "misc": [({"name": "x"}, "y")],
+    })
+    world.game_configs["start_gold"] = 100
+    return world
+
+
+class TestSnapshotFile:
+    def test_roundtrip(self, tmp_path):
+        path = tmp_path / "tbamud.snap"
+        key = content_hash({"rooms": "a", "zones": "b"})
+        save_snapshot(_loaded_world(), path, key)
+
+        world = World()
+        assert load_snapshot(world, path, key)
+        assert sorted(world.rooms) == [3001, 3002]
+        assert world.rooms[3001].proto.exits[0].to_vnum == 3002
+        assert world.classes[0].name == "마법사"
+        assert world.get_thac0(0, 1) == 19
+        assert world.get_table_value("misc", name="x") == "y"
+        assert world.game_configs == {"start_gold": 100}
+
+    def test_stale_key_or_code_rejected(self, tmp_path, monkeypatch):
+        path = tmp_path / "w.snap"
+        key = content_hash({"rooms": "a"})
+        save_snapshot(_loaded_world(), path, key)
+        assert not load_snapshot(World(), path, content_hash({"rooms": "changed"}))
+        monkeypatch.setattr(world_snapshot, "_code_hash", lambda: b"\0" * 32)
+        assert not load_snapshot(World(), path, key)
+
+    def test_missing_or_corrupt_file(self, tmp_path):
+        key = content_hash({})
+        assert not load_snapshot(World(), tmp_path / "none.snap", key)
+        path = tmp_path / "bad.snap"
+        save_snapshot(_loaded_world(), path, key)
+        path.write_bytes(path.read_bytes()[:80])
+        world = World()
+        assert not load_snapshot(world, path, key)
+        assert world.rooms == {}
+
+
+class TestLoadWorld:
+    def _db(self, fingerprint="v1"):
+        db = AsyncMock()
+        db.table_fingerprints = AsyncMock(
+            side_effect=lambda tables: {t: fingerprint for t in tables})
+        return db
+
+    @pytest.mark.asyncio
+    async def test_db_then_snapshot_then_db_after_change(self, tmp_path, monkeypatch):
+        loads = []
+
+        async def fake_load(self, db, data_dir=None):
+            loads.append(1)
+            self.rooms = _loaded_world().rooms
+
+        monkeypatch.setattr(World, "load_from_db", fake_load)
+        path = tmp_path / "tbamud.snap"
+
+        assert await load_world(World(), self._db(), None, path) == "db"
+        assert path.exists()
+        world = World()
+        assert await load_world(world, self._db(), None, path) == "snapshot"
+        assert sorted(world.rooms) == [3001, 3002]
+        assert await load_world(World(), self._db("v2"), None, path) == "db"
+        assert len(loads) == 2
+
+    @pytest.mark.asyncio
+    async def test_fingerprint_failure_falls_back(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(World, "load_from_db", AsyncMock())
+        db = AsyncMock()
+        db.table_fingerprints = AsyncMock(side_effect=OSError("no such table"))
+        assert await load_world(World(), db, None, tmp_path / "x.snap") == "db"
+        assert not (tmp_path / "x.snap").exists()